@@ -0,0 +1,441 @@
+#  Copyright 2020-2023 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# *******************************************************************************
+#
+# File: argument_converter.py
+#
+# Initially created by Nguyen Huynh Tri Cuong (MS/EMC12-XC) / May 2023.
+#
+# Description:
+#   Provide the conversion of Robot Framework arguments to the input signature
+#   of a DBus method.
+#
+# History:
+#
+# 22.05.2023 / V 0.1.0 / Nguyen Huynh Tri Cuong
+# - Initialize
+#
+# *******************************************************************************
+from dasbus.client.handler import GLibClient
+from dasbus.client.proxy import get_object_handler
+from dasbus.error import ErrorMapper
+from dasbus.typing import get_variant_type, unwrap_variant
+from gi.repository import GLib
+from threading import Lock
+import array
+import ast
+import json
+
+# The array typecodes with the same item size as the fixed-size DBus numeric types.
+_BULK_TYPECODES = {dbus_type: typecode
+                   for dbus_type, typecode, size in (("y", "B", 1), ("n", "h", 2), ("q", "H", 2), ("i", "i", 4),
+                                                     ("u", "I", 4), ("x", "q", 8), ("t", "Q", 8), ("d", "d", 8))
+                   if array.array(typecode).itemsize == size}
+_TRUE_STRINGS = ("true", "yes", "on", "1")
+_FALSE_STRINGS = ("false", "no", "off", "0", "")
+_INT32_RANGE = range(-2 ** 31, 2 ** 31)
+_MAX_REPORTED_LENGTH = 64
+_ERROR_MAPPER = ErrorMapper()
+
+
+def split_signature(signature):
+   """
+Split a DBus signature into its complete types, e.g. 'sa{sv}(ii)' into ['s', 'a{sv}', '(ii)'].
+
+**Arguments:**
+
+* ``signature``
+
+  / *Condition*: required / *Type*: str /
+
+  The DBus signature.
+
+**Returns:**
+
+  / *Type*: list /
+
+  The complete types.
+   """
+   types = []
+   start = 0
+   depth = 0
+   for index, char in enumerate(signature):
+      if char in "({":
+         depth += 1
+      elif char in ")}":
+         depth -= 1
+      if depth == 0 and char not in "am":
+         types.append(signature[start:index + 1])
+         start = index + 1
+   if depth != 0 or start != len(signature):
+      raise ValueError("Invalid DBus signature '%s'." % signature)
+   return types
+
+
+def _parse_literal(value):
+   """
+Parse a JSON or Python literal, e.g. '[1, 2, 3]' or "{'key': 1}".
+   """
+   try:
+      return json.loads(value)
+   except ValueError:
+      return ast.literal_eval(value)
+
+
+def _shorten(value):
+   """
+Get the string representation of a value for an error message, shortened if it is long.
+   """
+   text = str(value)
+   if len(text) > _MAX_REPORTED_LENGTH:
+      text = text[:_MAX_REPORTED_LENGTH - 3] + "..."
+   return text
+
+
+def _to_int(value):
+   if isinstance(value, str):
+      value = value.strip()
+      try:
+         return int(value, 0)
+      except ValueError:
+         return int(value)
+   if isinstance(value, float) and value.is_integer():
+      return int(value)
+   return value
+
+
+def _to_bool(value):
+   if isinstance(value, str):
+      lower_value = value.strip().lower()
+      if lower_value in _TRUE_STRINGS:
+         return True
+      if lower_value in _FALSE_STRINGS:
+         return False
+      raise ValueError("'%s' is not a boolean." % value)
+   return bool(value)
+
+
+def _to_float(value):
+   if isinstance(value, (str, int)) and not isinstance(value, bool):
+      return float(value)
+   return value
+
+
+def _to_str(value):
+   if not isinstance(value, str):
+      raise TypeError("'%s' is not a string." % (value,))
+   return value
+
+
+def _to_variant(value):
+   """
+Wrap a value into a variant, guessing its DBus type.
+   """
+   if isinstance(value, GLib.Variant):
+      return value
+   if isinstance(value, bool):
+      return GLib.Variant("b", value)
+   if isinstance(value, int):
+      return GLib.Variant("i" if value in _INT32_RANGE else "x", value)
+   if isinstance(value, float):
+      return GLib.Variant("d", value)
+   if isinstance(value, str):
+      return GLib.Variant("s", value)
+   if isinstance(value, (bytes, bytearray)):
+      return GLib.Variant.new_from_bytes(GLib.VariantType.new("ay"), GLib.Bytes.new(bytes(value)), False)
+   if isinstance(value, dict):
+      return GLib.Variant("a{sv}", {_to_str(key): _to_variant(item) for key, item in value.items()})
+   if isinstance(value, (list, tuple)):
+      return GLib.Variant("av", [_to_variant(item) for item in value])
+   raise TypeError("Cannot guess the DBus type of '%s'." % (value,))
+
+
+_BASIC_CONVERTERS = {
+   "y": _to_int, "n": _to_int, "q": _to_int, "i": _to_int, "u": _to_int, "x": _to_int, "t": _to_int, "h": _to_int,
+   "b": _to_bool,
+   "d": _to_float,
+   "s": _to_str, "o": _to_str, "g": _to_str,
+   "v": _to_variant,
+}
+
+
+def _compile(dbus_type):
+   """
+Build the conversion function of a complete DBus type.
+   """
+   converter = _BASIC_CONVERTERS.get(dbus_type)
+   if converter is not None:
+      return converter
+
+   if dbus_type.startswith("a{"):
+      key_type, value_type = split_signature(dbus_type[2:-1])
+      key_converter = _compile(key_type)
+      value_converter = _compile(value_type)
+
+      def _convert_dict(value):
+         if isinstance(value, str):
+            value = _parse_literal(value)
+         if not isinstance(value, dict):
+            value = dict(value)
+         return {key_converter(key): value_converter(item) for key, item in value.items()}
+      return _convert_dict
+
+   if dbus_type.startswith("a"):
+      element_type = dbus_type[1:]
+      element_converter = _compile(element_type)
+
+      def _convert_list(value):
+         if isinstance(value, str):
+            value = _parse_literal(value)
+         return [element_converter(item) for item in value]
+      return _convert_list
+
+   if dbus_type.startswith("("):
+      item_converters = [_compile(item_type) for item_type in split_signature(dbus_type[1:-1])]
+
+      def _convert_tuple(value):
+         if isinstance(value, str):
+            value = _parse_literal(value)
+         if len(value) != len(item_converters):
+            raise ValueError("Expected %s items but got %s." % (len(item_converters), len(value)))
+         return tuple(converter(item) for converter, item in zip(item_converters, value))
+      return _convert_tuple
+
+   raise ValueError("Unsupported DBus type '%s'." % dbus_type)
+
+
+def _compile_bulk(dbus_type, threshold):
+   """
+Build the conversion function of a numeric array argument, which creates the variant of a large array
+from its raw data instead of element by element.
+   """
+   element_type = dbus_type[1:]
+   typecode = _BULK_TYPECODES[element_type]
+   variant_type = GLib.VariantType.new(dbus_type)
+   element_converter = _compile(element_type)
+
+   def _convert_array(value):
+      if isinstance(value, str):
+         value = _parse_literal(value)
+      if isinstance(value, (bytes, bytearray, memoryview)):
+         if element_type != "y":
+            value = array.array(typecode, value)
+      elif not isinstance(value, array.array):
+         if len(value) < threshold:
+            return [element_converter(item) for item in value]
+         try:
+            value = array.array(typecode, value)
+         except TypeError:
+            value = array.array(typecode, [element_converter(item) for item in value])
+      elif value.typecode != typecode:
+         value = array.array(typecode, value.tolist())
+      return GLib.Variant.new_from_bytes(variant_type, GLib.Bytes.new(bytes(value)), False)
+   return _convert_array
+
+
+class ArgumentConverter:
+   """
+The conversion of arguments to the input signature of a DBus method, compiled once per signature.
+
+Robot Framework arguments are usually strings, so they are converted to the DBus type of their parameter,
+e.g. '42' to 'u' or '[1, 2, 3]' to 'ai'. Arguments which have the expected type already are passed unchanged.
+
+Arrays of fixed-size numbers ('ay', 'ai', 'ad', ...) with at least ``BULK_ARRAY_THRESHOLD`` items, bytes-like
+objects and ``array.array`` objects are converted in bulk: their variant is created from the raw data in native
+byte order instead of element by element.
+   """
+   BULK_ARRAY_THRESHOLD = 64
+
+   _converter_dict = {}
+   _lock = Lock()
+
+   @classmethod
+   def get(cls, in_type):
+      """
+Get the cached converter of an input signature or compile it.
+
+**Arguments:**
+
+* ``in_type``
+
+  / *Condition*: required / *Type*: str /
+
+  The input signature of the method, e.g. '(su)', or None for a method without arguments.
+
+**Returns:**
+
+  / *Type*: ArgumentConverter /
+
+  The converter.
+      """
+      converter = cls._converter_dict.get(in_type)
+      if converter is None:
+         with cls._lock:
+            converter = cls._converter_dict.get(in_type)
+            if converter is None:
+               converter = ArgumentConverter(in_type)
+               cls._converter_dict[in_type] = converter
+      return converter
+
+   def __init__(self, in_type):
+      """
+Constructor for ArgumentConverter class.
+
+**Arguments:**
+
+* ``in_type``
+
+  / *Condition*: required / *Type*: str /
+
+  The input signature of the method, e.g. '(su)', or None for a method without arguments.
+
+**Returns:**
+
+(*no returns*)
+      """
+      self.in_type = in_type
+      self.types = split_signature(in_type[1:-1]) if in_type else []
+      self._converters = []
+      for dbus_type in self.types:
+         if dbus_type[:1] == "a" and dbus_type[1:] in _BULK_TYPECODES:
+            self._converters.append(_compile_bulk(dbus_type, ArgumentConverter.BULK_ARRAY_THRESHOLD))
+         else:
+            self._converters.append(_compile(dbus_type))
+
+   def convert(self, args):
+      """
+Convert the arguments of a call.
+
+**Arguments:**
+
+* ``args``
+
+  / *Condition*: required / *Type*: tuple /
+
+  The arguments.
+
+**Returns:**
+
+* ``args``
+
+  / *Type*: tuple /
+
+  The converted arguments, to be passed to the proxy method.
+
+* ``parameters``
+
+  / *Type*: GLib.Variant /
+
+  The variant of all arguments if an argument has been converted in bulk, otherwise None.
+      """
+      if len(args) != len(self._converters):
+         raise TypeError("Expected %s arguments (signature '%s') but got %s."
+                         % (len(self._converters), self.in_type or "", len(args)))
+      values = []
+      has_bulk = False
+      for index, (dbus_type, converter, arg) in enumerate(zip(self.types, self._converters, args)):
+         try:
+            value = converter(arg)
+         except Exception as ex:
+            raise ValueError("Cannot convert argument %s '%s' to DBus type '%s': %s"
+                             % (index + 1, _shorten(arg), dbus_type, _shorten(ex))) from None
+         has_bulk = has_bulk or (dbus_type != "v" and isinstance(value, GLib.Variant))
+         values.append(value)
+
+      if not has_bulk:
+         return tuple(values), None
+      children = [value if isinstance(value, GLib.Variant) and dbus_type != "v" else GLib.Variant(dbus_type, value)
+                  for dbus_type, value in zip(self.types, values)]
+      return tuple(values), GLib.Variant.new_tuple(*children)
+
+
+def _get_method_reply(call, *args):
+   """
+Get the result of a DBus call like dasbus: a single value is returned unwrapped, no value as None.
+A remote DBus error is raised as ``DBusError`` with its ``dbus_name``.
+   """
+   try:
+      values = unwrap_variant(call(*args))
+   except Exception as error:
+      if GLibClient.is_remote_error(error):
+         name = GLibClient.get_remote_error_name(error)
+         exception = _ERROR_MAPPER.get_exception_type(name)(GLibClient.get_remote_error_message(error))
+         exception.dbus_name = name
+         raise exception from None
+      if GLibClient.is_timeout_error(error):
+         raise TimeoutError("The DBus call timeout was reached.") from None
+      raise
+   if not values:
+      return None
+   if len(values) == 1:
+      return values[0]
+   return values
+
+
+def call_with_parameters(message_bus, proxy, method_spec, parameters, callback=None):
+   """
+Call a DBus method with the variant of its arguments.
+
+dasbus always creates the variant from Python values, so the call is made with its low-level ``GLibClient``
+and the variant created by ``ArgumentConverter``. The reply and the errors are handled like dasbus does.
+
+**Arguments:**
+
+* ``message_bus``
+
+  / *Condition*: required / *Type*: dasbus.connection.MessageBus /
+
+  The message bus of the proxy.
+
+* ``proxy``
+
+  / *Condition*: required / *Type*: dasbus.client.proxy.ObjectProxy /
+
+  The proxy of the object.
+
+* ``method_spec``
+
+  / *Condition*: required / *Type*: DBusSpecification.Method /
+
+  The specification of the method.
+
+* ``parameters``
+
+  / *Condition*: required / *Type*: GLib.Variant /
+
+  The variant of the arguments.
+
+* ``callback``
+
+  / *Condition*: optional / *Type*: callable / *Default*: None /
+
+  The callback of an asynchronous call, called like a dasbus method callback. None means a synchronous call.
+
+**Returns:**
+
+  / *Type*: Any /
+
+  The return value of a synchronous call.
+   """
+   handler = get_object_handler(proxy)
+   args = (message_bus.connection,
+           handler.service_name,
+           handler.object_path,
+           method_spec.interface_name,
+           method_spec.name,
+           parameters,
+           get_variant_type(method_spec.out_type) if method_spec.out_type else None)
+   if callback is None:
+      return _get_method_reply(GLibClient.sync_call, *args)
+   GLibClient.async_call(*args, callback=lambda getter: callback(lambda: _get_method_reply(getter)))
@@ -0,0 +1,527 @@
+#  Copyright 2020-2023 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# *******************************************************************************
+#
+# File: async_call.py
+#
+# Initially created by Nguyen Huynh Tri Cuong (MS/EMC12-XC) / May 2023.
+#
+# Description:
+#   Provide handles for asynchronous DBus method calls.
+#
+# History:
+#
+# 22.05.2023 / V 0.1.0 / Nguyen Huynh Tri Cuong
+# - Initialize
+#
+# *******************************************************************************
+from RobotFramework_DBus.common.thread_safe_dict import ThreadSafeDict
+from threading import Event, Lock
+import itertools
+import time
+
+
+class MethodCallHandle:
+   """
+A handle to the result of an asynchronous DBus method call.
+   """
+   def __init__(self, handle_id, method_name):
+      """
+Constructor for MethodCallHandle class.
+
+**Arguments:**
+
+* ``handle_id``
+
+  / *Condition*: required / *Type*: str /
+
+  The unique identifier of the call.
+
+* ``method_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the called DBus method.
+
+**Returns:**
+
+(*no returns*)
+      """
+      self.handle_id = handle_id
+      self.method_name = method_name
+      self.start_time = time.monotonic()
+      self.end_time = None
+      self._result = None
+      self._error = None
+      self._done = Event()
+
+   def reply_callback(self, call):
+      """
+Callback of dasbus for the reply of the asynchronous call.
+
+**Arguments:**
+
+* ``call``
+
+  / *Condition*: required / *Type*: callable /
+
+  The function returning the result of the call or raising its error.
+
+**Returns:**
+
+(*no returns*)
+      """
+      try:
+         self.set_result(call())
+      except Exception as ex:
+         self.set_error(ex)
+
+   def set_result(self, result):
+      """
+Complete the call with a result.
+
+**Arguments:**
+
+* ``result``
+
+  / *Condition*: required / *Type*: Any /
+
+  Return from called method.
+
+**Returns:**
+
+(*no returns*)
+      """
+      self._result = result
+      self.end_time = time.monotonic()
+      self._done.set()
+
+   def set_error(self, error):
+      """
+Complete the call with an error.
+
+**Arguments:**
+
+* ``error``
+
+  / *Condition*: required / *Type*: Exception /
+
+  The error raised by the call.
+
+**Returns:**
+
+(*no returns*)
+      """
+      self._error = error
+      self.end_time = time.monotonic()
+      self._done.set()
+
+   def done(self):
+      """
+Check if the call has completed.
+
+**Returns:**
+
+  / *Type*: bool /
+
+  True if the reply has been received.
+      """
+      return self._done.is_set()
+
+   def failed(self):
+      """
+Check if the call has completed with an error.
+
+**Returns:**
+
+  / *Type*: bool /
+
+  True if the call has failed.
+      """
+      return self._done.is_set() and self._error is not None
+
+   def wait(self, timeout=None):
+      """
+Wait for the call to complete.
+
+**Arguments:**
+
+* ``timeout``
+
+  / *Condition*: optional / *Type*: float / *Default*: None /
+
+  The maximum time (in seconds) to wait. None means to wait without limit.
+
+**Returns:**
+
+  / *Type*: bool /
+
+  True if the call has completed.
+      """
+      return self._done.wait(timeout)
+
+   def get_result(self):
+      """
+Get the result of the completed call.
+
+**Returns:**
+
+  / *Type*: Any /
+
+  Return from called method. The error of a failed call is raised.
+      """
+      if self._error is not None:
+         raise self._error
+      return self._result
+
+   def get_error(self):
+      """
+Get the error of the completed call.
+
+**Returns:**
+
+  / *Type*: Exception /
+
+  The error of the call or None if it has succeeded.
+      """
+      return self._error
+
+   def get_elapsed_time(self):
+      """
+Get the time between sending the call and receiving its reply.
+
+**Returns:**
+
+  / *Type*: float /
+
+  The elapsed time in seconds, or None if the call has not completed yet.
+      """
+      if self.end_time is None:
+         return None
+      return self.end_time - self.start_time
+
+
+class MethodCallRegistry:
+   """
+Keep the pending asynchronous method calls of a connection in issue order.
+   """
+   def __init__(self):
+      """
+Constructor for MethodCallRegistry class.
+
+**Returns:**
+
+(*no returns*)
+      """
+      self._handle_dict = ThreadSafeDict()
+      self._counter = itertools.count(1)
+      self._lock = Lock()
+
+   def create(self, method_name):
+      """
+Create and register a handle for a new call.
+
+**Arguments:**
+
+* ``method_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the called DBus method.
+
+**Returns:**
+
+  / *Type*: MethodCallHandle /
+
+  The new handle.
+      """
+      with self._lock:
+         handle = MethodCallHandle("%s-%s" % (method_name, next(self._counter)), method_name)
+         self._handle_dict[handle.handle_id] = handle
+      return handle
+
+   def get(self, handle_id):
+      """
+Get a registered handle.
+
+**Arguments:**
+
+* ``handle_id``
+
+  / *Condition*: required / *Type*: str /
+
+  The identifier of the call.
+
+**Returns:**
+
+  / *Type*: MethodCallHandle /
+
+  The handle of the call.
+      """
+      if handle_id not in self._handle_dict:
+         raise Exception("There is no pending method call with handle '%s'" % handle_id)
+      return self._handle_dict[handle_id]
+
+   def remove(self, handle_id):
+      """
+Unregister a handle.
+
+**Arguments:**
+
+* ``handle_id``
+
+  / *Condition*: required / *Type*: str /
+
+  The identifier of the call.
+
+**Returns:**
+
+(*no returns*)
+      """
+      self._handle_dict.pop(handle_id, None)
+
+   def get_all(self):
+      """
+Get all registered handles in issue order.
+
+**Returns:**
+
+  / *Type*: list /
+
+  The handles of all pending calls.
+      """
+      with self._lock:
+         return list(self._handle_dict.values())
+
+   def wait_for_result(self, handle_id, timeout=None):
+      """
+Wait for the result of a call and unregister its handle.
+
+**Arguments:**
+
+* ``handle_id``
+
+  / *Condition*: required / *Type*: str /
+
+  The identifier of the call.
+
+* ``timeout``
+
+  / *Condition*: optional / *Type*: float / *Default*: None /
+
+  The maximum time (in seconds) to wait. None means to wait without limit.
+
+**Returns:**
+
+  / *Type*: Any /
+
+  Return from called method. The error of a failed call is raised.
+      """
+      handle = self.get(handle_id)
+      if not handle.wait(timeout):
+         raise AssertionError("The '%s' method call has not completed after '%s'" % (handle_id, timeout))
+      self.remove(handle_id)
+      return handle.get_result()
+
+   def wait_for_all_results(self, timeout=None):
+      """
+Wait for the results of all pending calls and unregister their handles.
+
+**Arguments:**
+
+* ``timeout``
+
+  / *Condition*: optional / *Type*: float / *Default*: None /
+
+  The maximum time (in seconds) to wait for all calls. None means to wait without limit.
+
+**Returns:**
+
+  / *Type*: list /
+
+  Returns from the called methods in issue order. If any call has failed, the error of the first
+  failed call is raised after all calls have completed.
+      """
+      deadline = None if timeout is None else time.monotonic() + timeout
+      handles = self.get_all()
+      for handle in handles:
+         remaining = None if deadline is None else max(0, deadline - time.monotonic())
+         if not handle.wait(remaining):
+            raise AssertionError("The '%s' method call has not completed after '%s'" % (handle.handle_id, timeout))
+
+      results = []
+      first_error = None
+      for handle in handles:
+         self.remove(handle.handle_id)
+         if handle.failed() and first_error is None:
+            first_error = handle.get_error()
+         results.append(None if handle.failed() else handle.get_result())
+      if first_error is not None:
+         raise first_error
+      return results
+
+
+class MethodCallBatch:
+   """
+A batch of DBus method calls which are sent pipelined and whose results are collected in order.
+   """
+   STATUS_PASS = "PASS"
+   STATUS_FAIL = "FAIL"
+   STATUS_NOT_RUN = "NOT RUN"
+
+   def __init__(self, calls, stop_on_error=False):
+      """
+Constructor for MethodCallBatch class.
+
+**Arguments:**
+
+* ``calls``
+
+  / *Condition*: required / *Type*: list /
+
+  The calls of the batch. Each call is a (method, args) tuple or list, where ``args`` is a list
+  of input arguments, or just the method name for a call without arguments.
+
+* ``stop_on_error``
+
+  / *Condition*: optional / *Type*: bool / *Default*: False /
+
+  If False, all calls are sent at once without waiting for any reply.
+  If True, each call is sent from the reply of the previous one on the event loop, and the batch stops
+  at the first failed call.
+
+**Returns:**
+
+(*no returns*)
+      """
+      self.stop_on_error = stop_on_error
+      self._calls = [MethodCallBatch._parse_call(call) for call in calls]
+      self._handles = [MethodCallHandle("batch-%s" % idx, call[0]) for idx, call in enumerate(self._calls)]
+      self._completed = Event()
+      self._lock = Lock()
+      self._remaining = len(self._calls)
+      if self._remaining == 0:
+         self._completed.set()
+
+   @staticmethod
+   def _parse_call(call):
+      if isinstance(call, str):
+         return call, ()
+      if len(call) == 1:
+         return call[0], ()
+      if len(call) == 2 and isinstance(call[1], (list, tuple)):
+         return call[0], tuple(call[1])
+      raise ValueError("Invalid batch call '%s'. Expected a (method, args) tuple." % (call,))
+
+   def _finish(self, count=1):
+      with self._lock:
+         self._remaining -= count
+         if self._remaining <= 0:
+            self._completed.set()
+
+   def _send(self, send_func, idx):
+      method_name, args = self._calls[idx]
+      handle = self._handles[idx]
+      handle.start_time = time.monotonic()
+
+      def _on_reply(call):
+         handle.reply_callback(call)
+         if self.stop_on_error and idx + 1 < len(self._calls):
+            if handle.failed():
+               self._finish(len(self._calls) - idx)
+               return
+            self._send(send_func, idx + 1)
+         self._finish()
+
+      try:
+         send_func(method_name, args, _on_reply)
+      except Exception as ex:
+         error = ex
+
+         def _failed_call():
+            raise error
+
+         _on_reply(_failed_call)
+
+   def start(self, send_func):
+      """
+Send the calls of the batch.
+
+**Arguments:**
+
+* ``send_func``
+
+  / *Condition*: required / *Type*: callable /
+
+  The function which sends one call asynchronously. It is called with the method name,
+  the input arguments and the reply callback, and must be called on the event loop thread.
+
+**Returns:**
+
+(*no returns*)
+      """
+      if not self._calls:
+         return
+      if self.stop_on_error:
+         self._send(send_func, 0)
+      else:
+         for idx in range(len(self._calls)):
+            self._send(send_func, idx)
+
+   def wait(self, timeout=None):
+      """
+Wait for the batch to complete.
+
+**Arguments:**
+
+* ``timeout``
+
+  / *Condition*: optional / *Type*: float / *Default*: None /
+
+  The maximum time (in seconds) to wait. None means to wait without limit.
+
+**Returns:**
+
+  / *Type*: bool /
+
+  True if the batch has completed.
+      """
+      return self._completed.wait(timeout)
+
+   def get_report(self):
+      """
+Get the status, result and timing of every call of the batch, in order.
+
+**Returns:**
+
+  / *Type*: list /
+
+  A dictionary per call with the keys 'method', 'status' ('PASS', 'FAIL' or 'NOT RUN'),
+  'result', 'error' and 'elapsed' (seconds between sending the call and receiving its reply).
+      """
+      report = []
+      for handle in self._handles:
+         entry = {"method": handle.method_name,
+                  "status": MethodCallBatch.STATUS_NOT_RUN,
+                  "result": None,
+                  "error": None,
+                  "elapsed": handle.get_elapsed_time()}
+         if handle.failed():
+            entry["status"] = MethodCallBatch.STATUS_FAIL
+            entry["error"] = str(handle.get_error())
+         elif handle.done():
+            entry["status"] = MethodCallBatch.STATUS_PASS
+            entry["result"] = handle.get_result()
+         report.append(entry)
+      return report
@@ -0,0 +1,214 @@
+#  Copyright 2020-2023 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# *******************************************************************************
+#
+# File: dbus_reactor.py
+#
+# Initially created by Nguyen Huynh Tri Cuong (MS/EMC12-XC) / May 2023.
+#
+# Description:
+#   Provide a single process-wide thread which runs the GLib main loop for all DBus clients.
+#
+# History:
+#
+# 22.05.2023 / V 0.1.0 / Nguyen Huynh Tri Cuong
+# - Initialize
+#
+# *******************************************************************************
+from dasbus.loop import EventLoop
+from gi.repository import GLib
+import sys
+import threading
+
+
+class DBusReactor:
+   """
+A single process-wide thread which owns the GLib main context for all DBus clients.
+
+DBus signal callbacks of every client are dispatched on this thread, and any work which has to
+touch the main context is marshalled onto it, so that the number of threads stays constant
+no matter how many connections are established.
+   """
+   _instance = None
+   _lock = threading.Lock()
+   _ALIVE_CHECK_INTERVAL = 0.5
+
+   @classmethod
+   def get_instance(cls):
+      """
+Get the process-wide reactor, start it if it is not running yet.
+
+**Returns:**
+
+  / *Type*: DBusReactor /
+
+  The reactor instance.
+      """
+      with cls._lock:
+         if cls._instance is None or not cls._instance.is_alive():
+            cls._instance = cls()
+            cls._instance.start()
+      return cls._instance
+
+   def __init__(self):
+      """
+Constructor for DBusReactor class.
+
+**Returns:**
+
+(*no returns*)
+      """
+      self._event_loop = EventLoop()
+      self._thread = threading.Thread(target=self._run, name="DBusReactor", daemon=True)
+      self._started = threading.Event()
+
+   def _run(self):
+      GLib.idle_add(self._on_started)
+      self._event_loop.run()
+
+   def _on_started(self):
+      self._started.set()
+      return GLib.SOURCE_REMOVE
+
+   def start(self):
+      """
+Start the reactor thread and wait until the main loop is running.
+
+**Returns:**
+
+(*no returns*)
+      """
+      self._thread.start()
+      self._started.wait()
+
+   def stop(self):
+      """
+Stop the main loop of the reactor.
+
+**Returns:**
+
+(*no returns*)
+      """
+      self._event_loop.quit()
+      self._thread.join()
+
+   def is_alive(self):
+      """
+Check if the reactor thread is running.
+
+**Returns:**
+
+  / *Type*: bool /
+
+  True if the reactor thread is running.
+      """
+      return self._thread.is_alive()
+
+   def in_reactor_thread(self):
+      """
+Check if the caller is running on the reactor thread.
+
+**Returns:**
+
+  / *Type*: bool /
+
+  True if the current thread is the reactor thread.
+      """
+      return threading.current_thread() is self._thread
+
+   def call_soon(self, func, *args):
+      """
+Schedule a function to be executed on the reactor thread without waiting for it.
+
+**Arguments:**
+
+* ``func``
+
+  / *Condition*: required / *Type*: callable /
+
+  The function to execute.
+
+* ``args``
+
+  / *Condition*: optional / *Type*: tuple /
+
+  Positional arguments to pass to the function.
+
+**Returns:**
+
+(*no returns*)
+      """
+      def _invoke():
+         func(*args)
+         return GLib.SOURCE_REMOVE
+
+      GLib.idle_add(_invoke)
+
+   def call(self, func, *args, **kwargs):
+      """
+Execute a function on the reactor thread and wait for its result.
+
+When called from the reactor thread itself, the function is executed directly. So it is while the
+interpreter shuts down, because the reactor thread does not run anymore then.
+
+**Arguments:**
+
+* ``func``
+
+  / *Condition*: required / *Type*: callable /
+
+  The function to execute.
+
+* ``args``
+
+  / *Condition*: optional / *Type*: tuple /
+
+  Positional arguments to pass to the function.
+
+* ``kwargs``
+
+  / *Condition*: optional / *Type*: dict /
+
+  Keyword arguments to pass to the function.
+
+**Returns:**
+
+  / *Type*: Any /
+
+  The return value of the function. Exceptions raised by the function are re-raised to the caller.
+  A RuntimeError is raised if the reactor thread stops before the function has been executed.
+      """
+      if self.in_reactor_thread() or sys.is_finalizing():
+         return func(*args, **kwargs)
+
+      done = threading.Event()
+      outcome = {}
+
+      def _invoke():
+         try:
+            outcome['result'] = func(*args, **kwargs)
+         except Exception as ex:
+            outcome['error'] = ex
+         finally:
+            done.set()
+         return GLib.SOURCE_REMOVE
+
+      GLib.idle_add(_invoke)
+      # The function is never executed if the reactor thread has stopped, e.g. after a failure of the main loop.
+      while not done.wait(DBusReactor._ALIVE_CHECK_INTERVAL):
+         if not self.is_alive():
+            raise RuntimeError("The DBus reactor thread is not running anymore.")
+      if 'error' in outcome:
+         raise outcome['error']
+      return outcome.get('result')
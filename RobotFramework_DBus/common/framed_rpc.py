@@ -0,0 +1,557 @@
+#  Copyright 2020-2023 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# *******************************************************************************
+#
+# File: framed_rpc.py
+#
+# Initially created by Nguyen Huynh Tri Cuong (MS/EMC12-XC) / May 2023.
+#
+# Description:
+#   Provide an RPC transport over one persistent TCP or Unix socket connection with
+#   length-prefixed msgpack frames, as an alternative to XML-RPC.
+#
+# History:
+#
+# 22.05.2023 / V 0.1.0 / Nguyen Huynh Tri Cuong
+# - Initialize
+#
+# *******************************************************************************
+from RobotFramework_DBus.common.worker_pool import WorkerPool, is_blocking_request
+from threading import Event, Lock, Thread
+import itertools
+import os
+import socket
+import struct
+import sys
+import time
+import xmlrpc.server
+
+try:
+   import msgpack
+except ImportError:
+   msgpack = None
+
+# The messages follow the msgpack-rpc layout: [0, msgid, method, params] and [1, msgid, error, result].
+MESSAGE_REQUEST = 0
+MESSAGE_RESPONSE = 1
+
+_HEADER = struct.Struct("!I")
+MAX_FRAME_SIZE = 256 * 1024 * 1024
+
+
+def is_available():
+   """
+Check if the framed transport can be used, i.e. if the optional 'msgpack' package is installed.
+
+**Returns:**
+
+  / *Type*: bool /
+
+  True if the framed transport is available.
+   """
+   return msgpack is not None
+
+
+def parse_address(address, host, port):
+   """
+Get the socket address of a framed transport endpoint.
+
+**Arguments:**
+
+* ``address``
+
+  / *Condition*: required / *Type*: str / int /
+
+  The path of a Unix socket (containing '/'), 'host:port', a port, or None for the default endpoint.
+
+* ``host``
+
+  / *Condition*: required / *Type*: str /
+
+  The host of the DBus Agent.
+
+* ``port``
+
+  / *Condition*: required / *Type*: int /
+
+  The XML-RPC port of the DBus Agent. The default endpoint listens on the next port.
+
+**Returns:**
+
+  / *Type*: str / tuple /
+
+  The path of a Unix socket or a (host, port) tuple.
+   """
+   if address is None or address == "":
+      return host, int(port) + 1
+   address = str(address)
+   if "/" in address:
+      return address
+   if ":" in address:
+      address_host, address_port = address.rsplit(":", 1)
+      return address_host or host, int(address_port)
+   return host, int(address)
+
+
+class FramedRPCError(Exception):
+   """
+An exception raised by the remote side of a framed RPC call.
+   """
+   def __init__(self, error_type, message):
+      """
+Constructor for FramedRPCError class.
+
+**Arguments:**
+
+* ``error_type``
+
+  / *Condition*: required / *Type*: str /
+
+  The class name of the remote exception.
+
+* ``message``
+
+  / *Condition*: required / *Type*: str /
+
+  The message of the remote exception.
+
+**Returns:**
+
+(*no returns*)
+      """
+      super().__init__("<class '%s'>:%s" % (error_type, message))
+      self.error_type = error_type
+      self.message = message
+
+
+class FrameStream:
+   """
+Length-prefixed msgpack frames over a connected socket. Writes are serialized, so that several threads
+can send over the same socket.
+   """
+   def __init__(self, sock):
+      """
+Constructor for FrameStream class.
+
+**Arguments:**
+
+* ``sock``
+
+  / *Condition*: required / *Type*: socket.socket /
+
+  The connected socket.
+
+**Returns:**
+
+(*no returns*)
+      """
+      self.sock = sock
+      self._write_lock = Lock()
+
+   def _read_exactly(self, size):
+      buffer = bytearray(size)
+      view = memoryview(buffer)
+      received = 0
+      while received < size:
+         count = self.sock.recv_into(view[received:])
+         if count == 0:
+            return None
+         received += count
+      return buffer
+
+   def read_message(self):
+      """
+Read the next message.
+
+**Returns:**
+
+  / *Type*: list /
+
+  The message or None if the connection has been closed.
+      """
+      header = self._read_exactly(_HEADER.size)
+      if header is None:
+         return None
+      size = _HEADER.unpack(header)[0]
+      if size > MAX_FRAME_SIZE:
+         raise ConnectionError("The frame size '%s' exceeds the maximum of '%s'." % (size, MAX_FRAME_SIZE))
+      body = self._read_exactly(size)
+      if body is None:
+         return None
+      return msgpack.unpackb(body, raw=False, strict_map_key=False)
+
+   def write_message(self, message):
+      """
+Write a message.
+
+**Arguments:**
+
+* ``message``
+
+  / *Condition*: required / *Type*: list /
+
+  The message.
+
+**Returns:**
+
+(*no returns*)
+      """
+      body = msgpack.packb(message, use_bin_type=True)
+      with self._write_lock:
+         self.sock.sendall(_HEADER.pack(len(body)) + body)
+
+
+def _connect(address, timeout=None):
+   if isinstance(address, str):
+      sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+      sock.settimeout(timeout)
+      sock.connect(address)
+   else:
+      sock = socket.create_connection(address, timeout)
+      sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+   sock.settimeout(None)
+   return sock
+
+
+class _PendingCall:
+   """
+A request which is waiting for its response.
+   """
+   __slots__ = ("event", "error", "result")
+
+   def __init__(self):
+      self.event = Event()
+      self.error = None
+      self.result = None
+
+
+class _Method:
+   """
+A callable remote method of a ``FramedRPCProxy``.
+   """
+   __slots__ = ("_proxy", "_name")
+
+   def __init__(self, proxy, name):
+      self._proxy = proxy
+      self._name = name
+
+   def __call__(self, *params):
+      return self._proxy.call(self._name, *params)
+
+
+class FramedRPCProxy:
+   """
+The client side of the framed transport, usable like ``xmlrpc.client.ServerProxy``.
+
+All calls of a proxy share one persistent connection. Each request carries an ID and the responses are
+matched to the waiting callers by a reader thread, so that calls from several threads, e.g. a method call
+and a long poll for signal events, are multiplexed over the same socket.
+   """
+   CONNECT_TIMEOUT = 10
+   READER_CHECK_INTERVAL = 0.5
+   DEFAULT_TIMEOUT = 600
+
+   def __init__(self, address, timeout=DEFAULT_TIMEOUT):
+      """
+Constructor for FramedRPCProxy class.
+
+**Arguments:**
+
+* ``address``
+
+  / *Condition*: required / *Type*: str / tuple /
+
+  The path of a Unix socket or a (host, port) tuple.
+
+* ``timeout``
+
+  / *Condition*: optional / *Type*: float / *Default*: 600 /
+
+  The maximum time in seconds to wait for the response of a call. It must be longer than the longest
+  wait requested from the agent, e.g. the timeout of ``wait_for_signal``. None means no limit.
+
+**Returns:**
+
+(*no returns*)
+      """
+      if msgpack is None:
+         raise RuntimeError("The framed transport requires the 'msgpack' package.")
+      self.address = address
+      self.timeout = timeout
+      self._stream = FrameStream(_connect(address, FramedRPCProxy.CONNECT_TIMEOUT))
+      self._pending_dict = {}
+      self._lock = Lock()
+      self._msgids = itertools.count(1)
+      self._closed_reason = None
+      self._reader = Thread(target=self._read_responses, name="dbus-framed-rpc-reader", daemon=True)
+      self._reader.start()
+
+   def __getattr__(self, name):
+      if name.startswith("_"):
+         raise AttributeError(name)
+      return _Method(self, name)
+
+   def _read_responses(self):
+      reason = "The connection has been closed by the DBus Agent."
+      try:
+         while True:
+            message = self._stream.read_message()
+            if message is None:
+               break
+            _message_type, msgid, error, result = message
+            with self._lock:
+               pending = self._pending_dict.pop(msgid, None)
+            if pending is not None:
+               pending.error = error
+               pending.result = result
+               pending.event.set()
+      except Exception as ex:
+         reason = "The connection to the DBus Agent has been lost. Reason: %s" % ex
+      finally:
+         with self._lock:
+            if self._closed_reason is None:
+               self._closed_reason = reason
+            pending_calls = list(self._pending_dict.values())
+            self._pending_dict.clear()
+         for pending in pending_calls:
+            pending.error = ["ConnectionError", self._closed_reason]
+            pending.event.set()
+
+   def call(self, method, *params):
+      """
+Call a remote method and wait for its result.
+
+The call fails with ``ConnectionError`` when the connection is lost and with ``TimeoutError`` when there is
+no response within the timeout of the proxy.
+
+**Arguments:**
+
+* ``method``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the remote method.
+
+* ``params``
+
+  / *Condition*: optional / *Type*: tuple /
+
+  The arguments of the remote method.
+
+**Returns:**
+
+  / *Type*: Any /
+
+  The result of the remote method.
+      """
+      pending = _PendingCall()
+      with self._lock:
+         if self._closed_reason is None and sys.is_finalizing():
+            # The reader thread does not run anymore while the interpreter shuts down.
+            self._closed_reason = "The connection to the DBus Agent has been closed at exit."
+         if self._closed_reason is not None:
+            raise ConnectionError(self._closed_reason)
+         msgid = next(self._msgids)
+         self._pending_dict[msgid] = pending
+      try:
+         self._stream.write_message([MESSAGE_REQUEST, msgid, method, params])
+      except Exception:
+         with self._lock:
+            self._pending_dict.pop(msgid, None)
+         raise
+      self._wait_for_response(pending, msgid, method)
+      if pending.error is not None:
+         if pending.error[0] == "ConnectionError":
+            raise ConnectionError(pending.error[1])
+         raise FramedRPCError(*pending.error)
+      return pending.result
+
+   def _wait_for_response(self, pending, msgid, method):
+      """
+Wait for the response of a call. The call is given up when the reader thread has stopped or the timeout
+of the proxy has passed.
+      """
+      deadline = None if self.timeout is None else time.monotonic() + self.timeout
+      while not pending.event.wait(FramedRPCProxy.READER_CHECK_INTERVAL):
+         if not self._reader.is_alive() or sys.is_finalizing():
+            error = ConnectionError("The connection to the DBus Agent is not read anymore.")
+         elif deadline is not None and time.monotonic() >= deadline:
+            error = TimeoutError("The DBus Agent has not responded to '%s' within %s seconds." % (method, self.timeout))
+         else:
+            continue
+         with self._lock:
+            abandoned = self._pending_dict.pop(msgid, None) is not None
+         # Otherwise the reader thread has just taken the response.
+         if abandoned or not pending.event.wait(FramedRPCProxy.READER_CHECK_INTERVAL):
+            raise error
+         return
+
+   def close(self):
+      """
+Close the connection. Waiting calls fail with ``ConnectionError``.
+
+**Returns:**
+
+(*no returns*)
+      """
+      with self._lock:
+         if self._closed_reason is None:
+            self._closed_reason = "The connection to the DBus Agent has been closed."
+      try:
+         self._stream.sock.shutdown(socket.SHUT_RDWR)
+      except OSError:
+         pass
+      self._stream.sock.close()
+
+
+class FramedRPCServer:
+   """
+The server side of the framed transport. It serves the public methods of an instance, like
+``SimpleXMLRPCServer.register_instance``, and ``system.multicall``.
+
+Every connection has a reader thread, the requests are executed in a pool of worker threads and their
+responses are sent as soon as they are ready, so that a long request does not delay the other requests
+of the same connection. Blocking requests (see ``blocking_request``) do not count against the number of
+workers.
+   """
+   def __init__(self, instance, workers=16):
+      """
+Constructor for FramedRPCServer class.
+
+**Arguments:**
+
+* ``instance``
+
+  / *Condition*: required / *Type*: object /
+
+  The object whose public methods are served.
+
+* ``workers``
+
+  / *Condition*: optional / *Type*: int / *Default*: 16 /
+
+  The maximum number of requests executed at once, not counting blocking requests.
+
+**Returns:**
+
+(*no returns*)
+      """
+      if msgpack is None:
+         raise RuntimeError("The framed transport requires the 'msgpack' package.")
+      self._instance = instance
+      self._worker_pool = WorkerPool(workers, "dbus-framed-rpc-worker")
+      self._server_sockets = []
+
+   def listen(self, address):
+      """
+Start accepting connections on an address.
+
+**Arguments:**
+
+* ``address``
+
+  / *Condition*: required / *Type*: str / tuple /
+
+  The path of a Unix socket or a (host, port) tuple.
+
+**Returns:**
+
+(*no returns*)
+      """
+      if isinstance(address, str):
+         if os.path.exists(address):
+            os.unlink(address)
+         server_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+         server_socket.bind(address)
+         server_socket.listen(64)
+      else:
+         server_socket = socket.create_server(address, backlog=64)
+      self._server_sockets.append(server_socket)
+      Thread(target=self._accept_connections, args=(server_socket,), name="dbus-framed-rpc-accept",
+             daemon=True).start()
+
+   def _accept_connections(self, server_socket):
+      while True:
+         try:
+            sock, client_address = server_socket.accept()
+         except OSError:
+            break
+         if sock.family != socket.AF_UNIX:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+         Thread(target=self._serve_connection, args=(sock, client_address), name="dbus-framed-rpc-connection",
+                daemon=True).start()
+
+   def _serve_connection(self, sock, client_address):
+      stream = FrameStream(sock)
+      try:
+         while True:
+            message = stream.read_message()
+            if message is None:
+               break
+            _message_type, msgid, method, params = message
+            self._worker_pool.submit(self._handle_request, stream, msgid, method, params)
+      except Exception as ex:
+         # Like socketserver.BaseServer.handle_error, the error is written to stderr.
+         print("Closing the framed RPC connection from '%s' after an error: %s: %s"
+               % (client_address or "Unix socket", type(ex).__name__, ex), file=sys.stderr)
+      finally:
+         sock.close()
+
+   def _multicall(self, calls):
+      """
+Execute several requests in order, with the results of ``SimpleXMLRPCDispatcher.system_multicall``.
+      """
+      results = []
+      for call in calls:
+         try:
+            func = xmlrpc.server.resolve_dotted_attribute(self._instance, call["methodName"], False)
+            results.append([self._call(func, call["params"])])
+         except Exception as ex:
+            results.append({"faultCode": 1, "faultString": "%s:%s" % (type(ex), ex)})
+      return results
+
+   def _call(self, func, params):
+      if is_blocking_request(func):
+         with self._worker_pool.blocking():
+            return func(*params)
+      return func(*params)
+
+   def _handle_request(self, stream, msgid, method, params):
+      try:
+         if method == "system.multicall":
+            func = self._multicall
+         else:
+            func = xmlrpc.server.resolve_dotted_attribute(self._instance, method, False)
+         response = [MESSAGE_RESPONSE, msgid, None, self._call(func, params)]
+      except Exception as ex:
+         response = [MESSAGE_RESPONSE, msgid, [type(ex).__name__, str(ex)], None]
+      try:
+         stream.write_message(response)
+      except TypeError as ex:
+         stream.write_message([MESSAGE_RESPONSE, msgid, [type(ex).__name__, str(ex)], None])
+      except OSError:
+         pass
+
+   def close(self):
+      """
+Stop accepting connections.
+
+**Returns:**
+
+(*no returns*)
+      """
+      for server_socket in self._server_sockets:
+         server_socket.close()
+      self._server_sockets = []
+      self._worker_pool.shutdown()
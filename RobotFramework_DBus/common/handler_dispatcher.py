@@ -0,0 +1,253 @@
+#  Copyright 2020-2023 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# *******************************************************************************
+#
+# File: handler_dispatcher.py
+#
+# Initially created by Nguyen Huynh Tri Cuong (MS/EMC12-XC) / May 2023.
+#
+# Description:
+#   Provide a bounded, prioritized dispatch queue and worker pool for signal handler keywords.
+#
+# History:
+#
+# 22.05.2023 / V 0.1.0 / Nguyen Huynh Tri Cuong
+# - Initialize
+#
+# *******************************************************************************
+from RobotFramework_DBus.common.priority_queue import PriorityQueue
+from robot.api import logger
+from threading import Lock, Thread, current_thread
+
+
+class HandlerDispatcher:
+   """
+A process-wide dispatch stage for signal handler keywords.
+
+Signal callbacks only enqueue the handler call, and a bounded pool of worker threads runs the
+handler keywords, so that a slow handler does not stall the signal delivery of the connection.
+Handlers with a higher priority are run first when calls are queued up.
+   """
+   DEFAULT_WORKERS = 1
+   DEFAULT_MAX_BACKLOG = 1000
+
+   _STOP_PRIORITY = float("-inf")
+
+   _instance = None
+   _lock = Lock()
+
+   @classmethod
+   def get_instance(cls):
+      """
+Get the process-wide dispatcher, start it if it is not running yet.
+
+**Returns:**
+
+  / *Type*: HandlerDispatcher /
+
+  The dispatcher instance.
+      """
+      with cls._lock:
+         if cls._instance is None:
+            cls._instance = cls()
+      return cls._instance
+
+   def __init__(self, workers=DEFAULT_WORKERS, max_backlog=DEFAULT_MAX_BACKLOG):
+      """
+Constructor for HandlerDispatcher class.
+
+**Arguments:**
+
+* ``workers``
+
+  / *Condition*: optional / *Type*: int / *Default*: 1 /
+
+  The number of worker threads running handler keywords.
+
+* ``max_backlog``
+
+  / *Condition*: optional / *Type*: int / *Default*: 1000 /
+
+  The maximum number of queued handler calls. Further calls are dropped and counted, unless a queued
+  call has a lower priority: then that call is dropped instead.
+
+**Returns:**
+
+(*no returns*)
+      """
+      self._queue = PriorityQueue("FIFO")
+      self._stats_lock = Lock()
+      self._workers = []
+      self._stopping_workers = 0
+      self._max_backlog = 0
+      self._backlog = 0
+      self._peak_backlog = 0
+      self._dispatched = 0
+      self._executed = 0
+      self._failed = 0
+      self._dropped = 0
+      self._dropped_per_handler = {}
+      self.configure(workers, max_backlog)
+
+   def configure(self, workers=DEFAULT_WORKERS, max_backlog=DEFAULT_MAX_BACKLOG):
+      """
+Set the size of the worker pool and the maximum backlog.
+
+**Arguments:**
+
+* ``workers``
+
+  / *Condition*: optional / *Type*: int / *Default*: 1 /
+
+  The number of worker threads running handler keywords.
+  More than one worker runs handlers concurrently, so the handlers must not depend on each other's order.
+
+* ``max_backlog``
+
+  / *Condition*: optional / *Type*: int / *Default*: 1000 /
+
+  The maximum number of queued handler calls. Further calls are dropped and counted, unless a queued
+  call has a lower priority: then that call is dropped instead.
+
+**Returns:**
+
+(*no returns*)
+      """
+      workers = int(workers)
+      max_backlog = int(max_backlog)
+      if workers < 1:
+         raise ValueError("The number of handler workers must be greater than 0, got '%s'" % workers)
+      if max_backlog < 1:
+         raise ValueError("The maximum handler backlog must be greater than 0, got '%s'" % max_backlog)
+
+      with self._stats_lock:
+         self._max_backlog = max_backlog
+         # Any worker may take a stop request, so a worker removes itself from the list when it stops.
+         active_workers = len(self._workers) - self._stopping_workers
+         while active_workers < workers:
+            worker = Thread(target=self._run_worker, name="DBusHandlerWorker", daemon=True)
+            self._workers.append(worker)
+            worker.start()
+            active_workers += 1
+         surplus = active_workers - workers
+         self._stopping_workers += surplus
+      for _ in range(surplus):
+         self._queue.put(None, HandlerDispatcher._STOP_PRIORITY)
+
+   def dispatch(self, callback_func, args=(), priority=0, handler_name=None):
+      """
+Enqueue a handler call. This never blocks the caller.
+
+**Arguments:**
+
+* ``callback_func``
+
+  / *Condition*: required / *Type*: callable /
+
+  The handler function to run.
+
+* ``args``
+
+  / *Condition*: optional / *Type*: tuple / *Default*: () /
+
+  Positional arguments to pass to the handler.
+
+* ``priority``
+
+  / *Condition*: optional / *Type*: int / *Default*: 0 /
+
+  The priority of the handler. Calls with a higher priority are run first.
+
+* ``handler_name``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The name of the handler, used for the drop counters.
+
+**Returns:**
+
+  / *Type*: bool /
+
+  True if the call has been queued, False if it has been dropped because the backlog is full of calls
+  with the same or a higher priority.
+      """
+      with self._stats_lock:
+         if self._backlog >= self._max_backlog:
+            # A full backlog makes room for a call by dropping the queued call with the lowest priority,
+            # if that priority is lower.
+            evicted = self._queue.get_last(-priority)
+            if evicted is None:
+               self._count_dropped(handler_name)
+               return False
+            self._count_dropped(evicted[2])
+            self._dispatched += 1
+            self._queue.put((callback_func, args, handler_name), -priority)
+            return True
+         self._backlog += 1
+         self._dispatched += 1
+         self._peak_backlog = max(self._peak_backlog, self._backlog)
+      self._queue.put((callback_func, args, handler_name), -priority)
+      return True
+
+   def _count_dropped(self, handler_name):
+      self._dropped += 1
+      self._dropped_per_handler[handler_name] = self._dropped_per_handler.get(handler_name, 0) + 1
+
+   def _run_worker(self):
+      while True:
+         item = self._queue.get()
+         if item is None:
+            with self._stats_lock:
+               self._workers.remove(current_thread())
+               self._stopping_workers -= 1
+            return
+         callback_func, args, handler_name = item
+         with self._stats_lock:
+            self._backlog -= 1
+         try:
+            callback_func(*args)
+            failed = False
+         except Exception as ex:
+            failed = True
+            message = "The signal handler '%s' failed. Exception: %s" % (handler_name, ex)
+            # Robot Framework drops log messages of threads other than the main thread, so the error
+            # is also written to the console.
+            logger.error(message)
+            logger.console("[ ERROR ] %s" % message, stream="stderr")
+         with self._stats_lock:
+            self._executed += 1
+            if failed:
+               self._failed += 1
+
+   def get_statistics(self):
+      """
+Get the counters of the dispatcher.
+
+**Returns:**
+
+  / *Type*: dict /
+
+  The counters 'workers', 'max_backlog', 'backlog', 'peak_backlog', 'dispatched', 'executed', 'failed',
+  'dropped' and 'dropped_per_handler'.
+      """
+      with self._stats_lock:
+         return {"workers": len(self._workers) - self._stopping_workers,
+                 "max_backlog": self._max_backlog,
+                 "backlog": self._backlog,
+                 "peak_backlog": self._peak_backlog,
+                 "dispatched": self._dispatched,
+                 "executed": self._executed,
+                 "failed": self._failed,
+                 "dropped": self._dropped,
+                 "dropped_per_handler": dict(self._dropped_per_handler)}
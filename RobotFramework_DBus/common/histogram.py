@@ -0,0 +1,203 @@
+#  Copyright 2020-2023 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# *******************************************************************************
+#
+# File: histogram.py
+#
+# Initially created by Nguyen Huynh Tri Cuong (MS/EMC12-XC) / May 2023.
+#
+# Description:
+#   Provide a fixed-size, log-bucketed histogram of durations with O(1) recording.
+#
+# History:
+#
+# 22.05.2023 / V 0.1.0 / Nguyen Huynh Tri Cuong
+# - Initialize
+#
+# *******************************************************************************
+import math
+
+
+class LogHistogram:
+   """
+A histogram of positive values (durations in seconds) in logarithmic buckets, in the style of HDR histograms.
+
+Each power of two between ``min_value`` and ``max_value`` is split into ``sub_buckets`` buckets, so the
+relative error of a percentile is below 2 ** (1 / sub_buckets) - 1 (about 4.4% with 16 sub-buckets),
+while recording a value is O(1) and the memory is fixed.
+   """
+   DEFAULT_MIN_VALUE = 1e-6
+   DEFAULT_MAX_VALUE = 3600.0
+   DEFAULT_SUB_BUCKETS = 16
+
+   def __init__(self, min_value=DEFAULT_MIN_VALUE, max_value=DEFAULT_MAX_VALUE, sub_buckets=DEFAULT_SUB_BUCKETS):
+      """
+Constructor for LogHistogram class.
+
+**Arguments:**
+
+* ``min_value``
+
+  / *Condition*: optional / *Type*: float / *Default*: 1e-6 /
+
+  The smallest distinguishable value. Smaller values are counted in the first bucket.
+
+* ``max_value``
+
+  / *Condition*: optional / *Type*: float / *Default*: 3600.0 /
+
+  The largest distinguishable value. Larger values are counted in the last bucket.
+
+* ``sub_buckets``
+
+  / *Condition*: optional / *Type*: int / *Default*: 16 /
+
+  The number of buckets per power of two.
+
+**Returns:**
+
+(*no returns*)
+      """
+      self.min_value = min_value
+      self.sub_buckets = sub_buckets
+      self._scale = sub_buckets / math.log(2)
+      self._buckets = [0] * (self._get_index(max_value) + 1)
+      self.count = 0
+      self.total = 0.0
+      self.min = None
+      self.max = None
+
+   def _get_index(self, value):
+      if value <= self.min_value:
+         return 0
+      return int(math.log(value / self.min_value) * self._scale) + 1
+
+   def record(self, value):
+      """
+Record a value.
+
+**Arguments:**
+
+* ``value``
+
+  / *Condition*: required / *Type*: float /
+
+  The value to record.
+
+**Returns:**
+
+(*no returns*)
+      """
+      self._buckets[min(self._get_index(value), len(self._buckets) - 1)] += 1
+      self.count += 1
+      self.total += value
+      if self.min is None or value < self.min:
+         self.min = value
+      if self.max is None or value > self.max:
+         self.max = value
+
+   def merge(self, other):
+      """
+Add the values of another histogram with the same bucket layout.
+
+**Arguments:**
+
+* ``other``
+
+  / *Condition*: required / *Type*: LogHistogram /
+
+  The histogram to add.
+
+**Returns:**
+
+(*no returns*)
+      """
+      for idx, bucket_count in enumerate(other._buckets):
+         self._buckets[idx] += bucket_count
+      self.count += other.count
+      self.total += other.total
+      if other.min is not None and (self.min is None or other.min < self.min):
+         self.min = other.min
+      if other.max is not None and (self.max is None or other.max > self.max):
+         self.max = other.max
+
+   def get_mean(self):
+      """
+Get the mean of the recorded values.
+
+**Returns:**
+
+  / *Type*: float /
+
+  The mean or None if no value has been recorded.
+      """
+      if self.count == 0:
+         return None
+      return self.total / self.count
+
+   def get_percentile(self, percentile):
+      """
+Get a percentile of the recorded values.
+
+**Arguments:**
+
+* ``percentile``
+
+  / *Condition*: required / *Type*: float /
+
+  The percentile between 0 and 100, e.g. 99.
+
+**Returns:**
+
+  / *Type*: float /
+
+  The upper bound of the bucket holding the percentile, limited to the recorded minimum and maximum,
+  or None if no value has been recorded.
+      """
+      if self.count == 0:
+         return None
+      rank = max(1, math.ceil(self.count * percentile / 100.0))
+      seen = 0
+      for idx, bucket_count in enumerate(self._buckets):
+         seen += bucket_count
+         if seen >= rank:
+            if idx == len(self._buckets) - 1:
+               # The last bucket also holds the values above ``max_value``, so it has no upper bound.
+               return self.max
+            upper_bound = self.min_value * math.exp(idx / self._scale)
+            return min(max(upper_bound, self.min), self.max)
+      return self.max
+
+   def to_dict(self, percentiles=(50, 90, 99)):
+      """
+Summarize the histogram.
+
+**Arguments:**
+
+* ``percentiles``
+
+  / *Condition*: optional / *Type*: tuple / *Default*: (50, 90, 99) /
+
+  The percentiles to include.
+
+**Returns:**
+
+  / *Type*: dict /
+
+  The keys 'count', 'min', 'mean', 'max' and 'p<percentile>' for each percentile, e.g. 'p99'.
+      """
+      summary = {"count": self.count, "min": self.min, "mean": self.get_mean(), "max": self.max}
+      for percentile in percentiles:
+         summary["p%s" % str(percentile).replace(".", "_")] = self.get_percentile(percentile)
+      return summary
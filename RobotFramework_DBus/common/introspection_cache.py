@@ -0,0 +1,334 @@
+#  Copyright 2020-2023 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# *******************************************************************************
+#
+# File: introspection_cache.py
+#
+# Initially created by Nguyen Huynh Tri Cuong (MS/EMC12-XC) / May 2023.
+#
+# Description:
+#   Provide a persistent on-disk cache of DBus introspection data.
+#
+# History:
+#
+# 22.05.2023 / V 0.1.0 / Nguyen Huynh Tri Cuong
+# - Initialize
+#
+# *******************************************************************************
+from dasbus.client.handler import ClientObjectHandler
+from dasbus.specification import DBusSpecification
+from gi.repository import GLib
+from robot.api import logger
+import hashlib
+import json
+import os
+import tempfile
+
+
+class IntrospectionCache:
+   """
+A persistent on-disk cache of the introspection XML of DBus objects.
+
+Entries are keyed by service name and object path, and are validated by a token derived from the
+executable of the service's owner process, so that the cache is refreshed when the service is updated.
+   """
+   ENV_CACHE_DIR = "ROBOTFRAMEWORK_DBUS_INTROSPECTION_CACHE"
+   DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "robotframework-dbus", "introspection")
+
+   def __init__(self, cache_dir=None):
+      """
+Constructor for IntrospectionCache class.
+
+**Arguments:**
+
+* ``cache_dir``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The directory to store the cache files in. If not provided, the directory is taken from the
+  ``ROBOTFRAMEWORK_DBUS_INTROSPECTION_CACHE`` environment variable or defaults to
+  ``~/.cache/robotframework-dbus/introspection``.
+
+**Returns:**
+
+(*no returns*)
+      """
+      if cache_dir is None:
+         cache_dir = os.environ.get(IntrospectionCache.ENV_CACHE_DIR, IntrospectionCache.DEFAULT_CACHE_DIR)
+      self.cache_dir = cache_dir
+
+   def get_validation_token(self, message_bus, service_name):
+      """
+Get a token identifying the build of the process which owns a service name.
+
+**Arguments:**
+
+* ``message_bus``
+
+  / *Condition*: required / *Type*: dasbus.connection.MessageBus /
+
+  The message bus of the service.
+
+* ``service_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the DBus service.
+
+**Returns:**
+
+  / *Type*: str /
+
+  The path, modification time and size of the owner's executable and of the files on its command line
+  (the script of an interpreted service), or None if it cannot be determined.
+      """
+      try:
+         reply = message_bus.connection.call_sync("org.freedesktop.DBus",
+                                                  "/org/freedesktop/DBus",
+                                                  "org.freedesktop.DBus",
+                                                  "GetConnectionUnixProcessID",
+                                                  GLib.Variant("(s)", (service_name,)),
+                                                  GLib.VariantType.new("(u)"),
+                                                  0, -1, None)
+         pid = reply.unpack()[0]
+         files = [os.path.realpath("/proc/%s/exe" % pid)]
+         with open("/proc/%s/cmdline" % pid, "rb") as cmdline_file:
+            cmdline = cmdline_file.read().split(b"\0")
+         cwd = os.readlink("/proc/%s/cwd" % pid)
+         for arg in cmdline[1:]:
+            arg_path = os.path.join(cwd, os.fsdecode(arg))
+            if arg and os.path.isfile(arg_path):
+               files.append(os.path.realpath(arg_path))
+         token_items = []
+         for file_path in files:
+            file_stat = os.stat(file_path)
+            token_items.append("%s:%s:%s" % (file_path, file_stat.st_mtime_ns, file_stat.st_size))
+      except Exception as _ex:
+         return None
+      return "|".join(token_items)
+
+   def _get_cache_file(self, service_name, object_path):
+      key = hashlib.sha1(("%s\n%s" % (service_name, object_path)).encode("utf-8")).hexdigest()
+      return os.path.join(self.cache_dir, "%s.json" % key)
+
+   def load(self, service_name, object_path, token):
+      """
+Load the cached introspection XML of an object.
+
+**Arguments:**
+
+* ``service_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the DBus service.
+
+* ``object_path``
+
+  / *Condition*: required / *Type*: str /
+
+  The object path.
+
+* ``token``
+
+  / *Condition*: required / *Type*: str /
+
+  The validation token the entry must have been stored with.
+
+**Returns:**
+
+  / *Type*: str /
+
+  The introspection XML or None if there is no valid entry.
+      """
+      try:
+         with open(self._get_cache_file(service_name, object_path), "r", encoding="utf-8") as cache_file:
+            entry = json.load(cache_file)
+      except Exception as _ex:
+         return None
+
+      if entry.get("service_name") != service_name \
+         or entry.get("object_path") != object_path \
+         or entry.get("token") != token:
+         return None
+      return entry.get("xml")
+
+   def store(self, service_name, object_path, token, xml):
+      """
+Store the introspection XML of an object.
+
+**Arguments:**
+
+* ``service_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the DBus service.
+
+* ``object_path``
+
+  / *Condition*: required / *Type*: str /
+
+  The object path.
+
+* ``token``
+
+  / *Condition*: required / *Type*: str /
+
+  The validation token of the entry.
+
+* ``xml``
+
+  / *Condition*: required / *Type*: str /
+
+  The introspection XML.
+
+**Returns:**
+
+(*no returns*)
+      """
+      os.makedirs(self.cache_dir, exist_ok=True)
+      entry = {"service_name": service_name, "object_path": object_path, "token": token, "xml": xml}
+      fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+      try:
+         with os.fdopen(fd, "w", encoding="utf-8") as cache_file:
+            json.dump(entry, cache_file)
+         os.replace(tmp_path, self._get_cache_file(service_name, object_path))
+      except Exception:
+         if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+         raise
+
+   def get_specification(self, message_bus, service_name, object_path, introspect, refresh=False):
+      """
+Get the specification of an object from the cache, introspecting and caching it on a miss.
+
+The validation token costs one call to the bus daemon, so only the introspection itself is saved.
+If the cache cannot be used, the fallback to a plain introspection is logged.
+
+**Arguments:**
+
+* ``message_bus``
+
+  / *Condition*: required / *Type*: dasbus.connection.MessageBus /
+
+  The message bus of the service.
+
+* ``service_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the DBus service.
+
+* ``object_path``
+
+  / *Condition*: required / *Type*: str /
+
+  The object path.
+
+* ``introspect``
+
+  / *Condition*: required / *Type*: callable /
+
+  Introspect the object and return its introspection XML.
+
+* ``refresh``
+
+  / *Condition*: optional / *Type*: bool / *Default*: False /
+
+  If True, the cached entry is ignored and replaced by a fresh introspection.
+
+**Returns:**
+
+  / *Type*: DBusSpecification /
+
+  The specification of the object.
+      """
+      token = self.get_validation_token(message_bus, service_name)
+      if token is None:
+         logger.info("Unable to validate the introspection cache of '%s'. Introspecting '%s'."
+                     % (service_name, object_path))
+         return DBusSpecification.from_xml(introspect())
+
+      xml = None if refresh else self.load(service_name, object_path, token)
+      if xml is not None:
+         try:
+            return DBusSpecification.from_xml(xml)
+         except Exception as ex:
+            logger.warn("Invalid introspection cache entry of '%s' on '%s'. Introspecting the object. Exception: %s"
+                        % (object_path, service_name, ex))
+
+      xml = introspect()
+      specification = DBusSpecification.from_xml(xml)
+      try:
+         self.store(service_name, object_path, token, xml)
+      except Exception as ex:
+         logger.warn("Unable to store the introspection of '%s' on '%s' in the cache. Exception: %s"
+                     % (object_path, service_name, ex))
+      return specification
+
+   def get_proxy(self, service, object_path=None, refresh=False):
+      """
+Create a proxy whose specification is taken from the cache when it is first needed.
+
+**Arguments:**
+
+* ``service``
+
+  / *Condition*: required / *Type*: dasbus.identifier.DBusServiceIdentifier /
+
+  The DBus service.
+
+* ``object_path``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The object path. None means the object path of the service.
+
+* ``refresh``
+
+  / *Condition*: optional / *Type*: bool / *Default*: False /
+
+  If True, the cached entry is ignored and replaced by a fresh introspection.
+
+**Returns:**
+
+  / *Type*: dasbus.client.proxy.ObjectProxy /
+
+  The new proxy.
+      """
+      return service.get_proxy(object_path,
+                               handler_factory=CachedSpecificationHandler,
+                               introspection_cache=self,
+                               refresh=refresh)
+
+
+class CachedSpecificationHandler(ClientObjectHandler):
+   """
+The dasbus object handler of the proxies created by ``IntrospectionCache.get_proxy``.
+
+It implements the specification hook of dasbus handlers (``_get_specification``), which is called when the
+proxy is first used, with ``IntrospectionCache.get_specification``.
+   """
+
+   def __init__(self, message_bus, service_name, object_path, introspection_cache=None, refresh=False, **kwargs):
+      super().__init__(message_bus, service_name, object_path, **kwargs)
+      self._introspection_args = (introspection_cache, message_bus, service_name, object_path, refresh)
+
+   def _introspect(self):
+      return self._call_method("org.freedesktop.DBus.Introspectable", "Introspect", None, "(s)")
+
+   def _get_specification(self):
+      introspection_cache, message_bus, service_name, object_path, refresh = self._introspection_args
+      return introspection_cache.get_specification(message_bus, service_name, object_path, self._introspect, refresh)
@@ -0,0 +1,369 @@
+#  Copyright 2020-2023 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# *******************************************************************************
+#
+# File: match_rule.py
+#
+# Initially created by Nguyen Huynh Tri Cuong (MS/EMC12-XC) / May 2023.
+#
+# Description:
+#   Provide DBus match-rule filters for signal subscriptions, so that the bus daemon
+#   drops uninteresting signal emissions before they reach the process.
+#
+# History:
+#
+# 22.05.2023 / V 0.1.0 / Nguyen Huynh Tri Cuong
+# - Initialize
+#
+# *******************************************************************************
+from dasbus.typing import unwrap_variant
+from gi.repository import Gio, GLib
+from threading import RLock
+
+
+class SignalMatchFilter:
+   """
+The argument and path filters of a DBus match rule for a signal subscription.
+
+Supported filters:
+
+- ``arg0``: the first argument of the signal must be equal to the given string.
+- ``arg0namespace``: the first argument of the signal must be the given bus or interface name,
+  or start with it followed by '.'.
+- ``path_namespace``: the object path of the emitter must be the given path or a path below it.
+  This replaces the object path of the connection in the rule.
+   """
+   FILTER_KEYS = ("arg0", "arg0namespace", "path_namespace")
+
+   def __init__(self, arg0=None, arg0namespace=None, path_namespace=None):
+      """
+Constructor for SignalMatchFilter class.
+
+**Arguments:**
+
+* ``arg0``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The required value of the first signal argument.
+
+* ``arg0namespace``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The required namespace of the first signal argument.
+
+* ``path_namespace``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The required namespace of the emitter's object path.
+
+**Returns:**
+
+(*no returns*)
+      """
+      if arg0 is not None and arg0namespace is not None:
+         raise ValueError("The 'arg0' and 'arg0namespace' filters cannot be combined")
+      if path_namespace is not None and not path_namespace.startswith("/"):
+         raise ValueError("The 'path_namespace' filter must be an object path, got '%s'" % path_namespace)
+      self.arg0 = arg0
+      self.arg0namespace = arg0namespace
+      self.path_namespace = path_namespace
+
+   @classmethod
+   def parse(cls, match_filter):
+      """
+Create a filter from its keyword representation.
+
+**Arguments:**
+
+* ``match_filter``
+
+  / *Condition*: required / *Type*: str / dict / SignalMatchFilter /
+
+  The filter as a dictionary or as a string of comma-separated ``key=value`` pairs,
+  e.g. "arg0=org.example.Service,path_namespace=/org/example".
+  None or an empty value means no filter.
+
+**Returns:**
+
+  / *Type*: SignalMatchFilter /
+
+  The filter, or None if no filter is given.
+      """
+      if match_filter is None or isinstance(match_filter, SignalMatchFilter):
+         return match_filter
+      if isinstance(match_filter, str):
+         items = {}
+         for item in match_filter.split(","):
+            if not item.strip():
+               continue
+            key, separator, value = item.partition("=")
+            if not separator:
+               raise ValueError("Invalid match filter '%s'. Expected 'key=value' pairs." % item.strip())
+            items[key.strip()] = value.strip()
+         match_filter = items
+      if not match_filter:
+         return None
+
+      unknown_keys = [key for key in match_filter if key not in cls.FILTER_KEYS]
+      if unknown_keys:
+         raise ValueError("Unsupported match filter '%s'. Supported filters: %s"
+                          % ("', '".join(unknown_keys), ", ".join(cls.FILTER_KEYS)))
+      return cls(**match_filter)
+
+   @property
+   def key(self):
+      """
+The identity of the filter, used to share subscriptions with equal filters.
+      """
+      return (self.arg0, self.arg0namespace, self.path_namespace)
+
+   def __eq__(self, other):
+      return isinstance(other, SignalMatchFilter) and self.key == other.key
+
+   def __hash__(self):
+      return hash(self.key)
+
+   def __str__(self):
+      return ",".join("%s=%s" % (key, value) for key, value in zip(SignalMatchFilter.FILTER_KEYS, self.key)
+                      if value is not None)
+
+   @staticmethod
+   def _quote(value):
+      return "'%s'" % value.replace("'", "'\\''")
+
+   def build_rule(self, sender, interface_name, member, object_path):
+      """
+Build the match rule of a signal subscription with this filter.
+
+**Arguments:**
+
+* ``sender``
+
+  / *Condition*: required / *Type*: str /
+
+  The bus name of the service emitting the signal.
+
+* ``interface_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The interface of the signal.
+
+* ``member``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the signal.
+
+* ``object_path``
+
+  / *Condition*: required / *Type*: str /
+
+  The object path of the connection. It is replaced by the ``path_namespace`` filter if given.
+
+**Returns:**
+
+  / *Type*: str /
+
+  The match rule string, e.g. "type='signal',sender='org.example',...,arg0='ready'".
+      """
+      items = [("type", "signal"), ("sender", sender), ("interface", interface_name), ("member", member)]
+      if self.path_namespace is not None:
+         items.append(("path_namespace", self.path_namespace))
+      else:
+         items.append(("path", object_path))
+      if self.arg0 is not None:
+         items.append(("arg0", self.arg0))
+      if self.arg0namespace is not None:
+         items.append(("arg0namespace", self.arg0namespace))
+      return ",".join("%s=%s" % (key, SignalMatchFilter._quote(value)) for key, value in items)
+
+   def matches_path(self, object_path):
+      """
+Check the object path of an emission against the ``path_namespace`` filter.
+
+**Arguments:**
+
+* ``object_path``
+
+  / *Condition*: required / *Type*: str /
+
+  The object path of the emitter.
+
+**Returns:**
+
+  / *Type*: bool /
+
+  True if the emission passes the filter.
+      """
+      if self.path_namespace is None or self.path_namespace == "/":
+         return True
+      return object_path == self.path_namespace or object_path.startswith(self.path_namespace + "/")
+
+
+class FilteredSignal:
+   """
+A signal source which subscribes to a DBus signal with its own match rule, including the argument
+and path filters, instead of the unfiltered subscription of the proxy.
+
+It provides the ``connect``/``disconnect`` interface of a dasbus signal, so it can back a ``SignalSubscription``.
+The subscription is created on the calling thread's main context, so it must be created on the reactor thread.
+   """
+   _DBUS_NAME = "org.freedesktop.DBus"
+   _DBUS_PATH = "/org/freedesktop/DBus"
+
+   def __init__(self, message_bus, service_name, object_path, interface_name, signal_name, match_filter):
+      """
+Constructor for FilteredSignal class.
+
+**Arguments:**
+
+* ``message_bus``
+
+  / *Condition*: required / *Type*: dasbus.connection.MessageBus /
+
+  The message bus of the service.
+
+* ``service_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the DBus service.
+
+* ``object_path``
+
+  / *Condition*: required / *Type*: str /
+
+  The object path of the connection.
+
+* ``interface_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The interface of the signal.
+
+* ``signal_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the signal.
+
+* ``match_filter``
+
+  / *Condition*: required / *Type*: SignalMatchFilter /
+
+  The argument and path filters.
+
+**Returns:**
+
+(*no returns*)
+      """
+      self._connection = message_bus.connection
+      self._match_filter = match_filter
+      self._callbacks = []
+      self._lock = RLock()
+      self.rule = match_filter.build_rule(service_name, interface_name, signal_name, object_path)
+
+      # The bus daemon only routes emissions matching our rule; Gio applies the sender, interface,
+      # member and arg0 filters again locally, and the callback the path namespace.
+      flags = Gio.DBusSignalFlags.NO_MATCH_RULE
+      arg0 = match_filter.arg0
+      if match_filter.arg0namespace is not None:
+         arg0 = match_filter.arg0namespace
+         flags |= Gio.DBusSignalFlags.MATCH_ARG0_NAMESPACE
+      self._subscription_id = self._connection.signal_subscribe(
+                                 service_name,
+                                 interface_name,
+                                 signal_name,
+                                 object_path if match_filter.path_namespace is None else None,
+                                 arg0,
+                                 flags,
+                                 self._signal_callback)
+      try:
+         self._call_bus("AddMatch")
+      except Exception:
+         self._connection.signal_unsubscribe(self._subscription_id)
+         raise
+
+   def _call_bus(self, method_name):
+      self._connection.call_sync(FilteredSignal._DBUS_NAME,
+                                 FilteredSignal._DBUS_PATH,
+                                 FilteredSignal._DBUS_NAME,
+                                 method_name,
+                                 GLib.Variant("(s)", (self.rule,)),
+                                 None, 0, -1, None)
+
+   def _signal_callback(self, connection, sender_name, object_path, interface_name, signal_name, parameters):
+      if not self._match_filter.matches_path(object_path):
+         return
+      args = unwrap_variant(parameters)
+      with self._lock:
+         callbacks = list(self._callbacks)
+      for callback in callbacks:
+         callback(*args)
+
+   def connect(self, callback):
+      """
+Connect a callback to the signal.
+
+**Arguments:**
+
+* ``callback``
+
+  / *Condition*: required / *Type*: callable /
+
+  The function to be called with the signal arguments.
+
+**Returns:**
+
+(*no returns*)
+      """
+      with self._lock:
+         self._callbacks.append(callback)
+
+   def disconnect(self, callback=None):
+      """
+Disconnect a callback, or all callbacks if none is given. The bus subscription and its match rule
+are removed with the last callback.
+
+**Arguments:**
+
+* ``callback``
+
+  / *Condition*: optional / *Type*: callable / *Default*: None /
+
+  The function to disconnect.
+
+**Returns:**
+
+(*no returns*)
+      """
+      with self._lock:
+         if callback is None:
+            self._callbacks.clear()
+         elif callback in self._callbacks:
+            self._callbacks.remove(callback)
+         if self._callbacks or self._subscription_id is None:
+            return
+         subscription_id = self._subscription_id
+         self._subscription_id = None
+
+      self._connection.signal_unsubscribe(subscription_id)
+      try:
+         self._call_bus("RemoveMatch")
+      except Exception as _ex:
+         pass
@@ -0,0 +1,119 @@
+#  Copyright 2020-2023 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# *******************************************************************************
+#
+# File: method_latency.py
+#
+# Initially created by Nguyen Huynh Tri Cuong (MS/EMC12-XC) / May 2023.
+#
+# Description:
+#   Provide an always-on recorder of DBus method call latencies.
+#
+# History:
+#
+# 22.05.2023 / V 0.1.0 / Nguyen Huynh Tri Cuong
+# - Initialize
+#
+# *******************************************************************************
+from RobotFramework_DBus.common.histogram import LogHistogram
+from threading import Lock
+
+
+class MethodLatencyRecorder:
+   """
+Per-method latency histograms of a connection.
+
+Each method has a fixed-size log-bucketed histogram, so the memory does not grow with the number of calls
+and recording a call is O(1).
+   """
+   PERCENTILES = (50, 90, 99, 99.9)
+
+   def __init__(self):
+      """
+Constructor for MethodLatencyRecorder class.
+
+**Returns:**
+
+(*no returns*)
+      """
+      self._histograms = {}
+      self._lock = Lock()
+
+   def record(self, method_name, elapsed):
+      """
+Record the latency of a call.
+
+**Arguments:**
+
+* ``method_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the called DBus method.
+
+* ``elapsed``
+
+  / *Condition*: required / *Type*: float /
+
+  The latency of the call in seconds.
+
+**Returns:**
+
+(*no returns*)
+      """
+      if elapsed is None:
+         return
+      with self._lock:
+         histogram = self._histograms.get(method_name)
+         if histogram is None:
+            histogram = LogHistogram()
+            self._histograms[method_name] = histogram
+         histogram.record(elapsed)
+
+   def get_statistics(self, method_name=None):
+      """
+Get the latency summary of one or all methods.
+
+**Arguments:**
+
+* ``method_name``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The name of the DBus method. None means all methods.
+
+**Returns:**
+
+  / *Type*: dict /
+
+  The summary of the method with the keys 'count', 'min', 'mean', 'max', 'p50', 'p90', 'p99' and 'p99_9'
+  (seconds), or a dictionary of the summaries of all methods keyed by method name.
+      """
+      with self._lock:
+         if method_name is not None:
+            histogram = self._histograms.get(method_name, LogHistogram())
+            return histogram.to_dict(MethodLatencyRecorder.PERCENTILES)
+         return {name: histogram.to_dict(MethodLatencyRecorder.PERCENTILES)
+                 for name, histogram in self._histograms.items()}
+
+   def reset(self):
+      """
+Remove all recorded latencies.
+
+**Returns:**
+
+(*no returns*)
+      """
+      with self._lock:
+         self._histograms.clear()
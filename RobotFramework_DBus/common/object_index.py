@@ -0,0 +1,346 @@
+#  Copyright 2020-2023 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# *******************************************************************************
+#
+# File: object_index.py
+#
+# Initially created by Nguyen Huynh Tri Cuong (MS/EMC12-XC) / May 2023.
+#
+# Description:
+#   Provide an index of the objects exported through org.freedesktop.DBus.ObjectManager,
+#   kept up to date by the InterfacesAdded, InterfacesRemoved and PropertiesChanged signals.
+#
+# History:
+#
+# 22.05.2023 / V 0.1.0 / Nguyen Huynh Tri Cuong
+# - Initialize
+#
+# *******************************************************************************
+from RobotFramework_DBus.common.property_cache import PROPERTIES_INTERFACE
+from dasbus.typing import unwrap_variant
+from gi.repository import Gio, GLib
+from threading import Event, RLock
+import bisect
+
+OBJECT_MANAGER_INTERFACE = "org.freedesktop.DBus.ObjectManager"
+
+
+def _insert_sorted(paths, object_path):
+   """
+Insert an object path into a sorted list of paths, if it is not in the list yet.
+   """
+   index = bisect.bisect_left(paths, object_path)
+   if index == len(paths) or paths[index] != object_path:
+      paths.insert(index, object_path)
+
+
+def _remove_sorted(paths, object_path):
+   """
+Remove an object path from a sorted list of paths, if it is in the list.
+   """
+   index = bisect.bisect_left(paths, object_path)
+   if index < len(paths) and paths[index] == object_path:
+      del paths[index]
+
+
+def _unwrap_interfaces(interfaces):
+   """
+Unwrap the variant property values of an 'a{sa{sv}}' dictionary of interfaces.
+   """
+   return {interface_name: {name: unwrap_variant(value) for name, value in properties.items()}
+           for interface_name, properties in interfaces.items()}
+
+
+class ObjectIndex:
+   """
+An index of the objects of a service which implements ``org.freedesktop.DBus.ObjectManager``.
+
+The index is loaded with one ``GetManagedObjects`` call and then updated incrementally by the
+``InterfacesAdded``, ``InterfacesRemoved`` and ``PropertiesChanged`` signals. Lookups by interface are
+O(1). Lookups by property value are O(1) after the first lookup of a property, which builds its
+value index once. Values are indexed by their string representation. The paths of each lookup are kept
+sorted, so that lookups do not sort them.
+
+``GetManagedObjects`` is called asynchronously and its reply is handled on the reactor thread, like the
+signals, so the reactor is not blocked by the load and a signal is always applied after the load which it
+follows on the bus. Signals received before the reply are already contained in it and are ignored.
+   """
+   def __init__(self, message_bus, service_name, manager_path):
+      """
+Constructor for ObjectIndex class.
+
+**Arguments:**
+
+* ``message_bus``
+
+  / *Condition*: required / *Type*: dasbus.connection.MessageBus /
+
+  The message bus of the service.
+
+* ``service_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the DBus service.
+
+* ``manager_path``
+
+  / *Condition*: required / *Type*: str /
+
+  The object path of the object manager.
+
+**Returns:**
+
+(*no returns*)
+      """
+      self.service_name = service_name
+      self.manager_path = manager_path
+      self._connection = message_bus.connection
+      self._objects = {}
+      self._by_interface = {}
+      self._by_property = {}
+      self._lock = RLock()
+      self._subscription_ids = []
+      self._loaded = Event()
+      self._load_error = None
+
+   def attach(self):
+      """
+Subscribe to the signals of the object manager and start loading the managed objects.
+Must be called on the reactor thread. Wait for the load with ``wait_until_loaded``.
+
+**Returns:**
+
+(*no returns*)
+      """
+      for interface_name, signal_name, object_path, callback_func in (
+            (OBJECT_MANAGER_INTERFACE, "InterfacesAdded", self.manager_path, self._on_interfaces_added),
+            (OBJECT_MANAGER_INTERFACE, "InterfacesRemoved", self.manager_path, self._on_interfaces_removed),
+            (PROPERTIES_INTERFACE, "PropertiesChanged", None, self._on_properties_changed)):
+         self._subscription_ids.append(self._connection.signal_subscribe(self.service_name, interface_name,
+                                                                         signal_name, object_path, None,
+                                                                         Gio.DBusSignalFlags.NONE,
+                                                                         callback_func))
+      self._connection.call(self.service_name, self.manager_path, OBJECT_MANAGER_INTERFACE,
+                            "GetManagedObjects", None, GLib.VariantType.new("(a{oa{sa{sv}}})"),
+                            Gio.DBusCallFlags.NONE, -1, None, self._on_managed_objects)
+
+   def _on_managed_objects(self, connection, result):
+      try:
+         managed_objects = unwrap_variant(connection.call_finish(result))[0]
+         with self._lock:
+            for object_path, interfaces in managed_objects.items():
+               self._add_interfaces(object_path, _unwrap_interfaces(interfaces))
+      except Exception as ex:
+         self._load_error = ex
+      finally:
+         self._loaded.set()
+
+   def wait_until_loaded(self):
+      """
+Wait until the managed objects have been loaded. Must not be called on the reactor thread.
+
+**Returns:**
+
+(*no returns*)
+      """
+      self._loaded.wait()
+      if self._load_error is not None:
+         raise self._load_error
+
+   def detach(self):
+      """
+Unsubscribe from the signals and drop the index. Must be called on the reactor thread.
+
+**Returns:**
+
+(*no returns*)
+      """
+      for subscription_id in self._subscription_ids:
+         self._connection.signal_unsubscribe(subscription_id)
+      self._subscription_ids = []
+      with self._lock:
+         self._objects.clear()
+         self._by_interface.clear()
+         self._by_property.clear()
+
+   def _add_interfaces(self, object_path, interfaces):
+      object_interfaces = self._objects.setdefault(object_path, {})
+      for interface_name, properties in interfaces.items():
+         self._remove_interface(object_path, interface_name)
+         object_interfaces[interface_name] = dict(properties)
+         _insert_sorted(self._by_interface.setdefault(interface_name, []), object_path)
+         for property_name, value in properties.items():
+            self._index_value(interface_name, property_name, value, object_path)
+
+   def _remove_interface(self, object_path, interface_name):
+      properties = self._objects.get(object_path, {}).pop(interface_name, None)
+      if properties is None:
+         return
+      paths = self._by_interface.get(interface_name)
+      if paths is not None:
+         _remove_sorted(paths, object_path)
+         if not paths:
+            del self._by_interface[interface_name]
+      for property_name, value in properties.items():
+         self._unindex_value(interface_name, property_name, value, object_path)
+
+   def _index_value(self, interface_name, property_name, value, object_path):
+      value_index = self._by_property.get((interface_name, property_name))
+      if value_index is not None:
+         _insert_sorted(value_index.setdefault(str(value), []), object_path)
+
+   def _unindex_value(self, interface_name, property_name, value, object_path):
+      value_index = self._by_property.get((interface_name, property_name))
+      if value_index is not None:
+         paths = value_index.get(str(value))
+         if paths is not None:
+            _remove_sorted(paths, object_path)
+            if not paths:
+               del value_index[str(value)]
+
+   def _on_interfaces_added(self, connection, sender_name, path, interface_name, signal_name, parameters):
+      if not self._loaded.is_set():
+         return
+      object_path, interfaces = unwrap_variant(parameters)
+      with self._lock:
+         self._add_interfaces(object_path, _unwrap_interfaces(interfaces))
+
+   def _on_interfaces_removed(self, connection, sender_name, path, interface_name, signal_name, parameters):
+      if not self._loaded.is_set():
+         return
+      object_path, interfaces = unwrap_variant(parameters)
+      with self._lock:
+         for removed_interface in interfaces:
+            self._remove_interface(object_path, removed_interface)
+         if object_path in self._objects and not self._objects[object_path]:
+            del self._objects[object_path]
+
+   def _on_properties_changed(self, connection, sender_name, path, interface_name, signal_name, parameters):
+      if not self._loaded.is_set():
+         return
+      changed_interface, changed, invalidated = unwrap_variant(parameters)
+      with self._lock:
+         properties = self._objects.get(path, {}).get(changed_interface)
+         if properties is None:
+            return
+         for property_name, value in changed.items():
+            value = unwrap_variant(value)
+            if property_name in properties:
+               self._unindex_value(changed_interface, property_name, properties[property_name], path)
+            properties[property_name] = value
+            self._index_value(changed_interface, property_name, value, path)
+         for property_name in invalidated:
+            if property_name in properties:
+               self._unindex_value(changed_interface, property_name, properties.pop(property_name), path)
+
+   def get_object_count(self):
+      """
+Get the number of indexed objects.
+
+**Returns:**
+
+  / *Type*: int /
+
+  The number of objects.
+      """
+      with self._lock:
+         return len(self._objects)
+
+   def get_object(self, object_path):
+      """
+Get the interfaces and properties of an object.
+
+**Arguments:**
+
+* ``object_path``
+
+  / *Condition*: required / *Type*: str /
+
+  The object path.
+
+**Returns:**
+
+  / *Type*: dict /
+
+  The properties of the object keyed by interface name, or None if the object is not managed.
+      """
+      with self._lock:
+         interfaces = self._objects.get(object_path)
+         if interfaces is None:
+            return None
+         return {interface_name: dict(properties) for interface_name, properties in interfaces.items()}
+
+   def find_by_interface(self, interface_name):
+      """
+Get the objects which implement an interface.
+
+**Arguments:**
+
+* ``interface_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The interface name.
+
+**Returns:**
+
+  / *Type*: list /
+
+  The sorted object paths.
+      """
+      with self._lock:
+         return list(self._by_interface.get(interface_name, ()))
+
+   def find_by_property(self, interface_name, property_name, value):
+      """
+Get the objects whose property has a value.
+
+**Arguments:**
+
+* ``interface_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The interface of the property.
+
+* ``property_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the property.
+
+* ``value``
+
+  / *Condition*: required / *Type*: Any /
+
+  The value. Values are compared by their string representation, so '3' matches 3.
+
+**Returns:**
+
+  / *Type*: list /
+
+  The sorted object paths.
+      """
+      with self._lock:
+         value_index = self._by_property.get((interface_name, property_name))
+         if value_index is None:
+            # The paths of the interface are sorted, so the paths of each value are sorted as well.
+            value_index = {}
+            for object_path in self._by_interface.get(interface_name, ()):
+               properties = self._objects[object_path][interface_name]
+               if property_name in properties:
+                  value_index.setdefault(str(properties[property_name]), []).append(object_path)
+            self._by_property[(interface_name, property_name)] = value_index
+         return list(value_index.get(str(value), ()))
@@ -1,9 +1,11 @@
+import heapq
+import itertools
 import queue
 
 class PriorityQueue(queue.PriorityQueue):
-   def __init__(self, type="FIFO"):
-      super(PriorityQueue, self).__init__()
-      self.counter = 0
+   def __init__(self, type="FIFO", maxsize=0):
+      super(PriorityQueue, self).__init__(maxsize)
+      self.sequence = itertools.count()
 
       self.factor=-1
       if type=="LIFO":
@@ -13,9 +15,27 @@ class PriorityQueue(queue.PriorityQueue):
       else:
          raise Exception("Fatal Error: PriorityQueue type not allowed: '%s'!" % str(type))
 
-   def put(self, item, priority=None):
+   def put(self, item, priority=None, block=True, timeout=None):
       if priority==None:
-         self.counter += 1
-         priority=self.counter
+         priority=0
 
-      super(PriorityQueue, self).put((self.factor * priority, item), block=True)
+      # The sequence number keeps the FIFO/LIFO order between items of the same priority,
+      # so that the items themselves are never compared.
+      entry = (self.factor * priority, self.factor * next(self.sequence), item)
+      super(PriorityQueue, self).put(entry, block=block, timeout=timeout)
+
+   def get(self, block=True, timeout=None):
+      return super(PriorityQueue, self).get(block=block, timeout=timeout)[-1]
+
+   def get_last(self, priority):
+      # Remove the item which would be got last, if it would also be got after a new item of ``priority``.
+      with self.mutex:
+         if not self.queue:
+            return None
+         entry = max(self.queue)
+         if entry[0] <= self.factor * priority:
+            return None
+         self.queue.remove(entry)
+         heapq.heapify(self.queue)
+         self.not_full.notify()
+         return entry[-1]
@@ -0,0 +1,526 @@
+#  Copyright 2020-2023 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# *******************************************************************************
+#
+# File: property_cache.py
+#
+# Initially created by Nguyen Huynh Tri Cuong (MS/EMC12-XC) / May 2023.
+#
+# Description:
+#   Provide a cache of the DBus properties of an object which is kept up to date
+#   by the PropertiesChanged signal.
+#
+# History:
+#
+# 22.05.2023 / V 0.1.0 / Nguyen Huynh Tri Cuong
+# - Initialize
+#
+# *******************************************************************************
+from RobotFramework_DBus.common.argument_converter import ArgumentConverter
+from dasbus.typing import get_variant, unwrap_variant
+from gi.repository import Gio, GLib
+from threading import Event, RLock
+import time
+
+PROPERTIES_INTERFACE = "org.freedesktop.DBus.Properties"
+
+
+def _unwrap_properties(properties):
+   """
+Unwrap the variant values of an 'a{sv}' dictionary of properties.
+   """
+   return {name: unwrap_variant(value) for name, value in properties.items()}
+
+
+class PropertyWaiter:
+   """
+A waiter for a property to reach an expected value, notified by the ``PropertiesChanged`` emissions
+applied to a property cache.
+   """
+   def __init__(self, interface_name, property_name, expected):
+      """
+Constructor for PropertyWaiter class.
+
+**Arguments:**
+
+* ``interface_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The interface of the property.
+
+* ``property_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the property.
+
+* ``expected``
+
+  / *Condition*: required / *Type*: Any /
+
+  The expected value. It also matches a value with the same string representation.
+
+**Returns:**
+
+(*no returns*)
+      """
+      self.interface_name = interface_name
+      self.property_name = property_name
+      self.expected = expected
+      self.value = None
+      self.matched = False
+      self.invalidated = False
+      self._event = Event()
+
+   def matches(self, value):
+      """
+Check if a value is the expected one.
+
+**Arguments:**
+
+* ``value``
+
+  / *Condition*: required / *Type*: Any /
+
+  The value of the property.
+
+**Returns:**
+
+  / *Type*: bool /
+
+  True if the value is the expected one.
+      """
+      return value == self.expected or str(value) == str(self.expected)
+
+   def __call__(self, interface_name, changed, invalidated):
+      if interface_name != self.interface_name:
+         return
+      if self.property_name in changed:
+         self.value = changed[self.property_name]
+         if self.matches(self.value):
+            self.matched = True
+            self._event.set()
+      elif self.property_name in invalidated:
+         self.invalidated = True
+         self._event.set()
+
+   def wait(self, timeout):
+      """
+Wait until the property has been changed to the expected value or has been invalidated.
+
+**Arguments:**
+
+* ``timeout``
+
+  / *Condition*: required / *Type*: float /
+
+  The maximum time (in seconds) to wait.
+
+**Returns:**
+
+  / *Type*: bool /
+
+  False if the timeout has expired.
+      """
+      notified = self._event.wait(timeout)
+      self._event.clear()
+      return notified
+
+
+class _PendingLoad:
+   """
+A load of properties in progress and the names of the properties changed meanwhile.
+   """
+   __slots__ = ("interface_name", "changed")
+
+   def __init__(self, interface_name):
+      self.interface_name = interface_name
+      self.changed = set()
+
+
+class PropertyCache:
+   """
+A cache of the properties of a DBus object.
+
+The properties of an interface are loaded with one ``GetAll`` call on first use and then kept up to date
+by the ``PropertiesChanged`` signal, so that reads are served without a round trip to the service.
+Invalidated properties are read again with ``Get`` on the next access.
+
+Loads are executed on the calling thread, so that the reactor thread keeps dispatching signals meanwhile.
+The order of a change and a concurrent load is unknown, so the properties changed while a load is in
+progress are not taken from the load but read again on their next access. The cache therefore cannot
+go back to an older value.
+   """
+   def __init__(self, message_bus, service_name, object_path, reactor):
+      """
+Constructor for PropertyCache class.
+
+**Arguments:**
+
+* ``message_bus``
+
+  / *Condition*: required / *Type*: dasbus.connection.MessageBus /
+
+  The message bus of the service.
+
+* ``service_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the DBus service.
+
+* ``object_path``
+
+  / *Condition*: required / *Type*: str /
+
+  The object path of the cached properties.
+
+* ``reactor``
+
+  / *Condition*: required / *Type*: DBusReactor /
+
+  The reactor dispatching the signals of the connection.
+
+**Returns:**
+
+(*no returns*)
+      """
+      self.service_name = service_name
+      self.object_path = object_path
+      self._connection = message_bus.connection
+      self._reactor = reactor
+      self._values = {}
+      self._lock = RLock()
+      self._subscription_id = None
+      self._waiters = []
+      self._loads = []
+
+   def attach(self):
+      """
+Subscribe to the ``PropertiesChanged`` signal of the object. Must be called on the reactor thread.
+
+**Returns:**
+
+(*no returns*)
+      """
+      if self._subscription_id is None:
+         self._subscription_id = self._connection.signal_subscribe(self.service_name, PROPERTIES_INTERFACE,
+                                                                   "PropertiesChanged", self.object_path, None,
+                                                                   Gio.DBusSignalFlags.NONE,
+                                                                   self._on_properties_changed)
+
+   def detach(self):
+      """
+Unsubscribe from the ``PropertiesChanged`` signal and drop the cached values.
+Must be called on the reactor thread.
+
+**Returns:**
+
+(*no returns*)
+      """
+      if self._subscription_id is not None:
+         self._connection.signal_unsubscribe(self._subscription_id)
+         self._subscription_id = None
+      with self._lock:
+         self._values.clear()
+
+   def _on_properties_changed(self, connection, sender_name, object_path, interface_name, signal_name, parameters):
+      interface, changed, invalidated = unwrap_variant(parameters)
+      changed = _unwrap_properties(changed)
+      with self._lock:
+         values = self._values.get(interface)
+         if values is not None:
+            values.update(changed)
+            for property_name in invalidated:
+               values.pop(property_name, None)
+         for load in self._loads:
+            if load.interface_name == interface:
+               load.changed.update(changed)
+               load.changed.update(invalidated)
+         waiters = list(self._waiters)
+      for waiter in waiters:
+         waiter(interface, changed, invalidated)
+
+   def _call(self, method_name, parameters, reply_type):
+      result = self._connection.call_sync(self.service_name, self.object_path, PROPERTIES_INTERFACE, method_name,
+                                          parameters, GLib.VariantType.new(reply_type) if reply_type else None,
+                                          Gio.DBusCallFlags.NONE, -1, None)
+      return unwrap_variant(result)
+
+   def _load(self, interface_name, property_name=None):
+      with self._lock:
+         read_all = property_name is None or interface_name not in self._values
+      load = _PendingLoad(interface_name)
+      with self._lock:
+         self._loads.append(load)
+      try:
+         loaded = self.read_all(interface_name) if read_all else {}
+         if property_name is not None and property_name not in loaded:
+            loaded[property_name] = self.read(interface_name, property_name)
+      finally:
+         with self._lock:
+            self._loads.remove(load)
+
+      with self._lock:
+         # Changes received during the load may be older or newer than the loaded values.
+         cached = {name: value for name, value in loaded.items() if name not in load.changed}
+         values = self._values.get(interface_name)
+         if values is None:
+            if read_all:
+               self._values[interface_name] = cached
+         else:
+            values.update(cached)
+      if property_name is None:
+         return loaded
+      return loaded[property_name]
+
+   def get(self, interface_name, property_name):
+      """
+Get the value of a property, from the cache if possible.
+
+**Arguments:**
+
+* ``interface_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The interface of the property.
+
+* ``property_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the property.
+
+**Returns:**
+
+  / *Type*: Any /
+
+  The value of the property.
+      """
+      with self._lock:
+         values = self._values.get(interface_name)
+         if values is not None and property_name in values:
+            return values[property_name]
+      return self._load(interface_name, property_name)
+
+   def get_all(self, interface_name):
+      """
+Get the values of all properties of an interface, from the cache if possible.
+
+**Arguments:**
+
+* ``interface_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The interface of the properties.
+
+**Returns:**
+
+  / *Type*: dict /
+
+  The values of the properties keyed by property name.
+      """
+      with self._lock:
+         values = self._values.get(interface_name)
+         if values is not None:
+            return dict(values)
+      return self._load(interface_name)
+
+   def wait_for_value(self, interface_name, property_name, expected, timeout):
+      """
+Wait until a property has an expected value.
+
+The current value is read once (from the cache if possible). Afterwards the waiter is only woken up
+by ``PropertiesChanged`` emissions, so the service is not polled.
+
+**Arguments:**
+
+* ``interface_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The interface of the property.
+
+* ``property_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the property.
+
+* ``expected``
+
+  / *Condition*: required / *Type*: Any /
+
+  The expected value. It also matches a value with the same string representation.
+
+* ``timeout``
+
+  / *Condition*: required / *Type*: float /
+
+  The maximum time (in seconds) to wait.
+
+**Returns:**
+
+* ``matched``
+
+  / *Type*: bool /
+
+  True if the property has reached the expected value.
+
+* ``value``
+
+  / *Type*: Any /
+
+  The last known value of the property.
+      """
+      waiter = PropertyWaiter(interface_name, property_name, expected)
+      # The waiter is added before the initial read, so that no change between both is missed.
+      with self._lock:
+         self._waiters.append(waiter)
+      try:
+         value = self.get(interface_name, property_name)
+         if waiter.matches(value):
+            return True, value
+         deadline = time.monotonic() + timeout
+         while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not waiter.wait(remaining):
+               return False, value if waiter.value is None else waiter.value
+            if waiter.matched:
+               return True, waiter.value
+            if waiter.invalidated:
+               waiter.invalidated = False
+               value = self.get(interface_name, property_name)
+               if waiter.matches(value):
+                  return True, value
+      finally:
+         with self._lock:
+            self._waiters.remove(waiter)
+
+   def read(self, interface_name, property_name):
+      """
+Read the current value of a property from the service, bypassing the cache.
+
+**Arguments:**
+
+* ``interface_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The interface of the property.
+
+* ``property_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the property.
+
+**Returns:**
+
+  / *Type*: Any /
+
+  The value of the property.
+      """
+      return unwrap_variant(self._call("Get", GLib.Variant("(ss)", (interface_name, property_name)), "(v)")[0])
+
+   def read_all(self, interface_name):
+      """
+Read the current values of all properties of an interface from the service, bypassing the cache.
+
+**Arguments:**
+
+* ``interface_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The interface of the properties.
+
+**Returns:**
+
+  / *Type*: dict /
+
+  The values of the properties keyed by property name.
+      """
+      return _unwrap_properties(self._call("GetAll", GLib.Variant("(s)", (interface_name,)), "(a{sv})")[0])
+
+   def set(self, interface_name, property_name, property_type, value):
+      """
+Set the value of a property. The cached value is dropped, so that the next read returns the value
+accepted by the service, also if it does not emit ``PropertiesChanged`` for the property.
+
+**Arguments:**
+
+* ``interface_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The interface of the property.
+
+* ``property_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the property.
+
+* ``property_type``
+
+  / *Condition*: required / *Type*: str /
+
+  The DBus type signature of the property, e.g. 's'.
+
+* ``value``
+
+  / *Condition*: required / *Type*: Any /
+
+  The new value.
+
+**Returns:**
+
+(*no returns*)
+      """
+      args, parameters = ArgumentConverter.get("(%s)" % property_type).convert((value,))
+      variant = parameters.get_child_value(0) if parameters is not None else get_variant(property_type, args[0])
+      self._call("Set", GLib.Variant("(ssv)", (interface_name, property_name, variant)), None)
+      self._reactor.call(self.invalidate, interface_name, property_name)
+
+   def invalidate(self, interface_name, property_name=None):
+      """
+Drop a cached value, or all cached values of an interface.
+
+**Arguments:**
+
+* ``interface_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The interface of the property.
+
+* ``property_name``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The name of the property. None means all properties of the interface.
+
+**Returns:**
+
+(*no returns*)
+      """
+      with self._lock:
+         if property_name is None:
+            self._values.pop(interface_name, None)
+         elif interface_name in self._values:
+            self._values[interface_name].pop(property_name, None)
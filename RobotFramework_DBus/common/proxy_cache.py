@@ -0,0 +1,328 @@
+#  Copyright 2020-2023 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# *******************************************************************************
+#
+# File: proxy_cache.py
+#
+# Initially created by Nguyen Huynh Tri Cuong (MS/EMC12-XC) / May 2023.
+#
+# Description:
+#   Provide a shared, reference-counted cache of DBus proxies and per-connection
+#   multiplexed signal subscriptions.
+#
+# History:
+#
+# 22.05.2023 / V 0.1.0 / Nguyen Huynh Tri Cuong
+# - Initialize
+#
+# *******************************************************************************
+from threading import Event, RLock
+
+
+class SignalSubscription:
+   """
+A single subscription of a connection to a signal of a (shared) proxy.
+
+All consumers of the signal on the connection - the captured signal queue and the handler keywords -
+are listeners of this subscription, so that the proxy's signal is connected only once per connection.
+   """
+   def __init__(self, signal, sgn):
+      """
+Constructor for SignalSubscription class.
+
+**Arguments:**
+
+* ``signal``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the DBus signal.
+
+* ``sgn``
+
+  / *Condition*: required / *Type*: dasbus.signal.Signal /
+
+  The proxy's signal object.
+
+**Returns:**
+
+(*no returns*)
+      """
+      self.signal = signal
+      self._sgn = sgn
+      self._listeners = []
+      self._lock = RLock()
+      self._sgn.connect(self._dispatch)
+
+   def _dispatch(self, *args):
+      with self._lock:
+         listeners = list(self._listeners)
+      for listener in listeners:
+         listener(*args)
+
+   def add_listener(self, callback_func):
+      """
+Add a listener to the subscription.
+
+**Arguments:**
+
+* ``callback_func``
+
+  / *Condition*: required / *Type*: callable /
+
+  The function to be called with the signal arguments when the signal is emitted.
+
+**Returns:**
+
+(*no returns*)
+      """
+      with self._lock:
+         self._listeners.append(callback_func)
+
+   def remove_listener(self, callback_func):
+      """
+Remove a listener from the subscription.
+
+**Arguments:**
+
+* ``callback_func``
+
+  / *Condition*: required / *Type*: callable /
+
+  The function which has been added as listener.
+
+**Returns:**
+
+(*no returns*)
+      """
+      with self._lock:
+         if callback_func in self._listeners:
+            self._listeners.remove(callback_func)
+
+   def has_listeners(self):
+      """
+Check if the subscription has any listener.
+
+**Returns:**
+
+  / *Type*: bool /
+
+  True if at least one listener is added.
+      """
+      with self._lock:
+         return len(self._listeners) > 0
+
+   def disconnect(self):
+      """
+Disconnect the subscription from the proxy's signal and drop all listeners.
+
+**Returns:**
+
+(*no returns*)
+      """
+      self._sgn.disconnect(self._dispatch)
+      with self._lock:
+         self._listeners.clear()
+
+
+class _ProxyEntry:
+   """
+A cached proxy and its reference count. The proxy is created outside the lock of the cache, other
+connections to the same object wait for ``ready`` meanwhile.
+   """
+   def __init__(self, key):
+      self.key = key
+      self.proxy = None
+      self.error = None
+      self.references = 0
+      self.ready = Event()
+
+
+class ProxyCache:
+   """
+A process-wide cache of DBus proxies keyed by (bus, service, object path, interface).
+
+Proxies are reference-counted across connections: a proxy is created, and introspected, only once
+for all connections to the same object, and is disconnected when the last connection releases it.
+Proxies are created outside the lock of the cache, so that creating the proxy of one object never
+delays connections to other objects.
+   """
+   _instance = None
+   _lock = RLock()
+
+   @classmethod
+   def get_instance(cls):
+      """
+Get the process-wide proxy cache.
+
+**Returns:**
+
+  / *Type*: ProxyCache /
+
+  The proxy cache instance.
+      """
+      with cls._lock:
+         if cls._instance is None:
+            cls._instance = cls()
+      return cls._instance
+
+   def __init__(self):
+      """
+Constructor for ProxyCache class.
+
+**Returns:**
+
+(*no returns*)
+      """
+      self._entries = {}
+
+   def acquire(self, message_bus, service_name, object_path, interface_name, factory, replace=False):
+      """
+Get the cached proxy of an object or create it, and increase its reference count.
+
+**Arguments:**
+
+* ``message_bus``
+
+  / *Condition*: required / *Type*: dasbus.connection.MessageBus /
+
+  The message bus of the proxy.
+
+* ``service_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the DBus service.
+
+* ``object_path``
+
+  / *Condition*: required / *Type*: str /
+
+  The object path of the proxy.
+
+* ``interface_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The interface of the proxy or None for a proxy of all interfaces of the object.
+
+* ``factory``
+
+  / *Condition*: required / *Type*: callable /
+
+  The function to create the proxy on a cache miss.
+
+* ``replace``
+
+  / *Condition*: optional / *Type*: bool / *Default*: False /
+
+  If True, a new proxy is created even if one is cached, e.g. to introspect the object again, and replaces
+  the cached one for later connections. Connections using the old proxy keep it until they release it.
+
+**Returns:**
+
+* ``key``
+
+  / *Type*: object /
+
+  The cache handle to release the proxy with.
+
+* ``proxy``
+
+  / *Type*: dasbus.client.proxy.ObjectProxy /
+
+  The shared proxy.
+      """
+      key = (id(message_bus), service_name, object_path, interface_name)
+      with ProxyCache._lock:
+         entry = self._entries.get(key)
+         create = entry is None or replace
+         if create:
+            entry = _ProxyEntry(key)
+            self._entries[key] = entry
+         entry.references += 1
+
+      if create:
+         try:
+            entry.proxy = factory()
+         except Exception as ex:
+            entry.error = ex
+            with ProxyCache._lock:
+               entry.references -= 1
+               if self._entries.get(key) is entry:
+                  del self._entries[key]
+            raise
+         finally:
+            entry.ready.set()
+      else:
+         entry.ready.wait()
+         if entry.error is not None:
+            with ProxyCache._lock:
+               entry.references -= 1
+            raise entry.error
+      return entry, entry.proxy
+
+   def release(self, key, disconnect_func):
+      """
+Decrease the reference count of a cached proxy and disconnect it if it is not used anymore.
+
+**Arguments:**
+
+* ``key``
+
+  / *Condition*: required / *Type*: object /
+
+  The cache handle returned by ``acquire``.
+
+* ``disconnect_func``
+
+  / *Condition*: required / *Type*: callable /
+
+  The function to disconnect the proxy with.
+
+**Returns:**
+
+(*no returns*)
+      """
+      entry = key
+      with ProxyCache._lock:
+         if entry.references <= 0:
+            return
+         entry.references -= 1
+         if entry.references > 0:
+            return
+         if self._entries.get(entry.key) is entry:
+            del self._entries[entry.key]
+      disconnect_func(entry.proxy)
+
+   def get_reference_count(self, key):
+      """
+Get the number of connections which are using a cached proxy.
+
+**Arguments:**
+
+* ``key``
+
+  / *Condition*: required / *Type*: object /
+
+  The cache handle returned by ``acquire``.
+
+**Returns:**
+
+  / *Type*: int /
+
+  The reference count.
+      """
+      with ProxyCache._lock:
+         return key.references
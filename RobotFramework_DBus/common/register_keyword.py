@@ -29,13 +29,22 @@
 from robot.api import logger
 from robot.libraries.BuiltIn import BuiltIn
 from robot.running import Keyword
+from RobotFramework_DBus.common.handler_dispatcher import HandlerDispatcher
+from threading import Lock
 
 
 class RegisterKeyword:
    """
 A class that provides a keyword as a callback function for a DBus signal received.
+
+The number of arguments accepted by the keyword is resolved once, when the handler is registered,
+and only resolved again if the Robot Framework namespace changes (e.g. in another suite).
    """
-   def __init__(self, kw):
+   _statistics_lock = Lock()
+   _total_lookups = 0
+   _total_lookups_avoided = 0
+
+   def __init__(self, kw, priority=0):
       """
 Constructor for RegisterKeyword class.
 
@@ -47,11 +56,86 @@ Constructor for RegisterKeyword class.
 
   Keyword name to be set as the callback function.
 
+* ``priority``
+
+  / *Condition*: optional / *Type*: int / *Default*: 0 /
+
+  The dispatch priority of the handler. Handlers with a higher priority are run first.
+
 **Returns:**
 
 (*no returns*)
       """
       self._kw = kw
+      self.priority = int(priority)
+      self._namespace = None
+      self._max_args = None
+      self._resolve_kw_args(RegisterKeyword._get_namespace())
+
+   @staticmethod
+   def _get_namespace():
+      """
+Get the current Robot Framework namespace.
+
+**Returns:**
+
+  / *Type*: robot.running.namespace.Namespace /
+
+  The current namespace or None if Robot Framework is not running.
+      """
+      try:
+         return BuiltIn()._namespace
+      except Exception as _ex:
+         return None
+
+   def _resolve_kw_args(self, namespace):
+      """
+Look up the maximum number of positional arguments of the handler keyword in a namespace.
+
+**Arguments:**
+
+* ``namespace``
+
+  / *Condition*: required / *Type*: robot.running.namespace.Namespace /
+
+  The namespace to look up the keyword in.
+
+**Returns:**
+
+(*no returns*)
+      """
+      max_args = None
+      try:
+         user_keywords = namespace._kw_store.user_keywords
+         max_args = len(user_keywords.handlers[self._kw.lower()].arguments.argument_names)
+      except Exception as _ex:
+         try:
+            kw_args = namespace.get_runner(self._kw, recommend_on_failure=False).keyword.args
+            if kw_args.var_positional is None:
+               max_args = kw_args.maxargs
+         except Exception as _ex:
+            pass
+
+      self._namespace = namespace
+      self._max_args = max_args
+      with RegisterKeyword._statistics_lock:
+         RegisterKeyword._total_lookups += 1
+
+   @classmethod
+   def get_lookup_statistics(cls):
+      """
+Get the counters of handler argument lookups.
+
+**Returns:**
+
+  / *Type*: dict /
+
+  The number of performed lookups ('argument_lookups') and of lookups avoided thanks to
+  the cached argument specification ('argument_lookups_avoided').
+      """
+      with cls._statistics_lock:
+         return {"argument_lookups": cls._total_lookups,
+                 "argument_lookups_avoided": cls._total_lookups_avoided}
 
    def get_kw_name(self):
       """
@@ -67,7 +151,7 @@ Get the handle keyword name.
 
    def callback_func(self, *observer):
       """
-Constructor for RegisterKeyword class.
+Callback function which runs the handler keyword with the signal's arguments.
 
 **Arguments:**
 
@@ -81,16 +165,34 @@ Constructor for RegisterKeyword class.
 
 (*no returns*)
       """
-      kw_args = None
-      input_kw_args = observer
-      try:
-         all_lib = BuiltIn().get_library_instance(all=True)
-         user_keywords = all_lib['BuiltIn']._context.namespace._kw_store.user_keywords
-         kw_args = user_keywords.handlers[self._kw.lower()].arguments.argument_names
-      except Exception as _ex:
-         pass
+      namespace = RegisterKeyword._get_namespace()
+      if namespace is not self._namespace:
+         self._resolve_kw_args(namespace)
+      else:
+         with RegisterKeyword._statistics_lock:
+            RegisterKeyword._total_lookups_avoided += 1
 
-      if kw_args is not None:
-         input_kw_args = observer[0:len(kw_args)]
+      input_kw_args = observer
+      if self._max_args is not None:
+         input_kw_args = observer[0:self._max_args]
 
       BuiltIn().run_keyword(self._kw, *input_kw_args)
+
+   def dispatch_func(self, *observer):
+      """
+Callback function which queues the handler keyword to the handler dispatcher instead of running it
+on the calling (signal delivery) thread.
+
+**Arguments:**
+
+* ``observer``
+
+  / *Condition*: optional / *Type*: tuple / *Default*: None /
+
+  Input arguments to be passed to the callback method.
+
+**Returns:**
+
+(*no returns*)
+      """
+      HandlerDispatcher.get_instance().dispatch(self.callback_func, observer, self.priority, self._kw)
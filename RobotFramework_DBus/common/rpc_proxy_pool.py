@@ -0,0 +1,161 @@
+#  Copyright 2020-2023 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# *******************************************************************************
+#
+# File: rpc_proxy_pool.py
+#
+# Initially created by Nguyen Huynh Tri Cuong (MS/EMC12-XC) / May 2023.
+#
+# Description:
+#   Provide a thread-safe pool of XML-RPC proxies with persistent HTTP/1.1 connections.
+#
+# History:
+#
+# 22.05.2023 / V 0.1.0 / Nguyen Huynh Tri Cuong
+# - Initialize
+#
+# *******************************************************************************
+from threading import Lock
+import xmlrpc.client
+
+
+class _PooledMethod:
+   """
+A callable remote method of a ``ServerProxyPool``.
+   """
+   __slots__ = ("_pool", "_name")
+
+   def __init__(self, pool, name):
+      self._pool = pool
+      self._name = name
+
+   def __call__(self, *params):
+      return self._pool.call(self._name, *params)
+
+
+class ServerProxyPool:
+   """
+A pool of ``xmlrpc.client.ServerProxy`` objects, usable like a single ``ServerProxy`` from several threads.
+
+A ``ServerProxy`` keeps its HTTP/1.1 connection open between requests, but it must not be used by two threads
+at once. Every call takes an idle proxy from the pool, or creates one if all are busy, and gives it back
+afterwards, so that concurrent calls (e.g. a method call and a long poll for signal emissions) run on
+separate persistent connections and no call opens a new TCP connection while an idle one exists.
+   """
+   DEFAULT_MAX_IDLE = 4
+
+   def __init__(self, uri, max_idle=DEFAULT_MAX_IDLE, **kwargs):
+      """
+Constructor for ServerProxyPool class.
+
+**Arguments:**
+
+* ``uri``
+
+  / *Condition*: required / *Type*: str /
+
+  The URI of the XML-RPC server, e.g. 'http://localhost:2507'.
+
+* ``max_idle``
+
+  / *Condition*: optional / *Type*: int / *Default*: 4 /
+
+  The maximum number of idle proxies kept open. Additional proxies are closed when they are given back.
+
+* ``kwargs``
+
+  / *Condition*: optional / *Type*: dict /
+
+  The keyword arguments of ``ServerProxy``.
+
+**Returns:**
+
+(*no returns*)
+      """
+      self.uri = uri
+      self.max_idle = max_idle
+      self._kwargs = kwargs
+      self._idle_proxies = []
+      self._lock = Lock()
+      self._closed = False
+
+   def __getattr__(self, name):
+      if name.startswith("_"):
+         raise AttributeError(name)
+      return _PooledMethod(self, name)
+
+   def _acquire(self):
+      with self._lock:
+         if self._idle_proxies:
+            return self._idle_proxies.pop()
+      return xmlrpc.client.ServerProxy(self.uri, **self._kwargs)
+
+   def _release(self, proxy, reusable):
+      with self._lock:
+         if reusable and not self._closed and len(self._idle_proxies) < self.max_idle:
+            self._idle_proxies.append(proxy)
+            return
+      proxy("close")()
+
+   def call(self, method, *params):
+      """
+Call a remote method on an idle proxy of the pool.
+
+**Arguments:**
+
+* ``method``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the remote method.
+
+* ``params``
+
+  / *Condition*: optional / *Type*: tuple /
+
+  The arguments of the remote method.
+
+**Returns:**
+
+  / *Type*: Any /
+
+  The result of the remote method.
+      """
+      proxy = self._acquire()
+      reusable = False
+      try:
+         result = getattr(proxy, method)(*params)
+         reusable = True
+         return result
+      except xmlrpc.client.Fault:
+         # A fault is a regular response, so the connection is still usable.
+         reusable = True
+         raise
+      finally:
+         self._release(proxy, reusable)
+
+   def close(self):
+      """
+Close the connections of the idle proxies. Proxies which are in use are closed when they are given back.
+
+**Returns:**
+
+(*no returns*)
+      """
+      with self._lock:
+         self._closed = True
+         idle_proxies = self._idle_proxies
+         self._idle_proxies = []
+      for proxy in idle_proxies:
+         proxy("close")()
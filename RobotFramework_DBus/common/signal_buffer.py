@@ -0,0 +1,713 @@
+#  Copyright 2020-2023 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# *******************************************************************************
+#
+# File: signal_buffer.py
+#
+# Initially created by Nguyen Huynh Tri Cuong (MS/EMC12-XC) / May 2023.
+#
+# Description:
+#   Provide bounded per-signal ring buffers for captured DBus signal emissions
+#   and a bounded event log read by sequence number.
+#
+# History:
+#
+# 22.05.2023 / V 0.1.0 / Nguyen Huynh Tri Cuong
+# - Initialize
+#
+# *******************************************************************************
+from collections import deque
+from itertools import islice
+from threading import Condition, RLock, Event
+import time
+
+
+def pack_payloads(args):
+   """
+Pack the arguments of a signal emission into its payloads.
+
+**Arguments:**
+
+* ``args``
+
+  / *Condition*: required / *Type*: tuple /
+
+  The arguments of the signal emission.
+
+**Returns:**
+
+  / *Type*: Any /
+
+  The single argument of the signal or a list of all arguments.
+   """
+   if len(args) == 1:
+      return args[0]
+   return list(args)
+
+
+class SignalEvent:
+   """
+A single captured emission of a DBus signal.
+   """
+   __slots__ = ("signal", "payloads", "timestamp", "sequence")
+
+   def __init__(self, signal, payloads, timestamp, sequence):
+      """
+Constructor for SignalEvent class.
+
+**Arguments:**
+
+* ``signal``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the DBus signal which has been raised.
+
+* ``payloads``
+
+  / *Condition*: required / *Type*: Any /
+
+  The payloads of the raised signal.
+
+* ``timestamp``
+
+  / *Condition*: required / *Type*: float /
+
+  Monotonic time (``time.monotonic()``) when the emission was received.
+
+* ``sequence``
+
+  / *Condition*: required / *Type*: int /
+
+  Sequence number of the emission, unique and increasing per connection.
+
+**Returns:**
+
+(*no returns*)
+      """
+      self.signal = signal
+      self.payloads = payloads
+      self.timestamp = timestamp
+      self.sequence = sequence
+
+   def to_dict(self):
+      """
+Convert the event to a dictionary.
+
+**Returns:**
+
+  / *Type*: dict /
+
+  The event's attributes.
+      """
+      return {attr: getattr(self, attr) for attr in SignalEvent.__slots__}
+
+
+class SignalBuffer:
+   """
+A bounded ring buffer holding the captured emissions of one DBus signal.
+   """
+   def __init__(self, capacity, overflow_policy):
+      """
+Constructor for SignalBuffer class.
+
+**Arguments:**
+
+* ``capacity``
+
+  / *Condition*: required / *Type*: int /
+
+  The maximum number of emissions kept in the buffer.
+
+* ``overflow_policy``
+
+  / *Condition*: required / *Type*: str /
+
+  What to do when the buffer is full. See ``CapturedSignalStore.OVERFLOW_POLICIES``.
+
+**Returns:**
+
+(*no returns*)
+      """
+      if overflow_policy == CapturedSignalStore.OVERFLOW_LATEST_ONLY:
+         capacity = 1
+      self.capacity = capacity
+      self.overflow_policy = overflow_policy
+      self.dropped = 0
+      self._events = deque()
+
+   def __len__(self):
+      return len(self._events)
+
+   def append(self, event):
+      """
+Append an event to the buffer according to the overflow policy.
+
+**Arguments:**
+
+* ``event``
+
+  / *Condition*: required / *Type*: SignalEvent /
+
+  The captured emission.
+
+**Returns:**
+
+  / *Type*: bool /
+
+  True if the event has been stored, False if it has been dropped.
+      """
+      if len(self._events) >= self.capacity:
+         self.dropped += 1
+         if self.overflow_policy == CapturedSignalStore.OVERFLOW_DROP_NEWEST:
+            return False
+         self._events.popleft()
+      self._events.append(event)
+      return True
+
+   def peek(self):
+      """
+Return the oldest event of the buffer without removing it.
+
+**Returns:**
+
+  / *Type*: SignalEvent /
+
+  The oldest event or None if the buffer is empty.
+      """
+      if self._events:
+         return self._events[0]
+      return None
+
+   def find_first(self, predicate):
+      """
+Return the oldest event of the buffer whose payloads match a predicate, without removing it.
+
+**Arguments:**
+
+* ``predicate``
+
+  / *Condition*: required / *Type*: callable /
+
+  The function to check the payloads with.
+
+**Returns:**
+
+  / *Type*: SignalEvent /
+
+  The oldest matching event or None if no event matches.
+      """
+      for event in self._events:
+         if predicate(event.payloads):
+            return event
+      return None
+
+   def remove(self, event):
+      """
+Remove an event from the buffer.
+
+**Arguments:**
+
+* ``event``
+
+  / *Condition*: required / *Type*: SignalEvent /
+
+  The event to remove.
+
+**Returns:**
+
+(*no returns*)
+      """
+      self._events.remove(event)
+
+   def popleft(self):
+      """
+Remove and return the oldest event of the buffer.
+
+**Returns:**
+
+  / *Type*: SignalEvent /
+
+  The oldest event or None if the buffer is empty.
+      """
+      if self._events:
+         return self._events.popleft()
+      return None
+
+   def clear(self):
+      """
+Remove all events from the buffer.
+
+**Returns:**
+
+(*no returns*)
+      """
+      self._events.clear()
+
+
+class SignalWaiter:
+   """
+A waiter blocked on one or more signals of a CapturedSignalStore.
+
+A waiter with a predicate is only woken by a matching emission, which is handed over to it directly.
+   """
+   __slots__ = ("signals", "predicate", "claimed_event", "_event")
+
+   def __init__(self, signals, predicate=None):
+      """
+Constructor for SignalWaiter class.
+
+**Arguments:**
+
+* ``signals``
+
+  / *Condition*: required / *Type*: tuple /
+
+  The names of the DBus signals to wait for.
+
+* ``predicate``
+
+  / *Condition*: optional / *Type*: callable / *Default*: None /
+
+  The function the payloads of an emission must match.
+
+**Returns:**
+
+(*no returns*)
+      """
+      self.signals = signals
+      self.predicate = predicate
+      self.claimed_event = None
+      self._event = Event()
+
+   def claim(self, event):
+      """
+Take over an emission matching the waiter's predicate and wake up the waiter.
+The predicate is evaluated on the thread pushing the emission.
+
+**Arguments:**
+
+* ``event``
+
+  / *Condition*: required / *Type*: SignalEvent /
+
+  The new emission.
+
+**Returns:**
+
+  / *Type*: bool /
+
+  True if the emission matches and has been taken over.
+      """
+      if self.claimed_event is not None or not self.predicate(event.payloads):
+         return False
+      self.claimed_event = event
+      self._event.set()
+      return True
+
+   def notify(self):
+      """
+Wake up the waiter.
+
+**Returns:**
+
+(*no returns*)
+      """
+      self._event.set()
+
+   def wait(self, timeout):
+      """
+Block until the waiter is notified or the timeout expires.
+
+**Arguments:**
+
+* ``timeout``
+
+  / *Condition*: required / *Type*: float /
+
+  The maximum time (in seconds) to block.
+
+**Returns:**
+
+  / *Type*: bool /
+
+  True if the waiter has been notified.
+      """
+      notified = self._event.wait(timeout)
+      self._event.clear()
+      return notified
+
+
+class CapturedSignalStore:
+   """
+Thread-safe collection of per-signal ring buffers for a single connection.
+
+Memory is capped by ``capacity`` entries per signal, no matter how fast the service emits.
+   """
+   OVERFLOW_DROP_OLDEST = "drop-oldest"
+   OVERFLOW_DROP_NEWEST = "drop-newest"
+   OVERFLOW_LATEST_ONLY = "latest-only"
+   OVERFLOW_POLICIES = (OVERFLOW_DROP_OLDEST, OVERFLOW_DROP_NEWEST, OVERFLOW_LATEST_ONLY)
+
+   DEFAULT_CAPACITY = 100
+
+   def __init__(self, capacity=DEFAULT_CAPACITY, overflow_policy=OVERFLOW_DROP_OLDEST):
+      """
+Constructor for CapturedSignalStore class.
+
+**Arguments:**
+
+* ``capacity``
+
+  / *Condition*: optional / *Type*: int / *Default*: 100 /
+
+  The maximum number of emissions kept per signal.
+
+* ``overflow_policy``
+
+  / *Condition*: optional / *Type*: str / *Default*: 'drop-oldest' /
+
+  What to do when the buffer of a signal is full:
+
+  - 'drop-oldest': discard the oldest emission to make room for the new one.
+  - 'drop-newest': discard the new emission.
+  - 'latest-only': keep only the most recent emission.
+
+**Returns:**
+
+(*no returns*)
+      """
+      capacity = int(capacity)
+      if capacity < 1:
+         raise ValueError("The signal queue size must be greater than 0, got '%s'" % capacity)
+      if overflow_policy not in CapturedSignalStore.OVERFLOW_POLICIES:
+         raise ValueError("Invalid signal overflow policy '%s'. Possible values are: %s"
+                          % (overflow_policy, ", ".join(CapturedSignalStore.OVERFLOW_POLICIES)))
+      self.capacity = capacity
+      self.overflow_policy = overflow_policy
+      self._buffers = {}
+      self._waiters = {}
+      self._sequence = 0
+      self._lock = RLock()
+
+   def __contains__(self, signal):
+      with self._lock:
+         return signal in self._buffers and len(self._buffers[signal]) > 0
+
+   def push(self, signal, payloads):
+      """
+Store a new emission of a signal.
+
+**Arguments:**
+
+* ``signal``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the DBus signal which has been raised.
+
+* ``payloads``
+
+  / *Condition*: required / *Type*: Any /
+
+  The payloads of the raised signal.
+
+**Returns:**
+
+* ``event``
+
+  / *Type*: SignalEvent /
+
+  The stored event or None if it has been dropped.
+      """
+      with self._lock:
+         self._sequence += 1
+         event = SignalEvent(signal, payloads, time.monotonic(), self._sequence)
+         waiters = self._waiters.get(signal, ())
+         for waiter in waiters:
+            if waiter.predicate is not None and waiter.claim(event):
+               return event
+         buffer = self._buffers.get(signal)
+         if buffer is None:
+            buffer = SignalBuffer(self.capacity, self.overflow_policy)
+            self._buffers[signal] = buffer
+         if not buffer.append(event):
+            return None
+         for waiter in waiters:
+            if waiter.predicate is None:
+               waiter.notify()
+      return event
+
+   def pop(self, signal):
+      """
+Remove and return the oldest captured emission of a signal.
+
+**Arguments:**
+
+* ``signal``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the DBus signal.
+
+**Returns:**
+
+* ``event``
+
+  / *Type*: SignalEvent /
+
+  The oldest event or None if no emission has been captured.
+      """
+      with self._lock:
+         buffer = self._buffers.get(signal)
+         if buffer is None:
+            return None
+         return buffer.popleft()
+
+   def _pop_oldest(self, signals, predicate=None):
+      """
+Remove and return the oldest captured emission among several signals. Must be called with the lock held.
+      """
+      if predicate is not None:
+         matches = [self._buffers[signal].find_first(predicate) for signal in signals if signal in self._buffers]
+         matches = [event for event in matches if event is not None]
+         if not matches:
+            return None
+         oldest = min(matches, key=lambda event: event.sequence)
+         self._buffers[oldest.signal].remove(oldest)
+         return oldest
+
+      oldest = None
+      for signal in signals:
+         buffer = self._buffers.get(signal)
+         if buffer is not None and len(buffer) > 0:
+            if oldest is None or buffer.peek().sequence < oldest.peek().sequence:
+               oldest = buffer
+      if oldest is None:
+         return None
+      return oldest.popleft()
+
+   def wait(self, signals, timeout=0, predicate=None):
+      """
+Consume the oldest captured emission among the given signals, waiting for one if none is queued yet.
+
+The caller is registered as a waiter of every given signal and is woken only by emissions of these
+signals, so that waiting on many signals at once does not need any extra thread.
+
+With a predicate, only matching emissions are consumed and other emissions stay queued.
+New emissions are checked against the predicate on the thread pushing them, and only a matching
+emission wakes the caller.
+
+**Arguments:**
+
+* ``signals``
+
+  / *Condition*: required / *Type*: list /
+
+  The names of the DBus signals to wait for.
+
+* ``timeout``
+
+  / *Condition*: optional / *Type*: float / str / *Default*: 0 /
+
+  The maximum time (in seconds) to wait. With 0 only the already queued emissions are checked.
+
+* ``predicate``
+
+  / *Condition*: optional / *Type*: callable / *Default*: None /
+
+  The function the payloads of the consumed emission must match.
+
+**Returns:**
+
+* ``event``
+
+  / *Type*: SignalEvent /
+
+  The consumed event or None if the timeout expired.
+      """
+      signals = tuple(signals)
+      timeout = float(timeout)
+      deadline = time.monotonic() + timeout
+      with self._lock:
+         event = self._pop_oldest(signals, predicate)
+         if event is not None or timeout <= 0:
+            return event
+         waiter = SignalWaiter(signals, predicate)
+         for signal in signals:
+            self._waiters.setdefault(signal, set()).add(waiter)
+
+      try:
+         while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+               break
+            waiter.wait(remaining)
+            with self._lock:
+               event = waiter.claimed_event if predicate is not None else self._pop_oldest(signals)
+               if event is not None:
+                  return event
+      finally:
+         with self._lock:
+            for signal in signals:
+               waiters = self._waiters.get(signal)
+               if waiters is not None:
+                  waiters.discard(waiter)
+                  if not waiters:
+                     del self._waiters[signal]
+
+      with self._lock:
+         if predicate is not None:
+            return waiter.claimed_event
+         return self._pop_oldest(signals)
+
+   def get_dropped_count(self, signal):
+      """
+Get the number of emissions of a signal dropped because its buffer was full.
+
+**Arguments:**
+
+* ``signal``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the DBus signal.
+
+**Returns:**
+
+  / *Type*: int /
+
+  The number of dropped emissions.
+      """
+      with self._lock:
+         buffer = self._buffers.get(signal)
+         return buffer.dropped if buffer is not None else 0
+
+   def clear(self):
+      """
+Remove all captured emissions.
+
+**Returns:**
+
+(*no returns*)
+      """
+      with self._lock:
+         self._buffers.clear()
+
+
+class SignalEventLog:
+   """
+A bounded log of signal emissions, read by sequence number.
+
+Reading does not consume the events, so a reader which remembers the last sequence number it has seen
+gets every emission exactly once, also across several reads. It is used to deliver the emissions of the
+signals with remote signal handlers with long polls instead of periodic polls.
+   """
+   DEFAULT_CAPACITY = 1000
+
+   def __init__(self, capacity=DEFAULT_CAPACITY):
+      """
+Constructor for SignalEventLog class.
+
+**Arguments:**
+
+* ``capacity``
+
+  / *Condition*: optional / *Type*: int / *Default*: 1000 /
+
+  The maximum number of emissions kept in the log. Older emissions are dropped.
+
+**Returns:**
+
+(*no returns*)
+      """
+      self._events = deque(maxlen=int(capacity))
+      self._sequence = 0
+      self._closed = False
+      self._condition = Condition()
+
+   def append(self, channel, payloads):
+      """
+Append an emission to the log and wake up the waiting readers.
+
+**Arguments:**
+
+* ``channel``
+
+  / *Condition*: required / *Type*: str /
+
+  The name under which the readers receive the emission, e.g. the signal name.
+
+* ``payloads``
+
+  / *Condition*: required / *Type*: Any /
+
+  The payloads of the emission.
+
+**Returns:**
+
+(*no returns*)
+      """
+      with self._condition:
+         self._sequence += 1
+         self._events.append((self._sequence, channel, payloads))
+         self._condition.notify_all()
+
+   def get_since(self, sequence, timeout=0):
+      """
+Get the emissions after a sequence number, waiting until there is one, the timeout expires or the log is closed.
+
+**Arguments:**
+
+* ``sequence``
+
+  / *Condition*: required / *Type*: int /
+
+  The sequence number of the last emission the reader has seen, 0 for a new reader.
+
+* ``timeout``
+
+  / *Condition*: optional / *Type*: float / *Default*: 0 /
+
+  The maximum time (in seconds) to wait for an emission.
+
+**Returns:**
+
+  / *Type*: dict /
+
+  A dictionary with the keys 'events' (list of [sequence, channel, payloads]), 'sequence' (the sequence
+  number to pass to the next call), 'missed' (the number of emissions dropped from the log before
+  they have been read) and 'closed' (True if the log has been closed).
+      """
+      with self._condition:
+         self._condition.wait_for(lambda: self._sequence > sequence or self._closed, timeout)
+         new_count = min(self._sequence - sequence, len(self._events)) if self._sequence > sequence else 0
+         events = [list(event) for event in islice(self._events, len(self._events) - new_count, None)]
+         missed = max(0, self._sequence - sequence - new_count)
+         return {"events": events,
+                 "sequence": self._sequence,
+                 "missed": missed,
+                 "closed": self._closed}
+
+   def close(self):
+      """
+Close the log and wake up the waiting readers.
+
+**Returns:**
+
+(*no returns*)
+      """
+      with self._condition:
+         self._closed = True
+         self._condition.notify_all()
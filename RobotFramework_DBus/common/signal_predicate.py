@@ -0,0 +1,143 @@
+#  Copyright 2020-2023 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# *******************************************************************************
+#
+# File: signal_predicate.py
+#
+# Initially created by Nguyen Huynh Tri Cuong (MS/EMC12-XC) / May 2023.
+#
+# Description:
+#   Provide predicates on signal payloads for waiting on matching signal emissions.
+#
+# History:
+#
+# 22.05.2023 / V 0.1.0 / Nguyen Huynh Tri Cuong
+# - Initialize
+#
+# *******************************************************************************
+import re
+
+
+class SignalPredicate:
+   """
+A predicate on the payloads of a signal emission.
+
+The predicate is compiled once and then evaluated for every emission, so it is cheap enough
+to be evaluated in the signal callback.
+   """
+   TYPE_REGEX = "regex"
+   TYPE_FIELD = "field"
+   TYPE_EXPRESSION = "expression"
+   PREDICATE_TYPES = (TYPE_REGEX, TYPE_FIELD, TYPE_EXPRESSION)
+
+   def __init__(self, predicate, predicate_type=TYPE_REGEX, allow_expression=True):
+      """
+Constructor for SignalPredicate class.
+
+**Arguments:**
+
+* ``predicate``
+
+  / *Condition*: required / *Type*: str /
+
+  The predicate, depending on ``predicate_type``:
+
+  - 'regex': a regular expression searched in the string representation of the payloads,
+    e.g. "state=READY".
+  - 'field': an equality ``field.path=value`` on a field of the payloads. The path consists of
+    dictionary keys and list indexes separated by '.', e.g. "0.state=READY". An empty path
+    compares the whole payloads.
+  - 'expression': a Python expression evaluated with the payloads bound to ``payloads``,
+    e.g. "payloads[1] > 3". The expression can execute any Python code.
+
+* ``predicate_type``
+
+  / *Condition*: optional / *Type*: str / *Default*: 'regex' /
+
+  The type of the predicate: 'regex', 'field' or 'expression'.
+
+* ``allow_expression``
+
+  / *Condition*: optional / *Type*: bool / *Default*: True /
+
+  If False, 'expression' predicates are rejected. Used by the DBus Agent, which must not execute code
+  sent by its clients unless it has been started with ``--allow-expression-predicates``.
+
+**Returns:**
+
+(*no returns*)
+      """
+      if predicate_type not in SignalPredicate.PREDICATE_TYPES:
+         raise ValueError("Invalid predicate type '%s'. Possible values are: %s"
+                          % (predicate_type, ", ".join(SignalPredicate.PREDICATE_TYPES)))
+      if predicate_type == SignalPredicate.TYPE_EXPRESSION and not allow_expression:
+         raise ValueError("Expression predicates are not allowed by the DBus Agent. They are only available "
+                          "in local mode, or on an agent started with '--allow-expression-predicates'.")
+      self.predicate = predicate
+      self.predicate_type = predicate_type
+
+      if predicate_type == SignalPredicate.TYPE_REGEX:
+         self._pattern = re.compile(predicate)
+         self._match_func = self._match_regex
+      elif predicate_type == SignalPredicate.TYPE_FIELD:
+         path, separator, expected = predicate.partition("=")
+         if not separator:
+            raise ValueError("Invalid field predicate '%s'. Expected 'field.path=value'." % predicate)
+         self._field_path = [item for item in path.strip().split(".") if item]
+         self._expected = expected.lstrip("=").strip()
+         self._match_func = self._match_field
+      else:
+         self._code = compile(predicate, "<predicate>", "eval")
+         self._match_func = self._match_expression
+
+   def __str__(self):
+      return "%s '%s'" % (self.predicate_type, self.predicate)
+
+   def __call__(self, payloads):
+      """
+Evaluate the predicate on the payloads of an emission.
+
+**Arguments:**
+
+* ``payloads``
+
+  / *Condition*: required / *Type*: Any /
+
+  The payloads of the emission.
+
+**Returns:**
+
+  / *Type*: bool /
+
+  True if the payloads match. Errors while evaluating the predicate count as no match.
+      """
+      try:
+         return bool(self._match_func(payloads))
+      except Exception as _ex:
+         return False
+
+   def _match_regex(self, payloads):
+      return self._pattern.search(str(payloads)) is not None
+
+   def _match_field(self, payloads):
+      value = payloads
+      for item in self._field_path:
+         if isinstance(value, (list, tuple)):
+            value = value[int(item)]
+         else:
+            value = value[item]
+      return value == self._expected or str(value) == self._expected
+
+   def _match_expression(self, payloads):
+      return eval(self._code, {"re": re}, {"payloads": payloads})
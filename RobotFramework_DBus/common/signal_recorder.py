@@ -0,0 +1,438 @@
+#  Copyright 2020-2023 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# *******************************************************************************
+#
+# File: signal_recorder.py
+#
+# Initially created by Nguyen Huynh Tri Cuong (MS/EMC12-XC) / May 2023.
+#
+# Description:
+#   Provide a streaming recorder of DBus signal emissions to rotating, compressed JSONL files
+#   and a lazy reader of the recordings.
+#
+# History:
+#
+# 22.05.2023 / V 0.1.0 / Nguyen Huynh Tri Cuong
+# - Initialize
+#
+# *******************************************************************************
+from RobotFramework_DBus.common.signal_buffer import pack_payloads
+from threading import Lock, Thread
+import base64
+import gzip
+import json
+import os
+import queue
+import time
+
+
+def _serialize(value):
+   """
+Serialize the values which are not supported by JSON.
+   """
+   if isinstance(value, (bytes, bytearray)):
+      return base64.b64encode(value).decode("ascii")
+   if isinstance(value, (set, frozenset)):
+      return list(value)
+   return str(value)
+
+
+def get_recording_files(file_path):
+   """
+Get the files of a recording, oldest first.
+
+**Arguments:**
+
+* ``file_path``
+
+  / *Condition*: required / *Type*: str /
+
+  The path of the recording file given when the recording has been started.
+
+**Returns:**
+
+  / *Type*: list /
+
+  The rotated files ('<file_path>.N' ... '<file_path>.1') followed by the current file.
+   """
+   backups = []
+   idx = 1
+   while os.path.exists("%s.%s" % (file_path, idx)):
+      backups.append("%s.%s" % (file_path, idx))
+      idx += 1
+   files = list(reversed(backups))
+   if os.path.exists(file_path):
+      files.append(file_path)
+   return files
+
+
+def read_signal_recording(file_path, signals=None):
+   """
+Read a signal recording lazily, one emission at a time, including its rotated files.
+
+**Arguments:**
+
+* ``file_path``
+
+  / *Condition*: required / *Type*: str /
+
+  The path of the recording file given when the recording has been started.
+
+* ``signals``
+
+  / *Condition*: optional / *Type*: list / *Default*: None /
+
+  The names of the signals to read. None means all signals.
+
+**Returns:**
+
+  / *Type*: generator /
+
+  The recorded emissions as dictionaries with the keys 'signal', 'interface', 'sender', 'path',
+  'monotonic', 'wall' and 'payloads', oldest first.
+   """
+   if isinstance(signals, str):
+      signals = [s.strip() for s in signals.split(",")]
+   for recording_file in get_recording_files(file_path):
+      with gzip.open(recording_file, "rt", encoding="utf-8") as file:
+         try:
+            for line in file:
+               if not line.strip():
+                  continue
+               record = json.loads(line)
+               if signals is None or record["signal"] in signals:
+                  yield record
+         except EOFError:
+            # The file of a running recording, or of an interrupted one, has no end marker yet.
+            pass
+
+
+class SignalRecorder:
+   """
+A recorder streaming signal emissions to a rotating, gzip compressed JSONL file.
+
+Emissions are only queued by the signal callback. A background writer thread serializes and writes them
+in batches and flushes the file at most once per flush interval, so that recording does not slow down
+the signal delivery and memory is bounded by the queue size.
+   """
+   DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+   DEFAULT_BACKUP_COUNT = 5
+   DEFAULT_QUEUE_SIZE = 10000
+   DEFAULT_FLUSH_INTERVAL = 1.0
+   BATCH_SIZE = 500
+   STOP_POLL_INTERVAL = 0.1
+
+   def __init__(self, file_path, max_bytes=DEFAULT_MAX_BYTES, backup_count=DEFAULT_BACKUP_COUNT,
+                queue_size=DEFAULT_QUEUE_SIZE, flush_interval=DEFAULT_FLUSH_INTERVAL, compress_level=6):
+      """
+Constructor for SignalRecorder class.
+
+**Arguments:**
+
+* ``file_path``
+
+  / *Condition*: required / *Type*: str /
+
+  The path of the recording file, e.g. 'signals.jsonl.gz'.
+
+* ``max_bytes``
+
+  / *Condition*: optional / *Type*: int / *Default*: 64 MiB /
+
+  The uncompressed size after which the file is rotated. 0 disables the rotation.
+
+* ``backup_count``
+
+  / *Condition*: optional / *Type*: int / *Default*: 5 /
+
+  The number of rotated files to keep as '<file_path>.1' (newest) to '<file_path>.N' (oldest).
+  0 disables the rotation, like a ``max_bytes`` of 0.
+
+* ``queue_size``
+
+  / *Condition*: optional / *Type*: int / *Default*: 10000 /
+
+  The maximum number of emissions waiting for the writer. Further emissions are dropped and counted.
+
+* ``flush_interval``
+
+  / *Condition*: optional / *Type*: float / *Default*: 1.0 /
+
+  The maximum time (in seconds) written emissions may stay in the compressor's buffer.
+
+* ``compress_level``
+
+  / *Condition*: optional / *Type*: int / *Default*: 6 /
+
+  The gzip compression level from 1 (fastest) to 9 (smallest).
+
+**Returns:**
+
+(*no returns*)
+      """
+      self.file_path = file_path
+      self.max_bytes = int(max_bytes)
+      self.backup_count = int(backup_count)
+      self.flush_interval = float(flush_interval)
+      self.compress_level = int(compress_level)
+      self._queue = queue.Queue(int(queue_size))
+      self._file = None
+      self._file_bytes = 0
+      self._writer = None
+      self._writer_error = None
+      self._stats_lock = Lock()
+      self._recorded = 0
+      self._dropped = 0
+      self._rotations = 0
+      self._subscription_id = None
+      self._connection = None
+
+   def start(self):
+      """
+Open the recording file and start the writer thread.
+
+**Returns:**
+
+(*no returns*)
+      """
+      directory = os.path.dirname(os.path.abspath(self.file_path))
+      os.makedirs(directory, exist_ok=True)
+      self._open()
+      self._writer = Thread(target=self._run_writer, name="DBusSignalRecorder", daemon=True)
+      self._writer.start()
+
+   def attach(self, message_bus, service_name, object_path, signals=None):
+      """
+Subscribe to all signals emitted by an object of a service and record them.
+Must be called on the reactor thread.
+
+**Arguments:**
+
+* ``message_bus``
+
+  / *Condition*: required / *Type*: dasbus.connection.MessageBus /
+
+  The message bus of the service.
+
+* ``service_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the DBus service.
+
+* ``object_path``
+
+  / *Condition*: required / *Type*: str /
+
+  The object path of the connection.
+
+* ``signals``
+
+  / *Condition*: optional / *Type*: list / *Default*: None /
+
+  The names of the signals to record. None means all signals of the object.
+
+**Returns:**
+
+(*no returns*)
+      """
+      # Imported here, so that recordings can be read without the DBus bindings.
+      from dasbus.typing import unwrap_variant
+      from gi.repository import Gio
+
+      signals = set(signals) if signals else None
+
+      def _signal_callback(connection, sender_name, path, interface_name, signal_name, parameters):
+         if signals is None or signal_name in signals:
+            self.record(signal_name, interface_name, sender_name, path, pack_payloads(unwrap_variant(parameters)))
+
+      self._connection = message_bus.connection
+      self._subscription_id = self._connection.signal_subscribe(service_name, None, None, object_path, None,
+                                                                Gio.DBusSignalFlags.NONE, _signal_callback)
+
+   def detach(self):
+      """
+Unsubscribe from the recorded signals. Must be called on the reactor thread.
+
+**Returns:**
+
+(*no returns*)
+      """
+      if self._subscription_id is not None:
+         self._connection.signal_unsubscribe(self._subscription_id)
+         self._subscription_id = None
+
+   def record(self, signal, interface, sender, path, payloads):
+      """
+Queue an emission for writing. This never blocks the caller.
+
+**Arguments:**
+
+* ``signal``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the DBus signal.
+
+* ``interface``
+
+  / *Condition*: required / *Type*: str /
+
+  The interface of the signal.
+
+* ``sender``
+
+  / *Condition*: required / *Type*: str /
+
+  The unique bus name of the emitter.
+
+* ``path``
+
+  / *Condition*: required / *Type*: str /
+
+  The object path of the emitter.
+
+* ``payloads``
+
+  / *Condition*: required / *Type*: Any /
+
+  The payloads of the emission.
+
+**Returns:**
+
+(*no returns*)
+      """
+      try:
+         self._queue.put_nowait((signal, interface, sender, path, time.monotonic(), time.time(), payloads))
+      except queue.Full:
+         with self._stats_lock:
+            self._dropped += 1
+
+   def stop(self):
+      """
+Write the remaining queued emissions, close the file and stop the writer thread.
+
+If the writer thread has failed, the emissions queued since then are discarded and the error is raised.
+
+**Returns:**
+
+  / *Type*: dict /
+
+  The statistics of the recording. See ``get_statistics``.
+      """
+      if self._writer is not None:
+         # A failed writer does not take items from the queue anymore, so a full queue must not block the stop.
+         while self._writer.is_alive():
+            try:
+               self._queue.put(None, timeout=SignalRecorder.STOP_POLL_INTERVAL)
+               break
+            except queue.Full:
+               pass
+         self._writer.join()
+         self._writer = None
+      if self._writer_error is not None:
+         raise Exception("Unable to write the signal recording '%s'. Reason: %s" % (self.file_path, self._writer_error))
+      return self.get_statistics()
+
+   def get_statistics(self):
+      """
+Get the counters of the recording.
+
+**Returns:**
+
+  / *Type*: dict /
+
+  The keys 'file_path', 'recorded' (written emissions), 'dropped' (emissions dropped because the writer
+  could not keep up) and 'rotations'.
+      """
+      with self._stats_lock:
+         return {"file_path": self.file_path,
+                 "recorded": self._recorded,
+                 "dropped": self._dropped,
+                 "rotations": self._rotations}
+
+   def _open(self):
+      self._file = gzip.open(self.file_path, "wb", compresslevel=self.compress_level)
+      self._file_bytes = 0
+
+   def _rotate(self):
+      self._file.close()
+      for idx in range(self.backup_count - 1, 0, -1):
+         source = "%s.%s" % (self.file_path, idx)
+         if os.path.exists(source):
+            os.replace(source, "%s.%s" % (self.file_path, idx + 1))
+      os.replace(self.file_path, "%s.1" % self.file_path)
+      self._open()
+      with self._stats_lock:
+         self._rotations += 1
+
+   def _write_batch(self, batch):
+      lines = []
+      for signal, interface, sender, path, monotonic, wall, payloads in batch:
+         lines.append(json.dumps({"signal": signal,
+                                  "interface": interface,
+                                  "sender": sender,
+                                  "path": path,
+                                  "monotonic": monotonic,
+                                  "wall": wall,
+                                  "payloads": payloads}, default=_serialize))
+      data = ("\n".join(lines) + "\n").encode("utf-8")
+      self._file.write(data)
+      self._file_bytes += len(data)
+      with self._stats_lock:
+         self._recorded += len(batch)
+      # Without backups a rotation would truncate the recording, so it is disabled like with max_bytes 0.
+      if self.max_bytes > 0 and self.backup_count > 0 and self._file_bytes >= self.max_bytes:
+         self._rotate()
+
+   def _run_writer(self):
+      try:
+         self._write_queued()
+      except Exception as ex:
+         self._writer_error = ex
+      finally:
+         try:
+            self._file.close()
+         except Exception as ex:
+            self._writer_error = self._writer_error or ex
+
+   def _write_queued(self):
+      last_flush = time.monotonic()
+      pending = False
+      stopping = False
+      while not stopping:
+         try:
+            item = self._queue.get(timeout=self.flush_interval)
+         except queue.Empty:
+            item = ()
+
+         batch = []
+         while item is not None:
+            if item:
+               batch.append(item)
+            if len(batch) >= SignalRecorder.BATCH_SIZE:
+               break
+            try:
+               item = self._queue.get_nowait()
+            except queue.Empty:
+               break
+         stopping = item is None
+
+         if batch:
+            self._write_batch(batch)
+            pending = True
+         if pending and (stopping or time.monotonic() - last_flush >= self.flush_interval):
+            self._file.flush()
+            last_flush = time.monotonic()
+            pending = False
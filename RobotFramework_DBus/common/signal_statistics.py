@@ -0,0 +1,261 @@
+#  Copyright 2020-2023 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# *******************************************************************************
+#
+# File: signal_statistics.py
+#
+# Initially created by Nguyen Huynh Tri Cuong (MS/EMC12-XC) / May 2023.
+#
+# Description:
+#   Provide lightweight per-signal counters of received emissions.
+#
+# History:
+#
+# 22.05.2023 / V 0.1.0 / Nguyen Huynh Tri Cuong
+# - Initialize
+#
+# *******************************************************************************
+from RobotFramework_DBus.common.histogram import LogHistogram
+from threading import Lock
+import time
+
+
+class SignalCounter:
+   """
+The counters of the received emissions of one signal: total count, rate over a sliding window
+and inter-arrival times. Every update is O(1).
+   """
+   def __init__(self, window, bucket_width):
+      """
+Constructor for SignalCounter class.
+
+**Arguments:**
+
+* ``window``
+
+  / *Condition*: required / *Type*: float /
+
+  The length (in seconds) of the sliding window of the rate.
+
+* ``bucket_width``
+
+  / *Condition*: required / *Type*: float /
+
+  The resolution (in seconds) of the sliding window.
+
+**Returns:**
+
+(*no returns*)
+      """
+      self.window = window
+      self.bucket_width = bucket_width
+      self.count = 0
+      self.first_time = None
+      self.last_time = None
+      self.inter_arrival = LogHistogram()
+      bucket_count = max(1, int(round(window / bucket_width)))
+      self._bucket_ids = [None] * bucket_count
+      self._bucket_counts = [0] * bucket_count
+
+   def record(self, timestamp):
+      """
+Count an emission.
+
+**Arguments:**
+
+* ``timestamp``
+
+  / *Condition*: required / *Type*: float /
+
+  Monotonic time (``time.monotonic()``) when the emission was received.
+
+**Returns:**
+
+(*no returns*)
+      """
+      if self.last_time is not None:
+         self.inter_arrival.record(timestamp - self.last_time)
+      else:
+         self.first_time = timestamp
+      self.last_time = timestamp
+      self.count += 1
+
+      bucket_id = int(timestamp / self.bucket_width)
+      slot = bucket_id % len(self._bucket_ids)
+      if self._bucket_ids[slot] != bucket_id:
+         self._bucket_ids[slot] = bucket_id
+         self._bucket_counts[slot] = 0
+      self._bucket_counts[slot] += 1
+
+   def get_rate(self, now):
+      """
+Get the rate of emissions over the sliding window.
+
+**Arguments:**
+
+* ``now``
+
+  / *Condition*: required / *Type*: float /
+
+  The current monotonic time.
+
+**Returns:**
+
+  / *Type*: float /
+
+  The number of emissions per second within the window ending now. If the first emission is more recent
+  than the window, the rate is computed since the first emission, but over at least one bucket width,
+  so that a single emission yields 1 / ``bucket_width`` instead of an unbounded rate.
+      """
+      current_id = int(now / self.bucket_width)
+      oldest_id = current_id - len(self._bucket_ids) + 1
+      in_window = sum(bucket_count for bucket_id, bucket_count in zip(self._bucket_ids, self._bucket_counts)
+                      if bucket_id is not None and oldest_id <= bucket_id <= current_id)
+      if in_window == 0:
+         return 0.0
+      elapsed = min(now - oldest_id * self.bucket_width, now - self.first_time)
+      return in_window / max(elapsed, self.bucket_width)
+
+   def to_dict(self, now):
+      """
+Summarize the counters.
+
+**Arguments:**
+
+* ``now``
+
+  / *Condition*: required / *Type*: float /
+
+  The current monotonic time.
+
+**Returns:**
+
+  / *Type*: dict /
+
+  The keys 'count', 'rate', 'window', 'last_received' (seconds ago) and the inter-arrival times
+  'inter_arrival_min', 'inter_arrival_mean', 'inter_arrival_max' and 'inter_arrival_p99' (seconds).
+      """
+      return {"count": self.count,
+              "rate": self.get_rate(now),
+              "window": self.window,
+              "last_received": None if self.last_time is None else now - self.last_time,
+              "inter_arrival_min": self.inter_arrival.min,
+              "inter_arrival_mean": self.inter_arrival.get_mean(),
+              "inter_arrival_max": self.inter_arrival.max,
+              "inter_arrival_p99": self.inter_arrival.get_percentile(99)}
+
+
+class SignalStatistics:
+   """
+Thread-safe per-signal counters of a connection.
+   """
+   DEFAULT_WINDOW = 10.0
+   DEFAULT_BUCKET_WIDTH = 0.5
+
+   def __init__(self, window=DEFAULT_WINDOW, bucket_width=DEFAULT_BUCKET_WIDTH):
+      """
+Constructor for SignalStatistics class.
+
+**Arguments:**
+
+* ``window``
+
+  / *Condition*: optional / *Type*: float / *Default*: 10.0 /
+
+  The length (in seconds) of the sliding window of the rates.
+
+* ``bucket_width``
+
+  / *Condition*: optional / *Type*: float / *Default*: 0.5 /
+
+  The resolution (in seconds) of the sliding window.
+
+**Returns:**
+
+(*no returns*)
+      """
+      self.window = float(window)
+      self.bucket_width = float(bucket_width)
+      self._counters = {}
+      self._lock = Lock()
+
+   def record(self, signal, timestamp=None):
+      """
+Count an emission of a signal.
+
+**Arguments:**
+
+* ``signal``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the DBus signal.
+
+* ``timestamp``
+
+  / *Condition*: optional / *Type*: float / *Default*: None /
+
+  Monotonic time when the emission was received. Defaults to now.
+
+**Returns:**
+
+(*no returns*)
+      """
+      if timestamp is None:
+         timestamp = time.monotonic()
+      with self._lock:
+         counter = self._counters.get(signal)
+         if counter is None:
+            counter = SignalCounter(self.window, self.bucket_width)
+            self._counters[signal] = counter
+         counter.record(timestamp)
+
+   def get_statistics(self, signal=None):
+      """
+Get the counters of one or all signals.
+
+**Arguments:**
+
+* ``signal``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The name of the DBus signal. None means all signals.
+
+**Returns:**
+
+  / *Type*: dict /
+
+  The counters of the signal (see ``SignalCounter.to_dict``), or a dictionary of the counters of
+  all signals keyed by signal name.
+      """
+      now = time.monotonic()
+      with self._lock:
+         if signal is not None:
+            counter = self._counters.get(signal)
+            if counter is None:
+               return SignalCounter(self.window, self.bucket_width).to_dict(now)
+            return counter.to_dict(now)
+         return {name: counter.to_dict(now) for name, counter in self._counters.items()}
+
+   def reset(self):
+      """
+Reset the counters of all signals.
+
+**Returns:**
+
+(*no returns*)
+      """
+      with self._lock:
+         self._counters.clear()
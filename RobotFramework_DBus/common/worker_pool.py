@@ -0,0 +1,242 @@
+#  Copyright 2020-2023 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# *******************************************************************************
+#
+# File: worker_pool.py
+#
+# Initially created by Nguyen Huynh Tri Cuong (MS/EMC12-XC) / May 2023.
+#
+# Description:
+#   Provide the pool of worker threads of the DBus Agent, in which blocking requests
+#   do not count against the number of workers.
+#
+# History:
+#
+# 22.05.2023 / V 0.1.0 / Nguyen Huynh Tri Cuong
+# - Initialize
+#
+# *******************************************************************************
+from threading import Condition, Thread, current_thread, local
+import collections
+import contextlib
+import sys
+import traceback
+
+
+def blocking_request(func):
+   """
+Mark a method of the DBus Agent as a blocking request, e.g. a wait for a signal, which may take until its timeout
+without using the CPU. The servers of the agent run it with ``WorkerPool.blocking``.
+
+**Arguments:**
+
+* ``func``
+
+  / *Condition*: required / *Type*: callable /
+
+  The method.
+
+**Returns:**
+
+  / *Type*: callable /
+
+  The marked method.
+   """
+   func.blocking_request = True
+   return func
+
+
+def is_blocking_request(func):
+   """
+Check if a method has been marked with ``blocking_request``.
+
+**Arguments:**
+
+* ``func``
+
+  / *Condition*: required / *Type*: callable /
+
+  The method.
+
+**Returns:**
+
+  / *Type*: bool /
+
+  True if the method is a blocking request.
+   """
+   return getattr(func, "blocking_request", False)
+
+
+class WorkerPool:
+   """
+A pool of worker threads which executes at most ``max_workers`` tasks at once, not counting the tasks
+waiting in a blocking request.
+
+When a worker enters a blocking request (see ``blocking``), it stops counting against ``max_workers`` and
+another worker is started if tasks are waiting, so that long waits of some clients (``wait_for_signal``,
+the long polls of the signal handlers) never delay the requests of the other clients. Up to ``max_blocking``
+workers can be blocked at once. Beyond that, further blocking requests keep their worker, which bounds
+the number of threads to ``max_workers + max_blocking``.
+
+Surplus workers exit when they become idle.
+   """
+   DEFAULT_MAX_BLOCKING = 1024
+
+   def __init__(self, max_workers, thread_name_prefix="worker", max_blocking=DEFAULT_MAX_BLOCKING):
+      """
+Constructor for WorkerPool class.
+
+**Arguments:**
+
+* ``max_workers``
+
+  / *Condition*: required / *Type*: int /
+
+  The maximum number of tasks executed at once, not counting blocked tasks.
+
+* ``thread_name_prefix``
+
+  / *Condition*: optional / *Type*: str / *Default*: 'worker' /
+
+  The prefix of the thread names.
+
+* ``max_blocking``
+
+  / *Condition*: optional / *Type*: int / *Default*: 1024 /
+
+  The maximum number of blocked tasks which do not count against ``max_workers``.
+
+**Returns:**
+
+(*no returns*)
+      """
+      self.max_workers = max(1, max_workers)
+      self.max_blocking = max(0, max_blocking)
+      self._thread_name_prefix = thread_name_prefix
+      self._tasks = collections.deque()
+      self._condition = Condition()
+      self._thread_count = 0
+      self._idle_count = 0
+      self._blocked_count = 0
+      self._started_count = 0
+      self._shutdown = False
+      self._local = local()
+
+   def _start_worker(self):
+      self._thread_count += 1
+      self._started_count += 1
+      Thread(target=self._run_worker, name="%s-%s" % (self._thread_name_prefix, self._started_count),
+             daemon=True).start()
+
+   def _run_worker(self):
+      self._local.worker = True
+      while True:
+         with self._condition:
+            while not self._tasks and not self._shutdown:
+               if self._thread_count - self._blocked_count > self.max_workers:
+                  break
+               self._idle_count += 1
+               self._condition.wait()
+               self._idle_count -= 1
+            if not self._tasks:
+               self._thread_count -= 1
+               return
+            func, args = self._tasks.popleft()
+         try:
+            func(*args)
+         except Exception:
+            # Like socketserver.BaseServer.handle_error, the traceback is written to stderr.
+            print("The task %r failed on the worker thread '%s':" % (func, current_thread().name), file=sys.stderr)
+            traceback.print_exc()
+
+   def submit(self, func, *args):
+      """
+Execute a task on a worker thread.
+
+**Arguments:**
+
+* ``func``
+
+  / *Condition*: required / *Type*: callable /
+
+  The task. It handles its own errors, an unhandled error is written to stderr.
+
+* ``args``
+
+  / *Condition*: optional / *Type*: tuple /
+
+  The arguments of the task.
+
+**Returns:**
+
+(*no returns*)
+      """
+      with self._condition:
+         if self._shutdown:
+            raise RuntimeError("The worker pool has been shut down.")
+         self._tasks.append((func, args))
+         if self._idle_count > len(self._tasks) - 1:
+            self._condition.notify()
+         elif self._thread_count - self._blocked_count < self.max_workers:
+            self._start_worker()
+
+   @contextlib.contextmanager
+   def blocking(self):
+      """
+Context manager for a blocking call on a worker thread, e.g. a wait for a signal. While it blocks, the worker
+does not count against ``max_workers``. On other threads it has no effect.
+      """
+      if not getattr(self._local, "worker", False):
+         yield
+         return
+      with self._condition:
+         if self._blocked_count >= self.max_blocking:
+            blocked = False
+         else:
+            blocked = True
+            self._blocked_count += 1
+            if len(self._tasks) > self._idle_count:
+               self._start_worker()
+      try:
+         yield
+      finally:
+         if blocked:
+            with self._condition:
+               self._blocked_count -= 1
+
+   def get_statistics(self):
+      """
+Get the current number of threads of the pool.
+
+**Returns:**
+
+  / *Type*: dict /
+
+  The number of 'threads', 'idle' threads, 'blocked' threads and queued 'tasks'.
+      """
+      with self._condition:
+         return {"threads": self._thread_count, "idle": self._idle_count,
+                 "blocked": self._blocked_count, "tasks": len(self._tasks)}
+
+   def shutdown(self):
+      """
+Stop the idle workers. Queued tasks are still executed, new tasks are rejected.
+
+**Returns:**
+
+(*no returns*)
+      """
+      with self._condition:
+         self._shutdown = True
+         self._condition.notify_all()
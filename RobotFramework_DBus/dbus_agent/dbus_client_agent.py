@@ -34,17 +34,33 @@
 # *******************************************************************************
 from RobotFramework_DBus.common.thread_safe_dict import ThreadSafeDict
 from RobotFramework_DBus.common.utils import Utils
+from RobotFramework_DBus.common.signal_buffer import CapturedSignalStore, SignalEventLog, pack_payloads
+from RobotFramework_DBus.common.signal_predicate import SignalPredicate
+from RobotFramework_DBus.common.signal_recorder import SignalRecorder
+from RobotFramework_DBus.common.signal_statistics import SignalStatistics
+from RobotFramework_DBus.common.async_call import MethodCallRegistry, MethodCallBatch
+from RobotFramework_DBus.common.method_latency import MethodLatencyRecorder
+from RobotFramework_DBus.common.dbus_reactor import DBusReactor
+from RobotFramework_DBus.common.proxy_cache import ProxyCache, SignalSubscription
+from RobotFramework_DBus.common.introspection_cache import IntrospectionCache
+from RobotFramework_DBus.common.match_rule import SignalMatchFilter, FilteredSignal
+from RobotFramework_DBus.common.property_cache import PropertyCache
+from RobotFramework_DBus.common.object_index import ObjectIndex
+from RobotFramework_DBus.common.argument_converter import ArgumentConverter, call_with_parameters
+from RobotFramework_DBus.common.worker_pool import WorkerPool, blocking_request, is_blocking_request
+from RobotFramework_DBus.common import framed_rpc
 from dasbus.connection import SessionMessageBus
 from dasbus.identifier import DBusServiceIdentifier, DBusObjectIdentifier
-from dasbus.client.proxy import disconnect_proxy
-from dasbus.loop import EventLoop
-from threading import Timer
+from dasbus.client.proxy import disconnect_proxy, get_object_handler
+from dasbus.specification import DBusSpecification
 from dasbus.connection import SessionMessageBus
 import xmlrpc.server
 import argparse
 import secrets
+import selectors
 import string
 import threading
+import time
 
 
 # Define the message bus.
@@ -56,9 +72,10 @@ class DBusClientExecutor:
 The DBusClientExecutor class represents an executor responsible for handling client requests on specific DBus services.
 It receives requests from the DBusAgent and executes them on the corresponding DBus service.
    """
-   _captured_signal_dict = ThreadSafeDict()
-
-   def __init__(self, namespace, object_path):
+   def __init__(self, namespace, object_path,
+                signal_queue_size=CapturedSignalStore.DEFAULT_CAPACITY,
+                signal_overflow_policy=CapturedSignalStore.OVERFLOW_DROP_OLDEST,
+                introspection_cache=True, refresh_introspection=False, allow_expression_predicates=False):
       """
 Constructor for DBusClientExecutor.
 
@@ -82,49 +99,142 @@ Constructor for DBusClientExecutor.
   The object path should be a string that follows the DBus object path naming convention.
   It typically consists of a hierarchical structure separated by slashes (/).
 
+* ``signal_queue_size``
+
+  / *Condition*: optional / *Type*: int / *Default*: 100 /
+
+  The maximum number of captured emissions kept per signal.
+
+* ``signal_overflow_policy``
+
+  / *Condition*: optional / *Type*: str / *Default*: 'drop-oldest' /
+
+  What to do when the queue of a signal is full: 'drop-oldest', 'drop-newest' or 'latest-only'.
+
+* ``introspection_cache``
+
+  / *Condition*: optional / *Type*: bool / *Default*: True /
+
+  If True, the introspection data of the object is taken from the persistent on-disk cache
+  instead of introspecting the object on every connect. Validating the entry still costs one call
+  to the bus daemon.
+
+* ``refresh_introspection``
+
+  / *Condition*: optional / *Type*: bool / *Default*: False /
+
+  If True, the object is introspected again and the on-disk cache entry is replaced.
+
+* ``allow_expression_predicates``
+
+  / *Condition*: optional / *Type*: bool / *Default*: False /
+
+  If True, ``wait_for_signal_matching`` accepts 'expression' predicates, which execute Python code on the agent.
+
 **Returns:**
 
 (*no returns*)
       """
       namespace_tuple = tuple(namespace.split('.'))
       self.proxy = None
+      self._allow_expression_predicates = allow_expression_predicates
       self.namespace = namespace
       self.object_path = object_path
+      self._captured_signal_store = CapturedSignalStore(signal_queue_size, signal_overflow_policy)
+      self._monitored_signal_dict = ThreadSafeDict()
+      self._signal_subscription_dict = ThreadSafeDict()
+      self._proxy_key = None
+      self._method_call_registry = MethodCallRegistry()
+      self._introspection_cache = IntrospectionCache() if introspection_cache else None
+      self._refresh_introspection = refresh_introspection
+      self._signal_recorder = None
+      self._signal_statistics = SignalStatistics()
+      self._method_latency = MethodLatencyRecorder()
+      self._property_cache = None
+      self._property_cache_lock = threading.Lock()
+      self._object_index = None
+      self._object_proxy_dict = {}
+      self._object_index_lock = threading.Lock()
+      self._method_converter_dict = {}
+      self._signal_event_log = SignalEventLog()
+      self._event_channel_dict = {}
       try:
          self.dbus = DBusServiceIdentifier(
                             namespace=namespace_tuple,
                             message_bus=SESSION_BUS
                         )
-         self.main_event_loop = EventLoop()
-         self.event_loop_thread = threading.Thread(target=self._start_event_loop, args=(self.main_event_loop,), daemon=True)
-         self.event_loop_thread.start()
+         self._reactor = DBusReactor.get_instance()
       except Exception as ex:
          raise Exception("Unable to connect to '%s' DBus. Reason: '%s'" % (namespace, str(ex)) )
 
-   def _start_event_loop(self, loop):
-      loop.run()
-
    def connect(self):
       """
 Create a proxy object to DBus object.
 
+The proxy is shared with all other connections to the same object, so that it is introspected only once.
+With ``refresh_introspection`` a new proxy is created, which replaces the shared one for later connections.
+
 **Returns:**
 
 (*no returns*)
       """
-      self.proxy = self.dbus.get_proxy(self.object_path)
+      self._proxy_key, self.proxy = ProxyCache.get_instance().acquire(
+                                       self.dbus.message_bus,
+                                       self.dbus.service_name,
+                                       self.object_path,
+                                       None,
+                                       self._create_proxy,
+                                       self._refresh_introspection)
+
+   def _create_proxy(self, object_path=None):
+      """
+Create a new proxy object to DBus object, using the introspection cache if it is enabled.
+
+**Arguments:**
+
+* ``object_path``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The object path. None means the object path of the connection.
+
+**Returns:**
+
+  / *Type*: dasbus.client.proxy.ObjectProxy /
+
+  The new proxy.
+      """
+      object_path = object_path or self.object_path
+      if self._introspection_cache is not None:
+         return self._introspection_cache.get_proxy(self.dbus, object_path, self._refresh_introspection)
+      return self.dbus.get_proxy(object_path)
 
    def disconnect(self):
       """
 Disconnect the DBus proxy from the remote object.
 
+The shared proxy is only disconnected when no other connection is using it anymore.
+
 **Returns:**
 
 (*no returns*)
       """
-      disconnect_proxy(self.proxy)
-      if self.event_loop_thread.is_alive():
-         self.main_event_loop.quit()
+      self._reactor.call(self._unsubscribe_all)
+      self._signal_event_log.close()
+      if self._property_cache is not None:
+         self._reactor.call(self._property_cache.detach)
+         self._property_cache = None
+      if self._object_index is not None:
+         self._reactor.call(self._object_index.detach)
+         self._object_index = None
+      self._release_object_proxies()
+      if self._proxy_key is not None:
+         ProxyCache.get_instance().release(self._proxy_key,
+                                           lambda proxy: self._reactor.call(disconnect_proxy, proxy))
+         self._proxy_key = None
+      # Stopped last, so that an error of the recording is raised after the connection has been cleaned up.
+      if self._signal_recorder is not None:
+         self.stop_signal_recording()
 
    def quit(self):
       """
@@ -138,7 +248,7 @@ Quit the DBus client.
 
    def get_monitoring_signal_payloads(self, signal):
       """
-Get the payloads of a specific signal.
+Get the payloads of the oldest queued emission of a specific signal.
 
 **Arguments:**
 
@@ -157,13 +267,14 @@ Get the payloads of a specific signal.
   The signal's payloads.
       """
       payloads = None
-      if signal in self._captured_signal_dict:
-         payloads = self._captured_signal_dict.pop(signal)
+      event = self._captured_signal_store.pop(signal)
+      if event is not None:
+         payloads = event.payloads
       return payloads
 
-   def add_signal_to_captured_dict(self, signal, loop=None, payloads=""):
+   def _subscribe_signal_events(self, signal, match_filter=None):
       """
-Add a signal and its payloads to the captured dictionary when the signal be emited.
+Start logging the emissions of a signal into the signal event log. Must be called on the reactor thread.
 
 **Arguments:**
 
@@ -171,332 +282,391 @@ Add a signal and its payloads to the captured dictionary when the signal be emit
 
   / *Condition*: required / *Type*: str /
 
-  The name of the DBus signal(s) which has been raised.
+  The name of the DBus signal.
 
-* ``loop``
+* ``match_filter``
 
-  / *Condition*: optional / *Type*: EventLoop / *Default*: None /
+  / *Condition*: optional / *Type*: SignalMatchFilter / *Default*: None /
 
-  The Event loop which is running to wait for the raised signal.
+  The match-rule filters of the logged emissions.
 
-* ``payloads``
+**Returns:**
 
-  / *Condition*: optional / *Type*: Any / *Default*: "" /
+  / *Type*: str /
 
-  The payloads of the raised signal.
+  The channel of the logged emissions.
+      """
+      channel = signal if match_filter is None else "%s[%s]" % (signal, match_filter)
+      entry = self._event_channel_dict.get(channel)
+      if entry is None:
+         subscription = self._subscribe_signal(signal, match_filter)
+         callback_func = lambda *args: self._signal_event_log.append(channel, pack_payloads(args))
+         subscription.add_listener(callback_func)
+         entry = [subscription, callback_func, signal, match_filter, 0]
+         self._event_channel_dict[channel] = entry
+      entry[4] += 1
+      return channel
+
+   def _unsubscribe_signal_events(self, channel):
+      """
+Stop logging the emissions of a channel when it has no subscribers anymore. Must be called on the reactor thread.
+
+**Arguments:**
+
+* ``channel``
+
+  / *Condition*: required / *Type*: str /
+
+  The channel returned by ``subscribe_signal_events``.
 
 **Returns:**
 
 (*no returns*)
       """
-      self._captured_signal_dict[signal] = payloads
-      if loop is not None:
-         try:
-            loop.quit()
-         except Exception as _ex:
-            pass
-
-   def register_monitored_signal(self, signal):
+      entry = self._event_channel_dict.get(channel)
+      if entry is None:
+         return
+      entry[4] -= 1
+      if entry[4] <= 0:
+         subscription, callback_func, signal, match_filter, _count = entry
+         subscription.remove_listener(callback_func)
+         self._release_subscription(signal, match_filter)
+         del self._event_channel_dict[channel]
+
+   def subscribe_signal_events(self, signal, match_filter=None):
       """
-Register a DBus signal or signals to be monitored for a specific connection.
+Start logging the emissions of a signal for a remote signal handler.
+The emissions are read with ``poll_signal_events``.
 
 **Arguments:**
 
 * ``signal``
 
-  / *Condition*: optional / *Type*: str / *Default*: '' /
+  / *Condition*: required / *Type*: str /
 
-  The name of the DBus signal(s) to register. It can be a single signal name as a string,
-  or multiple signal names joined by ','. For example: "signal1,signal2,signal3".
+  The name of the DBus signal.
+
+* ``match_filter``
+
+  / *Condition*: optional / *Type*: str / dict / *Default*: None /
+
+  DBus match-rule filters applied by the bus daemon, so that only matching emissions are logged.
 
 **Returns:**
 
-(*no returns*)
+  / *Type*: str /
+
+  The channel of the logged emissions. Channels are shared by the subscriptions of a signal with equal filters.
       """
-      if isinstance(signal, str):
-         sgn_list = signal.split(",")
-         for s in sgn_list:
-            sgn = getattr(self.proxy, s)
-            sgn.connect(lambda x: self.add_signal_to_captured_dict(s, None, x))
-      elif isinstance(signal, list):
-         for s in signal:
-            sgn = getattr(self.proxy, s)
-            sgn.connect(lambda x: self.add_signal_to_captured_dict(s, None, x))
+      match_filter = SignalMatchFilter.parse(match_filter)
+      return self._reactor.call(self._subscribe_signal_events, signal, match_filter)
 
-   def _run_event_loop_with_timeout(self, loop, timeout):
+   def unsubscribe_signal_events(self, channel):
       """
-Run the Event Loop with timeout.
+Remove a subscription made with ``subscribe_signal_events``.
 
 **Arguments:**
 
-* ``loop``
-
-  / *Condition*: required / *Type*: EventLoop /
-
-  The Event loop to be run.
+* ``channel``
 
-* ``timeout``
-
-  / *Condition*: required / *Type*: int /
+  / *Condition*: required / *Type*: str /
 
-  The timeout for running Event loop.
+  The channel returned by ``subscribe_signal_events``.
 
 **Returns:**
 
 (*no returns*)
       """
-      try:
-         t = Timer(timeout, loop.quit)
-         t.start()
-      except Exception as _ex:
-         pass
+      self._reactor.call(self._unsubscribe_signal_events, channel)
 
-      loop.run()
-
-   def wait_for_signal(self, wait_signal="", timeout=0):
+   def poll_signal_events(self, since_sequence=0, timeout=0):
       """
-Wait for a specific DBus signal to be received within a specified timeout period.
+Get the logged emissions after a sequence number, waiting for a new emission if there is none yet (long poll).
 
 **Arguments:**
 
-* ``wait_signal``
+* ``since_sequence``
 
-  / *Condition*: optional / *Type*: str / *Default*: '' /
+  / *Condition*: optional / *Type*: int / *Default*: 0 /
 
-  The name of the DBus signal to wait for.
+  The sequence number returned by the previous call, 0 for the first call.
 
 * ``timeout``
 
-  / *Condition*: optional / *Type*: int / *Default*: 0 /
+  / *Condition*: optional / *Type*: float / *Default*: 0 /
 
-  The maximum time (in seconds) to wait for the signal.
+  The maximum time (in seconds) to wait for a new emission.
 
 **Returns:**
 
-* ``payloads``
+  / *Type*: dict /
 
-  / *Type*: str /
+  A dictionary with the keys 'events' (list of [sequence, channel, payloads]), 'sequence', 'missed' and 'closed'.
+  See ``SignalEventLog.get_since``.
+      """
+      return self._signal_event_log.get_since(int(since_sequence), float(timeout))
 
-  The signal payloads.
+   def add_signal_to_captured_dict(self, signal, payloads=""):
       """
-      timeout = int(timeout)
-      loop = EventLoop()
-      try:
-         sgn = getattr(self.proxy, wait_signal)
-      except Exception as _ex:
-         raise Exception("DBus service '%s' not have the signal '%s'" % (self.namespace, wait_signal))
+Add a signal and its payloads to the captured signal queue when the signal be emited.
 
-      callback_func = lambda x: self.add_signal_to_captured_dict(wait_signal, loop, x)
-      sgn.connect(callback_func)
-      if wait_signal in self._captured_signal_dict:
-         sgn.disconnect(callback_func)
-         return self._captured_signal_dict[wait_signal]
+**Arguments:**
 
-      self._run_event_loop_with_timeout(loop, timeout)
+* ``signal``
 
-      if wait_signal in self._captured_signal_dict:
-         sgn.disconnect(callback_func)
-         return self._captured_signal_dict[wait_signal]
-      else:
-         raise AssertionError("Unable to receive the '%s' signal after '%s'" % (wait_signal, timeout))
+  / *Condition*: required / *Type*: str /
 
-   def call_dbus_method(self, method_name, *args):
-      """
-Call a DBus method with the specified method name and input arguments.
+  The name of the DBus signal(s) which has been raised.
 
-**Arguments:**
+* ``payloads``
 
-* ``method_name``
+  / *Condition*: optional / *Type*: Any / *Default*: "" /
 
-  / *Condition*: optional / *Type*: str / *Default*: '' /
+  The payloads of the raised signal.
 
-  The name of the DBus method to be called.
+**Returns:**
 
-* ``args``
+(*no returns*)
+      """
+      self._captured_signal_store.push(signal, payloads)
 
-  / *Condition*: optional / *Type*: tuple / *Default*: None /
+   def _subscribe_signal(self, signal, match_filter=None):
+      """
+Get the connection's subscription to a signal of the proxy, create it if needed.
+Must be called on the reactor thread.
 
-  Input arguments to be passed to the method.
+Unfiltered subscriptions use the signal of the shared proxy. Filtered subscriptions have their own
+match rule on the bus and are shared by all consumers of the connection with an equal filter.
 
-**Returns:**
+**Arguments:**
 
-* ``mtd_ret``
+* ``signal``
 
-  / *Type*: Any /
+  / *Condition*: required / *Type*: str /
 
-  Return from called method.
-      """
-      try:
-         method = getattr(self.proxy, method_name)
-         mtd_ret = method(*args)
-         return mtd_ret
-      except Exception as ex:
-         raise ex
+  The name of the DBus signal.
 
+* ``match_filter``
 
-class DBusClientAgent:
-   """
-The DBusClientAgent class acts as a mediator between clients and the corresponding DBus services they request.
-It manages client connections, session tokens, and assigns the appropriate DBusClientExecutor for each client session.
-   """
-   def __init__(self):
-      """
-Constructor for DBusClientAgent.
-      """
-      self._executor_dict = dict()
+  / *Condition*: optional / *Type*: SignalMatchFilter / *Default*: None /
 
-   def get_session_token(self):
-      """
- Generates a unique session token for a client and returns it.
+  The match-rule filters of the subscription.
 
 **Returns:**
 
-/ *Type*: str /
+  / *Type*: SignalSubscription /
 
-  The random and unique token.
+  The connection's subscription to the signal.
       """
-      return Utils().make_unique_token()
-
-   def initialize_dbus_client(self, session, namespace, object_path):
+      subscription = self._signal_subscription_dict.get((signal, match_filter))
+      if subscription is None:
+         if match_filter is None:
+            sgn = getattr(self.proxy, signal)
+         else:
+            sgn = FilteredSignal(self.dbus.message_bus,
+                                 self.dbus.service_name,
+                                 self.object_path,
+                                 self._get_signal_interface(signal),
+                                 signal,
+                                 match_filter)
+         subscription = SignalSubscription(signal, sgn)
+         statistics_name = signal if match_filter is None else "%s[%s]" % (signal, match_filter)
+         subscription.add_listener(lambda *args: self._signal_statistics.record(statistics_name))
+         self._signal_subscription_dict[(signal, match_filter)] = subscription
+      return subscription
+
+   def _get_signal_interface(self, signal):
       """
-Initializes an DBusClientExecutor instance for a specific client.
-
-An DBusClientExecutor is an object responsible for executing requests from clients on corresponding DBus services.
-By initializing a separate DBusClientExecutor for each client, the DBusClientAgent ensures that requests from different
-clients are handled independently.
-
-The client session token is a unique identifier that can be used to associate the DBusClientExecutor with the specific client.
-This allows the DBusClientAgent to route incoming requests to the correct DBusClientExecutor based on the client session token.
+Get the interface of a signal of the proxy.
 
 **Arguments:**
 
-* ``session``
+* ``signal``
 
   / *Condition*: required / *Type*: str /
 
-  The client's session token.
-
-* ``namespace``
-
-  / *Condition*: optional / *Type*: str / *Default*: '' /
+  The name of the DBus signal.
 
-  The namespace of the DBus service.
-  This identifies the specific service or group of services.
-  It is used to differentiate between different service instances.
-  The namespace should be a string that uniquely identifies the service.
+**Returns:**
 
-* ``object_path``
+  / *Type*: str /
 
-  / *Condition*: optional / *Type*: str / *Default*: None /
+  The interface name.
+      """
+      for member in get_object_handler(self.proxy).specification.members:
+         if isinstance(member, DBusSpecification.Signal) and member.name == signal:
+            return member.interface_name
+      raise AttributeError("DBus object has no signal '%s'." % signal)
 
-  The object path of the DBus service.
-  This identifies the specific object within the service that the action will be performed on.
-  The object path should be a string that follows the DBus object path naming convention.
-  It typically consists of a hierarchical structure separated by slashes (/).
+   def _release_subscription(self, signal, match_filter):
+      """
+Disconnect a filtered subscription which has no listeners anymore, so that its match rule is removed from the bus.
+Must be called on the reactor thread.
 
-**Returns:**
+**Arguments:**
 
-(*no returns*)
-      """
-      if session in self._executor_dict:
-         raise Exception("The session '%s' has alreday initialized." % session)
+* ``signal``
 
-      self._executor_dict[session] = DBusClientExecutor(namespace, object_path)
+  / *Condition*: required / *Type*: str /
 
-   def connect(self, session):
-      """
-Create a proxy object to DBus service.
+  The name of the DBus signal.
 
-**Returns:**
+* ``match_filter``
 
-(*no returns*)
-      """
-      self._executor_dict[session].connect()
+  / *Condition*: required / *Type*: SignalMatchFilter /
 
-   def disconnect(self, session):
-      """
-Disconnect the DBus proxy from the remote object.
+  The match-rule filters of the subscription.
 
 **Returns:**
 
 (*no returns*)
       """
-      self._executor_dict[session].disconnect()
+      subscription = self._signal_subscription_dict.get((signal, match_filter))
+      if match_filter is not None and subscription is not None and not subscription.has_listeners():
+         subscription.disconnect()
+         del self._signal_subscription_dict[(signal, match_filter)]
 
-   def quit(self, session):
+   def _unsubscribe_all(self):
       """
-Quit the DBus client.
+Disconnect all signal subscriptions of the connection. Must be called on the reactor thread.
 
 **Returns:**
 
 (*no returns*)
       """
-      self._executor_dict[session].quit()
+      for subscription in self._signal_subscription_dict.values():
+         subscription.disconnect()
+      self._signal_subscription_dict.clear()
+      self._monitored_signal_dict.clear()
+      self._event_channel_dict.clear()
 
-   def get_monitoring_signal_payloads(self, session, signal):
+   def _monitor_signal(self, signal, match_filter=None, replace_filter=False):
       """
-Get the payloads of a specific signal.
+Start capturing the emissions of a signal into its queue if it is not monitored yet.
+Must be called on the reactor thread.
 
 **Arguments:**
 
-* ``session``
+* ``signal``
 
   / *Condition*: required / *Type*: str /
 
-  The client's session token.
+  The name of the DBus signal to monitor.
 
-* ``signal``
+* ``match_filter``
 
-  / *Condition*: required / *Type*: str /
+  / *Condition*: optional / *Type*: SignalMatchFilter / *Default*: None /
 
-  The name of the DBus signal to get payloads.
+  The match-rule filters of the captured emissions.
 
-**Returns:**
+* ``replace_filter``
 
-* ``payloads``
+  / *Condition*: optional / *Type*: bool / *Default*: False /
 
-  / *Type*: str /
+  If True and the signal is already monitored with another filter, the monitoring is moved to the given filter.
+  Otherwise an already monitored signal keeps its filter.
 
-  The signal's payloads.
-      """
-      return self._executor_dict[session].get_monitoring_signal_payloads(signal)
+**Returns:**
 
-   def register_monitored_signal(self, session, signal):
+  / *Type*: SignalSubscription /
+
+  The connection's subscription to the signal.
+      """
+      monitored = self._monitored_signal_dict.get(signal)
+      if monitored is not None:
+         subscription, callback_func, monitored_filter = monitored
+         if not replace_filter or monitored_filter == match_filter:
+            return subscription
+         subscription.remove_listener(callback_func)
+         self._release_subscription(signal, monitored_filter)
+
+      subscription = self._subscribe_signal(signal, match_filter)
+      callback_func = lambda *args: self.add_signal_to_captured_dict(signal, pack_payloads(args))
+      subscription.add_listener(callback_func)
+      self._monitored_signal_dict[signal] = (subscription, callback_func, match_filter)
+      return subscription
+
+   def register_monitored_signal(self, signal, match_filter=None):
       """
 Register a DBus signal or signals to be monitored for a specific connection.
 
-**Arguments:**
-
-* ``session``
-
-  / *Condition*: required / *Type*: str /
+Every emission of a monitored signal is kept in a bounded queue until it is consumed.
 
-  The client's session token.
+**Arguments:**
 
 * ``signal``
 
-  / *Condition*: required / *Type*: str /
+  / *Condition*: optional / *Type*: str / *Default*: '' /
 
   The name of the DBus signal(s) to register. It can be a single signal name as a string,
   or multiple signal names joined by ','. For example: "signal1,signal2,signal3".
 
+* ``match_filter``
+
+  / *Condition*: optional / *Type*: str / dict / *Default*: None /
+
+  DBus match-rule filters applied by the bus daemon, so that other emissions never reach the process.
+  Either a dictionary or comma-separated ``key=value`` pairs with the keys 'arg0', 'arg0namespace'
+  and 'path_namespace', e.g. "arg0=org.example.Service".
+
 **Returns:**
 
 (*no returns*)
       """
-      self._executor_dict[session].register_monitored_signal(signal)
+      match_filter = SignalMatchFilter.parse(match_filter)
+      if isinstance(signal, str):
+         signal = signal.split(",")
+      for s in signal:
+         self._reactor.call(self._monitor_signal, s.strip(), match_filter, match_filter is not None)
 
-   def wait_for_signal(self, session, wait_signal="", timeout=0):
+   def _wait_for_signal_event(self, signals, timeout, predicate=None):
       """
-Wait for a specific DBus signal to be received within a specified timeout period.
+Monitor the given signals and consume the oldest emission among them, waiting for one if needed.
 
 **Arguments:**
 
-* ``session``
+* ``signals``
 
-  / *Condition*: required / *Type*: str /
+  / *Condition*: required / *Type*: list /
 
-  The client's session token.
+  The names of the DBus signals to wait for.
+
+* ``timeout``
+
+  / *Condition*: required / *Type*: float /
+
+  The maximum time (in seconds) to wait.
+
+* ``predicate``
+
+  / *Condition*: optional / *Type*: SignalPredicate / *Default*: None /
+
+  The predicate the payloads of the consumed emission must match.
+
+**Returns:**
+
+* ``event``
+
+  / *Type*: SignalEvent /
+
+  The consumed event or None if the timeout expired.
+      """
+      for signal in signals:
+         try:
+            self._reactor.call(self._monitor_signal, signal)
+         except Exception as _ex:
+            raise Exception("DBus service '%s' not have the signal '%s'" % (self.namespace, signal))
+
+      return self._captured_signal_store.wait(signals, float(timeout), predicate)
+
+   def wait_for_signal(self, wait_signal="", timeout=0):
+      """
+Wait for a specific DBus signal to be received within a specified timeout period.
+
+The oldest queued emission of the signal is consumed first, so that no emission is lost
+between two calls.
+
+**Arguments:**
 
 * ``wait_signal``
 
@@ -506,9 +676,9 @@ Wait for a specific DBus signal to be received within a specified timeout period
 
 * ``timeout``
 
-  / *Condition*: optional / *Type*: int / *Default*: 0 /
+  / *Condition*: optional / *Type*: float / *Default*: 0 /
 
-  The maximum time (in seconds) to wait for the signal.
+  The maximum time (in seconds) to wait for the signal. Fractions of a second are allowed.
 
 **Returns:**
 
@@ -518,23 +688,1777 @@ Wait for a specific DBus signal to be received within a specified timeout period
 
   The signal payloads.
       """
-      return self._executor_dict[session].wait_for_signal(wait_signal, timeout)
+      event = self._wait_for_signal_event([wait_signal], timeout)
+      if event is not None:
+         return event.payloads
+      else:
+         raise AssertionError("Unable to receive the '%s' signal after '%s'" % (wait_signal, timeout))
 
-   def call_dbus_method(self, session, method_name, *args):
+   def wait_for_signal_matching(self, wait_signal="", predicate="", predicate_type=SignalPredicate.TYPE_REGEX, timeout=0):
       """
-Call a DBus method with the specified method name and input arguments.
+Wait for an emission of a DBus signal whose payloads match a predicate.
+
+Queued emissions are checked first. New emissions are checked in the signal callback on the event loop thread,
+and only a matching emission wakes the caller. Non-matching emissions stay queued.
 
 **Arguments:**
 
-* ``session``
+* ``wait_signal``
 
-  / *Condition*: required / *Type*: str /
+  / *Condition*: optional / *Type*: str / *Default*: '' /
 
-  The client's session token.
+  The name of the DBus signal to wait for.
 
-* ``method_name``
+* ``predicate``
 
-  / *Condition*: optional / *Type*: str / *Default*: '' /
+  / *Condition*: required / *Type*: str /
+
+  The predicate the payloads must match, depending on ``predicate_type``:
+
+  - 'regex': a regular expression searched in the string representation of the payloads, e.g. "state=READY".
+  - 'field': an equality ``field.path=value`` on a field of the payloads. The path consists of dictionary keys
+    and list indexes separated by '.', e.g. "0.state=READY".
+  - 'expression': a Python expression evaluated with the payloads bound to ``payloads``, e.g. "payloads[1] > 3".
+    Only accepted if the agent has been started with ``--allow-expression-predicates``.
+
+* ``predicate_type``
+
+  / *Condition*: optional / *Type*: str / *Default*: 'regex' /
+
+  The type of the predicate: 'regex', 'field' or 'expression'.
+
+* ``timeout``
+
+  / *Condition*: optional / *Type*: float / *Default*: 0 /
+
+  The maximum time (in seconds) to wait for the signal. Fractions of a second are allowed.
+
+**Returns:**
+
+* ``payloads``
+
+  / *Type*: Any /
+
+  The payloads of the matching emission.
+      """
+      signal_predicate = SignalPredicate(predicate, predicate_type, self._allow_expression_predicates)
+      event = self._wait_for_signal_event([wait_signal], timeout, signal_predicate)
+      if event is not None:
+         return event.payloads
+      else:
+         raise AssertionError("Unable to receive the '%s' signal matching %s after '%s'"
+                              % (wait_signal, signal_predicate, timeout))
+
+   def wait_for_any_signal(self, signals="", timeout=0):
+      """
+Wait for any of several DBus signals to be received within a specified timeout period.
+
+**Arguments:**
+
+* ``signals``
+
+  / *Condition*: optional / *Type*: str / *Default*: '' /
+
+  The names of the DBus signals to wait for. It can be a list of signal names,
+  or multiple signal names joined by ','. For example: "signal1,signal2,signal3".
+
+* ``timeout``
+
+  / *Condition*: optional / *Type*: float / *Default*: 0 /
+
+  The maximum time (in seconds) to wait for the signals. Fractions of a second are allowed.
+
+**Returns:**
+
+* ``signal_info``
+
+  / *Type*: tuple /
+
+  The name of the received signal and its payloads.
+      """
+      if isinstance(signals, str):
+         signals = signals.split(",")
+      signals = [s.strip() for s in signals]
+      event = self._wait_for_signal_event(signals, timeout)
+      if event is not None:
+         return event.signal, event.payloads
+      else:
+         raise AssertionError("Unable to receive any of the '%s' signals after '%s'" % (", ".join(signals), timeout))
+
+   def get_signal_statistics(self, signal=None):
+      """
+Get the counters of the received emissions of the subscribed signals.
+
+Signals are counted as soon as they are registered, waited for or handled, and the counters are updated
+in O(1) in the signal callback.
+
+**Arguments:**
+
+* ``signal``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The name of the DBus signal. None means all signals.
+
+**Returns:**
+
+* ``statistics``
+
+  / *Type*: dict /
+
+  The counters of the signal, or a dictionary of the counters of all signals keyed by signal name
+  (filtered subscriptions as 'signal[filter]'):
+
+  - 'count': the number of received emissions.
+  - 'rate': the emissions per second over the sliding window of 'window' seconds.
+  - 'last_received': the time (in seconds) since the last emission.
+  - 'inter_arrival_min', 'inter_arrival_mean', 'inter_arrival_max', 'inter_arrival_p99':
+    the times (in seconds) between consecutive emissions.
+      """
+      return self._signal_statistics.get_statistics(signal)
+
+   def start_signal_recording(self, file_path, signals=None,
+                              max_bytes=SignalRecorder.DEFAULT_MAX_BYTES,
+                              backup_count=SignalRecorder.DEFAULT_BACKUP_COUNT,
+                              queue_size=SignalRecorder.DEFAULT_QUEUE_SIZE,
+                              flush_interval=SignalRecorder.DEFAULT_FLUSH_INTERVAL):
+      """
+Start recording every emission of the object's signals to a rotating, compressed JSONL file.
+
+Each line holds the signal name, interface, sender, object path, monotonic and wall timestamps and the payloads.
+The signal callback only queues the emissions, and a background thread writes them in batches.
+
+**Arguments:**
+
+* ``file_path``
+
+  / *Condition*: required / *Type*: str /
+
+  The path of the gzip compressed JSONL recording file, e.g. 'signals.jsonl.gz'.
+
+* ``signals``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The names of the signals to record, joined by ','. None means all signals of the object.
+
+* ``max_bytes``
+
+  / *Condition*: optional / *Type*: int / *Default*: 64 MiB /
+
+  The uncompressed size after which the file is rotated. 0 disables the rotation.
+
+* ``backup_count``
+
+  / *Condition*: optional / *Type*: int / *Default*: 5 /
+
+  The number of rotated files to keep as '<file_path>.1' (newest) to '<file_path>.N' (oldest).
+  0 disables the rotation, like a ``max_bytes`` of 0.
+
+* ``queue_size``
+
+  / *Condition*: optional / *Type*: int / *Default*: 10000 /
+
+  The maximum number of emissions waiting for the writer thread. Further emissions are dropped and counted.
+
+* ``flush_interval``
+
+  / *Condition*: optional / *Type*: float / *Default*: 1.0 /
+
+  The maximum time (in seconds) recorded emissions may stay buffered before they are flushed to the file.
+
+**Returns:**
+
+(*no returns*)
+      """
+      if self._signal_recorder is not None:
+         raise Exception("The signals of '%s' are already being recorded to '%s'"
+                         % (self.namespace, self._signal_recorder.file_path))
+      if isinstance(signals, str):
+         signals = [s.strip() for s in signals.split(",") if s.strip()]
+
+      recorder = SignalRecorder(file_path, max_bytes, backup_count, queue_size, flush_interval)
+      recorder.start()
+      try:
+         self._reactor.call(recorder.attach, self.dbus.message_bus, self.dbus.service_name, self.object_path, signals)
+      except Exception:
+         recorder.stop()
+         raise
+      self._signal_recorder = recorder
+
+   def stop_signal_recording(self):
+      """
+Stop recording signals, write the remaining emissions and close the recording file.
+
+**Returns:**
+
+* ``statistics``
+
+  / *Type*: dict /
+
+  The statistics of the recording: 'file_path', 'recorded' (written emissions), 'dropped' (emissions
+  dropped because the writer could not keep up) and 'rotations'.
+      """
+      recorder = self._signal_recorder
+      if recorder is None:
+         raise Exception("The signals of '%s' are not being recorded" % self.namespace)
+      self._signal_recorder = None
+      self._reactor.call(recorder.detach)
+      return recorder.stop()
+
+   def get_method_latency_statistics(self, method_name=None):
+      """
+Get the latencies of the DBus method calls executed by the agent for this connection.
+
+**Arguments:**
+
+* ``method_name``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The name of the DBus method. None means all methods.
+
+**Returns:**
+
+  / *Type*: dict /
+
+  The latency summary of the method with the keys 'count', 'min', 'mean', 'max', 'p50', 'p90', 'p99' and 'p99_9' (seconds),
+  or a dictionary of the summaries of all methods keyed by method name.
+      """
+      return self._method_latency.get_statistics(method_name)
+
+   def _get_property_cache(self):
+      """
+Get the property cache of the connection, create it on first use.
+
+**Returns:**
+
+  / *Type*: PropertyCache /
+
+  The property cache.
+      """
+      with self._property_cache_lock:
+         if self._property_cache is None:
+            property_cache = PropertyCache(self.dbus.message_bus, self.dbus.service_name, self.object_path,
+                                           self._reactor)
+            self._reactor.call(property_cache.attach)
+            self._property_cache = property_cache
+         return self._property_cache
+
+   def _get_property_spec(self, property_name, interface=None):
+      """
+Get the specification of a property of the proxy.
+
+**Arguments:**
+
+* ``property_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the DBus property.
+
+* ``interface``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The interface of the property. None means the first interface which has the property.
+
+**Returns:**
+
+  / *Type*: DBusSpecification.Property /
+
+  The property specification.
+      """
+      for member in get_object_handler(self.proxy).specification.members:
+         if isinstance(member, DBusSpecification.Property) and member.name == property_name \
+               and interface in (None, member.interface_name):
+            return member
+      raise AttributeError("DBus object has no property '%s'." % property_name)
+
+   def get_dbus_property(self, property_name, interface=None, use_cache=True):
+      """
+Get the value of a DBus property.
+
+**Arguments:**
+
+* ``property_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the DBus property.
+
+* ``interface``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The interface of the property. None means the first interface which has the property.
+
+* ``use_cache``
+
+  / *Condition*: optional / *Type*: bool / *Default*: True /
+
+  If True, the value is served from the property cache. If False, it is read from the service.
+
+**Returns:**
+
+  / *Type*: Any /
+
+  The value of the property.
+      """
+      property_spec = self._get_property_spec(property_name, interface)
+      property_cache = self._get_property_cache()
+      if use_cache:
+         return property_cache.get(property_spec.interface_name, property_name)
+      return property_cache.read(property_spec.interface_name, property_name)
+
+   def set_dbus_property(self, property_name, value, interface=None):
+      """
+Set the value of a DBus property.
+
+**Arguments:**
+
+* ``property_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the DBus property.
+
+* ``value``
+
+  / *Condition*: required / *Type*: Any /
+
+  The new value.
+
+* ``interface``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The interface of the property. None means the first interface which has the property.
+
+**Returns:**
+
+(*no returns*)
+      """
+      property_spec = self._get_property_spec(property_name, interface)
+      if not property_spec.writable:
+         raise AttributeError("The '%s' property is not writable." % property_name)
+      self._get_property_cache().set(property_spec.interface_name, property_name, property_spec.type, value)
+
+   def get_all_dbus_properties(self, interface=None, use_cache=True):
+      """
+Get the values of all readable DBus properties of the object or of one of its interfaces.
+
+**Arguments:**
+
+* ``interface``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The interface of the properties. None means all interfaces of the object.
+
+* ``use_cache``
+
+  / *Condition*: optional / *Type*: bool / *Default*: True /
+
+  If True, the values are served from the property cache. If False, they are read from the service.
+
+**Returns:**
+
+  / *Type*: dict /
+
+  The values of the properties keyed by property name.
+      """
+      interfaces = []
+      for member in get_object_handler(self.proxy).specification.members:
+         if isinstance(member, DBusSpecification.Property) and member.readable \
+               and interface in (None, member.interface_name) and member.interface_name not in interfaces:
+            interfaces.append(member.interface_name)
+
+      property_cache = self._get_property_cache()
+      properties = {}
+      for interface_name in interfaces:
+         if use_cache:
+            properties.update(property_cache.get_all(interface_name))
+         else:
+            properties.update(property_cache.read_all(interface_name))
+      return properties
+
+   def wait_for_property_value(self, property_name, value, timeout=0, interface=None):
+      """
+Wait until a DBus property has an expected value, driven by the ``PropertiesChanged`` signal.
+
+**Arguments:**
+
+* ``property_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the DBus property.
+
+* ``value``
+
+  / *Condition*: required / *Type*: Any /
+
+  The expected value. It also matches a value with the same string representation.
+
+* ``timeout``
+
+  / *Condition*: optional / *Type*: float / *Default*: 0 /
+
+  The maximum time (in seconds) to wait. Fractions of a second are allowed.
+
+* ``interface``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The interface of the property. None means the first interface which has the property.
+
+**Returns:**
+
+  / *Type*: Any /
+
+  The value of the property.
+      """
+      property_spec = self._get_property_spec(property_name, interface)
+      matched, current_value = self._get_property_cache().wait_for_value(property_spec.interface_name, property_name,
+                                                                         value, float(timeout))
+      if not matched:
+         raise AssertionError("The '%s' property is '%s' instead of '%s' after '%s'"
+                              % (property_name, current_value, value, timeout))
+      return current_value
+
+   def _get_object_index(self, manager_path=None, refresh=False):
+      """
+Get the index of the managed objects of the service, load it on first use.
+
+**Arguments:**
+
+* ``manager_path``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The object path of the object manager. None means the object path of the connection,
+  or the path of the existing index.
+
+* ``refresh``
+
+  / *Condition*: optional / *Type*: bool / *Default*: False /
+
+  If True, the index is loaded again.
+
+**Returns:**
+
+  / *Type*: ObjectIndex /
+
+  The object index.
+      """
+      with self._object_index_lock:
+         index = self._object_index
+         if index is not None and (refresh or manager_path not in (None, index.manager_path)):
+            self._reactor.call(index.detach)
+            manager_path = manager_path or index.manager_path
+            index = None
+         if index is None:
+            index = ObjectIndex(self.dbus.message_bus, self.dbus.service_name, manager_path or self.object_path)
+            try:
+               self._reactor.call(index.attach)
+               index.wait_until_loaded()
+            except Exception as ex:
+               self._reactor.call(index.detach)
+               raise ex
+            self._object_index = index
+         return index
+
+   def index_managed_objects(self, manager_path=None):
+      """
+Load the index of the objects exported by the object manager of the service.
+
+**Arguments:**
+
+* ``manager_path``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The object path of the object manager. None means the object path of the connection.
+
+**Returns:**
+
+  / *Type*: int /
+
+  The number of indexed objects.
+      """
+      return self._get_object_index(manager_path, refresh=True).get_object_count()
+
+   def find_objects_by_interface(self, interface):
+      """
+Get the managed objects which implement an interface.
+
+**Arguments:**
+
+* ``interface``
+
+  / *Condition*: required / *Type*: str /
+
+  The interface name.
+
+**Returns:**
+
+  / *Type*: list /
+
+  The sorted object paths.
+      """
+      return self._get_object_index().find_by_interface(interface)
+
+   def find_objects_by_property(self, interface, property_name, value):
+      """
+Get the managed objects whose property has a value.
+
+**Arguments:**
+
+* ``interface``
+
+  / *Condition*: required / *Type*: str /
+
+  The interface of the property.
+
+* ``property_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the property.
+
+* ``value``
+
+  / *Condition*: required / *Type*: Any /
+
+  The value, compared by its string representation.
+
+**Returns:**
+
+  / *Type*: list /
+
+  The sorted object paths.
+      """
+      return self._get_object_index().find_by_property(interface, property_name, value)
+
+   def get_managed_object(self, object_path):
+      """
+Get the interfaces and properties of a managed object from the index.
+
+**Arguments:**
+
+* ``object_path``
+
+  / *Condition*: required / *Type*: str /
+
+  The object path.
+
+**Returns:**
+
+  / *Type*: dict /
+
+  The properties of the object keyed by interface name.
+      """
+      interfaces = self._get_object_index().get_object(object_path)
+      if interfaces is None:
+         raise AttributeError("The '%s' object is not managed by the service." % object_path)
+      return interfaces
+
+   def _get_object_proxy(self, object_path):
+      """
+Get the proxy of another object of the service, create it on first use.
+The proxy is shared through the proxy cache and released when the connection is disconnected.
+
+**Arguments:**
+
+* ``object_path``
+
+  / *Condition*: required / *Type*: str /
+
+  The object path.
+
+**Returns:**
+
+  / *Type*: dasbus.client.proxy.ObjectProxy /
+
+  The proxy of the object.
+      """
+      if object_path == self.object_path:
+         return self.proxy
+      with self._object_index_lock:
+         entry = self._object_proxy_dict.get(object_path)
+         if entry is None:
+            entry = ProxyCache.get_instance().acquire(self.dbus.message_bus,
+                                                      self.dbus.service_name,
+                                                      object_path,
+                                                      None,
+                                                      lambda: self._create_proxy(object_path),
+                                                      self._refresh_introspection)
+            self._object_proxy_dict[object_path] = entry
+         return entry[1]
+
+   def _release_object_proxies(self):
+      """
+Release the proxies of the other objects of the service used by the connection.
+
+**Returns:**
+
+(*no returns*)
+      """
+      with self._object_index_lock:
+         entries = list(self._object_proxy_dict.values())
+         self._object_proxy_dict.clear()
+      for proxy_key, _proxy in entries:
+         ProxyCache.get_instance().release(proxy_key, lambda proxy: self._reactor.call(disconnect_proxy, proxy))
+
+   def _call_method(self, method_name, args, object_path=None, callback=None):
+      """
+Call a DBus method of the object or of another object of the service. The arguments are converted to
+the input signature of the method by its cached argument converter.
+
+**Arguments:**
+
+* ``method_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the DBus method to be called.
+
+* ``args``
+
+  / *Condition*: required / *Type*: tuple /
+
+  Input arguments to be passed to the method.
+
+* ``object_path``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The object path. None means the object path of the connection.
+
+* ``callback``
+
+  / *Condition*: optional / *Type*: callable / *Default*: None /
+
+  The callback of an asynchronous call. None means a synchronous call.
+
+**Returns:**
+
+  / *Type*: Any /
+
+  The return value of a synchronous call.
+      """
+      object_path = object_path or self.object_path
+      proxy = self._get_object_proxy(object_path)
+      entry = self._method_converter_dict.get((object_path, method_name))
+      if entry is None:
+         for member in get_object_handler(proxy).specification.members:
+            if isinstance(member, DBusSpecification.Method) and member.name == method_name:
+               entry = (member, ArgumentConverter.get(member.in_type))
+               break
+         else:
+            raise AttributeError("DBus object has no method '%s'." % method_name)
+         self._method_converter_dict[(object_path, method_name)] = entry
+
+      method_spec, converter = entry
+      args, parameters = converter.convert(args)
+      if parameters is not None:
+         return call_with_parameters(self.dbus.message_bus, proxy, method_spec, parameters, callback)
+      method = getattr(proxy, method_name)
+      if callback is None:
+         return method(*args)
+      return method(*args, callback=callback)
+
+   def call_object_method(self, object_path, method_name, *args):
+      """
+Call a DBus method of another object of the service, e.g. of a managed object.
+
+**Arguments:**
+
+* ``object_path``
+
+  / *Condition*: required / *Type*: str /
+
+  The object path.
+
+* ``method_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the DBus method to be called.
+
+* ``args``
+
+  / *Condition*: optional / *Type*: tuple / *Default*: None /
+
+  Input arguments to be passed to the method.
+
+**Returns:**
+
+  / *Type*: Any /
+
+  The return value of the method.
+      """
+      start_time = time.perf_counter()
+      try:
+         return self._call_method(method_name, args, object_path)
+      finally:
+         self._method_latency.record(method_name, time.perf_counter() - start_time)
+
+   def call_dbus_method(self, method_name, *args):
+      """
+Call a DBus method with the specified method name and input arguments.
+
+**Arguments:**
+
+* ``method_name``
+
+  / *Condition*: optional / *Type*: str / *Default*: '' /
+
+  The name of the DBus method to be called.
+
+* ``args``
+
+  / *Condition*: optional / *Type*: tuple / *Default*: None /
+
+  Input arguments to be passed to the method.
+
+**Returns:**
+
+* ``mtd_ret``
+
+  / *Type*: Any /
+
+  Return from called method.
+      """
+      try:
+         start_time = time.perf_counter()
+         try:
+            return self._call_method(method_name, args)
+         finally:
+            self._method_latency.record(method_name, time.perf_counter() - start_time)
+      except Exception as ex:
+         raise ex
+
+   def call_dbus_method_async(self, method_name, *args):
+      """
+Call a DBus method asynchronously. The call is sent on the event loop and this method returns
+immediately, so that many calls can be in flight at once over the connection.
+
+**Arguments:**
+
+* ``method_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the DBus method to be called.
+
+* ``args``
+
+  / *Condition*: optional / *Type*: tuple / *Default*: None /
+
+  Input arguments to be passed to the method.
+
+**Returns:**
+
+* ``handle_id``
+
+  / *Type*: str /
+
+  The handle to get the result of the call with.
+      """
+      handle = self._method_call_registry.create(method_name)
+
+      def _on_reply(call):
+         handle.reply_callback(call)
+         self._method_latency.record(method_name, handle.get_elapsed_time())
+
+      def _send_call():
+         try:
+            self._call_method(method_name, args, callback=_on_reply)
+         except Exception as ex:
+            handle.set_error(ex)
+
+      self._reactor.call(_send_call)
+      return handle.handle_id
+
+   def wait_for_method_result(self, handle_id, timeout=None):
+      """
+Wait for the result of an asynchronous DBus method call.
+
+**Arguments:**
+
+* ``handle_id``
+
+  / *Condition*: required / *Type*: str /
+
+  The handle returned by ``call_dbus_method_async``.
+
+* ``timeout``
+
+  / *Condition*: optional / *Type*: float / *Default*: None /
+
+  The maximum time (in seconds) to wait. None means to wait without limit.
+
+**Returns:**
+
+  / *Type*: Any /
+
+  Return from called method.
+      """
+      return self._method_call_registry.wait_for_result(handle_id, timeout)
+
+   def wait_for_all_method_results(self, timeout=None):
+      """
+Wait for the results of all pending asynchronous DBus method calls.
+
+**Arguments:**
+
+* ``timeout``
+
+  / *Condition*: optional / *Type*: float / *Default*: None /
+
+  The maximum time (in seconds) to wait for all calls. None means to wait without limit.
+
+**Returns:**
+
+  / *Type*: list /
+
+  Returns from the called methods in issue order.
+      """
+      return self._method_call_registry.wait_for_all_results(timeout)
+
+   def call_dbus_method_batch(self, calls, stop_on_error=False, timeout=None):
+      """
+Call a batch of DBus methods pipelined over the proxy and collect their results in order.
+
+**Arguments:**
+
+* ``calls``
+
+  / *Condition*: required / *Type*: list /
+
+  The calls of the batch. Each call is a (method, args) tuple, where ``args`` is a list of input arguments.
+
+* ``stop_on_error``
+
+  / *Condition*: optional / *Type*: bool / *Default*: False /
+
+  If False, all calls are sent at once and every call is run regardless of errors.
+  If True, each call is sent as soon as the previous one has succeeded and the batch stops at the first error.
+
+* ``timeout``
+
+  / *Condition*: optional / *Type*: float / *Default*: None /
+
+  The maximum time (in seconds) to wait for the batch. None means to wait without limit.
+
+**Returns:**
+
+* ``report``
+
+  / *Type*: list /
+
+  A dictionary per call with its 'method', 'status', 'result', 'error' and 'elapsed' time.
+      """
+      batch = MethodCallBatch(calls, stop_on_error)
+
+      def _send_call(method_name, args, callback_func):
+         self._call_method(method_name, args, callback=callback_func)
+
+      self._reactor.call(batch.start, _send_call)
+      if not batch.wait(timeout):
+         raise AssertionError("The batch of method calls has not completed after '%s'" % timeout)
+      report = batch.get_report()
+      for entry in report:
+         self._method_latency.record(entry["method"], entry["elapsed"])
+      return report
+
+
+class DBusClientAgent:
+   """
+The DBusClientAgent class acts as a mediator between clients and the corresponding DBus services they request.
+It manages client connections, session tokens, and assigns the appropriate DBusClientExecutor for each client session.
+   """
+   def __init__(self, allow_expression_predicates=False):
+      """
+Constructor for DBusClientAgent.
+
+**Arguments:**
+
+* ``allow_expression_predicates``
+
+  / *Condition*: optional / *Type*: bool / *Default*: False /
+
+  If True, the clients may send 'expression' predicates to ``wait_for_signal_matching``.
+  They are evaluated with ``eval``, so any client can execute code on the agent's system.
+
+**Returns:**
+
+(*no returns*)
+      """
+      self._executor_dict = ThreadSafeDict()
+      self._allow_expression_predicates = allow_expression_predicates
+
+   def get_session_token(self):
+      """
+ Generates a unique session token for a client and returns it.
+
+**Returns:**
+
+/ *Type*: str /
+
+  The random and unique token.
+      """
+      return Utils().make_unique_token()
+
+   def initialize_dbus_client(self, session, namespace, object_path,
+                              signal_queue_size=CapturedSignalStore.DEFAULT_CAPACITY,
+                              signal_overflow_policy=CapturedSignalStore.OVERFLOW_DROP_OLDEST,
+                              introspection_cache=True, refresh_introspection=False):
+      """
+Initializes an DBusClientExecutor instance for a specific client.
+
+An DBusClientExecutor is an object responsible for executing requests from clients on corresponding DBus services.
+By initializing a separate DBusClientExecutor for each client, the DBusClientAgent ensures that requests from different
+clients are handled independently.
+
+The client session token is a unique identifier that can be used to associate the DBusClientExecutor with the specific client.
+This allows the DBusClientAgent to route incoming requests to the correct DBusClientExecutor based on the client session token.
+
+**Arguments:**
+
+* ``session``
+
+  / *Condition*: required / *Type*: str /
+
+  The client's session token.
+
+* ``namespace``
+
+  / *Condition*: optional / *Type*: str / *Default*: '' /
+
+  The namespace of the DBus service.
+  This identifies the specific service or group of services.
+  It is used to differentiate between different service instances.
+  The namespace should be a string that uniquely identifies the service.
+
+* ``object_path``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The object path of the DBus service.
+  This identifies the specific object within the service that the action will be performed on.
+  The object path should be a string that follows the DBus object path naming convention.
+  It typically consists of a hierarchical structure separated by slashes (/).
+
+* ``signal_queue_size``
+
+  / *Condition*: optional / *Type*: int / *Default*: 100 /
+
+  The maximum number of captured emissions kept per signal.
+
+* ``signal_overflow_policy``
+
+  / *Condition*: optional / *Type*: str / *Default*: 'drop-oldest' /
+
+  What to do when the queue of a signal is full: 'drop-oldest', 'drop-newest' or 'latest-only'.
+
+* ``introspection_cache``
+
+  / *Condition*: optional / *Type*: bool / *Default*: True /
+
+  If True, the introspection data of the object is taken from the agent's persistent on-disk cache.
+
+* ``refresh_introspection``
+
+  / *Condition*: optional / *Type*: bool / *Default*: False /
+
+  If True, the object is introspected again and the on-disk cache entry is replaced.
+
+**Returns:**
+
+(*no returns*)
+      """
+      if session in self._executor_dict:
+         raise Exception("The session '%s' has alreday initialized." % session)
+
+      self._executor_dict[session] = DBusClientExecutor(namespace, object_path,
+                                                        signal_queue_size, signal_overflow_policy,
+                                                        introspection_cache, refresh_introspection,
+                                                        self._allow_expression_predicates)
+
+   def connect(self, session):
+      """
+Create a proxy object to DBus service.
+
+**Returns:**
+
+(*no returns*)
+      """
+      self._executor_dict[session].connect()
+
+   def disconnect(self, session):
+      """
+Disconnect the DBus proxy from the remote object.
+
+**Returns:**
+
+(*no returns*)
+      """
+      self._executor_dict[session].disconnect()
+
+   def quit(self, session):
+      """
+Quit the DBus client and release its session.
+
+**Returns:**
+
+(*no returns*)
+      """
+      executor = self._executor_dict.pop(session, None)
+      if executor is not None:
+         executor.quit()
+
+   def get_monitoring_signal_payloads(self, session, signal):
+      """
+Get the payloads of a specific signal.
+
+**Arguments:**
+
+* ``session``
+
+  / *Condition*: required / *Type*: str /
+
+  The client's session token.
+
+* ``signal``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the DBus signal to get payloads.
+
+**Returns:**
+
+* ``payloads``
+
+  / *Type*: str /
+
+  The signal's payloads.
+      """
+      return self._executor_dict[session].get_monitoring_signal_payloads(signal)
+
+   def subscribe_signal_events(self, session, signal, match_filter=None):
+      """
+Start logging the emissions of a signal for a remote signal handler of a client's connection.
+
+**Arguments:**
+
+* ``session``
+
+  / *Condition*: required / *Type*: str /
+
+  The client's session token.
+
+* ``signal``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the DBus signal.
+
+* ``match_filter``
+
+  / *Condition*: optional / *Type*: str / dict / *Default*: None /
+
+  DBus match-rule filters applied by the bus daemon, so that only matching emissions are logged.
+
+**Returns:**
+
+  / *Type*: str /
+
+  The channel of the logged emissions.
+      """
+      return self._executor_dict[session].subscribe_signal_events(signal, match_filter)
+
+   def unsubscribe_signal_events(self, session, channel):
+      """
+Remove a subscription made with ``subscribe_signal_events``.
+
+**Arguments:**
+
+* ``session``
+
+  / *Condition*: required / *Type*: str /
+
+  The client's session token.
+
+* ``channel``
+
+  / *Condition*: required / *Type*: str /
+
+  The channel returned by ``subscribe_signal_events``.
+
+**Returns:**
+
+(*no returns*)
+      """
+      self._executor_dict[session].unsubscribe_signal_events(channel)
+
+   @blocking_request
+   def poll_signal_events(self, session, since_sequence=0, timeout=0):
+      """
+Get the logged emissions of a client's connection after a sequence number, waiting for a new emission
+if there is none yet (long poll).
+
+A waiting poll is a blocking request: it waits on a thread of its own and does not count against the workers
+of the agent, so the long polls of many connections with signal handlers do not delay the other requests.
+
+**Arguments:**
+
+* ``session``
+
+  / *Condition*: required / *Type*: str /
+
+  The client's session token.
+
+* ``since_sequence``
+
+  / *Condition*: optional / *Type*: int / *Default*: 0 /
+
+  The sequence number returned by the previous call, 0 for the first call.
+
+* ``timeout``
+
+  / *Condition*: optional / *Type*: float / *Default*: 0 /
+
+  The maximum time (in seconds) to wait for a new emission.
+
+**Returns:**
+
+  / *Type*: dict /
+
+  A dictionary with the keys 'events' (list of [sequence, channel, payloads]), 'sequence', 'missed' and 'closed'.
+      """
+      return self._executor_dict[session].poll_signal_events(since_sequence, timeout)
+
+   def register_monitored_signal(self, session, signal, match_filter=None):
+      """
+Register a DBus signal or signals to be monitored for a specific connection.
+
+**Arguments:**
+
+* ``session``
+
+  / *Condition*: required / *Type*: str /
+
+  The client's session token.
+
+* ``signal``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the DBus signal(s) to register. It can be a single signal name as a string,
+  or multiple signal names joined by ','. For example: "signal1,signal2,signal3".
+
+* ``match_filter``
+
+  / *Condition*: optional / *Type*: str / dict / *Default*: None /
+
+  DBus match-rule filters applied by the bus daemon, so that other emissions never reach the process.
+  Either a dictionary or comma-separated ``key=value`` pairs with the keys 'arg0', 'arg0namespace'
+  and 'path_namespace', e.g. "arg0=org.example.Service".
+
+**Returns:**
+
+(*no returns*)
+      """
+      self._executor_dict[session].register_monitored_signal(signal, match_filter)
+
+   @blocking_request
+   def wait_for_signal(self, session, wait_signal="", timeout=0):
+      """
+Wait for a specific DBus signal to be received within a specified timeout period.
+
+**Arguments:**
+
+* ``session``
+
+  / *Condition*: required / *Type*: str /
+
+  The client's session token.
+
+* ``wait_signal``
+
+  / *Condition*: optional / *Type*: str / *Default*: '' /
+
+  The name of the DBus signal to wait for.
+
+* ``timeout``
+
+  / *Condition*: optional / *Type*: float / *Default*: 0 /
+
+  The maximum time (in seconds) to wait for the signal.
+
+**Returns:**
+
+* ``payloads``
+
+  / *Type*: str /
+
+  The signal payloads.
+      """
+      return self._executor_dict[session].wait_for_signal(wait_signal, timeout)
+
+   @blocking_request
+   def wait_for_signal_matching(self, session, wait_signal="", predicate="", predicate_type=SignalPredicate.TYPE_REGEX, timeout=0):
+      """
+Wait for an emission of a DBus signal whose payloads match a predicate. The predicate is evaluated on the agent.
+
+**Arguments:**
+
+* ``session``
+
+  / *Condition*: required / *Type*: str /
+
+  The client's session token.
+
+* ``wait_signal``
+
+  / *Condition*: optional / *Type*: str / *Default*: '' /
+
+  The name of the DBus signal to wait for.
+
+* ``predicate``
+
+  / *Condition*: required / *Type*: str /
+
+  The predicate the payloads must match.
+
+* ``predicate_type``
+
+  / *Condition*: optional / *Type*: str / *Default*: 'regex' /
+
+  The type of the predicate: 'regex', 'field' or 'expression'.
+  'expression' is rejected unless the agent has been started with ``--allow-expression-predicates``.
+
+* ``timeout``
+
+  / *Condition*: optional / *Type*: float / *Default*: 0 /
+
+  The maximum time (in seconds) to wait for the signal.
+
+**Returns:**
+
+* ``payloads``
+
+  / *Type*: Any /
+
+  The payloads of the matching emission.
+      """
+      if predicate_type == SignalPredicate.TYPE_EXPRESSION and not self._allow_expression_predicates:
+         raise ValueError("Expression predicates are not allowed by the DBus Agent. They are only available "
+                          "in local mode, or on an agent started with '--allow-expression-predicates'.")
+      return self._executor_dict[session].wait_for_signal_matching(wait_signal, predicate, predicate_type, timeout)
+
+   @blocking_request
+   def wait_for_any_signal(self, session, signals="", timeout=0):
+      """
+Wait for any of several DBus signals to be received within a specified timeout period.
+
+**Arguments:**
+
+* ``session``
+
+  / *Condition*: required / *Type*: str /
+
+  The client's session token.
+
+* ``signals``
+
+  / *Condition*: optional / *Type*: str / *Default*: '' /
+
+  The names of the DBus signals to wait for, joined by ','.
+
+* ``timeout``
+
+  / *Condition*: optional / *Type*: float / *Default*: 0 /
+
+  The maximum time (in seconds) to wait for the signals.
+
+**Returns:**
+
+* ``signal_info``
+
+  / *Type*: tuple /
+
+  The name of the received signal and its payloads.
+      """
+      return self._executor_dict[session].wait_for_any_signal(signals, timeout)
+
+   def get_signal_statistics(self, session, signal=None):
+      """
+Get the counters of the received emissions of the subscribed signals of a client's connection.
+
+**Arguments:**
+
+* ``session``
+
+  / *Condition*: required / *Type*: str /
+
+  The client's session token.
+
+* ``signal``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The name of the DBus signal. None means all signals.
+
+**Returns:**
+
+* ``statistics``
+
+  / *Type*: dict /
+
+  The counters of the signal, or a dictionary of the counters of all signals keyed by signal name
+  (filtered subscriptions as 'signal[filter]'):
+
+  - 'count': the number of received emissions.
+  - 'rate': the emissions per second over the sliding window of 'window' seconds.
+  - 'last_received': the time (in seconds) since the last emission.
+  - 'inter_arrival_min', 'inter_arrival_mean', 'inter_arrival_max', 'inter_arrival_p99':
+    the times (in seconds) between consecutive emissions.
+      """
+      return self._executor_dict[session].get_signal_statistics(signal)
+
+   def start_signal_recording(self, session, file_path, signals=None,
+                                     max_bytes=SignalRecorder.DEFAULT_MAX_BYTES,
+                                     backup_count=SignalRecorder.DEFAULT_BACKUP_COUNT,
+                                     queue_size=SignalRecorder.DEFAULT_QUEUE_SIZE,
+                                     flush_interval=SignalRecorder.DEFAULT_FLUSH_INTERVAL):
+      """
+Start recording the signals of a client's connection on the agent host.
+
+**Arguments:**
+
+* ``session``
+
+  / *Condition*: required / *Type*: str /
+
+  The client's session token.
+
+* ``file_path``
+
+  / *Condition*: required / *Type*: str /
+
+  The path of the gzip compressed JSONL recording file, e.g. 'signals.jsonl.gz'.
+
+* ``signals``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The names of the signals to record, joined by ','. None means all signals of the object.
+
+* ``max_bytes``
+
+  / *Condition*: optional / *Type*: int / *Default*: 64 MiB /
+
+  The uncompressed size after which the file is rotated. 0 disables the rotation.
+
+* ``backup_count``
+
+  / *Condition*: optional / *Type*: int / *Default*: 5 /
+
+  The number of rotated files to keep as '<file_path>.1' (newest) to '<file_path>.N' (oldest).
+  0 disables the rotation, like a ``max_bytes`` of 0.
+
+* ``queue_size``
+
+  / *Condition*: optional / *Type*: int / *Default*: 10000 /
+
+  The maximum number of emissions waiting for the writer thread. Further emissions are dropped and counted.
+
+* ``flush_interval``
+
+  / *Condition*: optional / *Type*: float / *Default*: 1.0 /
+
+  The maximum time (in seconds) recorded emissions may stay buffered before they are flushed to the file.
+
+**Returns:**
+
+(*no returns*)
+      """
+      self._executor_dict[session].start_signal_recording(file_path, signals, max_bytes, backup_count,
+                                                          queue_size, flush_interval)
+
+   def stop_signal_recording(self, session):
+      """
+Stop recording the signals of a client's connection.
+
+**Arguments:**
+
+* ``session``
+
+  / *Condition*: required / *Type*: str /
+
+  The client's session token.
+
+**Returns:**
+
+* ``statistics``
+
+  / *Type*: dict /
+
+  The statistics of the recording: 'file_path', 'recorded' (written emissions), 'dropped' (emissions
+  dropped because the writer could not keep up) and 'rotations'.
+      """
+      return self._executor_dict[session].stop_signal_recording()
+
+   def get_method_latency_statistics(self, session, method_name=None):
+      """
+Get the latencies of the DBus method calls executed by the agent for a client's connection.
+
+**Arguments:**
+
+* ``session``
+
+  / *Condition*: required / *Type*: str /
+
+  The client's session token.
+
+* ``method_name``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The name of the DBus method. None means all methods.
+
+**Returns:**
+
+  / *Type*: dict /
+
+  The latency summary of the method, or a dictionary of the summaries of all methods keyed by method name.
+      """
+      return self._executor_dict[session].get_method_latency_statistics(method_name)
+
+   def get_dbus_property(self, session, property_name, interface=None, use_cache=True):
+      """
+Get the value of a DBus property of a client's connection, served from the agent's property cache.
+
+**Arguments:**
+
+* ``session``
+
+  / *Condition*: required / *Type*: str /
+
+  The client's session token.
+
+* ``property_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the DBus property.
+
+* ``interface``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The interface of the property. None means the first interface which has the property.
+
+* ``use_cache``
+
+  / *Condition*: optional / *Type*: bool / *Default*: True /
+
+  If True, the value is served from the property cache. If False, it is read from the service.
+
+**Returns:**
+
+  / *Type*: Any /
+
+  The value of the property.
+      """
+      return self._executor_dict[session].get_dbus_property(property_name, interface, use_cache)
+
+   def set_dbus_property(self, session, property_name, value, interface=None):
+      """
+Set the value of a DBus property of a client's connection.
+
+**Arguments:**
+
+* ``session``
+
+  / *Condition*: required / *Type*: str /
+
+  The client's session token.
+
+* ``property_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the DBus property.
+
+* ``value``
+
+  / *Condition*: required / *Type*: Any /
+
+  The new value.
+
+* ``interface``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The interface of the property. None means the first interface which has the property.
+
+**Returns:**
+
+(*no returns*)
+      """
+      self._executor_dict[session].set_dbus_property(property_name, value, interface)
+
+   def get_all_dbus_properties(self, session, interface=None, use_cache=True):
+      """
+Get the values of all readable DBus properties of a client's connection.
+
+**Arguments:**
+
+* ``session``
+
+  / *Condition*: required / *Type*: str /
+
+  The client's session token.
+
+* ``interface``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The interface of the properties. None means all interfaces of the object.
+
+* ``use_cache``
+
+  / *Condition*: optional / *Type*: bool / *Default*: True /
+
+  If True, the values are served from the property cache. If False, they are read from the service.
+
+**Returns:**
+
+  / *Type*: dict /
+
+  The values of the properties keyed by property name.
+      """
+      return self._executor_dict[session].get_all_dbus_properties(interface, use_cache)
+
+   @blocking_request
+   def wait_for_property_value(self, session, property_name, value, timeout=0, interface=None):
+      """
+Wait on the agent until a DBus property of a client's connection has an expected value.
+
+**Arguments:**
+
+* ``session``
+
+  / *Condition*: required / *Type*: str /
+
+  The client's session token.
+
+* ``property_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the DBus property.
+
+* ``value``
+
+  / *Condition*: required / *Type*: Any /
+
+  The expected value. It also matches a value with the same string representation.
+
+* ``timeout``
+
+  / *Condition*: optional / *Type*: float / *Default*: 0 /
+
+  The maximum time (in seconds) to wait.
+
+* ``interface``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The interface of the property. None means the first interface which has the property.
+
+**Returns:**
+
+  / *Type*: Any /
+
+  The value of the property.
+      """
+      return self._executor_dict[session].wait_for_property_value(property_name, value, timeout, interface)
+
+   def index_managed_objects(self, session, manager_path=None):
+      """
+Load the index of the objects exported by the object manager of the service of a client's connection.
+
+**Arguments:**
+
+* ``session``
+
+  / *Condition*: required / *Type*: str /
+
+  The client's session token.
+
+* ``manager_path``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The object path of the object manager. None means the object path of the connection.
+
+**Returns:**
+
+  / *Type*: int /
+
+  The number of indexed objects.
+      """
+      return self._executor_dict[session].index_managed_objects(manager_path)
+
+   def find_objects_by_interface(self, session, interface):
+      """
+Get the managed objects which implement an interface of a client's connection.
+
+**Arguments:**
+
+* ``session``
+
+  / *Condition*: required / *Type*: str /
+
+  The client's session token.
+
+* ``interface``
+
+  / *Condition*: required / *Type*: str /
+
+  The interface name.
+
+**Returns:**
+
+  / *Type*: list /
+
+  The sorted object paths.
+      """
+      return self._executor_dict[session].find_objects_by_interface(interface)
+
+   def find_objects_by_property(self, session, interface, property_name, value):
+      """
+Get the managed objects whose property has a value of a client's connection.
+
+**Arguments:**
+
+* ``session``
+
+  / *Condition*: required / *Type*: str /
+
+  The client's session token.
+
+* ``interface``
+
+  / *Condition*: required / *Type*: str /
+
+  The interface name.
+
+* ``property_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the property.
+
+* ``value``
+
+  / *Condition*: required / *Type*: Any /
+
+  The value, compared by its string representation.
+
+**Returns:**
+
+  / *Type*: list /
+
+  The sorted object paths.
+      """
+      return self._executor_dict[session].find_objects_by_property(interface, property_name, value)
+
+   def get_managed_object(self, session, object_path):
+      """
+Get the interfaces and properties of a managed object from the index of a client's connection.
+
+**Arguments:**
+
+* ``session``
+
+  / *Condition*: required / *Type*: str /
+
+  The client's session token.
+
+* ``object_path``
+
+  / *Condition*: required / *Type*: str /
+
+  The object path.
+
+**Returns:**
+
+  / *Type*: dict /
+
+  The properties of the object keyed by interface name.
+      """
+      return self._executor_dict[session].get_managed_object(object_path)
+
+   def call_object_method(self, session, object_path, method_name, *args):
+      """
+Call a DBus method of another object of the service, e.g. of a managed object of a client's connection.
+
+**Arguments:**
+
+* ``session``
+
+  / *Condition*: required / *Type*: str /
+
+  The client's session token.
+
+* ``object_path``
+
+  / *Condition*: required / *Type*: str /
+
+  The object path.
+
+* ``method_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the DBus method to be called.
+
+* ``args``
+
+  / *Condition*: optional / *Type*: tuple / *Default*: None /
+
+  Input arguments to be passed to the method.
+
+**Returns:**
+
+  / *Type*: Any /
+
+  The return value of the method.
+      """
+      return self._executor_dict[session].call_object_method(object_path, method_name, *args)
+
+   def call_dbus_method(self, session, method_name, *args):
+      """
+Call a DBus method with the specified method name and input arguments.
+
+**Arguments:**
+
+* ``session``
+
+  / *Condition*: required / *Type*: str /
+
+  The client's session token.
+
+* ``method_name``
+
+  / *Condition*: optional / *Type*: str / *Default*: '' /
 
   The name of the DBus method to be called.
 
@@ -552,6 +2476,297 @@ Call a DBus method with the specified method name and input arguments.
       """
       return self._executor_dict[session].call_dbus_method(method_name, *args)
 
+   def call_dbus_method_async(self, session, method_name, *args):
+      """
+Call a DBus method asynchronously and return a handle to its result immediately.
+
+**Arguments:**
+
+* ``session``
+
+  / *Condition*: required / *Type*: str /
+
+  The client's session token.
+
+* ``method_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the DBus method to be called.
+
+* ``args``
+
+  / *Condition*: optional / *Type*: tuple / *Default*: None /
+
+  Input arguments to be passed to the method.
+
+**Returns:**
+
+* ``handle_id``
+
+  / *Type*: str /
+
+  The handle to get the result of the call with.
+      """
+      return self._executor_dict[session].call_dbus_method_async(method_name, *args)
+
+   @blocking_request
+   def wait_for_method_result(self, session, handle_id, timeout=None):
+      """
+Wait for the result of an asynchronous DBus method call.
+
+**Arguments:**
+
+* ``session``
+
+  / *Condition*: required / *Type*: str /
+
+  The client's session token.
+
+* ``handle_id``
+
+  / *Condition*: required / *Type*: str /
+
+  The handle returned by ``call_dbus_method_async``.
+
+* ``timeout``
+
+  / *Condition*: optional / *Type*: float / *Default*: None /
+
+  The maximum time (in seconds) to wait. None means to wait without limit.
+
+**Returns:**
+
+  / *Type*: Any /
+
+  Return from called method.
+      """
+      return self._executor_dict[session].wait_for_method_result(handle_id, timeout)
+
+   @blocking_request
+   def wait_for_all_method_results(self, session, timeout=None):
+      """
+Wait for the results of all pending asynchronous DBus method calls of a session.
+
+**Arguments:**
+
+* ``session``
+
+  / *Condition*: required / *Type*: str /
+
+  The client's session token.
+
+* ``timeout``
+
+  / *Condition*: optional / *Type*: float / *Default*: None /
+
+  The maximum time (in seconds) to wait for all calls. None means to wait without limit.
+
+**Returns:**
+
+  / *Type*: list /
+
+  Returns from the called methods in issue order.
+      """
+      return self._executor_dict[session].wait_for_all_method_results(timeout)
+
+   @blocking_request
+   def call_dbus_method_batch(self, session, calls, stop_on_error=False, timeout=None):
+      """
+Call a batch of DBus methods pipelined over the session's proxy and collect their results in order.
+
+**Arguments:**
+
+* ``session``
+
+  / *Condition*: required / *Type*: str /
+
+  The client's session token.
+
+* ``calls``
+
+  / *Condition*: required / *Type*: list /
+
+  The calls of the batch. Each call is a (method, args) pair.
+
+* ``stop_on_error``
+
+  / *Condition*: optional / *Type*: bool / *Default*: False /
+
+  If True, the batch stops at the first error.
+
+* ``timeout``
+
+  / *Condition*: optional / *Type*: float / *Default*: None /
+
+  The maximum time (in seconds) to wait for the batch. None means to wait without limit.
+
+**Returns:**
+
+* ``report``
+
+  / *Type*: list /
+
+  A dictionary per call with its 'method', 'status', 'result', 'error' and 'elapsed' time.
+      """
+      return self._executor_dict[session].call_dbus_method_batch(calls, stop_on_error, timeout)
+
+
+class KeepAliveXMLRPCRequestHandler(xmlrpc.server.SimpleXMLRPCRequestHandler):
+   """
+An XML-RPC request handler which speaks HTTP/1.1, so that clients keep their connection open between requests.
+
+It handles one request per call. Between two requests the connection is watched by the server, so that an
+idle connection does not occupy a worker thread.
+   """
+   protocol_version = "HTTP/1.1"
+
+   def handle(self):
+      """
+Handle one request of the connection.
+      """
+      self.close_connection = True
+      self.handle_one_request()
+
+
+class ThreadPoolXMLRPCServer(xmlrpc.server.SimpleXMLRPCServer):
+   """
+An XML-RPC server which handles the requests in a pool of worker threads.
+
+At most ``workers`` requests are executed at once. Requests which arrive while all workers are busy wait
+for a free worker. Blocking requests (marked with ``blocking_request``, e.g. ``wait_for_signal`` or the long
+polls of ``poll_signal_events`` which push the emissions to remote signal handlers) do not count against
+this limit: while they wait, another worker takes over, so that waiting sessions never delay the requests
+of the other sessions. See ``WorkerPool``.
+
+Connections are kept alive (HTTP/1.1): after a request, the connection is parked in a selector and handed
+to a worker again when the next request arrives. Connections which stay idle for ``KEEP_ALIVE_TIMEOUT``
+seconds are closed.
+   """
+   DEFAULT_WORKERS = 16
+   KEEP_ALIVE_TIMEOUT = 30
+   request_queue_size = 64
+   allow_reuse_address = True
+
+   def __init__(self, addr, workers=DEFAULT_WORKERS, **kwargs):
+      """
+Constructor for ThreadPoolXMLRPCServer class.
+
+**Arguments:**
+
+* ``addr``
+
+  / *Condition*: required / *Type*: tuple /
+
+  The (host, port) address to listen on.
+
+* ``workers``
+
+  / *Condition*: optional / *Type*: int / *Default*: 16 /
+
+  The maximum number of requests handled at once, not counting blocking requests.
+
+* ``kwargs``
+
+  / *Condition*: optional / *Type*: dict /
+
+  The keyword arguments of ``SimpleXMLRPCServer``.
+
+**Returns:**
+
+(*no returns*)
+      """
+      kwargs.setdefault("requestHandler", KeepAliveXMLRPCRequestHandler)
+      super().__init__(addr, **kwargs)
+      self._worker_pool = WorkerPool(workers, "dbus-agent-worker")
+      # On Linux the selector is an epoll object, whose select() also reports connections parked during the call.
+      self._idle_selector = selectors.DefaultSelector()
+      self._idle_lock = threading.Lock()
+      self._closed = False
+      threading.Thread(target=self._watch_idle_connections, name="dbus-agent-keep-alive", daemon=True).start()
+
+   def process_request(self, request, client_address):
+      """
+Hand over an accepted request to the worker pool.
+      """
+      self._worker_pool.submit(self._process_request_thread, request, client_address)
+
+   def _dispatch(self, method, params):
+      """
+Dispatch a request. Blocking requests are executed with ``WorkerPool.blocking``.
+      """
+      try:
+         func = self.funcs.get(method) or xmlrpc.server.resolve_dotted_attribute(self.instance, method,
+                                                                                  self.allow_dotted_names)
+      except AttributeError:
+         func = None
+      if func is not None and is_blocking_request(func):
+         with self._worker_pool.blocking():
+            return super()._dispatch(method, params)
+      return super()._dispatch(method, params)
+
+   def finish_request(self, request, client_address):
+      """
+Handle one request of a connection.
+
+**Returns:**
+
+  / *Type*: bool /
+
+  True if the connection is kept alive.
+      """
+      handler = self.RequestHandlerClass(request, client_address, self)
+      return not getattr(handler, "close_connection", True)
+
+   def _process_request_thread(self, request, client_address):
+      keep_alive = False
+      try:
+         keep_alive = self.finish_request(request, client_address)
+      except Exception:
+         self.handle_error(request, client_address)
+      finally:
+         if not (keep_alive and self._park_connection(request, client_address)):
+            self.shutdown_request(request)
+
+   def _park_connection(self, request, client_address):
+      with self._idle_lock:
+         if self._closed:
+            return False
+         self._idle_selector.register(request, selectors.EVENT_READ, (client_address, time.monotonic()))
+         return True
+
+   def _watch_idle_connections(self):
+      while True:
+         try:
+            events = self._idle_selector.select(timeout=1.0)
+         except (OSError, ValueError):
+            break
+         with self._idle_lock:
+            if self._closed:
+               break
+            for key, _mask in events:
+               self._idle_selector.unregister(key.fileobj)
+               self._worker_pool.submit(self._process_request_thread, key.fileobj, key.data[0])
+            deadline = time.monotonic() - ThreadPoolXMLRPCServer.KEEP_ALIVE_TIMEOUT
+            expired = [key.fileobj for key in self._idle_selector.get_map().values() if key.data[1] < deadline]
+            for request in expired:
+               self._idle_selector.unregister(request)
+         for request in expired:
+            self.shutdown_request(request)
+
+   def server_close(self):
+      """
+Stop listening, close the idle connections and let the worker threads finish the pending requests.
+      """
+      super().server_close()
+      with self._idle_lock:
+         self._closed = True
+         idle_requests = [key.fileobj for key in self._idle_selector.get_map().values()]
+         self._idle_selector.close()
+      for request in idle_requests:
+         self.shutdown_request(request)
+      self._worker_pool.shutdown()
+
 
 def run_agent():
    """
@@ -572,6 +2787,20 @@ Description:
       --host (str, optional): The host where the agent is running. Default is '0.0.0.0'.
 
       --port (int, optional): The port where the agent is listening. Default is 2507.
+
+      --workers (int, optional): The number of requests which are handled at once. Default is 16.
+      Waiting requests (e.g. `Wait For Signal` or the long polls of remote signal handlers) do not count against
+      this limit, up to 1024 waiting requests per transport.
+
+      --framed-port (int, optional): The port of the framed transport, e.g. the port after --port. Default is 0,
+      which disables it.
+
+      --framed-socket (str, optional): The path of a Unix socket for the framed transport.
+
+      --allow-expression-predicates (flag, optional): Accept 'expression' predicates of `Wait For Signal Matching`.
+      They are Python code evaluated on the agent, so only use it on a trusted network. Disabled by default.
+
+   The framed transport requires the optional 'msgpack' package. Without it, only XML-RPC is served.
    """
    # Create the argument parser
    parser = argparse.ArgumentParser(description='DBus Agent Configuration')
@@ -581,6 +2810,20 @@ Description:
    # Add the port option
    parser.add_argument('--port', type=int, default=2507, help='The port where the agent is listening')
 
+   # Add the workers option
+   parser.add_argument('--workers', type=int, default=ThreadPoolXMLRPCServer.DEFAULT_WORKERS,
+                       help='The number of requests which are handled at once. Waiting requests (Wait For Signal, '
+                            'signal handlers) do not count, up to %s of them' % WorkerPool.DEFAULT_MAX_BLOCKING)
+
+   # Add the expression predicates option
+   parser.add_argument('--allow-expression-predicates', action='store_true',
+                       help="Accept 'expression' predicates, which execute Python code sent by the clients")
+
+   # Add the framed transport options
+   parser.add_argument('--framed-port', type=int, default=0,
+                       help='The port of the framed transport (default: 0, which disables it)')
+   parser.add_argument('--framed-socket', default=None, help='The path of a Unix socket for the framed transport')
+
    # Parse the command-line arguments
    args = parser.parse_args()
 
@@ -589,8 +2832,25 @@ Description:
    port = args.port
 
    print("Starting DBus Agent Client on port %s..." % port)
-   server = xmlrpc.server.SimpleXMLRPCServer((host, port), allow_none=True)
-   server.register_instance(DBusClientAgent())
+   server = ThreadPoolXMLRPCServer((host, port), args.workers, allow_none=True, use_builtin_types=True)
+   agent = DBusClientAgent(args.allow_expression_predicates)
+   server.register_instance(agent)
+   server.register_multicall_functions()
+
+   framed_addresses = [(host, args.framed_port)] if args.framed_port else []
+   if args.framed_socket:
+      framed_addresses.append(args.framed_socket)
+   if framed_addresses and not framed_rpc.is_available():
+      print("The framed transport is disabled: the 'msgpack' package is not installed.")
+   elif framed_addresses:
+      framed_server = framed_rpc.FramedRPCServer(agent, args.workers)
+      for address in framed_addresses:
+         try:
+            framed_server.listen(address)
+            print("Serving the framed transport on %s..." % (address if isinstance(address, str) else
+                                                             "port %s" % address[1]))
+         except OSError as ex:
+            print("Unable to serve the framed transport on '%s'. Reason: %s" % (address, ex))
    server.serve_forever()
 
 if __name__ == '__main__':
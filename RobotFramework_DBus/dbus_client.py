@@ -27,29 +27,63 @@
 #
 # *******************************************************************************
 
-from threading import Timer
 from RobotFramework_DBus.common.thread_safe_dict import ThreadSafeDict
 from RobotFramework_DBus.common.register_keyword import RegisterKeyword
+from RobotFramework_DBus.common.signal_buffer import CapturedSignalStore, pack_payloads
+from RobotFramework_DBus.common.signal_predicate import SignalPredicate
+from RobotFramework_DBus.common.signal_recorder import SignalRecorder
+from RobotFramework_DBus.common.signal_statistics import SignalStatistics
+from RobotFramework_DBus.common.async_call import MethodCallRegistry, MethodCallBatch
+from RobotFramework_DBus.common.method_latency import MethodLatencyRecorder
 from robot.api import logger
 from robot.libraries.BuiltIn import BuiltIn
 from robot.running import Keyword
 import platform
 import threading
+import time
 if platform.system().lower().startswith("linux"):
    from dasbus.connection import SessionMessageBus
    from dasbus.identifier import DBusServiceIdentifier, DBusObjectIdentifier
-   from dasbus.client.proxy import disconnect_proxy
-   from dasbus.loop import EventLoop
+   from dasbus.client.proxy import disconnect_proxy, get_object_handler
+   from dasbus.specification import DBusSpecification
+   from RobotFramework_DBus.common.dbus_reactor import DBusReactor
+   from RobotFramework_DBus.common.proxy_cache import ProxyCache, SignalSubscription
+   from RobotFramework_DBus.common.introspection_cache import IntrospectionCache
+   from RobotFramework_DBus.common.match_rule import SignalMatchFilter, FilteredSignal
+   from RobotFramework_DBus.common.property_cache import PropertyCache
+   from RobotFramework_DBus.common.object_index import ObjectIndex
+   from RobotFramework_DBus.common.argument_converter import ArgumentConverter, call_with_parameters
 
-   # Define the message bus.
-   SESSION_BUS = SessionMessageBus()
+_session_bus = None
+_session_bus_lock = threading.Lock()
+
+
+def get_session_bus():
+   """
+Get the session message bus shared by all local connections. It is created on first use,
+so that importing the library does not require a session bus.
+
+**Returns:**
+
+  / *Type*: dasbus.connection.SessionMessageBus /
+
+  The session message bus.
+   """
+   global _session_bus
+   with _session_bus_lock:
+      if _session_bus is None:
+         _session_bus = SessionMessageBus()
+      return _session_bus
 
 
 class DBusClient:
    """
 A client class for interacting with a specific DBus service.
    """
-   def __init__(self, namespace, object_path):
+   def __init__(self, namespace, object_path,
+                signal_queue_size=CapturedSignalStore.DEFAULT_CAPACITY,
+                signal_overflow_policy=CapturedSignalStore.OVERFLOW_DROP_OLDEST,
+                introspection_cache=True, refresh_introspection=False):
       """
 Constructor for DBusClient class.
 
@@ -73,6 +107,32 @@ Constructor for DBusClient class.
   The object path should be a string that follows the DBus object path naming convention.
   It typically consists of a hierarchical structure separated by slashes (/).
 
+* ``signal_queue_size``
+
+  / *Condition*: optional / *Type*: int / *Default*: 100 /
+
+  The maximum number of captured emissions kept per signal.
+
+* ``signal_overflow_policy``
+
+  / *Condition*: optional / *Type*: str / *Default*: 'drop-oldest' /
+
+  What to do when the queue of a signal is full: 'drop-oldest', 'drop-newest' or 'latest-only'.
+
+* ``introspection_cache``
+
+  / *Condition*: optional / *Type*: bool / *Default*: True /
+
+  If True, the introspection data of the object is taken from the persistent on-disk cache
+  instead of introspecting the object on every connect. Validating the entry still costs one call
+  to the bus daemon.
+
+* ``refresh_introspection``
+
+  / *Condition*: optional / *Type*: bool / *Default*: False /
+
+  If True, the object is introspected again and the on-disk cache entry is replaced.
+
 **Returns:**
 
 (*no returns*)
@@ -81,16 +141,29 @@ Constructor for DBusClient class.
       self.proxy = None
       self.namespace = namespace
       self.object_path = object_path
-      self._captured_signal_dict = ThreadSafeDict()
+      self._captured_signal_store = CapturedSignalStore(signal_queue_size, signal_overflow_policy)
+      self._monitored_signal_dict = ThreadSafeDict()
+      self._signal_subscription_dict = ThreadSafeDict()
+      self._proxy_key = None
+      self._method_call_registry = MethodCallRegistry()
+      self._introspection_cache = IntrospectionCache() if introspection_cache else None
+      self._refresh_introspection = refresh_introspection
+      self._signal_recorder = None
+      self._signal_statistics = SignalStatistics()
+      self._method_latency = MethodLatencyRecorder()
+      self._property_cache = None
+      self._property_cache_lock = threading.Lock()
+      self._object_index = None
+      self._object_proxy_dict = {}
+      self._object_index_lock = threading.Lock()
+      self._method_converter_dict = {}
       self._singal_handler_dict = ThreadSafeDict()
       try:
          self.dbus = DBusServiceIdentifier(
                             namespace=namespace_tuple,
-                            message_bus=SESSION_BUS
+                            message_bus=get_session_bus()
                         )
-         self.main_event_loop = EventLoop()
-         self.event_loop_thread = threading.Thread(target=self._start_event_loop, args=(self.main_event_loop,), daemon=True)
-         self.event_loop_thread.start()
+         self._reactor = DBusReactor.get_instance()
       except Exception as ex:
          raise Exception("Unable to connect to '%s' DBus. Reason: '%s'" % (namespace, str(ex)) )
 
@@ -98,23 +171,69 @@ Constructor for DBusClient class.
       """
 Create a proxy object to DBus object.
 
+The proxy is shared with all other connections to the same object, so that it is introspected only once.
+With ``refresh_introspection`` a new proxy is created, which replaces the shared one for later connections.
+
 **Returns:**
 
 (*no returns*)
       """
-      self.proxy = self.dbus.get_proxy(self.object_path)
+      self._proxy_key, self.proxy = ProxyCache.get_instance().acquire(
+                                       self.dbus.message_bus,
+                                       self.dbus.service_name,
+                                       self.object_path,
+                                       None,
+                                       self._create_proxy,
+                                       self._refresh_introspection)
+
+   def _create_proxy(self, object_path=None):
+      """
+Create a new proxy object to DBus object, using the introspection cache if it is enabled.
+
+**Arguments:**
+
+* ``object_path``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The object path. None means the object path of the connection.
+
+**Returns:**
+
+  / *Type*: dasbus.client.proxy.ObjectProxy /
+
+  The new proxy.
+      """
+      object_path = object_path or self.object_path
+      if self._introspection_cache is not None:
+         return self._introspection_cache.get_proxy(self.dbus, object_path, self._refresh_introspection)
+      return self.dbus.get_proxy(object_path)
 
    def disconnect(self):
       """
 Disconnect the DBus proxy from the remote object.
 
+The shared proxy is only disconnected when no other connection is using it anymore.
+
 **Returns:**
 
 (*no returns*)
       """
-      disconnect_proxy(self.proxy)
-      if self.event_loop_thread.is_alive():
-         self.main_event_loop.quit()
+      self._reactor.call(self._unsubscribe_all)
+      if self._property_cache is not None:
+         self._reactor.call(self._property_cache.detach)
+         self._property_cache = None
+      if self._object_index is not None:
+         self._reactor.call(self._object_index.detach)
+         self._object_index = None
+      self._release_object_proxies()
+      if self._proxy_key is not None:
+         ProxyCache.get_instance().release(self._proxy_key,
+                                           lambda proxy: self._reactor.call(disconnect_proxy, proxy))
+         self._proxy_key = None
+      # Stopped last, so that an error of the recording is raised after the connection has been cleaned up.
+      if self._signal_recorder is not None:
+         self.stop_signal_recording()
 
    def quit(self):
       """
@@ -126,7 +245,7 @@ Quit the DBus client.
       """
       self.disconnect()
 
-   def set_signal_received_handler(self, signal, handler):
+   def set_signal_received_handler(self, signal, handler, priority=0, match_filter=None):
       """
 Set a signal received handler for a specific signal.
 
@@ -145,20 +264,32 @@ Set a signal received handler for a specific signal.
   The keyword to handle the received signal.
   The handler should accept the necessary parameters based on the signal being handled.
 
+* ``priority``
+
+  / *Condition*: optional / *Type*: int / *Default*: 0 /
+
+  The dispatch priority of the handler. When handler calls are queued up, the ones with a higher priority are run first.
+
+* ``match_filter``
+
+  / *Condition*: optional / *Type*: str / dict / *Default*: None /
+
+  DBus match-rule filters applied by the bus daemon, so that only matching emissions reach the handler.
+  Either a dictionary or comma-separated ``key=value`` pairs with the keys 'arg0', 'arg0namespace'
+  and 'path_namespace', e.g. "arg0=org.example.Service".
+
 **Returns:**
 
 (*no returns*)
       """
-      rkw = RegisterKeyword(handler)
-      sgn = getattr(self.proxy, signal)
-      sgn.connect(rkw.callback_func)
+      match_filter = SignalMatchFilter.parse(match_filter)
+      rkw = RegisterKeyword(handler, priority)
+      subscription = self._reactor.call(self._subscribe_signal, signal, match_filter)
+      subscription.add_listener(rkw.dispatch_func)
       if signal not in self._singal_handler_dict:
-         self._singal_handler_dict[signal] = [(sgn, rkw)]
+         self._singal_handler_dict[signal] = [(subscription, rkw, match_filter)]
       else:
-         self._singal_handler_dict[signal].append((sgn, rkw))
-
-   def _start_event_loop(self, loop):
-      loop.run()
+         self._singal_handler_dict[signal].append((subscription, rkw, match_filter))
 
    def unset_signal_received_handler(self, signal, handle_keyword=None):
       """
@@ -185,11 +316,12 @@ Unset a signal received handler for a specific signal.
       if signal in self._singal_handler_dict:
          for hdl in self._singal_handler_dict[signal]:
             if handle_keyword is None or hdl[1].get_kw_name() == handle_keyword:
-               hdl[0].disconnect(hdl[1].callback_func)
+               hdl[0].remove_listener(hdl[1].dispatch_func)
+               self._reactor.call(self._release_subscription, signal, hdl[2])
 
-   def add_signal_to_captured_dict(self,  signal, loop=None, payloads=""):
+   def add_signal_to_captured_dict(self, signal, payloads=""):
       """
-Add a signal and its payloads to the captured dictionary when the signal be emited.
+Add a signal and its payloads to the captured signal queue when the signal be emited.
 
 **Arguments:**
 
@@ -199,12 +331,6 @@ Add a signal and its payloads to the captured dictionary when the signal be emit
 
   The name of the DBus signal(s) which has been raised.
 
-* ``loop``
-
-  / *Condition*: optional / *Type*: EventLoop / *Default*: None /
-
-  The Event loop which is running to wait for the raised signal.
-
 * ``payloads``
 
   / *Condition*: optional / *Type*: Any / *Default*: "" /
@@ -215,17 +341,169 @@ Add a signal and its payloads to the captured dictionary when the signal be emit
 
 (*no returns*)
       """
-      self._captured_signal_dict[signal] = payloads
-      if loop is not None:
-         try:
-            loop.quit()
-         except Exception as _ex:
-            pass
+      self._captured_signal_store.push(signal, payloads)
+
+   def _subscribe_signal(self, signal, match_filter=None):
+      """
+Get the connection's subscription to a signal of the proxy, create it if needed.
+Must be called on the reactor thread.
+
+Unfiltered subscriptions use the signal of the shared proxy. Filtered subscriptions have their own
+match rule on the bus and are shared by all consumers of the connection with an equal filter.
+
+**Arguments:**
+
+* ``signal``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the DBus signal.
+
+* ``match_filter``
+
+  / *Condition*: optional / *Type*: SignalMatchFilter / *Default*: None /
+
+  The match-rule filters of the subscription.
+
+**Returns:**
+
+  / *Type*: SignalSubscription /
 
-   def register_monitored_signal(self, signal):
+  The connection's subscription to the signal.
+      """
+      subscription = self._signal_subscription_dict.get((signal, match_filter))
+      if subscription is None:
+         if match_filter is None:
+            sgn = getattr(self.proxy, signal)
+         else:
+            sgn = FilteredSignal(self.dbus.message_bus,
+                                 self.dbus.service_name,
+                                 self.object_path,
+                                 self._get_signal_interface(signal),
+                                 signal,
+                                 match_filter)
+         subscription = SignalSubscription(signal, sgn)
+         statistics_name = signal if match_filter is None else "%s[%s]" % (signal, match_filter)
+         subscription.add_listener(lambda *args: self._signal_statistics.record(statistics_name))
+         self._signal_subscription_dict[(signal, match_filter)] = subscription
+      return subscription
+
+   def _get_signal_interface(self, signal):
+      """
+Get the interface of a signal of the proxy.
+
+**Arguments:**
+
+* ``signal``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the DBus signal.
+
+**Returns:**
+
+  / *Type*: str /
+
+  The interface name.
+      """
+      for member in get_object_handler(self.proxy).specification.members:
+         if isinstance(member, DBusSpecification.Signal) and member.name == signal:
+            return member.interface_name
+      raise AttributeError("DBus object has no signal '%s'." % signal)
+
+   def _release_subscription(self, signal, match_filter):
+      """
+Disconnect a filtered subscription which has no listeners anymore, so that its match rule is removed from the bus.
+Must be called on the reactor thread.
+
+**Arguments:**
+
+* ``signal``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the DBus signal.
+
+* ``match_filter``
+
+  / *Condition*: required / *Type*: SignalMatchFilter /
+
+  The match-rule filters of the subscription.
+
+**Returns:**
+
+(*no returns*)
+      """
+      subscription = self._signal_subscription_dict.get((signal, match_filter))
+      if match_filter is not None and subscription is not None and not subscription.has_listeners():
+         subscription.disconnect()
+         del self._signal_subscription_dict[(signal, match_filter)]
+
+   def _unsubscribe_all(self):
+      """
+Disconnect all signal subscriptions of the connection. Must be called on the reactor thread.
+
+**Returns:**
+
+(*no returns*)
+      """
+      for subscription in self._signal_subscription_dict.values():
+         subscription.disconnect()
+      self._signal_subscription_dict.clear()
+      self._monitored_signal_dict.clear()
+
+   def _monitor_signal(self, signal, match_filter=None, replace_filter=False):
+      """
+Start capturing the emissions of a signal into its queue if it is not monitored yet.
+Must be called on the reactor thread.
+
+**Arguments:**
+
+* ``signal``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the DBus signal to monitor.
+
+* ``match_filter``
+
+  / *Condition*: optional / *Type*: SignalMatchFilter / *Default*: None /
+
+  The match-rule filters of the captured emissions.
+
+* ``replace_filter``
+
+  / *Condition*: optional / *Type*: bool / *Default*: False /
+
+  If True and the signal is already monitored with another filter, the monitoring is moved to the given filter.
+  Otherwise an already monitored signal keeps its filter.
+
+**Returns:**
+
+  / *Type*: SignalSubscription /
+
+  The connection's subscription to the signal.
+      """
+      monitored = self._monitored_signal_dict.get(signal)
+      if monitored is not None:
+         subscription, callback_func, monitored_filter = monitored
+         if not replace_filter or monitored_filter == match_filter:
+            return subscription
+         subscription.remove_listener(callback_func)
+         self._release_subscription(signal, monitored_filter)
+
+      subscription = self._subscribe_signal(signal, match_filter)
+      callback_func = lambda *args: self.add_signal_to_captured_dict(signal, pack_payloads(args))
+      subscription.add_listener(callback_func)
+      self._monitored_signal_dict[signal] = (subscription, callback_func, match_filter)
+      return subscription
+
+   def register_monitored_signal(self, signal, match_filter=None):
       """
 Register a DBus signal or signals to be monitored for a specific connection.
 
+Every emission of a monitored signal is kept in a bounded queue until it is consumed by ``wait_for_signal``.
+
 **Arguments:**
 
 * ``signal``
@@ -235,54 +513,71 @@ Register a DBus signal or signals to be monitored for a specific connection.
   The name of the DBus signal(s) to register. It can be a single signal name as a string,
   or multiple signal names joined by ','. For example: "signal1,signal2,signal3".
 
+* ``match_filter``
+
+  / *Condition*: optional / *Type*: str / dict / *Default*: None /
+
+  DBus match-rule filters applied by the bus daemon, so that other emissions never reach the process.
+  Either a dictionary or comma-separated ``key=value`` pairs with the keys 'arg0', 'arg0namespace'
+  and 'path_namespace', e.g. "arg0=org.example.Service".
+
 **Returns:**
 
 (*no returns*)
       """
+      match_filter = SignalMatchFilter.parse(match_filter)
       if isinstance(signal, str):
-         sgn_list = signal.split(",")
-         for s in sgn_list:
-            sgn = getattr(self.proxy, s)
-            sgn.connect(lambda x: self.add_signal_to_captured_dict(s, None, x))
-      elif isinstance(signal, list):
-         for s in signal:
-            sgn = getattr(self.proxy, s)
-            sgn.connect(lambda x: self.add_signal_to_captured_dict(s, None, x))
+         signal = signal.split(",")
+      for s in signal:
+         self._reactor.call(self._monitor_signal, s.strip(), match_filter, match_filter is not None)
 
-   def _run_event_loop_with_timeout(self, loop, timeout):
+   def _wait_for_signal_event(self, signals, timeout, predicate=None):
       """
-Run the Event Loop with timeout.
+Monitor the given signals and consume the oldest emission among them, waiting for one if needed.
 
 **Arguments:**
 
-* ``loop``
+* ``signals``
 
-  / *Condition*: required / *Type*: EventLoop /
+  / *Condition*: required / *Type*: list /
 
-  The Event loop to be run.
+  The names of the DBus signals to wait for.
 
 * ``timeout``
 
-  / *Condition*: required / *Type*: int /
+  / *Condition*: required / *Type*: float /
+
+  The maximum time (in seconds) to wait.
 
-  The timeout for running Event loop.
+* ``predicate``
+
+  / *Condition*: optional / *Type*: SignalPredicate / *Default*: None /
+
+  The predicate the payloads of the consumed emission must match.
 
 **Returns:**
 
-(*no returns*)
+* ``event``
+
+  / *Type*: SignalEvent /
+
+  The consumed event or None if the timeout expired.
       """
-      try:
-         t = Timer(timeout, loop.quit)
-         t.start()
-      except Exception as _ex:
-         pass
+      for signal in signals:
+         try:
+            self._reactor.call(self._monitor_signal, signal)
+         except Exception as _ex:
+            raise Exception("DBus service '%s' not have the signal '%s'" % (self.namespace, signal))
 
-      loop.run()
+      return self._captured_signal_store.wait(signals, float(timeout), predicate)
 
    def wait_for_signal(self, wait_signal="", timeout=0):
       """
 Wait for a specific DBus signal to be received within a specified timeout period.
 
+The oldest queued emission of the signal is consumed first, so that no emission is lost
+between two calls.
+
 **Arguments:**
 
 * ``wait_signal``
@@ -293,9 +588,9 @@ Wait for a specific DBus signal to be received within a specified timeout period
 
 * ``timeout``
 
-  / *Condition*: optional / *Type*: int / *Default*: 0 /
+  / *Condition*: optional / *Type*: float / *Default*: 0 /
 
-  The maximum time (in seconds) to wait for the signal.
+  The maximum time (in seconds) to wait for the signal. Fractions of a second are allowed.
 
 **Returns:**
 
@@ -305,83 +600,925 @@ Wait for a specific DBus signal to be received within a specified timeout period
 
   The signal payloads.
       """
-      timeout = int(timeout)
-      loop = EventLoop()
-      try:
-         sgn = getattr(self.proxy, wait_signal)
-      except Exception as _ex:
-         raise Exception("DBus service '%s' not have the signal '%s'" % (self.namespace, wait_signal))
-
-      callback_func = lambda x: self.add_signal_to_captured_dict(wait_signal, loop, x)
-      sgn.connect(callback_func)
-      if wait_signal in self._captured_signal_dict:
-         sgn.disconnect(callback_func)
-         return self._captured_signal_dict[wait_signal]
-
-      self._run_event_loop_with_timeout(loop, timeout)
-      if wait_signal in self._captured_signal_dict:
-         return self._captured_signal_dict[wait_signal]
+      event = self._wait_for_signal_event([wait_signal], timeout)
+      if event is not None:
+         return event.payloads
       else:
          raise AssertionError("Unable to receive the '%s' signal after '%s'" % (wait_signal, timeout))
 
-   def call_dbus_method(self, method_name, *args):
+   def wait_for_signal_matching(self, wait_signal="", predicate="", predicate_type=SignalPredicate.TYPE_REGEX, timeout=0):
       """
-Call a DBus method with the specified method name and input arguments.
+Wait for an emission of a DBus signal whose payloads match a predicate.
+
+Queued emissions are checked first. New emissions are checked in the signal callback on the event loop thread,
+and only a matching emission wakes the caller. Non-matching emissions stay queued.
 
 **Arguments:**
 
-* ``method_name``
+* ``wait_signal``
 
   / *Condition*: optional / *Type*: str / *Default*: '' /
 
-  The name of the DBus method to be called.
+  The name of the DBus signal to wait for.
 
-* ``args``
+* ``predicate``
 
-  / *Condition*: optional / *Type*: tuple / *Default*: None /
+  / *Condition*: required / *Type*: str /
 
-  Input arguments to be passed to the method.
+  The predicate the payloads must match, depending on ``predicate_type``:
+
+  - 'regex': a regular expression searched in the string representation of the payloads, e.g. "state=READY".
+  - 'field': an equality ``field.path=value`` on a field of the payloads. The path consists of dictionary keys
+    and list indexes separated by '.', e.g. "0.state=READY".
+  - 'expression': a Python expression evaluated with the payloads bound to ``payloads``, e.g. "payloads[1] > 3".
+
+* ``predicate_type``
+
+  / *Condition*: optional / *Type*: str / *Default*: 'regex' /
+
+  The type of the predicate: 'regex', 'field' or 'expression'.
+
+* ``timeout``
+
+  / *Condition*: optional / *Type*: float / *Default*: 0 /
+
+  The maximum time (in seconds) to wait for the signal. Fractions of a second are allowed.
 
 **Returns:**
 
+* ``payloads``
+
   / *Type*: Any /
 
-  Return from called method.
+  The payloads of the matching emission.
       """
-      try:
-         method = getattr(self.proxy, method_name)
-         return method(*args)
-      except Exception as ex:
-         raise ex
+      signal_predicate = SignalPredicate(predicate, predicate_type)
+      event = self._wait_for_signal_event([wait_signal], timeout, signal_predicate)
+      if event is not None:
+         return event.payloads
+      else:
+         raise AssertionError("Unable to receive the '%s' signal matching %s after '%s'"
+                              % (wait_signal, signal_predicate, timeout))
 
-   def call_dbus_method_with_keyword_args(self, method_name, **kwargs):
+   def wait_for_any_signal(self, signals="", timeout=0):
       """
-Call a DBus method with the specified method name and input arguments.
+Wait for any of several DBus signals to be received within a specified timeout period.
 
 **Arguments:**
 
-* ``method_name``
+* ``signals``
 
   / *Condition*: optional / *Type*: str / *Default*: '' /
 
-  The name of the DBus method to be called.
+  The names of the DBus signals to wait for. It can be a list of signal names,
+  or multiple signal names joined by ','. For example: "signal1,signal2,signal3".
 
-* ``args``
+* ``timeout``
 
-  / *Condition*: optional / *Type*: tuple / *Default*: None /
+  / *Condition*: optional / *Type*: float / *Default*: 0 /
 
-  Input arguments to be passed to the method.
+  The maximum time (in seconds) to wait for the signals. Fractions of a second are allowed.
 
 **Returns:**
 
-* ``ret_obj``
+* ``signal_info``
 
-  / *Type*: Any /
+  / *Type*: tuple /
 
-  Connection object.
+  The name of the received signal and its payloads.
+      """
+      if isinstance(signals, str):
+         signals = signals.split(",")
+      signals = [s.strip() for s in signals]
+      event = self._wait_for_signal_event(signals, timeout)
+      if event is not None:
+         return event.signal, event.payloads
+      else:
+         raise AssertionError("Unable to receive any of the '%s' signals after '%s'" % (", ".join(signals), timeout))
+
+   def get_signal_statistics(self, signal=None):
+      """
+Get the counters of the received emissions of the subscribed signals.
+
+Signals are counted as soon as they are registered, waited for or handled, and the counters are updated
+in O(1) in the signal callback.
+
+**Arguments:**
+
+* ``signal``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The name of the DBus signal. None means all signals.
+
+**Returns:**
+
+* ``statistics``
+
+  / *Type*: dict /
+
+  The counters of the signal, or a dictionary of the counters of all signals keyed by signal name
+  (filtered subscriptions as 'signal[filter]'):
+
+  - 'count': the number of received emissions.
+  - 'rate': the emissions per second over the sliding window of 'window' seconds.
+  - 'last_received': the time (in seconds) since the last emission.
+  - 'inter_arrival_min', 'inter_arrival_mean', 'inter_arrival_max', 'inter_arrival_p99':
+    the times (in seconds) between consecutive emissions.
+      """
+      return self._signal_statistics.get_statistics(signal)
+
+   def start_signal_recording(self, file_path, signals=None,
+                              max_bytes=SignalRecorder.DEFAULT_MAX_BYTES,
+                              backup_count=SignalRecorder.DEFAULT_BACKUP_COUNT,
+                              queue_size=SignalRecorder.DEFAULT_QUEUE_SIZE,
+                              flush_interval=SignalRecorder.DEFAULT_FLUSH_INTERVAL):
+      """
+Start recording every emission of the object's signals to a rotating, compressed JSONL file.
+
+Each line holds the signal name, interface, sender, object path, monotonic and wall timestamps and the payloads.
+The signal callback only queues the emissions, and a background thread writes them in batches.
+
+**Arguments:**
+
+* ``file_path``
+
+  / *Condition*: required / *Type*: str /
+
+  The path of the gzip compressed JSONL recording file, e.g. 'signals.jsonl.gz'.
+
+* ``signals``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The names of the signals to record, joined by ','. None means all signals of the object.
+
+* ``max_bytes``
+
+  / *Condition*: optional / *Type*: int / *Default*: 64 MiB /
+
+  The uncompressed size after which the file is rotated. 0 disables the rotation.
+
+* ``backup_count``
+
+  / *Condition*: optional / *Type*: int / *Default*: 5 /
+
+  The number of rotated files to keep as '<file_path>.1' (newest) to '<file_path>.N' (oldest).
+  0 disables the rotation, like a ``max_bytes`` of 0.
+
+* ``queue_size``
+
+  / *Condition*: optional / *Type*: int / *Default*: 10000 /
+
+  The maximum number of emissions waiting for the writer thread. Further emissions are dropped and counted.
+
+* ``flush_interval``
+
+  / *Condition*: optional / *Type*: float / *Default*: 1.0 /
+
+  The maximum time (in seconds) recorded emissions may stay buffered before they are flushed to the file.
+
+**Returns:**
+
+(*no returns*)
       """
+      if self._signal_recorder is not None:
+         raise Exception("The signals of '%s' are already being recorded to '%s'"
+                         % (self.namespace, self._signal_recorder.file_path))
+      if isinstance(signals, str):
+         signals = [s.strip() for s in signals.split(",") if s.strip()]
+
+      recorder = SignalRecorder(file_path, max_bytes, backup_count, queue_size, flush_interval)
+      recorder.start()
       try:
-         method = getattr(self.proxy, method_name)
-         return method(**kwargs)
+         self._reactor.call(recorder.attach, self.dbus.message_bus, self.dbus.service_name, self.object_path, signals)
+      except Exception:
+         recorder.stop()
+         raise
+      self._signal_recorder = recorder
+
+   def stop_signal_recording(self):
+      """
+Stop recording signals, write the remaining emissions and close the recording file.
+
+**Returns:**
+
+* ``statistics``
+
+  / *Type*: dict /
+
+  The statistics of the recording: 'file_path', 'recorded' (written emissions), 'dropped' (emissions
+  dropped because the writer could not keep up) and 'rotations'.
+      """
+      recorder = self._signal_recorder
+      if recorder is None:
+         raise Exception("The signals of '%s' are not being recorded" % self.namespace)
+      self._signal_recorder = None
+      self._reactor.call(recorder.detach)
+      return recorder.stop()
+
+   def get_method_latency_statistics(self, method_name=None):
+      """
+Get the latencies of the DBus method calls of the connection.
+
+Synchronous, asynchronous and batched calls are recorded in a fixed-size log-bucketed histogram per method.
+
+**Arguments:**
+
+* ``method_name``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The name of the DBus method. None means all methods.
+
+**Returns:**
+
+  / *Type*: dict /
+
+  The latencies of the method as {'round_trip': summary}, or a dictionary of them keyed by method name.
+  A summary has the keys 'count', 'min', 'mean', 'max', 'p50', 'p90', 'p99' and 'p99_9' (seconds).
+      """
+      if method_name is not None:
+         return {"round_trip": self._method_latency.get_statistics(method_name)}
+      return {name: {"round_trip": summary} for name, summary in self._method_latency.get_statistics().items()}
+
+   def _get_property_cache(self):
+      """
+Get the property cache of the connection, create it on first use.
+
+**Returns:**
+
+  / *Type*: PropertyCache /
+
+  The property cache.
+      """
+      with self._property_cache_lock:
+         if self._property_cache is None:
+            property_cache = PropertyCache(self.dbus.message_bus, self.dbus.service_name, self.object_path,
+                                           self._reactor)
+            self._reactor.call(property_cache.attach)
+            self._property_cache = property_cache
+         return self._property_cache
+
+   def _get_property_spec(self, property_name, interface=None):
+      """
+Get the specification of a property of the proxy.
+
+**Arguments:**
+
+* ``property_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the DBus property.
+
+* ``interface``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The interface of the property. None means the first interface which has the property.
+
+**Returns:**
+
+  / *Type*: DBusSpecification.Property /
+
+  The property specification.
+      """
+      for member in get_object_handler(self.proxy).specification.members:
+         if isinstance(member, DBusSpecification.Property) and member.name == property_name \
+               and interface in (None, member.interface_name):
+            return member
+      raise AttributeError("DBus object has no property '%s'." % property_name)
+
+   def get_dbus_property(self, property_name, interface=None, use_cache=True):
+      """
+Get the value of a DBus property.
+
+**Arguments:**
+
+* ``property_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the DBus property.
+
+* ``interface``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The interface of the property. None means the first interface which has the property.
+
+* ``use_cache``
+
+  / *Condition*: optional / *Type*: bool / *Default*: True /
+
+  If True, the value is served from the property cache. If False, it is read from the service.
+
+**Returns:**
+
+  / *Type*: Any /
+
+  The value of the property.
+      """
+      property_spec = self._get_property_spec(property_name, interface)
+      property_cache = self._get_property_cache()
+      if use_cache:
+         return property_cache.get(property_spec.interface_name, property_name)
+      return property_cache.read(property_spec.interface_name, property_name)
+
+   def set_dbus_property(self, property_name, value, interface=None):
+      """
+Set the value of a DBus property.
+
+**Arguments:**
+
+* ``property_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the DBus property.
+
+* ``value``
+
+  / *Condition*: required / *Type*: Any /
+
+  The new value.
+
+* ``interface``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The interface of the property. None means the first interface which has the property.
+
+**Returns:**
+
+(*no returns*)
+      """
+      property_spec = self._get_property_spec(property_name, interface)
+      if not property_spec.writable:
+         raise AttributeError("The '%s' property is not writable." % property_name)
+      self._get_property_cache().set(property_spec.interface_name, property_name, property_spec.type, value)
+
+   def get_all_dbus_properties(self, interface=None, use_cache=True):
+      """
+Get the values of all readable DBus properties of the object or of one of its interfaces.
+
+**Arguments:**
+
+* ``interface``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The interface of the properties. None means all interfaces of the object.
+
+* ``use_cache``
+
+  / *Condition*: optional / *Type*: bool / *Default*: True /
+
+  If True, the values are served from the property cache. If False, they are read from the service.
+
+**Returns:**
+
+  / *Type*: dict /
+
+  The values of the properties keyed by property name.
+      """
+      interfaces = []
+      for member in get_object_handler(self.proxy).specification.members:
+         if isinstance(member, DBusSpecification.Property) and member.readable \
+               and interface in (None, member.interface_name) and member.interface_name not in interfaces:
+            interfaces.append(member.interface_name)
+
+      property_cache = self._get_property_cache()
+      properties = {}
+      for interface_name in interfaces:
+         if use_cache:
+            properties.update(property_cache.get_all(interface_name))
+         else:
+            properties.update(property_cache.read_all(interface_name))
+      return properties
+
+   def wait_for_property_value(self, property_name, value, timeout=0, interface=None):
+      """
+Wait until a DBus property has an expected value, driven by the ``PropertiesChanged`` signal.
+
+**Arguments:**
+
+* ``property_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the DBus property.
+
+* ``value``
+
+  / *Condition*: required / *Type*: Any /
+
+  The expected value. It also matches a value with the same string representation.
+
+* ``timeout``
+
+  / *Condition*: optional / *Type*: float / *Default*: 0 /
+
+  The maximum time (in seconds) to wait. Fractions of a second are allowed.
+
+* ``interface``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The interface of the property. None means the first interface which has the property.
+
+**Returns:**
+
+  / *Type*: Any /
+
+  The value of the property.
+      """
+      property_spec = self._get_property_spec(property_name, interface)
+      matched, current_value = self._get_property_cache().wait_for_value(property_spec.interface_name, property_name,
+                                                                         value, float(timeout))
+      if not matched:
+         raise AssertionError("The '%s' property is '%s' instead of '%s' after '%s'"
+                              % (property_name, current_value, value, timeout))
+      return current_value
+
+   def _get_object_index(self, manager_path=None, refresh=False):
+      """
+Get the index of the managed objects of the service, load it on first use.
+
+**Arguments:**
+
+* ``manager_path``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The object path of the object manager. None means the object path of the connection,
+  or the path of the existing index.
+
+* ``refresh``
+
+  / *Condition*: optional / *Type*: bool / *Default*: False /
+
+  If True, the index is loaded again.
+
+**Returns:**
+
+  / *Type*: ObjectIndex /
+
+  The object index.
+      """
+      with self._object_index_lock:
+         index = self._object_index
+         if index is not None and (refresh or manager_path not in (None, index.manager_path)):
+            self._reactor.call(index.detach)
+            manager_path = manager_path or index.manager_path
+            index = None
+         if index is None:
+            index = ObjectIndex(self.dbus.message_bus, self.dbus.service_name, manager_path or self.object_path)
+            try:
+               self._reactor.call(index.attach)
+               index.wait_until_loaded()
+            except Exception as ex:
+               self._reactor.call(index.detach)
+               raise ex
+            self._object_index = index
+         return index
+
+   def index_managed_objects(self, manager_path=None):
+      """
+Load the index of the objects exported by the object manager of the service.
+
+**Arguments:**
+
+* ``manager_path``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The object path of the object manager. None means the object path of the connection.
+
+**Returns:**
+
+  / *Type*: int /
+
+  The number of indexed objects.
+      """
+      return self._get_object_index(manager_path, refresh=True).get_object_count()
+
+   def find_objects_by_interface(self, interface):
+      """
+Get the managed objects which implement an interface.
+
+**Arguments:**
+
+* ``interface``
+
+  / *Condition*: required / *Type*: str /
+
+  The interface name.
+
+**Returns:**
+
+  / *Type*: list /
+
+  The sorted object paths.
+      """
+      return self._get_object_index().find_by_interface(interface)
+
+   def find_objects_by_property(self, interface, property_name, value):
+      """
+Get the managed objects whose property has a value.
+
+**Arguments:**
+
+* ``interface``
+
+  / *Condition*: required / *Type*: str /
+
+  The interface of the property.
+
+* ``property_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the property.
+
+* ``value``
+
+  / *Condition*: required / *Type*: Any /
+
+  The value, compared by its string representation.
+
+**Returns:**
+
+  / *Type*: list /
+
+  The sorted object paths.
+      """
+      return self._get_object_index().find_by_property(interface, property_name, value)
+
+   def get_managed_object(self, object_path):
+      """
+Get the interfaces and properties of a managed object from the index.
+
+**Arguments:**
+
+* ``object_path``
+
+  / *Condition*: required / *Type*: str /
+
+  The object path.
+
+**Returns:**
+
+  / *Type*: dict /
+
+  The properties of the object keyed by interface name.
+      """
+      interfaces = self._get_object_index().get_object(object_path)
+      if interfaces is None:
+         raise AttributeError("The '%s' object is not managed by the service." % object_path)
+      return interfaces
+
+   def _get_object_proxy(self, object_path):
+      """
+Get the proxy of another object of the service, create it on first use.
+The proxy is shared through the proxy cache and released when the connection is disconnected.
+
+**Arguments:**
+
+* ``object_path``
+
+  / *Condition*: required / *Type*: str /
+
+  The object path.
+
+**Returns:**
+
+  / *Type*: dasbus.client.proxy.ObjectProxy /
+
+  The proxy of the object.
+      """
+      if object_path == self.object_path:
+         return self.proxy
+      with self._object_index_lock:
+         entry = self._object_proxy_dict.get(object_path)
+         if entry is None:
+            entry = ProxyCache.get_instance().acquire(self.dbus.message_bus,
+                                                      self.dbus.service_name,
+                                                      object_path,
+                                                      None,
+                                                      lambda: self._create_proxy(object_path),
+                                                      self._refresh_introspection)
+            self._object_proxy_dict[object_path] = entry
+         return entry[1]
+
+   def _release_object_proxies(self):
+      """
+Release the proxies of the other objects of the service used by the connection.
+
+**Returns:**
+
+(*no returns*)
+      """
+      with self._object_index_lock:
+         entries = list(self._object_proxy_dict.values())
+         self._object_proxy_dict.clear()
+      for proxy_key, _proxy in entries:
+         ProxyCache.get_instance().release(proxy_key, lambda proxy: self._reactor.call(disconnect_proxy, proxy))
+
+   def _call_method(self, method_name, args, object_path=None, callback=None):
+      """
+Call a DBus method of the object or of another object of the service. The arguments are converted to
+the input signature of the method by its cached argument converter.
+
+**Arguments:**
+
+* ``method_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the DBus method to be called.
+
+* ``args``
+
+  / *Condition*: required / *Type*: tuple /
+
+  Input arguments to be passed to the method.
+
+* ``object_path``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The object path. None means the object path of the connection.
+
+* ``callback``
+
+  / *Condition*: optional / *Type*: callable / *Default*: None /
+
+  The callback of an asynchronous call. None means a synchronous call.
+
+**Returns:**
+
+  / *Type*: Any /
+
+  The return value of a synchronous call.
+      """
+      object_path = object_path or self.object_path
+      proxy = self._get_object_proxy(object_path)
+      entry = self._method_converter_dict.get((object_path, method_name))
+      if entry is None:
+         for member in get_object_handler(proxy).specification.members:
+            if isinstance(member, DBusSpecification.Method) and member.name == method_name:
+               entry = (member, ArgumentConverter.get(member.in_type))
+               break
+         else:
+            raise AttributeError("DBus object has no method '%s'." % method_name)
+         self._method_converter_dict[(object_path, method_name)] = entry
+
+      method_spec, converter = entry
+      args, parameters = converter.convert(args)
+      if parameters is not None:
+         return call_with_parameters(self.dbus.message_bus, proxy, method_spec, parameters, callback)
+      method = getattr(proxy, method_name)
+      if callback is None:
+         return method(*args)
+      return method(*args, callback=callback)
+
+   def call_object_method(self, object_path, method_name, *args):
+      """
+Call a DBus method of another object of the service, e.g. of a managed object.
+
+**Arguments:**
+
+* ``object_path``
+
+  / *Condition*: required / *Type*: str /
+
+  The object path.
+
+* ``method_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the DBus method to be called.
+
+* ``args``
+
+  / *Condition*: optional / *Type*: tuple / *Default*: None /
+
+  Input arguments to be passed to the method.
+
+**Returns:**
+
+  / *Type*: Any /
+
+  The return value of the method.
+      """
+      start_time = time.perf_counter()
+      try:
+         return self._call_method(method_name, args, object_path)
+      finally:
+         self._method_latency.record(method_name, time.perf_counter() - start_time)
+
+   def call_dbus_method(self, method_name, *args):
+      """
+Call a DBus method with the specified method name and input arguments.
+
+**Arguments:**
+
+* ``method_name``
+
+  / *Condition*: optional / *Type*: str / *Default*: '' /
+
+  The name of the DBus method to be called.
+
+* ``args``
+
+  / *Condition*: optional / *Type*: tuple / *Default*: None /
+
+  Input arguments to be passed to the method.
+
+**Returns:**
+
+  / *Type*: Any /
+
+  Return from called method.
+      """
+      try:
+         start_time = time.perf_counter()
+         try:
+            return self._call_method(method_name, args)
+         finally:
+            self._method_latency.record(method_name, time.perf_counter() - start_time)
+      except Exception as ex:
+         raise ex
+
+   def call_dbus_method_async(self, method_name, *args):
+      """
+Call a DBus method asynchronously. The call is sent on the event loop and this method returns
+immediately, so that many calls can be in flight at once over the connection.
+
+**Arguments:**
+
+* ``method_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the DBus method to be called.
+
+* ``args``
+
+  / *Condition*: optional / *Type*: tuple / *Default*: None /
+
+  Input arguments to be passed to the method.
+
+**Returns:**
+
+* ``handle_id``
+
+  / *Type*: str /
+
+  The handle to get the result of the call with.
+      """
+      handle = self._method_call_registry.create(method_name)
+
+      def _on_reply(call):
+         handle.reply_callback(call)
+         self._method_latency.record(method_name, handle.get_elapsed_time())
+
+      def _send_call():
+         try:
+            self._call_method(method_name, args, callback=_on_reply)
+         except Exception as ex:
+            handle.set_error(ex)
+
+      self._reactor.call(_send_call)
+      return handle.handle_id
+
+   def wait_for_method_result(self, handle_id, timeout=None):
+      """
+Wait for the result of an asynchronous DBus method call.
+
+**Arguments:**
+
+* ``handle_id``
+
+  / *Condition*: required / *Type*: str /
+
+  The handle returned by ``call_dbus_method_async``.
+
+* ``timeout``
+
+  / *Condition*: optional / *Type*: float / *Default*: None /
+
+  The maximum time (in seconds) to wait. None means to wait without limit.
+
+**Returns:**
+
+  / *Type*: Any /
+
+  Return from called method.
+      """
+      return self._method_call_registry.wait_for_result(handle_id, timeout)
+
+   def wait_for_all_method_results(self, timeout=None):
+      """
+Wait for the results of all pending asynchronous DBus method calls.
+
+**Arguments:**
+
+* ``timeout``
+
+  / *Condition*: optional / *Type*: float / *Default*: None /
+
+  The maximum time (in seconds) to wait for all calls. None means to wait without limit.
+
+**Returns:**
+
+  / *Type*: list /
+
+  Returns from the called methods in issue order.
+      """
+      return self._method_call_registry.wait_for_all_results(timeout)
+
+   def call_dbus_method_batch(self, calls, stop_on_error=False, timeout=None):
+      """
+Call a batch of DBus methods pipelined over the proxy and collect their results in order.
+
+**Arguments:**
+
+* ``calls``
+
+  / *Condition*: required / *Type*: list /
+
+  The calls of the batch. Each call is a (method, args) tuple, where ``args`` is a list of input arguments.
+
+* ``stop_on_error``
+
+  / *Condition*: optional / *Type*: bool / *Default*: False /
+
+  If False, all calls are sent at once and every call is run regardless of errors.
+  If True, each call is sent as soon as the previous one has succeeded and the batch stops at the first error.
+
+* ``timeout``
+
+  / *Condition*: optional / *Type*: float / *Default*: None /
+
+  The maximum time (in seconds) to wait for the batch. None means to wait without limit.
+
+**Returns:**
+
+* ``report``
+
+  / *Type*: list /
+
+  A dictionary per call with its 'method', 'status', 'result', 'error' and 'elapsed' time.
+      """
+      batch = MethodCallBatch(calls, stop_on_error)
+
+      def _send_call(method_name, args, callback_func):
+         self._call_method(method_name, args, callback=callback_func)
+
+      self._reactor.call(batch.start, _send_call)
+      if not batch.wait(timeout):
+         raise AssertionError("The batch of method calls has not completed after '%s'" % timeout)
+      report = batch.get_report()
+      for entry in report:
+         self._method_latency.record(entry["method"], entry["elapsed"])
+      return report
+
+   def call_dbus_method_with_keyword_args(self, method_name, **kwargs):
+      """
+Call a DBus method with the specified method name and input arguments.
+
+**Arguments:**
+
+* ``method_name``
+
+  / *Condition*: optional / *Type*: str / *Default*: '' /
+
+  The name of the DBus method to be called.
+
+* ``args``
+
+  / *Condition*: optional / *Type*: tuple / *Default*: None /
+
+  Input arguments to be passed to the method.
+
+**Returns:**
+
+* ``ret_obj``
+
+  / *Type*: Any /
+
+  Connection object.
+      """
+      try:
+         method = getattr(self.proxy, method_name)
+         start_time = time.perf_counter()
+         try:
+            return method(**kwargs)
+         finally:
+            self._method_latency.record(method_name, time.perf_counter() - start_time)
       except Exception as ex:
          raise ex
@@ -29,23 +29,50 @@
 from threading import Timer
 from RobotFramework_DBus.common.thread_safe_dict import ThreadSafeDict
 from RobotFramework_DBus.common.register_keyword import RegisterKeyword
-from RobotFramework_DBus.common.scheduled_job import ScheduledJob
+from RobotFramework_DBus.common.signal_recorder import SignalRecorder
+from RobotFramework_DBus.common.signal_buffer import CapturedSignalStore
+from RobotFramework_DBus.common.method_latency import MethodLatencyRecorder
+from RobotFramework_DBus.common.rpc_proxy_pool import ServerProxyPool
+from RobotFramework_DBus.common.utils import Utils
+from RobotFramework_DBus.common import framed_rpc
 from robot.api import logger
 from robot.libraries.BuiltIn import BuiltIn
 from robot.running import Keyword
-from datetime import timedelta
+import array
 import threading
+import time
 import xmlrpc.client
 
 
+def _to_rpc_args(args):
+   """
+Make the arguments of a DBus method call marshallable by XML-RPC. Arrays are sent as lists and converted
+back in bulk by the agent, bytes-like objects are sent as binary data.
+   """
+   return [value.tolist() if isinstance(value, array.array)
+           else bytes(value) if isinstance(value, memoryview)
+           else value for value in args]
+
+
 class DBusClientRemote:
    """
 A client class for interacting with a specific DBus service on a remote machine.
    """
 
-   _CHECK_SIGNAL_INTERVAL = 50
+   TRANSPORT_XMLRPC = "xmlrpc"
+   TRANSPORT_FRAMED = "framed"
 
-   def __init__(self, namespace, object_path, host, port):
+   _POLL_SIGNAL_TIMEOUT = 5
+   _POLL_SIGNAL_RETRY_INTERVAL = 0.5
+   # The errors of system.multicall after which the requests are sent one by one: the agent rejected it.
+   # Transport errors are not among them, the agent may already have executed the requests.
+   _MULTICALL_FALLBACK_ERRORS = (xmlrpc.client.Fault, framed_rpc.FramedRPCError)
+
+   def __init__(self, namespace, object_path, host, port,
+                signal_queue_size=CapturedSignalStore.DEFAULT_CAPACITY,
+                signal_overflow_policy=CapturedSignalStore.OVERFLOW_DROP_OLDEST,
+                introspection_cache=True, refresh_introspection=False,
+                transport=TRANSPORT_XMLRPC, transport_address=None):
       """
 Constructor for DBusClientRemote class.
 
@@ -81,32 +108,159 @@ Constructor for DBusClientRemote class.
 
   The port which the DBus Agent is listening on the remote system.
 
+* ``signal_queue_size``
+
+  / *Condition*: optional / *Type*: int / *Default*: 100 /
+
+  The maximum number of captured emissions kept per signal by the DBus Agent.
+
+* ``signal_overflow_policy``
+
+  / *Condition*: optional / *Type*: str / *Default*: 'drop-oldest' /
+
+  What to do when the queue of a signal is full: 'drop-oldest', 'drop-newest' or 'latest-only'.
+
+* ``introspection_cache``
+
+  / *Condition*: optional / *Type*: bool / *Default*: True /
+
+  If True, the DBus Agent takes the introspection data of the object from its persistent on-disk cache.
+
+* ``refresh_introspection``
+
+  / *Condition*: optional / *Type*: bool / *Default*: False /
+
+  If True, the object is introspected again and the agent's on-disk cache entry is replaced.
+
+* ``transport``
+
+  / *Condition*: optional / *Type*: str / *Default*: 'xmlrpc' /
+
+  The transport to the DBus Agent: 'xmlrpc' or 'framed'.
+  'framed' sends all requests of the connection, including the long polls for signal emissions, over one
+  persistent TCP or Unix socket connection with length-prefixed msgpack frames. It requires the 'msgpack'
+  package on both sides and falls back to XML-RPC if the framed endpoint cannot be used.
+
+* ``transport_address``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The framed endpoint of the DBus Agent: a port, 'host:port' or the path of a Unix socket.
+  None means the port after ``port`` on ``host``.
+
 **Returns:**
 
 (*no returns*)
       """
       namespace_tuple = tuple(namespace.split('.'))
-      self.rpc_proxy = xmlrpc.client.ServerProxy("http://%s:%s" % (host, port), allow_none=True)
-      self.session = self.rpc_proxy.get_session_token()
+      self.host = host
+      self.port = port
+      self.transport = transport
+      self.rpc_proxy = self._create_rpc_proxy(transport_address)
+      # The session token is made by the client, so that the session is initialized and connected in one round trip.
+      self.session = Utils.make_unique_token()
+      self._initialized = False
       self._singal_handler_dict = ThreadSafeDict()
+      self._signal_receiver = None
+      self._signal_receiver_lock = threading.Lock()
+      self._signal_receiver_stopped = threading.Event()
+      self._method_latency = MethodLatencyRecorder()
       self.namespace = namespace
       self.object_path = object_path
-      self.host = host
-      self.port = port
+      self._initialize_params = (self.session, self.namespace, self.object_path,
+                                 int(signal_queue_size), signal_overflow_policy,
+                                 bool(introspection_cache), bool(refresh_introspection))
+
+   def _create_rpc_proxy(self, transport_address):
+      """
+Create the proxy of the DBus Agent for the selected transport.
+
+**Arguments:**
+
+* ``transport_address``
+
+  / *Condition*: required / *Type*: str /
+
+  The framed endpoint of the DBus Agent, see the constructor.
+
+**Returns:**
+
+  / *Type*: ServerProxyPool / FramedRPCProxy /
+
+  The proxy.
+      """
+      if self.transport == DBusClientRemote.TRANSPORT_FRAMED:
+         try:
+            address = framed_rpc.parse_address(transport_address, self.host, self.port)
+            return framed_rpc.FramedRPCProxy(address)
+         except Exception as ex:
+            logger.warn("Unable to use the framed transport to the DBus Agent. Falling back to XML-RPC. Reason: %s"
+                        % ex)
+            self.transport = DBusClientRemote.TRANSPORT_XMLRPC
+      elif self.transport != DBusClientRemote.TRANSPORT_XMLRPC:
+         raise ValueError("Invalid transport '%s'. Valid transports are '%s' and '%s'."
+                          % (self.transport, DBusClientRemote.TRANSPORT_XMLRPC, DBusClientRemote.TRANSPORT_FRAMED))
+      return ServerProxyPool("http://%s:%s" % (self.host, self.port), allow_none=True)
+
+   def multicall(self, calls):
+      """
+Execute several requests on the DBus Agent in one round trip (``system.multicall``).
+
+The requests are executed in order and a failed request does not stop the following ones.
+If the agent rejects ``system.multicall``, e.g. because it does not support it, the requests are sent one by one.
+A transport error is raised: the agent may already have executed the requests, so they are not sent again.
+
+**Arguments:**
+
+* ``calls``
+
+  / *Condition*: required / *Type*: list /
+
+  The requests as (method name, arguments) tuples, e.g. [('connect', (session,))].
+
+**Returns:**
+
+  / *Type*: list /
+
+  The result of each request, or the ``xmlrpc.client.Fault`` of a failed request.
+      """
       try:
-         self.rpc_proxy.initialize_dbus_client(self.session, self.namespace, self.object_path)
-      except Exception as ex:
-         raise Exception("Unable to connect to '%s' DBus. Reason: '%s'" % (namespace, str(ex)) )
+         results = self.rpc_proxy.call("system.multicall",
+                                       [{"methodName": method, "params": list(params)} for method, params in calls])
+      except DBusClientRemote._MULTICALL_FALLBACK_ERRORS as ex:
+         logger.debug("Unable to execute system.multicall on the DBus Agent, sending the requests one by one. "
+                      "Exception: %s" % ex)
+         results = []
+         for method, params in calls:
+            try:
+               results.append([self.rpc_proxy.call(method, *params)])
+            except xmlrpc.client.Fault as fault:
+               results.append({"faultCode": fault.faultCode, "faultString": fault.faultString})
+            except framed_rpc.FramedRPCError as error:
+               results.append({"faultCode": 1, "faultString": str(error)})
+      return [xmlrpc.client.Fault(result["faultCode"], result["faultString"]) if isinstance(result, dict)
+              else result[0] for result in results]
 
    def connect(self):
       """
 Create a proxy object to DBus object.
 
+The first connect initializes the session of the client on the DBus Agent and connects it in one round trip.
+
 **Returns:**
 
 (*no returns*)
       """
-      self.rpc_proxy.connect(self.session)
+      if self._initialized:
+         self.rpc_proxy.connect(self.session)
+         return
+      initialize_result, connect_result = self.multicall([("initialize_dbus_client", self._initialize_params),
+                                                          ("connect", (self.session,))])
+      if isinstance(initialize_result, Exception):
+         raise Exception("Unable to connect to '%s' DBus. Reason: '%s'" % (self.namespace, str(initialize_result)))
+      self._initialized = True
+      if isinstance(connect_result, Exception):
+         raise connect_result
 
    def disconnect(self):
       """
@@ -126,44 +280,78 @@ Quit the DBus client.
 
 (*no returns*)
       """
-      self.disconnect()
-      for job_list in self._singal_handler_dict.values():
-         for schdl_job in job_list:
-            if not schdl_job[0].stopped.is_set():
-               schdl_job[0].stop()
+      self._signal_receiver_stopped.set()
+      if self._initialized:
+         try:
+            # Disconnect and release the session on the agent.
+            self.rpc_proxy.quit(self.session)
+         except Exception as ex:
+            logger.warn("Unable to disconnect the '%s' connection from the DBus Agent. Exception: %s"
+                        % (self.namespace, ex))
+      with self._signal_receiver_lock:
+         receiver = self._signal_receiver
+         self._signal_receiver = None
+      if receiver is not None:
+         receiver.join(DBusClientRemote._POLL_SIGNAL_TIMEOUT + 1)
       self._singal_handler_dict.clear()
+      self.rpc_proxy.close()
 
-   def do_signal_check(self, signal, call_back_func):
+   def _receive_signal_events(self):
       """
-Checking if the signal was emited.
-
-**Arguments:**
+Receive the emissions of the signals with handlers from the DBus Agent and dispatch them to the handlers.
+It runs on the signal receiver thread of the connection, with one long poll after another.
 
-* ``signal``
-
-  / *Condition*: required / *Type*: str /
-
-  The name of the DBus signal to check.
-
-* ``call_back_func``
-
-  / *Condition*: required / *Type*: callable /
+**Returns:**
 
-  The function to be callback when receiving the signal.
+(*no returns*)
+      """
+      # Both proxies are thread-safe: the pool runs the long polls on a persistent connection of their own,
+      # the framed proxy multiplexes them with the other requests over its connection.
+      sequence = 0
+      while not self._signal_receiver_stopped.is_set():
+         try:
+            result = self.rpc_proxy.poll_signal_events(self.session, sequence, DBusClientRemote._POLL_SIGNAL_TIMEOUT)
+         except Exception as ex:
+            if self._signal_receiver_stopped.wait(DBusClientRemote._POLL_SIGNAL_RETRY_INTERVAL):
+               break
+            logger.debug("Unable to poll the signals of '%s' connection. Exception: %s" % (self.namespace, ex))
+            continue
+         if result["missed"]:
+            logger.warn("%s signal emissions of '%s' connection have been dropped before they could be handled."
+                        % (result["missed"], self.namespace))
+         sequence = result["sequence"]
+         if result["events"]:
+            handlers = [handler for handler_list in list(self._singal_handler_dict.values())
+                        for handler in handler_list]
+            for _sequence, channel, payloads in result["events"]:
+               for handler_channel, rkw in handlers:
+                  if handler_channel == channel:
+                     rkw.dispatch_func(payloads)
+         if result["closed"]:
+            break
+
+   def _start_signal_receiver(self):
+      """
+Start the signal receiver thread of the connection if it is not running yet.
 
 **Returns:**
 
 (*no returns*)
       """
-      rpc_proxy = xmlrpc.client.ServerProxy("http://%s:%s" % (self.host, self.port), allow_none=True)
-      payloads = rpc_proxy.get_monitoring_signal_payloads(self.session, signal)
-      if payloads is not None:
-         call_back_func(payloads)
-
-   def set_signal_received_handler(self, signal, handler):
+      with self._signal_receiver_lock:
+         if self._signal_receiver is None and not self._signal_receiver_stopped.is_set():
+            self._signal_receiver = threading.Thread(target=self._receive_signal_events,
+                                                     name="dbus-signal-receiver-%s" % self.session,
+                                                     daemon=True)
+            self._signal_receiver.start()
+
+   def set_signal_received_handler(self, signal, handler, priority=0, match_filter=None):
       """
 Set a signal received handler for a specific signal.
 
+The emissions are pushed by the DBus Agent to the signal receiver thread of the connection with long polls,
+so that they reach the handlers without polling delay and none is lost between two polls.
+
 **Arguments:**
 
 * ``signal``
@@ -179,21 +367,31 @@ Set a signal received handler for a specific signal.
   The keyword to handle the received signal.
   The handler should accept the necessary parameters based on the signal being handled.
 
+* ``priority``
+
+  / *Condition*: optional / *Type*: int / *Default*: 0 /
+
+  The dispatch priority of the handler. When handler calls are queued up, the ones with a higher priority are run first.
+
+* ``match_filter``
+
+  / *Condition*: optional / *Type*: str / dict / *Default*: None /
+
+  DBus match-rule filters applied by the bus daemon, so that only matching emissions reach the handler.
+  Either a dictionary or comma-separated ``key=value`` pairs with the keys 'arg0', 'arg0namespace'
+  and 'path_namespace', e.g. "arg0=org.example.Service".
+
 **Returns:**
 
 (*no returns*)
       """
-      rkw = RegisterKeyword(handler)
-      signal_check_job = ScheduledJob( timedelta(milliseconds=DBusClientRemote._CHECK_SIGNAL_INTERVAL),
-                              self.do_signal_check,
-                              *(signal, rkw.callback_func))
-      self.rpc_proxy.register_monitored_signal(self.session, signal)
-      signal_check_job.start()
-      # self.singal_handler_dict[signal] = signal_check_job
+      rkw = RegisterKeyword(handler, priority)
+      channel = self.rpc_proxy.subscribe_signal_events(self.session, signal, match_filter)
       if signal not in self._singal_handler_dict:
-         self._singal_handler_dict[signal] = [(signal_check_job, rkw)]
+         self._singal_handler_dict[signal] = [(channel, rkw)]
       else:
-         self._singal_handler_dict[signal].append((signal_check_job, rkw))
+         self._singal_handler_dict[signal].append((channel, rkw))
+      self._start_signal_receiver()
 
    def unset_signal_received_handler(self, signal, handle_keyword=None):
       """
@@ -207,21 +405,24 @@ Unset a signal received handler for a specific signal.
 
   The name of the DBus signal to handle.
 
+* ``handle_keyword``
+
+  / *Condition*: optional / *Type*: str / *Type*: None /
+
+  The keyword which is handling for signal emitted event.
+
 **Returns:**
 
 (*no returns*)
       """
       if signal in self._singal_handler_dict:
-        #  job_check = self.singal_handler_dict[signal]
-        #  job_check.stop()
-        #  del self.singal_handler_dict[signal]
-        for hdl in self._singal_handler_dict[signal]:
-            if handle_keyword is None or hdl[1].get_kw_name() == handle_keyword:
-              #  hdl[0].disconnect(hdl[1].callback_func)
-              hdl[0].stop()
-
+         removed = [hdl for hdl in self._singal_handler_dict[signal]
+                    if handle_keyword is None or hdl[1].get_kw_name() == handle_keyword]
+         self._singal_handler_dict[signal] = [hdl for hdl in self._singal_handler_dict[signal] if hdl not in removed]
+         for channel, _rkw in removed:
+            self.rpc_proxy.unsubscribe_signal_events(self.session, channel)
 
-   def register_monitored_signal(self, signal):
+   def register_monitored_signal(self, signal, match_filter=None):
       """
 Register a DBus signal or signals to be monitored for a specific connection.
 
@@ -234,11 +435,19 @@ Register a DBus signal or signals to be monitored for a specific connection.
   The name of the DBus signal(s) to register. It can be a single signal name as a string,
   or multiple signal names joined by ','. For example: "signal1,signal2,signal3".
 
+* ``match_filter``
+
+  / *Condition*: optional / *Type*: str / dict / *Default*: None /
+
+  DBus match-rule filters applied by the bus daemon, so that other emissions never reach the process.
+  Either a dictionary or comma-separated ``key=value`` pairs with the keys 'arg0', 'arg0namespace'
+  and 'path_namespace', e.g. "arg0=org.example.Service".
+
 **Returns:**
 
 (*no returns*)
       """
-      self.rpc_proxy.register_monitored_signal(self.session, signal)
+      self.rpc_proxy.register_monitored_signal(self.session, signal, match_filter)
 
    def wait_for_signal(self, wait_signal="", timeout=0):
       """
@@ -254,9 +463,9 @@ Wait for a specific DBus signal to be received within a specified timeout period
 
 * ``timeout``
 
-  / *Condition*: optional / *Type*: int / *Default*: 0 /
+  / *Condition*: optional / *Type*: float / *Default*: 0 /
 
-  The maximum time (in seconds) to wait for the signal.
+  The maximum time (in seconds) to wait for the signal. Fractions of a second are allowed.
 
 **Returns:**
 
@@ -266,7 +475,475 @@ Wait for a specific DBus signal to be received within a specified timeout period
 
   The signal payloads.
       """
-      return self.rpc_proxy.wait_for_signal(self.session, wait_signal, timeout)
+      return self.rpc_proxy.wait_for_signal(self.session, wait_signal, float(timeout))
+
+   def wait_for_signal_matching(self, wait_signal="", predicate="", predicate_type="regex", timeout=0):
+      """
+Wait for an emission of a DBus signal whose payloads match a predicate.
+
+The predicate is evaluated by the agent, so that only the matching emission is sent back.
+
+**Arguments:**
+
+* ``wait_signal``
+
+  / *Condition*: optional / *Type*: str / *Default*: '' /
+
+  The name of the DBus signal to wait for.
+
+* ``predicate``
+
+  / *Condition*: required / *Type*: str /
+
+  The predicate the payloads must match, depending on ``predicate_type``:
+
+  - 'regex': a regular expression searched in the string representation of the payloads, e.g. "state=READY".
+  - 'field': an equality ``field.path=value`` on a field of the payloads. The path consists of dictionary keys
+    and list indexes separated by '.', e.g. "0.state=READY".
+  - 'expression': a Python expression evaluated with the payloads bound to ``payloads``, e.g. "payloads[1] > 3".
+    Expression predicates are local-only: they execute Python code, so a DBus agent rejects them
+    unless it has been started with ``--allow-expression-predicates``.
+
+* ``predicate_type``
+
+  / *Condition*: optional / *Type*: str / *Default*: 'regex' /
+
+  The type of the predicate: 'regex', 'field' or 'expression'.
+
+* ``timeout``
+
+  / *Condition*: optional / *Type*: float / *Default*: 0 /
+
+  The maximum time (in seconds) to wait for the signal. Fractions of a second are allowed.
+
+**Returns:**
+
+* ``payloads``
+
+  / *Type*: Any /
+
+  The payloads of the matching emission.
+      """
+      return self.rpc_proxy.wait_for_signal_matching(self.session, wait_signal, predicate, predicate_type, float(timeout))
+
+   def wait_for_any_signal(self, signals="", timeout=0):
+      """
+Wait for any of several DBus signals to be received within a specified timeout period.
+
+**Arguments:**
+
+* ``signals``
+
+  / *Condition*: optional / *Type*: str / *Default*: '' /
+
+  The names of the DBus signals to wait for. It can be a list of signal names,
+  or multiple signal names joined by ','. For example: "signal1,signal2,signal3".
+
+* ``timeout``
+
+  / *Condition*: optional / *Type*: float / *Default*: 0 /
+
+  The maximum time (in seconds) to wait for the signals. Fractions of a second are allowed.
+
+**Returns:**
+
+* ``signal_info``
+
+  / *Type*: tuple /
+
+  The name of the received signal and its payloads.
+      """
+      if isinstance(signals, list):
+         signals = ",".join(signals)
+      return tuple(self.rpc_proxy.wait_for_any_signal(self.session, signals, float(timeout)))
+
+   def get_signal_statistics(self, signal=None):
+      """
+Get the counters of the received emissions of the subscribed signals.
+The emissions are counted by the agent, where the signals are received.
+
+**Arguments:**
+
+* ``signal``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The name of the DBus signal. None means all signals.
+
+**Returns:**
+
+* ``statistics``
+
+  / *Type*: dict /
+
+  The counters of the signal, or a dictionary of the counters of all signals keyed by signal name
+  (filtered subscriptions as 'signal[filter]'):
+
+  - 'count': the number of received emissions.
+  - 'rate': the emissions per second over the sliding window of 'window' seconds.
+  - 'last_received': the time (in seconds) since the last emission.
+  - 'inter_arrival_min', 'inter_arrival_mean', 'inter_arrival_max', 'inter_arrival_p99':
+    the times (in seconds) between consecutive emissions.
+      """
+      return self.rpc_proxy.get_signal_statistics(self.session, signal)
+
+   def start_signal_recording(self, file_path, signals=None,
+                              max_bytes=SignalRecorder.DEFAULT_MAX_BYTES,
+                              backup_count=SignalRecorder.DEFAULT_BACKUP_COUNT,
+                              queue_size=SignalRecorder.DEFAULT_QUEUE_SIZE,
+                              flush_interval=SignalRecorder.DEFAULT_FLUSH_INTERVAL):
+      """
+Start recording every emission of the object's signals to a rotating, compressed JSONL file.
+The recording is written by the agent, so the file path refers to the agent host.
+
+**Arguments:**
+
+* ``file_path``
+
+  / *Condition*: required / *Type*: str /
+
+  The path of the gzip compressed JSONL recording file, e.g. 'signals.jsonl.gz'.
+
+* ``signals``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The names of the signals to record, joined by ','. None means all signals of the object.
+
+* ``max_bytes``
+
+  / *Condition*: optional / *Type*: int / *Default*: 64 MiB /
+
+  The uncompressed size after which the file is rotated. 0 disables the rotation.
+
+* ``backup_count``
+
+  / *Condition*: optional / *Type*: int / *Default*: 5 /
+
+  The number of rotated files to keep as '<file_path>.1' (newest) to '<file_path>.N' (oldest).
+  0 disables the rotation, like a ``max_bytes`` of 0.
+
+* ``queue_size``
+
+  / *Condition*: optional / *Type*: int / *Default*: 10000 /
+
+  The maximum number of emissions waiting for the writer thread. Further emissions are dropped and counted.
+
+* ``flush_interval``
+
+  / *Condition*: optional / *Type*: float / *Default*: 1.0 /
+
+  The maximum time (in seconds) recorded emissions may stay buffered before they are flushed to the file.
+
+**Returns:**
+
+(*no returns*)
+      """
+      self.rpc_proxy.start_signal_recording(self.session, file_path, signals, int(max_bytes), int(backup_count),
+                                            int(queue_size), float(flush_interval))
+
+   def stop_signal_recording(self):
+      """
+Stop recording signals, write the remaining emissions and close the recording file.
+
+**Returns:**
+
+* ``statistics``
+
+  / *Type*: dict /
+
+  The statistics of the recording: 'file_path', 'recorded' (written emissions), 'dropped' (emissions
+  dropped because the writer could not keep up) and 'rotations'.
+      """
+      return self.rpc_proxy.stop_signal_recording(self.session)
+
+   def get_method_latency_statistics(self, method_name=None):
+      """
+Get the latencies of the DBus method calls of the connection.
+
+The client-side round trip of the synchronous calls, including the transport to the agent, is kept separately
+from the execution time of the calls on the agent (synchronous, asynchronous and batched calls).
+
+**Arguments:**
+
+* ``method_name``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The name of the DBus method. None means all methods.
+
+**Returns:**
+
+  / *Type*: dict /
+
+  The latencies of the method as {'round_trip': summary, 'agent': summary}, or a dictionary of them keyed by
+  method name. A summary has the keys 'count', 'min', 'mean', 'max', 'p50', 'p90', 'p99' and 'p99_9' (seconds).
+      """
+      if method_name is not None:
+         return {"round_trip": self._method_latency.get_statistics(method_name),
+                 "agent": self.rpc_proxy.get_method_latency_statistics(self.session, method_name)}
+
+      statistics = {}
+      for name, summary in self._method_latency.get_statistics().items():
+         statistics.setdefault(name, {})["round_trip"] = summary
+      for name, summary in self.rpc_proxy.get_method_latency_statistics(self.session).items():
+         statistics.setdefault(name, {})["agent"] = summary
+      return statistics
+
+   def get_dbus_property(self, property_name, interface=None, use_cache=True):
+      """
+Get the value of a DBus property. The property cache is kept by the agent.
+
+**Arguments:**
+
+* ``property_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the DBus property.
+
+* ``interface``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The interface of the property. None means the first interface which has the property.
+
+* ``use_cache``
+
+  / *Condition*: optional / *Type*: bool / *Default*: True /
+
+  If True, the value is served from the property cache. If False, it is read from the service.
+
+**Returns:**
+
+  / *Type*: Any /
+
+  The value of the property.
+      """
+      return self.rpc_proxy.get_dbus_property(self.session, property_name, interface, use_cache)
+
+   def set_dbus_property(self, property_name, value, interface=None):
+      """
+Set the value of a DBus property.
+
+**Arguments:**
+
+* ``property_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the DBus property.
+
+* ``value``
+
+  / *Condition*: required / *Type*: Any /
+
+  The new value.
+
+* ``interface``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The interface of the property. None means the first interface which has the property.
+
+**Returns:**
+
+(*no returns*)
+      """
+      self.rpc_proxy.set_dbus_property(self.session, property_name, value, interface)
+
+   def get_all_dbus_properties(self, interface=None, use_cache=True):
+      """
+Get the values of all readable DBus properties of the object or of one of its interfaces.
+
+**Arguments:**
+
+* ``interface``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The interface of the properties. None means all interfaces of the object.
+
+* ``use_cache``
+
+  / *Condition*: optional / *Type*: bool / *Default*: True /
+
+  If True, the values are served from the property cache. If False, they are read from the service.
+
+**Returns:**
+
+  / *Type*: dict /
+
+  The values of the properties keyed by property name.
+      """
+      return self.rpc_proxy.get_all_dbus_properties(self.session, interface, use_cache)
+
+   def wait_for_property_value(self, property_name, value, timeout=0, interface=None):
+      """
+Wait until a DBus property has an expected value. The agent waits for the ``PropertiesChanged`` signal,
+so only one request is sent.
+
+**Arguments:**
+
+* ``property_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the DBus property.
+
+* ``value``
+
+  / *Condition*: required / *Type*: Any /
+
+  The expected value. It also matches a value with the same string representation.
+
+* ``timeout``
+
+  / *Condition*: optional / *Type*: float / *Default*: 0 /
+
+  The maximum time (in seconds) to wait. Fractions of a second are allowed.
+
+* ``interface``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The interface of the property. None means the first interface which has the property.
+
+**Returns:**
+
+  / *Type*: Any /
+
+  The value of the property.
+      """
+      return self.rpc_proxy.wait_for_property_value(self.session, property_name, value, timeout, interface)
+
+   def index_managed_objects(self, manager_path=None):
+      """
+Load the index of the objects exported by the object manager of the service, using the index kept by the agent.
+
+**Arguments:**
+
+* ``manager_path``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The object path of the object manager. None means the object path of the connection.
+
+**Returns:**
+
+  / *Type*: int /
+
+  The number of indexed objects.
+      """
+      return self.rpc_proxy.index_managed_objects(self.session, manager_path)
+
+   def find_objects_by_interface(self, interface):
+      """
+Get the managed objects which implement an interface, using the index kept by the agent.
+
+**Arguments:**
+
+* ``interface``
+
+  / *Condition*: required / *Type*: str /
+
+  The interface name.
+
+**Returns:**
+
+  / *Type*: list /
+
+  The sorted object paths.
+      """
+      return self.rpc_proxy.find_objects_by_interface(self.session, interface)
+
+   def find_objects_by_property(self, interface, property_name, value):
+      """
+Get the managed objects whose property has a value, using the index kept by the agent.
+
+**Arguments:**
+
+* ``interface``
+
+  / *Condition*: required / *Type*: str /
+
+  The interface name.
+
+* ``property_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the property.
+
+* ``value``
+
+  / *Condition*: required / *Type*: Any /
+
+  The value, compared by its string representation.
+
+**Returns:**
+
+  / *Type*: list /
+
+  The sorted object paths.
+      """
+      return self.rpc_proxy.find_objects_by_property(self.session, interface, property_name, value)
+
+   def get_managed_object(self, object_path):
+      """
+Get the interfaces and properties of a managed object from the index, using the index kept by the agent.
+
+**Arguments:**
+
+* ``object_path``
+
+  / *Condition*: required / *Type*: str /
+
+  The object path.
+
+**Returns:**
+
+  / *Type*: dict /
+
+  The properties of the object keyed by interface name.
+      """
+      return self.rpc_proxy.get_managed_object(self.session, object_path)
+
+   def call_object_method(self, object_path, method_name, *args):
+      """
+Call a DBus method of another object of the service, e.g. of a managed object.
+
+**Arguments:**
+
+* ``object_path``
+
+  / *Condition*: required / *Type*: str /
+
+  The object path.
+
+* ``method_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the DBus method to be called.
+
+* ``args``
+
+  / *Condition*: optional / *Type*: tuple / *Default*: None /
+
+  Input arguments to be passed to the method.
+
+**Returns:**
+
+  / *Type*: Any /
+
+  The return value of the method.
+      """
+      start_time = time.perf_counter()
+      try:
+         return self.rpc_proxy.call_object_method(self.session, object_path, method_name, *_to_rpc_args(args))
+      finally:
+         self._method_latency.record(method_name, time.perf_counter() - start_time)
 
    def call_dbus_method(self, method_name, *args):
       """
@@ -294,4 +971,120 @@ Call a DBus method with the specified method name and input arguments.
 
   Connection object.
       """
-      return self.rpc_proxy.call_dbus_method(self.session, method_name, *args)
+      start_time = time.perf_counter()
+      try:
+         return self.rpc_proxy.call_dbus_method(self.session, method_name, *_to_rpc_args(args))
+      finally:
+         self._method_latency.record(method_name, time.perf_counter() - start_time)
+
+   def call_dbus_method_async(self, method_name, *args):
+      """
+Call a DBus method asynchronously on the remote machine and return a handle to its result immediately.
+
+**Arguments:**
+
+* ``method_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the DBus method to be called.
+
+* ``args``
+
+  / *Condition*: optional / *Type*: tuple / *Default*: None /
+
+  Input arguments to be passed to the method.
+
+**Returns:**
+
+* ``handle_id``
+
+  / *Type*: str /
+
+  The handle to get the result of the call with.
+      """
+      return self.rpc_proxy.call_dbus_method_async(self.session, method_name, *_to_rpc_args(args))
+
+   def wait_for_method_result(self, handle_id, timeout=None):
+      """
+Wait for the result of an asynchronous DBus method call.
+
+**Arguments:**
+
+* ``handle_id``
+
+  / *Condition*: required / *Type*: str /
+
+  The handle returned by ``call_dbus_method_async``.
+
+* ``timeout``
+
+  / *Condition*: optional / *Type*: float / *Default*: None /
+
+  The maximum time (in seconds) to wait. None means to wait without limit.
+
+**Returns:**
+
+  / *Type*: Any /
+
+  Return from called method.
+      """
+      return self.rpc_proxy.wait_for_method_result(self.session, handle_id, timeout)
+
+   def wait_for_all_method_results(self, timeout=None):
+      """
+Wait for the results of all pending asynchronous DBus method calls.
+
+**Arguments:**
+
+* ``timeout``
+
+  / *Condition*: optional / *Type*: float / *Default*: None /
+
+  The maximum time (in seconds) to wait for all calls. None means to wait without limit.
+
+**Returns:**
+
+  / *Type*: list /
+
+  Returns from the called methods in issue order.
+      """
+      return self.rpc_proxy.wait_for_all_method_results(self.session, timeout)
+
+   def call_dbus_method_batch(self, calls, stop_on_error=False, timeout=None):
+      """
+Call a batch of DBus methods on the remote machine. The whole batch is forwarded to the DBus Agent
+in a single request, which sends the calls pipelined and collects their results in order.
+
+**Arguments:**
+
+* ``calls``
+
+  / *Condition*: required / *Type*: list /
+
+  The calls of the batch. Each call is a (method, args) tuple, where ``args`` is a list of input arguments.
+
+* ``stop_on_error``
+
+  / *Condition*: optional / *Type*: bool / *Default*: False /
+
+  If True, the batch stops at the first error.
+
+* ``timeout``
+
+  / *Condition*: optional / *Type*: float / *Default*: None /
+
+  The maximum time (in seconds) to wait for the batch. None means to wait without limit.
+
+**Returns:**
+
+* ``report``
+
+  / *Type*: list /
+
+  A dictionary per call with its 'method', 'status', 'result', 'error' and 'elapsed' time.
+      """
+      calls = [[call, []] if isinstance(call, str)
+               else [call[0], _to_rpc_args(call[1])] if len(call) == 2 and isinstance(call[1], (list, tuple))
+               else list(call) for call in calls]
+      return self.rpc_proxy.call_dbus_method_batch(self.session, calls, bool(stop_on_error), timeout)
@@ -29,17 +29,16 @@
 from robot.api import logger
 from robot.libraries.BuiltIn import BuiltIn
 from robot.api.deco import keyword
-from RobotFramework_DBus.dbus_client import DBusClient
 from RobotFramework_DBus.dbus_client_remote import DBusClientRemote
 from RobotFramework_DBus.common.utils import Singleton
+from RobotFramework_DBus.common.signal_buffer import CapturedSignalStore
+from RobotFramework_DBus.common.handler_dispatcher import HandlerDispatcher
+from RobotFramework_DBus.common.register_keyword import RegisterKeyword
+from RobotFramework_DBus.common.signal_recorder import SignalRecorder
 import threading
-import platform
-if platform.system().lower().startswith("linux"):
-   from dasbus.connection import SessionMessageBus
-   from dasbus.identifier import DBusServiceIdentifier, DBusObjectIdentifier
-   from dasbus.client.proxy import disconnect_proxy
-   from dasbus.client.observer import DBusObserver
-   from dasbus.loop import EventLoop
+import json
+import os
+import time
 
 
 class DBusManager(Singleton):
@@ -48,6 +47,9 @@ Class to manage all DBus connections.
    """
    ROBOT_LIBRARY_SCOPE = 'GLOBAL'
    ROBOT_AUTO_KEYWORDS = False
+   ROBOT_LISTENER_API_VERSION = 2
+
+   ENV_LATENCY_DUMP_FILE = "ROBOTFRAMEWORK_DBUS_LATENCY_DUMP"
 
    ERR_CONNECTION_NAME_EXIST_STR = "The connection name '%s' has already existed! Please use other name"
    ERR_UNNABLE_CREATE_CONNECTION_STR = "Unable to create connection. Exception: %s"
@@ -56,6 +58,11 @@ Class to manage all DBus connections.
    ERR_REGISTER_SIGNAL_STR = "Unable to register '%s' signal to monitoring list. Exception: %s"
    ERR_CALL_DBUS_METHOD_STR = "Problem occurs when calling '%s' method.  Exception: %s"
    ERR_WAIT_DBUS_SIGNAL_STR = "Problem occurs when waiting for '%s' signal.  Exception: %s"
+   ERR_WAIT_METHOD_RESULT_STR = "Problem occurs when waiting for the result of '%s' method call.  Exception: %s"
+   ERR_SIGNAL_RECORDING_STR = "Problem occurs when recording the signals of '%s' connection.  Exception: %s"
+   ERR_CONFIGURE_HANDLER_DISPATCHER_STR = "Unable to configure the signal handler dispatcher. Exception: %s"
+   ERR_DBUS_PROPERTY_STR = "Problem occurs when accessing '%s' property.  Exception: %s"
+   ERR_OBJECT_INDEX_STR = "Problem occurs when querying the managed objects of '%s' connection.  Exception: %s"
 
    idx = 0
 
@@ -68,6 +75,72 @@ Constructor for DBusManager class.
 (*no returns*)
       """
       self.connection_manage_dict = {}
+      self.closed_latency_statistics = {}
+      self.ROBOT_LIBRARY_LISTENER = self
+
+   def _end_suite(self, name, attrs):
+      """
+Listener method called at the end of every suite. Dumps the method latency statistics if the
+``ROBOTFRAMEWORK_DBUS_LATENCY_DUMP`` environment variable names a dump file.
+
+**Arguments:**
+
+* ``name``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the suite.
+
+* ``attrs``
+
+  / *Condition*: required / *Type*: dict /
+
+  The attributes of the suite.
+
+**Returns:**
+
+(*no returns*)
+      """
+      dump_file = os.environ.get(DBusManager.ENV_LATENCY_DUMP_FILE)
+      if dump_file:
+         try:
+            self.dump_method_latency_statistics(dump_file)
+         except Exception as ex:
+            logger.warn("Unable to dump the method latency statistics to '%s'. Exception: %s" % (dump_file, ex))
+
+   def _close(self):
+      """
+Listener method called when the library goes out of scope at the end of the execution. Quits the
+connections which have not been disconnected, while their threads are still running.
+
+**Returns:**
+
+(*no returns*)
+      """
+      self.quit()
+
+   def _keep_method_latency_statistics(self, connection_name):
+      """
+Keep the method latency statistics of a connection which is going to be closed.
+
+**Arguments:**
+
+* ``connection_name``
+
+  / *Condition*: required / *Type*: str /
+
+  Connection's name.
+
+**Returns:**
+
+(*no returns*)
+      """
+      try:
+         statistics = self.connection_manage_dict[connection_name].get_method_latency_statistics()
+      except Exception as _ex:
+         return
+      if statistics:
+         self.closed_latency_statistics[connection_name] = statistics
 
    def __del__(self):
       """
@@ -179,13 +252,19 @@ Keyword for disconnecting a connection by name.
 (*no returns*)
       """
       if connection_name in self.connection_manage_dict.keys():
+         self._keep_method_latency_statistics(connection_name)
          self.connection_manage_dict[connection_name].quit()
          del self.connection_manage_dict[connection_name]
       elif connection_name.startswith("ALL"):
+         for name in list(self.connection_manage_dict.keys()):
+            self._keep_method_latency_statistics(name)
          self.connection_manage_dict.clear()
 
    @keyword
-   def connect(self, conn_name='default_conn', namespace="", object_path=None, mode = "local", host="localhost", port=2507):
+   def connect(self, conn_name='default_conn', namespace="", object_path=None, mode = "local", host="localhost", port=2507,
+               signal_queue_size=CapturedSignalStore.DEFAULT_CAPACITY,
+               signal_overflow_policy=CapturedSignalStore.OVERFLOW_DROP_OLDEST,
+               introspection_cache=True, refresh_introspection=False, transport="xmlrpc", transport_address=None):
       """
 Keyword used to establish a DBus connection.
 
@@ -240,6 +319,65 @@ Keyword used to establish a DBus connection.
 
   This parameter is applicable only if `mode` is set to 'remote'.
 
+* ``signal_queue_size``
+
+  / *Condition*: optional / *Type*: int / *Default*: 100 /
+
+  The maximum number of captured emissions kept per signal.
+  Emissions are queued until they are consumed by the `Wait For Signal` keyword,
+  so that bursts of a signal are not lost.
+
+* ``signal_overflow_policy``
+
+  / *Condition*: optional / *Type*: str / *Default*: 'drop-oldest' /
+
+  What to do when the queue of a signal is full. Possible values are:
+
+  - 'drop-oldest': discard the oldest emission to make room for the new one.
+  - 'drop-newest': discard the new emission.
+  - 'latest-only': keep only the most recent emission.
+
+* ``introspection_cache``
+
+  / *Condition*: optional / *Type*: bool / *Default*: True /
+
+  If True, the introspection data of the DBus object is stored in a persistent on-disk cache
+  (``~/.cache/robotframework-dbus/introspection`` or the directory set by the
+  ``ROBOTFRAMEWORK_DBUS_INTROSPECTION_CACHE`` environment variable) and later connections build
+  their proxy from it without introspecting the object again. Entries are invalidated when the
+  executable of the service changes, so each connect still costs one call to the bus daemon to validate
+  the entry; only the introspection itself is saved.
+
+* ``refresh_introspection``
+
+  / *Condition*: optional / *Type*: bool / *Default*: False /
+
+  If True, the DBus object is introspected again and its cache entry is replaced.
+
+* ``transport``
+
+  / *Condition*: optional / *Type*: str / *Default*: 'xmlrpc' /
+
+  The transport to the DBus agent. Possible values are:
+
+  - 'xmlrpc': one HTTP request per call.
+  - 'framed': one persistent TCP or Unix socket connection with length-prefixed msgpack frames.
+    The requests carry IDs, so that method calls and the emissions pushed to the signal handlers
+    share the connection. It requires the optional 'msgpack' package on both systems.
+    If the framed endpoint cannot be used, the connection falls back to XML-RPC with a warning.
+
+  This parameter is applicable only if `mode` is set to 'remote'.
+
+* ``transport_address``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The framed endpoint of the DBus agent: a port, 'host:port' or the path of a Unix socket.
+  If not provided, the port after `port` on `host` is used. The agent serves the framed transport only
+  if it is started with ``--framed-port`` or ``--framed-socket``.
+
+  This parameter is applicable only if `transport` is set to 'framed'.
+
 **Returns:**
 
 (*no returns*)
@@ -253,9 +391,15 @@ Keyword used to establish a DBus connection.
 
       try:
          if mode == 'local':
-            connection_obj = DBusClient(namespace, object_path)
+            # Imported on the first local connection, so that remote-only tests need neither dasbus nor a session bus.
+            from RobotFramework_DBus.dbus_client import DBusClient
+            connection_obj = DBusClient(namespace, object_path, int(signal_queue_size), signal_overflow_policy,
+                                        introspection_cache, refresh_introspection)
          elif mode == 'remote':
-            connection_obj = DBusClientRemote(namespace, object_path, host, int(port))
+            connection_obj = DBusClientRemote(namespace, object_path, host, int(port),
+                                              int(signal_queue_size), signal_overflow_policy,
+                                              introspection_cache, refresh_introspection,
+                                              transport, transport_address)
       except Exception as ex:
          # BuiltIn().log("Unable to create connection. Exception: %s" % ex, constants.LOG_LEVEL_ERROR)
          raise AssertionError("Unable to create connection. Exception: %s" % ex)
@@ -274,7 +418,7 @@ Keyword used to establish a DBus connection.
          raise Exception(DBusManager.ERR_UNNABLE_CREATE_CONNECTION_STR % ex)
 
    @keyword
-   def set_signal_received_handler(self, conn_name="", signal="", handler=None):
+   def set_signal_received_handler(self, conn_name="", signal="", handler=None, priority=0, match_filter=None):
       """
 Keyword used to set a signal received handler for a specific DBus connection and signal.
 
@@ -299,6 +443,21 @@ Keyword used to set a signal received handler for a specific DBus connection and
   The keyword to handle the received signal.
   The handler should accept the necessary parameters based on the signal being handled.
 
+* ``priority``
+
+  / *Condition*: optional / *Type*: int / *Default*: 0 /
+
+  The dispatch priority of the handler. Handler keywords are run by the handler dispatcher's workers,
+  and when handler calls are queued up, the ones with a higher priority are run first.
+
+* ``match_filter``
+
+  / *Condition*: optional / *Type*: str / dict / *Default*: None /
+
+  DBus match-rule filters applied by the bus daemon, so that only matching emissions reach the handler.
+  Either a dictionary or comma-separated ``key=value`` pairs with the keys 'arg0', 'arg0namespace'
+  and 'path_namespace', e.g. "arg0=org.example.Service".
+
 **Returns:**
 
 (*no returns*)
@@ -308,7 +467,7 @@ Keyword used to set a signal received handler for a specific DBus connection and
 
       connection_obj = self.connection_manage_dict[conn_name]
       try:
-         connection_obj.set_signal_received_handler(signal, handler)
+         connection_obj.set_signal_received_handler(signal, handler, int(priority), match_filter)
       except Exception as ex:
          raise Exception(DBusManager.ERR_SET_SIGNAL_HANDLER_STR % (handler, signal, ex))
 
@@ -351,7 +510,7 @@ Keyword used to set a signal received handler for a specific DBus connection and
          raise Exception(DBusManager.ERR_UNSET_SIGNAL_HANDLER_STR % (handler, signal, ex))
 
    @keyword
-   def register_signal(self, conn_name="default_conn", signal=""):
+   def register_signal(self, conn_name="default_conn", signal="", match_filter=None):
       """
 Keyword used to register a DBus signal or signals to be monitored for a specific connection.
 
@@ -370,6 +529,17 @@ Keyword used to register a DBus signal or signals to be monitored for a specific
   The name of the DBus signal(s) to register. It can be a single signal name as a string,
   or multiple signal names joined by ','. For example: "signal1,signal2,signal3".
 
+* ``match_filter``
+
+  / *Condition*: optional / *Type*: str / dict / *Default*: None /
+
+  DBus match-rule filters applied by the bus daemon, so that other emissions never reach the process.
+  Either a dictionary or comma-separated ``key=value`` pairs with the keys 'arg0', 'arg0namespace'
+  and 'path_namespace', e.g. "arg0=org.example.Service".
+
+  If the signal is already monitored, its filter is replaced. `Wait For Signal` uses the filter
+  of the monitored signal.
+
 **Returns:**
 
 (*no returns*)
@@ -379,15 +549,173 @@ Keyword used to register a DBus signal or signals to be monitored for a specific
 
       connection_obj = self.connection_manage_dict[conn_name]
       try:
-         connection_obj.register_monitored_signal(signal)
+         connection_obj.register_monitored_signal(signal, match_filter)
       except Exception as ex:
          raise Exception(DBusManager.ERR_REGISTER_SIGNAL_STR % (signal, ex))
 
+   @keyword
+   def get_signal_statistics(self, conn_name="default_conn", signal=None):
+      """
+Keyword used to get the counters of the signal emissions received by a connection.
+
+Use it to detect a service flooding the bus, e.g. by checking the 'rate' of a signal.
+Signals are counted as soon as they are registered, waited for or handled on the connection.
+In remote mode the emissions are counted by the agent.
+
+**Arguments:**
+
+* ``conn_name``
+
+  / *Condition*: optional / *Type*: str / *Default*: 'default_conn' /
+
+  The name of the DBus connection.
+
+* ``signal``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The name of the DBus signal. None means all signals.
+
+**Returns:**
+
+* ``statistics``
+
+  / *Type*: dict /
+
+  The counters of the signal, or a dictionary of the counters of all signals keyed by signal name
+  (filtered subscriptions as 'signal[filter]'):
+
+  - 'count': the number of received emissions.
+  - 'rate': the emissions per second over the sliding window of 'window' seconds. Right after the first
+    emission, the rate is computed over at least 0.5 seconds.
+  - 'last_received': the time (in seconds) since the last emission.
+  - 'inter_arrival_min', 'inter_arrival_mean', 'inter_arrival_max', 'inter_arrival_p99':
+    the times (in seconds) between consecutive emissions.
+      """
+      if conn_name not in self.connection_manage_dict.keys():
+         raise AssertionError("The '%s' connection  hasn't been established. Please connect first." % conn_name)
+
+      return self.connection_manage_dict[conn_name].get_signal_statistics(signal)
+
+   @keyword
+   def start_signal_recording(self, conn_name="default_conn", file_path="", signals=None,
+                              max_bytes=SignalRecorder.DEFAULT_MAX_BYTES,
+                              backup_count=SignalRecorder.DEFAULT_BACKUP_COUNT,
+                              queue_size=SignalRecorder.DEFAULT_QUEUE_SIZE,
+                              flush_interval=SignalRecorder.DEFAULT_FLUSH_INTERVAL):
+      """
+Keyword used to start recording every signal emission of a connection to a rotating, gzip compressed JSONL file.
+
+Each line holds the signal name, interface, sender, object path, monotonic and wall timestamps and the payloads.
+Emissions are streamed to disk by a background writer thread instead of being kept in memory.
+In remote mode the file is written on the agent host.
+
+The recording can be read lazily with ``RobotFramework_DBus.common.signal_recorder.read_signal_recording``.
+
+**Arguments:**
+
+* ``conn_name``
+
+  / *Condition*: optional / *Type*: str / *Default*: 'default_conn' /
+
+  The name of the DBus connection.
+
+* ``file_path``
+
+  / *Condition*: required / *Type*: str /
+
+  The path of the gzip compressed JSONL recording file, e.g. 'signals.jsonl.gz'.
+
+* ``signals``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The names of the signals to record, joined by ','. None means all signals of the object.
+
+* ``max_bytes``
+
+  / *Condition*: optional / *Type*: int / *Default*: 64 MiB /
+
+  The uncompressed size after which the file is rotated. 0 disables the rotation.
+
+* ``backup_count``
+
+  / *Condition*: optional / *Type*: int / *Default*: 5 /
+
+  The number of rotated files to keep as '<file_path>.1' (newest) to '<file_path>.N' (oldest).
+  0 disables the rotation, like a ``max_bytes`` of 0.
+
+* ``queue_size``
+
+  / *Condition*: optional / *Type*: int / *Default*: 10000 /
+
+  The maximum number of emissions waiting for the writer thread. Further emissions are dropped and counted.
+
+* ``flush_interval``
+
+  / *Condition*: optional / *Type*: float / *Default*: 1.0 /
+
+  The maximum time (in seconds) recorded emissions may stay buffered before they are flushed to the file.
+
+**Returns:**
+
+(*no returns*)
+      """
+      if conn_name not in self.connection_manage_dict.keys():
+         raise AssertionError("The '%s' connection  hasn't been established. Please connect first." % conn_name)
+
+      connection_obj = self.connection_manage_dict[conn_name]
+      try:
+         connection_obj.start_signal_recording(file_path, signals, int(max_bytes), int(backup_count),
+                                               int(queue_size), float(flush_interval))
+      except Exception as ex:
+         raise Exception(DBusManager.ERR_SIGNAL_RECORDING_STR % (conn_name, ex))
+
+   @keyword
+   def stop_signal_recording(self, conn_name="default_conn"):
+      """
+Keyword used to stop recording the signal emissions of a connection.
+
+All emissions received until now are written and the recording file is closed.
+If writing the recording has failed, e.g. because the disk is full, the keyword fails with the error of
+the writer.
+
+**Arguments:**
+
+* ``conn_name``
+
+  / *Condition*: optional / *Type*: str / *Default*: 'default_conn' /
+
+  The name of the DBus connection.
+
+**Returns:**
+
+* ``statistics``
+
+  / *Type*: dict /
+
+  The statistics of the recording: 'file_path', 'recorded' (written emissions), 'dropped' (emissions
+  dropped because the writer could not keep up) and 'rotations'.
+      """
+      if conn_name not in self.connection_manage_dict.keys():
+         raise AssertionError("The '%s' connection  hasn't been established. Please connect first." % conn_name)
+
+      connection_obj = self.connection_manage_dict[conn_name]
+      try:
+         return connection_obj.stop_signal_recording()
+      except Exception as ex:
+         raise Exception(DBusManager.ERR_SIGNAL_RECORDING_STR % (conn_name, ex))
+
    @keyword
    def call_dbus_method(self, conn_name="default_conn", method_name="", *args):
       """
 Keyword used to call a DBus method with the specified method name and input arguments.
 
+The arguments are converted to the input signature of the method, so that they can be given as strings,
+e.g. ``42`` for a 'u' argument or ``[1, 2, 3]`` for an 'ai' argument. Large numeric arrays, bytes and
+``array.array`` objects are passed in bulk. String arguments ('s', 'o', 'g') must be given as strings, other
+values are rejected instead of being converted with ``str()``.
+
 **Arguments:**
 
 * ``conn_name``
@@ -428,53 +756,62 @@ Keyword used to call a DBus method with the specified method name and input argu
 
       return ret_obj
 
-#    @keyword
-#    def call_dbus_method_with_keyword_args(self, conn_name="default_conn", method_name="", **kwargs):
-#       """
-# Keyword used to call a DBus method with the specified method name and input keyword arguments.
+   @keyword
+   def get_dbus_property(self, conn_name="default_conn", property_name="", interface=None, use_cache=True):
+      """
+Keyword used to get the value of a DBus property.
 
-# **Arguments:**
+The properties of an interface are loaded into the property cache of the connection with one ``GetAll`` call
+and kept up to date by the ``PropertiesChanged`` signal, so most reads are served without calling the service.
+In remote mode the cache is kept by the agent.
 
-# * ``conn_name``
+**Arguments:**
 
-#   / *Condition*: optional / *Type*: str / *Default*: 'default_conn' /
+* ``conn_name``
 
-#   The name of the DBus connection.
+  / *Condition*: optional / *Type*: str / *Default*: 'default_conn' /
 
-# * ``method_name``
+  The name of the DBus connection.
 
-#   / *Condition*: optional / *Type*: str / *Default*: '' /
+* ``property_name``
 
-#   The name of the DBus method to be called.
+  / *Condition*: required / *Type*: str /
 
-# * ``kwargs``
+  The name of the DBus property.
 
-#   / *Condition*: optional / *Type*: dict / *Default*: None /
+* ``interface``
 
-#   Input keyword arguments to be passed to the method.
+  / *Condition*: optional / *Type*: str / *Default*: None /
 
-# **Returns:**
+  The interface of the property. None means the first interface which has the property.
 
-#   / *Type*: Any /
+* ``use_cache``
 
-#   Return from called method.
-#       """
-#       if conn_name not in self.connection_manage_dict.keys():
-#          raise AssertionError("The '%s' connection  hasn't been established. Please connect first." % conn_name)
+  / *Condition*: optional / *Type*: bool / *Default*: True /
 
-#       ret_obj = None
-#       connection_obj = self.connection_manage_dict[conn_name]
-#       try:
-#          ret_obj = connection_obj.call_dbus_method_with_keyword_args(method_name, **kwargs)
-#       except Exception as ex:
-#          raise Exception(DBusManager.ERR_CALL_DBUS_METHOD_STR % (method_name, ex))
+  If False, the cache is bypassed and the value is read from the service,
+  e.g. for properties whose changes are not signaled.
 
-#       return ret_obj
+**Returns:**
+
+* ``value``
+
+  / *Type*: Any /
+
+  The value of the property.
+      """
+      if conn_name not in self.connection_manage_dict.keys():
+         raise AssertionError("The '%s' connection  hasn't been established. Please connect first." % conn_name)
+
+      try:
+         return self.connection_manage_dict[conn_name].get_dbus_property(property_name, interface, use_cache)
+      except Exception as ex:
+         raise Exception(DBusManager.ERR_DBUS_PROPERTY_STR % (property_name, ex))
 
    @keyword
-   def wait_for_signal(self, conn_name="default_conn", signal="", timeout=0):
+   def set_dbus_property(self, conn_name="default_conn", property_name="", value=None, interface=None):
       """
-Keyword used to wait for a specific DBus signal to be received within a specified timeout period.
+Keyword used to set the value of a DBus property.
 
 **Arguments:**
 
@@ -484,37 +821,879 @@ Keyword used to wait for a specific DBus signal to be received within a specifie
 
   The name of the DBus connection.
 
-* ``signal``
+* ``property_name``
 
-  / *Condition*: optional / *Type*: str / *Default*: '' /
+  / *Condition*: required / *Type*: str /
 
-  The name of the DBus signal to wait for.
+  The name of the DBus property.
 
-* ``timeout``
+* ``value``
 
-  / *Condition*: optional / *Type*: int / *Default*: 0 /
+  / *Condition*: required / *Type*: Any /
 
-  The maximum time (in seconds) to wait for the signal.
+  The new value. It must match the type of the property.
 
-**Returns:**
+* ``interface``
 
-* ``payloads``
+  / *Condition*: optional / *Type*: str / *Default*: None /
 
-  / *Type*: str /
+  The interface of the property. None means the first interface which has the property.
 
-  The signal payloads.
+**Returns:**
+
+(*no returns*)
       """
       if conn_name not in self.connection_manage_dict.keys():
-         raise Exception("The '%s' connection  hasn't been established. Please connect first." % conn_name)
+         raise AssertionError("The '%s' connection  hasn't been established. Please connect first." % conn_name)
 
-      connection_obj = self.connection_manage_dict[conn_name]
-      payloads = None
       try:
-         payloads = connection_obj.wait_for_signal(signal, timeout)
-      except AssertionError as ae:
-         raise ae
+         self.connection_manage_dict[conn_name].set_dbus_property(property_name, value, interface)
       except Exception as ex:
-         raise Exception(DBusManager.ERR_WAIT_DBUS_SIGNAL_STR % (signal, ex))
+         raise Exception(DBusManager.ERR_DBUS_PROPERTY_STR % (property_name, ex))
 
-      return payloads
+   @keyword
+   def get_all_dbus_properties(self, conn_name="default_conn", interface=None, use_cache=True):
+      """
+Keyword used to get the values of all readable DBus properties of the object or of one of its interfaces.
+
+**Arguments:**
+
+* ``conn_name``
+
+  / *Condition*: optional / *Type*: str / *Default*: 'default_conn' /
+
+  The name of the DBus connection.
+
+* ``interface``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
 
+  The interface of the properties. None means all interfaces of the object.
+
+* ``use_cache``
+
+  / *Condition*: optional / *Type*: bool / *Default*: True /
+
+  If False, the cache is bypassed and the values are read from the service.
+
+**Returns:**
+
+* ``properties``
+
+  / *Type*: dict /
+
+  The values of the properties keyed by property name.
+      """
+      if conn_name not in self.connection_manage_dict.keys():
+         raise AssertionError("The '%s' connection  hasn't been established. Please connect first." % conn_name)
+
+      try:
+         return self.connection_manage_dict[conn_name].get_all_dbus_properties(interface, use_cache)
+      except Exception as ex:
+         raise Exception(DBusManager.ERR_DBUS_PROPERTY_STR % ("%s.*" % interface if interface else "*", ex))
+
+   @keyword
+   def wait_for_property_value(self, conn_name="default_conn", property_name="", value=None, timeout=0, interface=None):
+      """
+Keyword used to wait until a DBus property has an expected value.
+
+The current value is read once, afterwards the keyword is only woken up by the ``PropertiesChanged`` signal,
+so the service is not polled and the keyword returns as soon as the value is reached.
+In remote mode the agent waits for the value.
+
+**Arguments:**
+
+* ``conn_name``
+
+  / *Condition*: optional / *Type*: str / *Default*: 'default_conn' /
+
+  The name of the DBus connection.
+
+* ``property_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the DBus property.
+
+* ``value``
+
+  / *Condition*: required / *Type*: Any /
+
+  The expected value. It also matches a value with the same string representation, e.g. '3' matches 3.
+
+* ``timeout``
+
+  / *Condition*: optional / *Type*: float / *Default*: 0 /
+
+  The maximum time (in seconds) to wait. Fractions of a second are allowed.
+
+* ``interface``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The interface of the property. None means the first interface which has the property.
+
+**Returns:**
+
+* ``value``
+
+  / *Type*: Any /
+
+  The value of the property.
+      """
+      if conn_name not in self.connection_manage_dict.keys():
+         raise AssertionError("The '%s' connection  hasn't been established. Please connect first." % conn_name)
+
+      try:
+         return self.connection_manage_dict[conn_name].wait_for_property_value(property_name, value, timeout, interface)
+      except AssertionError as ae:
+         raise ae
+      except Exception as ex:
+         raise Exception(DBusManager.ERR_DBUS_PROPERTY_STR % (property_name, ex))
+
+   @keyword
+   def index_managed_objects(self, conn_name="default_conn", manager_path=None):
+      """
+Keyword used to load the index of the objects exported by a service which implements
+``org.freedesktop.DBus.ObjectManager``.
+
+The index is loaded with one ``GetManagedObjects`` call and then kept up to date by the ``InterfacesAdded``,
+``InterfacesRemoved`` and ``PropertiesChanged`` signals, so that `Find Objects By Interface`,
+`Find Objects By Property` and `Get Managed Object` are answered without calling the service.
+The query keywords load the index on first use, this keyword is only needed to load it again or to use
+another object manager. In remote mode the index is kept by the agent.
+
+**Arguments:**
+
+* ``conn_name``
+
+  / *Condition*: optional / *Type*: str / *Default*: 'default_conn' /
+
+  The name of the DBus connection.
+
+* ``manager_path``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The object path of the object manager. None means the object path of the connection.
+
+**Returns:**
+
+* ``count``
+
+  / *Type*: int /
+
+  The number of indexed objects.
+      """
+      if conn_name not in self.connection_manage_dict.keys():
+         raise AssertionError("The '%s' connection  hasn't been established. Please connect first." % conn_name)
+      try:
+         return self.connection_manage_dict[conn_name].index_managed_objects(manager_path)
+      except Exception as ex:
+         raise Exception(DBusManager.ERR_OBJECT_INDEX_STR % (conn_name, ex))
+
+   @keyword
+   def find_objects_by_interface(self, conn_name="default_conn", interface=""):
+      """
+Keyword used to get the managed objects which implement an interface.
+
+**Arguments:**
+
+* ``conn_name``
+
+  / *Condition*: optional / *Type*: str / *Default*: 'default_conn' /
+
+  The name of the DBus connection.
+
+* ``interface``
+
+  / *Condition*: required / *Type*: str /
+
+  The interface name.
+
+**Returns:**
+
+* ``object_paths``
+
+  / *Type*: list /
+
+  The sorted object paths.
+      """
+      if conn_name not in self.connection_manage_dict.keys():
+         raise AssertionError("The '%s' connection  hasn't been established. Please connect first." % conn_name)
+      try:
+         return self.connection_manage_dict[conn_name].find_objects_by_interface(interface)
+      except Exception as ex:
+         raise Exception(DBusManager.ERR_OBJECT_INDEX_STR % (conn_name, ex))
+
+   @keyword
+   def find_objects_by_property(self, conn_name="default_conn", interface="", property_name="", value=None):
+      """
+Keyword used to get the managed objects whose property has a value.
+
+The first query of a property builds an index of its values, the following queries are O(1).
+
+**Arguments:**
+
+* ``conn_name``
+
+  / *Condition*: optional / *Type*: str / *Default*: 'default_conn' /
+
+  The name of the DBus connection.
+
+* ``interface``
+
+  / *Condition*: required / *Type*: str /
+
+  The interface of the property.
+
+* ``property_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the property.
+
+* ``value``
+
+  / *Condition*: required / *Type*: Any /
+
+  The value. Values are compared by their string representation, e.g. '3' matches 3.
+
+**Returns:**
+
+* ``object_paths``
+
+  / *Type*: list /
+
+  The sorted object paths.
+      """
+      if conn_name not in self.connection_manage_dict.keys():
+         raise AssertionError("The '%s' connection  hasn't been established. Please connect first." % conn_name)
+      try:
+         return self.connection_manage_dict[conn_name].find_objects_by_property(interface, property_name, value)
+      except Exception as ex:
+         raise Exception(DBusManager.ERR_OBJECT_INDEX_STR % (conn_name, ex))
+
+   @keyword
+   def get_managed_object(self, conn_name="default_conn", object_path=""):
+      """
+Keyword used to get the interfaces and properties of a managed object from the index.
+
+**Arguments:**
+
+* ``conn_name``
+
+  / *Condition*: optional / *Type*: str / *Default*: 'default_conn' /
+
+  The name of the DBus connection.
+
+* ``object_path``
+
+  / *Condition*: required / *Type*: str /
+
+  The object path.
+
+**Returns:**
+
+* ``interfaces``
+
+  / *Type*: dict /
+
+  The properties of the object keyed by interface name.
+      """
+      if conn_name not in self.connection_manage_dict.keys():
+         raise AssertionError("The '%s' connection  hasn't been established. Please connect first." % conn_name)
+      try:
+         return self.connection_manage_dict[conn_name].get_managed_object(object_path)
+      except Exception as ex:
+         raise Exception(DBusManager.ERR_OBJECT_INDEX_STR % (conn_name, ex))
+
+   @keyword
+   def call_dbus_object_method(self, conn_name="default_conn", object_path="", method_name="", *args):
+      """
+Keyword used to call a DBus method of another object of the service, e.g. of a managed object.
+
+The proxy of the object is created on first use and reused by the following calls, so one connection
+serves all objects of the service.
+
+**Arguments:**
+
+* ``conn_name``
+
+  / *Condition*: optional / *Type*: str / *Default*: 'default_conn' /
+
+  The name of the DBus connection.
+
+* ``object_path``
+
+  / *Condition*: required / *Type*: str /
+
+  The object path.
+
+* ``method_name``
+
+  / *Condition*: required / *Type*: str /
+
+  The name of the DBus method to be called.
+
+* ``args``
+
+  / *Condition*: optional / *Type*: tuple / *Default*: None /
+
+  Input arguments to be passed to the method.
+
+**Returns:**
+
+* ``ret_obj``
+
+  / *Type*: Any /
+
+  Return from called method.
+      """
+      if conn_name not in self.connection_manage_dict.keys():
+         raise AssertionError("The '%s' connection  hasn't been established. Please connect first." % conn_name)
+      try:
+         return self.connection_manage_dict[conn_name].call_object_method(object_path, method_name, *args)
+      except Exception as ex:
+         raise Exception(DBusManager.ERR_CALL_DBUS_METHOD_STR % (method_name, ex))
+
+   @keyword
+   def get_method_latency_statistics(self, conn_name=None, method_name=None):
+      """
+Keyword used to get the latency histograms of the DBus method calls.
+
+Every method call is recorded per connection and method in a fixed-size log-bucketed histogram.
+In remote mode the client-side round trip ('round_trip') is kept separately from the execution time
+on the agent ('agent'). Asynchronous and batched calls run on the agent, so they only have an 'agent' entry.
+The statistics of disconnected connections are kept.
+
+**Arguments:**
+
+* ``conn_name``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The name of the DBus connection. None means all connections.
+
+* ``method_name``
+
+  / *Condition*: optional / *Type*: str / *Default*: None /
+
+  The name of the DBus method. None means all methods. Requires ``conn_name``.
+
+**Returns:**
+
+* ``statistics``
+
+  / *Type*: dict /
+
+  The latencies of a method as {'round_trip': summary, 'agent': summary}, keyed by method name and,
+  without ``conn_name``, by connection name. A summary has the keys 'count', 'min', 'mean', 'max', 'p50', 'p90', 'p99' and 'p99_9' (seconds).
+      """
+      if conn_name is None:
+         statistics = dict(self.closed_latency_statistics)
+         for name, connection_obj in self.connection_manage_dict.items():
+            statistics[name] = connection_obj.get_method_latency_statistics()
+         return statistics
+
+      if conn_name in self.connection_manage_dict.keys():
+         return self.connection_manage_dict[conn_name].get_method_latency_statistics(method_name)
+      if conn_name in self.closed_latency_statistics:
+         statistics = self.closed_latency_statistics[conn_name]
+         return statistics if method_name is None else statistics.get(method_name, {})
+      raise AssertionError("The '%s' connection  hasn't been established. Please connect first." % conn_name)
+
+   @keyword
+   def dump_method_latency_statistics(self, file_path):
+      """
+Keyword used to write the latency statistics of the DBus method calls of all connections to a JSON file,
+e.g. in the suite teardown, to compare the latencies of different runs.
+
+The statistics are also dumped automatically at the end of every suite to the file named by the
+``ROBOTFRAMEWORK_DBUS_LATENCY_DUMP`` environment variable, if it is set.
+
+**Arguments:**
+
+* ``file_path``
+
+  / *Condition*: required / *Type*: str /
+
+  The path of the JSON file.
+
+**Returns:**
+
+(*no returns*)
+      """
+      dump = {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+              "connections": self.get_method_latency_statistics()}
+      directory = os.path.dirname(os.path.abspath(file_path))
+      os.makedirs(directory, exist_ok=True)
+      with open(file_path, "w", encoding="utf-8") as dump_file:
+         json.dump(dump, dump_file, indent=2)
+
+   @keyword
+   def call_dbus_method_async(self, conn_name="default_conn", method_name="", *args):
+      """
+Keyword used to call a DBus method asynchronously. It returns a handle immediately, without waiting
+for the reply, so that many calls can be in flight at once over one connection.
+
+Use `Wait For Method Result` or `Wait For All Method Results` to get the returns of the calls.
+
+**Arguments:**
+
+* ``conn_name``
+
+  / *Condition*: optional / *Type*: str / *Default*: 'default_conn' /
+
+  The name of the DBus connection.
+
+* ``method_name``
+
+  / *Condition*: optional / *Type*: str / *Default*: '' /
+
+  The name of the DBus method to be called.
+
+* ``args``
+
+  / *Condition*: optional / *Type*: tuple / *Default*: None /
+
+  Input arguments to be passed to the method.
+
+**Returns:**
+
+* ``handle``
+
+  / *Type*: str /
+
+  The handle of the call.
+      """
+      if conn_name not in self.connection_manage_dict.keys():
+         raise AssertionError("The '%s' connection  hasn't been established. Please connect first." % conn_name)
+
+      handle = None
+      connection_obj = self.connection_manage_dict[conn_name]
+      try:
+         handle = connection_obj.call_dbus_method_async(method_name, *args)
+      except Exception as ex:
+         raise Exception(DBusManager.ERR_CALL_DBUS_METHOD_STR % (method_name, ex))
+
+      return handle
+
+   @keyword
+   def wait_for_method_result(self, conn_name="default_conn", handle="", timeout=None):
+      """
+Keyword used to wait for the result of a DBus method call started with `Call DBus Method Async`.
+
+**Arguments:**
+
+* ``conn_name``
+
+  / *Condition*: optional / *Type*: str / *Default*: 'default_conn' /
+
+  The name of the DBus connection.
+
+* ``handle``
+
+  / *Condition*: optional / *Type*: str / *Default*: '' /
+
+  The handle returned by `Call DBus Method Async`.
+
+* ``timeout``
+
+  / *Condition*: optional / *Type*: float / *Default*: None /
+
+  The maximum time (in seconds) to wait for the result. None means to wait without limit.
+
+**Returns:**
+
+* ``ret_obj``
+
+  / *Type*: Any /
+
+  Return from called method.
+      """
+      if conn_name not in self.connection_manage_dict.keys():
+         raise AssertionError("The '%s' connection  hasn't been established. Please connect first." % conn_name)
+
+      ret_obj = None
+      connection_obj = self.connection_manage_dict[conn_name]
+      try:
+         ret_obj = connection_obj.wait_for_method_result(handle, None if timeout is None else float(timeout))
+      except AssertionError as ae:
+         raise ae
+      except Exception as ex:
+         raise Exception(DBusManager.ERR_WAIT_METHOD_RESULT_STR % (handle, ex))
+
+      return ret_obj
+
+   @keyword
+   def wait_for_all_method_results(self, conn_name="default_conn", timeout=None):
+      """
+Keyword used to wait for the results of all pending DBus method calls started with `Call DBus Method Async`.
+
+**Arguments:**
+
+* ``conn_name``
+
+  / *Condition*: optional / *Type*: str / *Default*: 'default_conn' /
+
+  The name of the DBus connection.
+
+* ``timeout``
+
+  / *Condition*: optional / *Type*: float / *Default*: None /
+
+  The maximum time (in seconds) to wait for all results. None means to wait without limit.
+
+**Returns:**
+
+* ``ret_list``
+
+  / *Type*: list /
+
+  Returns from the called methods in the order the calls have been made.
+      """
+      if conn_name not in self.connection_manage_dict.keys():
+         raise AssertionError("The '%s' connection  hasn't been established. Please connect first." % conn_name)
+
+      ret_list = None
+      connection_obj = self.connection_manage_dict[conn_name]
+      try:
+         ret_list = connection_obj.wait_for_all_method_results(None if timeout is None else float(timeout))
+      except AssertionError as ae:
+         raise ae
+      except Exception as ex:
+         raise Exception(DBusManager.ERR_WAIT_METHOD_RESULT_STR % ("all", ex))
+
+      return ret_list
+
+   @keyword
+   def call_dbus_method_batch(self, conn_name="default_conn", calls=None, stop_on_error=False, timeout=None):
+      """
+Keyword used to call a batch of DBus methods in one step.
+
+The calls are sent pipelined over the connection, without waiting for the reply of a call before sending
+the next one and without the overhead of one keyword per call. Their results are collected in order.
+In remote mode the whole batch is forwarded to the DBus Agent in a single request.
+
+**Arguments:**
+
+* ``conn_name``
+
+  / *Condition*: optional / *Type*: str / *Default*: 'default_conn' /
+
+  The name of the DBus connection.
+
+* ``calls``
+
+  / *Condition*: optional / *Type*: list / *Default*: None /
+
+  The calls of the batch. Each call is a (method, args) tuple, where ``args`` is a list of input arguments.
+  For example: ``${{ [("Hello", ["World"]), ("SetMode", [2])] }}``.
+
+* ``stop_on_error``
+
+  / *Condition*: optional / *Type*: bool / *Default*: False /
+
+  If False, every call is run regardless of errors (continue-on-error).
+  If True, each call is sent as soon as the previous one has succeeded and the batch stops at the first
+  error (stop-on-first-error). The calls after the failed one get the status 'NOT RUN'.
+
+* ``timeout``
+
+  / *Condition*: optional / *Type*: float / *Default*: None /
+
+  The maximum time (in seconds) to wait for the batch. None means to wait without limit.
+
+**Returns:**
+
+* ``report``
+
+  / *Type*: list /
+
+  A dictionary per call with the keys 'method', 'status' ('PASS', 'FAIL' or 'NOT RUN'), 'result', 'error'
+  and 'elapsed' (time in seconds between sending the call and receiving its reply).
+      """
+      if conn_name not in self.connection_manage_dict.keys():
+         raise AssertionError("The '%s' connection  hasn't been established. Please connect first." % conn_name)
+
+      report = None
+      connection_obj = self.connection_manage_dict[conn_name]
+      try:
+         report = connection_obj.call_dbus_method_batch(calls or [], stop_on_error,
+                                                        None if timeout is None else float(timeout))
+      except AssertionError as ae:
+         raise ae
+      except Exception as ex:
+         raise Exception(DBusManager.ERR_CALL_DBUS_METHOD_STR % ("batch", ex))
+
+      return report
+
+#    @keyword
+#    def call_dbus_method_with_keyword_args(self, conn_name="default_conn", method_name="", **kwargs):
+#       """
+# Keyword used to call a DBus method with the specified method name and input keyword arguments.
+
+# **Arguments:**
+
+# * ``conn_name``
+
+#   / *Condition*: optional / *Type*: str / *Default*: 'default_conn' /
+
+#   The name of the DBus connection.
+
+# * ``method_name``
+
+#   / *Condition*: optional / *Type*: str / *Default*: '' /
+
+#   The name of the DBus method to be called.
+
+# * ``kwargs``
+
+#   / *Condition*: optional / *Type*: dict / *Default*: None /
+
+#   Input keyword arguments to be passed to the method.
+
+# **Returns:**
+
+#   / *Type*: Any /
+
+#   Return from called method.
+#       """
+#       if conn_name not in self.connection_manage_dict.keys():
+#          raise AssertionError("The '%s' connection  hasn't been established. Please connect first." % conn_name)
+
+#       ret_obj = None
+#       connection_obj = self.connection_manage_dict[conn_name]
+#       try:
+#          ret_obj = connection_obj.call_dbus_method_with_keyword_args(method_name, **kwargs)
+#       except Exception as ex:
+#          raise Exception(DBusManager.ERR_CALL_DBUS_METHOD_STR % (method_name, ex))
+
+#       return ret_obj
+
+   @keyword
+   def wait_for_signal(self, conn_name="default_conn", signal="", timeout=0):
+      """
+Keyword used to wait for a specific DBus signal to be received within a specified timeout period.
+
+**Arguments:**
+
+* ``conn_name``
+
+  / *Condition*: optional / *Type*: str / *Default*: 'default_conn' /
+
+  The name of the DBus connection.
+
+* ``signal``
+
+  / *Condition*: optional / *Type*: str / *Default*: '' /
+
+  The name of the DBus signal to wait for.
+
+* ``timeout``
+
+  / *Condition*: optional / *Type*: float / *Default*: 0 /
+
+  The maximum time (in seconds) to wait for the signal. Fractions of a second are allowed.
+
+**Returns:**
+
+* ``payloads``
+
+  / *Type*: str /
+
+  The signal payloads.
+      """
+      if conn_name not in self.connection_manage_dict.keys():
+         raise Exception("The '%s' connection  hasn't been established. Please connect first." % conn_name)
+
+      connection_obj = self.connection_manage_dict[conn_name]
+      payloads = None
+      try:
+         payloads = connection_obj.wait_for_signal(signal, timeout)
+      except AssertionError as ae:
+         raise ae
+      except Exception as ex:
+         raise Exception(DBusManager.ERR_WAIT_DBUS_SIGNAL_STR % (signal, ex))
+
+      return payloads
+
+   @keyword
+   def wait_for_signal_matching(self, conn_name="default_conn", signal="", predicate="", predicate_type="regex", timeout=0):
+      """
+Keyword used to wait for an emission of a DBus signal whose payloads match a predicate.
+
+The predicate is evaluated in the signal callback on the event loop thread (on the agent in remote mode),
+so that only the matching emission wakes the test. Already queued emissions are checked first,
+and non-matching emissions stay queued for `Wait For Signal`.
+
+**Arguments:**
+
+* ``conn_name``
+
+  / *Condition*: optional / *Type*: str / *Default*: 'default_conn' /
+
+  The name of the DBus connection.
+
+* ``signal``
+
+  / *Condition*: optional / *Type*: str / *Default*: '' /
+
+  The name of the DBus signal to wait for.
+
+* ``predicate``
+
+  / *Condition*: required / *Type*: str /
+
+  The predicate the payloads must match, depending on ``predicate_type``:
+
+  - 'regex': a regular expression searched in the string representation of the payloads, e.g. "state=READY".
+  - 'field': an equality ``field.path=value`` on a field of the payloads. The path consists of dictionary keys
+    and list indexes separated by '.', e.g. "0.state=READY".
+  - 'expression': a Python expression evaluated with the payloads bound to ``payloads``, e.g. "payloads[1] > 3".
+    Expression predicates are local-only: they execute Python code, so a DBus agent rejects them
+    unless it has been started with ``--allow-expression-predicates``.
+
+* ``predicate_type``
+
+  / *Condition*: optional / *Type*: str / *Default*: 'regex' /
+
+  The type of the predicate: 'regex', 'field' or 'expression'.
+
+* ``timeout``
+
+  / *Condition*: optional / *Type*: float / *Default*: 0 /
+
+  The maximum time (in seconds) to wait for the signal. Fractions of a second are allowed.
+
+**Returns:**
+
+* ``payloads``
+
+  / *Type*: Any /
+
+  The payloads of the matching emission.
+      """
+      if conn_name not in self.connection_manage_dict.keys():
+         raise Exception("The '%s' connection  hasn't been established. Please connect first." % conn_name)
+
+      connection_obj = self.connection_manage_dict[conn_name]
+      payloads = None
+      try:
+         payloads = connection_obj.wait_for_signal_matching(signal, predicate, predicate_type, timeout)
+      except AssertionError as ae:
+         raise ae
+      except Exception as ex:
+         raise Exception(DBusManager.ERR_WAIT_DBUS_SIGNAL_STR % (signal, ex))
+
+      return payloads
+
+   @keyword
+   def wait_for_any_signal(self, conn_name="default_conn", signals="", timeout=0):
+      """
+Keyword used to wait for any of several DBus signals to be received within a specified timeout period.
+
+The oldest queued emission among the given signals is returned. Waiting does not start any thread,
+so short timeouts can be used to poll tightly.
+
+**Arguments:**
+
+* ``conn_name``
+
+  / *Condition*: optional / *Type*: str / *Default*: 'default_conn' /
+
+  The name of the DBus connection.
+
+* ``signals``
+
+  / *Condition*: optional / *Type*: str / *Default*: '' /
+
+  The names of the DBus signals to wait for. It can be a list of signal names,
+  or multiple signal names joined by ','. For example: "signal1,signal2,signal3".
+
+* ``timeout``
+
+  / *Condition*: optional / *Type*: float / *Default*: 0 /
+
+  The maximum time (in seconds) to wait for the signals. Fractions of a second are allowed.
+
+**Returns:**
+
+* ``signal_info``
+
+  / *Type*: tuple /
+
+  The name of the received signal and its payloads.
+      """
+      if conn_name not in self.connection_manage_dict.keys():
+         raise Exception("The '%s' connection  hasn't been established. Please connect first." % conn_name)
+
+      connection_obj = self.connection_manage_dict[conn_name]
+      signal_info = None
+      try:
+         signal_info = connection_obj.wait_for_any_signal(signals, timeout)
+      except AssertionError as ae:
+         raise ae
+      except Exception as ex:
+         raise Exception(DBusManager.ERR_WAIT_DBUS_SIGNAL_STR % (signals, ex))
+
+      return signal_info
+
+   @keyword
+   def get_signal_handler_statistics(self):
+      """
+Keyword used to get the statistics of the signal received handlers.
+
+**Returns:**
+
+* ``statistics``
+
+  / *Type*: dict /
+
+  The statistics of the handlers:
+
+  - 'argument_lookups': the number of times the arguments of a handler keyword have been resolved.
+  - 'argument_lookups_avoided': the number of handler calls which used the cached argument specification.
+  - 'workers', 'max_backlog': the configuration of the handler dispatcher.
+  - 'backlog', 'peak_backlog': the current and the highest number of queued handler calls.
+  - 'dispatched', 'executed', 'failed': the number of queued, run and failed handler calls.
+  - 'dropped', 'dropped_per_handler': the number of handler calls dropped because the backlog was full,
+    in total and per handler keyword.
+      """
+      statistics = RegisterKeyword.get_lookup_statistics()
+      statistics.update(HandlerDispatcher.get_instance().get_statistics())
+      return statistics
+
+   @keyword
+   def configure_signal_handler_dispatcher(self, workers=HandlerDispatcher.DEFAULT_WORKERS, max_backlog=HandlerDispatcher.DEFAULT_MAX_BACKLOG):
+      """
+Keyword used to configure the dispatcher which runs the signal received handlers.
+
+Signal deliveries only queue the handler calls, and the handler keywords are run by a pool of worker threads.
+When the backlog is full, further handler calls are dropped and counted (see `Get Signal Handler Statistics`),
+unless a queued call has a lower priority: then the queued call with the lowest priority is dropped instead.
+
+**Arguments:**
+
+* ``workers``
+
+  / *Condition*: optional / *Type*: int / *Default*: 1 /
+
+  The number of worker threads running handler keywords.
+  With more than one worker, handlers are run concurrently and their order is not guaranteed.
+
+* ``max_backlog``
+
+  / *Condition*: optional / *Type*: int / *Default*: 1000 /
+
+  The maximum number of queued handler calls.
+
+**Returns:**
+
+(*no returns*)
+      """
+      try:
+         HandlerDispatcher.get_instance().configure(int(workers), int(max_backlog))
+      except Exception as ex:
+         raise Exception(DBusManager.ERR_CONFIGURE_HANDLER_DISPATCHER_STR % ex)
@@ -0,0 +1,68 @@
+#  Copyright 2020-2023 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# *******************************************************************************
+#
+# File: signal_service.py
+#
+# Initially created by Nguyen Huynh Tri Cuong (MS/EMC12-XC) / May 2023.
+#
+# Description:
+#   Provide a DBus service on the session bus whose signals are emitted on request,
+#   used by test_signal_queue.robot.
+#
+# History:
+#
+# 22.05.2023 / V 0.1.0 / Nguyen Huynh Tri Cuong
+# - Initialize
+#
+# *******************************************************************************
+from dasbus.connection import SessionMessageBus
+from dasbus.loop import EventLoop
+from dasbus.server.interface import dbus_interface, dbus_signal
+from dasbus.typing import Str, Int
+
+SERVICE_NAME = "org.example.SignalQueue"
+OBJECT_PATH = "/org/example/SignalQueue"
+
+
+@dbus_interface(SERVICE_NAME)
+class SignalQueue(object):
+   """
+The DBus interface of the test service.
+   """
+
+   @dbus_signal
+   def Tick(self, msg: Str):
+      """Signal emitted by ``Burst``."""
+
+   @dbus_signal
+   def Status(self, name: Str, code: Int):
+      """Signal emitted by ``EmitStatus``."""
+
+   def Burst(self, count: Int):
+      for idx in range(count):
+         self.Tick("Tick %s" % idx)
+
+   def EmitStatus(self, name: Str, code: Int):
+      self.Status(name, code)
+
+
+if __name__ == "__main__":
+   bus = SessionMessageBus()
+   try:
+      bus.publish_object(OBJECT_PATH, SignalQueue())
+      bus.register_service(SERVICE_NAME)
+      EventLoop().run()
+   finally:
+      bus.disconnect()
@@ -0,0 +1,155 @@
+#  Copyright 2020-2023 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# *******************************************************************************
+#
+# File: test_argument_converter.py
+#
+# Initially created by Nguyen Huynh Tri Cuong (MS/EMC12-XC) / May 2023.
+#
+# Description:
+#   Unit tests of the conversion of keyword arguments to the input signature of a DBus method.
+#
+# History:
+#
+# 22.05.2023 / V 0.1.0 / Nguyen Huynh Tri Cuong
+# - Initialize
+#
+# *******************************************************************************
+from RobotFramework_DBus.common.argument_converter import ArgumentConverter, split_signature
+from gi.repository import GLib
+import array
+import unittest
+
+
+class TestSplitSignature(unittest.TestCase):
+
+   def test_basic_types(self):
+      self.assertEqual(split_signature("sub"), ["s", "u", "b"])
+      self.assertEqual(split_signature(""), [])
+
+   def test_container_types(self):
+      self.assertEqual(split_signature("sa{sv}(ii)"), ["s", "a{sv}", "(ii)"])
+      self.assertEqual(split_signature("aa(s(ib))a{oa{sv}}"), ["aa(s(ib))", "a{oa{sv}}"])
+
+   def test_invalid_signature(self):
+      for signature in ("(ii", "a", "ii)"):
+         with self.assertRaises(ValueError):
+            split_signature(signature)
+
+
+class TestArgumentConverter(unittest.TestCase):
+
+   def _convert(self, in_type, *args):
+      values, parameters = ArgumentConverter(in_type).convert(args)
+      self.assertIsNone(parameters)
+      return values
+
+   def test_no_arguments(self):
+      self.assertEqual(self._convert(None), ())
+      self.assertEqual(self._convert("()"), ())
+
+   def test_basic_types(self):
+      self.assertEqual(self._convert("(yiutxd)", "255", " -3 ", "0x10", "7", 2.0, "1.5"), (255, -3, 16, 7, 2, 1.5))
+      self.assertEqual(self._convert("(bbb)", "Yes", "off", 1), (True, False, True))
+      self.assertEqual(self._convert("(sog)", "text", "/org/example", "s"), ("text", "/org/example", "s"))
+
+   def test_values_of_the_expected_type_are_unchanged(self):
+      self.assertEqual(self._convert("(isb)", 42, "42", False), (42, "42", False))
+
+   def test_variant(self):
+      (variant,) = self._convert("(v)", 1)
+      self.assertEqual(variant.get_type_string(), "i")
+      (variant,) = self._convert("(v)", 2 ** 40)
+      self.assertEqual(variant.get_type_string(), "x")
+      (variant,) = self._convert("(v)", {"name": "x", "values": [1.5, True]})
+      self.assertEqual(variant.get_type_string(), "a{sv}")
+      self.assertEqual(variant.unpack(), {"name": "x", "values": [1.5, True]})
+      existing = GLib.Variant("u", 3)
+      self.assertIs(self._convert("(v)", existing)[0], existing)
+
+   def test_nested_types(self):
+      self.assertEqual(self._convert("(ai)", "[1, '2', 3]"), ([1, 2, 3],))
+      self.assertEqual(self._convert("(a{su})", '{"a": "1", "b": 2}'), ({"a": 1, "b": 2},))
+      self.assertEqual(self._convert("(a{su})", [("a", 1)]), ({"a": 1},))
+      self.assertEqual(self._convert("((sb)a(ii))", "('x', 'true')", [["1", "2"]]), (("x", True), [(1, 2)]))
+      self.assertEqual(self._convert("(a{sa{sb}})", "{'a': {'b': 'no'}}"), ({"a": {"b": False}},))
+
+   def test_argument_count(self):
+      converter = ArgumentConverter("(su)")
+      with self.assertRaisesRegex(TypeError, r"Expected 2 arguments \(signature '\(su\)'\) but got 1"):
+         converter.convert(("x",))
+      with self.assertRaisesRegex(TypeError, "Expected 0 arguments"):
+         ArgumentConverter(None).convert(("x",))
+
+   def test_conversion_errors(self):
+      converter = ArgumentConverter("(sib)")
+      with self.assertRaisesRegex(ValueError, "Cannot convert argument 2 'many' to DBus type 'i'"):
+         converter.convert(("x", "many", True))
+      with self.assertRaisesRegex(ValueError, "Cannot convert argument 3 'maybe' to DBus type 'b'"):
+         converter.convert(("x", 1, "maybe"))
+      with self.assertRaisesRegex(ValueError, "Cannot convert argument 1 '3' to DBus type 's'"):
+         converter.convert((3, 1, True))
+      with self.assertRaisesRegex(ValueError, "Expected 2 items but got 3"):
+         ArgumentConverter("((ii))").convert(([1, 2, 3],))
+
+   def test_long_argument_is_shortened_in_errors(self):
+      with self.assertRaises(ValueError) as context:
+         ArgumentConverter("(i)").convert(("x" * 1000,))
+      # The argument and the reason, which repeats it, are shortened.
+      self.assertIn("x" * 61 + "...'", str(context.exception))
+      self.assertNotIn("x" * 62, str(context.exception))
+
+   def test_cache(self):
+      self.assertIs(ArgumentConverter.get("(su)"), ArgumentConverter.get("(su)"))
+      self.assertIsNot(ArgumentConverter.get("(su)"), ArgumentConverter.get("(us)"))
+
+
+class TestBulkConversion(unittest.TestCase):
+
+   THRESHOLD = ArgumentConverter.BULK_ARRAY_THRESHOLD
+
+   def test_small_array_is_converted_element_by_element(self):
+      values, parameters = ArgumentConverter("(ai)").convert((["1"] * (self.THRESHOLD - 1),))
+      self.assertEqual(values, ([1] * (self.THRESHOLD - 1),))
+      self.assertIsNone(parameters)
+
+   def test_large_array_is_converted_in_bulk(self):
+      items = list(range(self.THRESHOLD))
+      values, parameters = ArgumentConverter("(sai)").convert(("name", items))
+      self.assertEqual(values[0], "name")
+      self.assertIsInstance(values[1], GLib.Variant)
+      self.assertEqual(parameters.get_type_string(), "(sai)")
+      self.assertEqual(parameters.unpack(), ("name", items))
+
+   def test_large_array_of_strings(self):
+      values, parameters = ArgumentConverter("(ad)").convert(([str(item) for item in range(self.THRESHOLD)],))
+      self.assertEqual(parameters.unpack(), ([float(item) for item in range(self.THRESHOLD)],))
+
+   def test_bytes(self):
+      values, parameters = ArgumentConverter("(ay)").convert((b"\x00\x01\xff",))
+      self.assertEqual(parameters.get_type_string(), "(ay)")
+      self.assertEqual(bytes(parameters.get_child_value(0).get_data_as_bytes().get_data()), b"\x00\x01\xff")
+
+   def test_array_with_other_typecode(self):
+      values, parameters = ArgumentConverter("(aq)").convert((array.array("b", [1, 2, 3]),))
+      self.assertEqual(parameters.unpack(), ([1, 2, 3],))
+
+   def test_variant_argument_is_wrapped(self):
+      values, parameters = ArgumentConverter("(vau)").convert(("text", range(self.THRESHOLD)))
+      self.assertEqual(parameters.get_type_string(), "(vau)")
+      self.assertEqual(parameters.unpack(), ("text", list(range(self.THRESHOLD))))
+
+
+if __name__ == "__main__":
+   unittest.main()
@@ -0,0 +1,217 @@
+#  Copyright 2020-2023 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# *******************************************************************************
+#
+# File: test_async_call.py
+#
+# Initially created by Nguyen Huynh Tri Cuong (MS/EMC12-XC) / May 2023.
+#
+# Description:
+#   Unit tests of the handles of asynchronous method calls and of the batched calls. The replies are
+#   delivered by the tests, without a message bus.
+#
+# History:
+#
+# 22.05.2023 / V 0.1.0 / Nguyen Huynh Tri Cuong
+# - Initialize
+#
+# *******************************************************************************
+from RobotFramework_DBus.common.async_call import MethodCallBatch, MethodCallHandle, MethodCallRegistry
+from threading import Timer
+import unittest
+
+
+def _raise(error):
+   raise error
+
+
+class TestMethodCallHandle(unittest.TestCase):
+
+   def test_result(self):
+      handle = MethodCallHandle("Add-1", "Add")
+      self.assertFalse(handle.done())
+      self.assertIsNone(handle.get_elapsed_time())
+      handle.reply_callback(lambda: 3)
+      self.assertTrue(handle.done())
+      self.assertFalse(handle.failed())
+      self.assertEqual(handle.get_result(), 3)
+      self.assertGreaterEqual(handle.get_elapsed_time(), 0)
+
+   def test_error(self):
+      handle = MethodCallHandle("Add-1", "Add")
+      error = ValueError("boom")
+      handle.reply_callback(lambda: _raise(error))
+      self.assertTrue(handle.failed())
+      self.assertIs(handle.get_error(), error)
+      with self.assertRaises(ValueError):
+         handle.get_result()
+
+
+class TestMethodCallRegistry(unittest.TestCase):
+
+   def setUp(self):
+      self.registry = MethodCallRegistry()
+
+   def test_handles_in_issue_order(self):
+      handles = [self.registry.create(method_name) for method_name in ("Add", "Get", "Add")]
+      self.assertEqual([handle.handle_id for handle in handles], ["Add-1", "Get-2", "Add-3"])
+      self.assertEqual(self.registry.get_all(), handles)
+      self.assertIs(self.registry.get("Get-2"), handles[1])
+      self.registry.remove("Get-2")
+      self.registry.remove("Get-2")
+      with self.assertRaisesRegex(Exception, "There is no pending method call with handle 'Get-2'"):
+         self.registry.get("Get-2")
+
+   def test_wait_for_result(self):
+      handle = self.registry.create("Add")
+      Timer(0.05, handle.set_result, (3,)).start()
+      self.assertEqual(self.registry.wait_for_result(handle.handle_id, 5), 3)
+      self.assertEqual(self.registry.get_all(), [])
+
+   def test_wait_for_result_raises_error(self):
+      handle = self.registry.create("Add")
+      handle.set_error(ValueError("boom"))
+      with self.assertRaises(ValueError):
+         self.registry.wait_for_result(handle.handle_id)
+      self.assertEqual(self.registry.get_all(), [])
+
+   def test_wait_for_result_times_out(self):
+      handle = self.registry.create("Add")
+      with self.assertRaisesRegex(AssertionError, "The 'Add-1' method call has not completed after '0.05'"):
+         self.registry.wait_for_result(handle.handle_id, 0.05)
+      # The handle stays registered, its result can still be waited for.
+      handle.set_result(3)
+      self.assertEqual(self.registry.wait_for_result(handle.handle_id), 3)
+
+   def test_wait_for_all_results(self):
+      first, second = self.registry.create("Add"), self.registry.create("Get")
+      Timer(0.05, second.set_result, ("value",)).start()
+      first.set_result(3)
+      self.assertEqual(self.registry.wait_for_all_results(5), [3, "value"])
+      self.assertEqual(self.registry.get_all(), [])
+
+   def test_wait_for_all_results_raises_first_error(self):
+      handles = [self.registry.create(method_name) for method_name in ("Add", "Get", "Set", "Reset")]
+      handles[0].set_result(3)
+      handles[2].set_error(KeyError("late"))
+      handles[3].set_result(None)
+      # The error of the first failed call in issue order is raised, after all calls have completed.
+      Timer(0.05, handles[1].set_error, (ValueError("first"),)).start()
+      with self.assertRaisesRegex(ValueError, "first"):
+         self.registry.wait_for_all_results(5)
+      self.assertEqual(self.registry.get_all(), [])
+
+   def test_wait_for_all_results_times_out(self):
+      self.registry.create("Add").set_result(3)
+      self.registry.create("Get")
+      with self.assertRaisesRegex(AssertionError, "The 'Get-2' method call has not completed"):
+         self.registry.wait_for_all_results(0.05)
+      self.assertEqual(len(self.registry.get_all()), 2)
+
+
+class _FakeService:
+   """
+Stand-in for the send function of a connection. The replies are delivered by ``reply``, in order.
+   """
+   def __init__(self):
+      self.sent = []
+      self._pending = []
+
+   def send(self, method_name, args, reply_callback):
+      if method_name == "Unknown":
+         raise AttributeError("The method 'Unknown' does not exist.")
+      self.sent.append((method_name, args))
+      self._pending.append((method_name, args, reply_callback))
+
+   def reply(self):
+      method_name, args, reply_callback = self._pending.pop(0)
+      if method_name == "Fail":
+         reply_callback(lambda: _raise(ValueError("boom")))
+      else:
+         reply_callback(lambda: sum(args))
+
+   def reply_all(self):
+      while self._pending:
+         self.reply()
+
+
+class TestMethodCallBatch(unittest.TestCase):
+
+   def setUp(self):
+      self.service = _FakeService()
+
+   def _run(self, calls, stop_on_error=False):
+      batch = MethodCallBatch(calls, stop_on_error)
+      batch.start(self.service.send)
+      self.service.reply_all()
+      self.assertTrue(batch.wait(0))
+      return [(entry["method"], entry["status"], entry["result"], entry["error"]) for entry in batch.get_report()]
+
+   def test_calls_are_pipelined(self):
+      batch = MethodCallBatch([("Add", [1, 2]), ["Add", (3, 4)], "Add", ["Add"]])
+      batch.start(self.service.send)
+      # All calls are sent before any reply.
+      self.assertEqual(self.service.sent, [("Add", (1, 2)), ("Add", (3, 4)), ("Add", ()), ("Add", ())])
+      self.assertFalse(batch.wait(0))
+      self.service.reply_all()
+      self.assertTrue(batch.wait(0))
+      self.assertEqual([entry["result"] for entry in batch.get_report()], [3, 7, 0, 0])
+      self.assertTrue(all(entry["elapsed"] >= 0 for entry in batch.get_report()))
+
+   def test_failed_call_does_not_stop_batch(self):
+      self.assertEqual(self._run([("Add", [1]), "Fail", ("Add", [2])]),
+                       [("Add", "PASS", 1, None), ("Fail", "FAIL", None, "boom"), ("Add", "PASS", 2, None)])
+
+   def test_stop_on_error(self):
+      batch = MethodCallBatch([("Add", [1]), "Fail", ("Add", [2]), "Add"], stop_on_error=True)
+      batch.start(self.service.send)
+      # Each call is sent from the reply of the previous one.
+      self.assertEqual(self.service.sent, [("Add", (1,))])
+      self.service.reply()
+      self.assertEqual(self.service.sent, [("Add", (1,)), ("Fail", ())])
+      self.service.reply()
+      self.assertTrue(batch.wait(0))
+      report = batch.get_report()
+      self.assertEqual([entry["status"] for entry in report], ["PASS", "FAIL", "NOT RUN", "NOT RUN"])
+      self.assertEqual(len(self.service.sent), 2)
+      self.assertIsNone(report[2]["elapsed"])
+
+   def test_stop_on_error_without_error(self):
+      self.assertEqual(self._run([("Add", [1]), ("Add", [2])], stop_on_error=True),
+                       [("Add", "PASS", 1, None), ("Add", "PASS", 2, None)])
+
+   def test_send_failure(self):
+      self.assertEqual(self._run(["Unknown", ("Add", [2])]),
+                       [("Unknown", "FAIL", None, "The method 'Unknown' does not exist."), ("Add", "PASS", 2, None)])
+
+   def test_send_failure_with_stop_on_error(self):
+      self.assertEqual(self._run([("Add", [1]), "Unknown", ("Add", [2])], stop_on_error=True),
+                       [("Add", "PASS", 1, None),
+                        ("Unknown", "FAIL", None, "The method 'Unknown' does not exist."),
+                        ("Add", "NOT RUN", None, None)])
+      self.assertEqual(self.service.sent, [("Add", (1,))])
+
+   def test_empty_batch(self):
+      batch = MethodCallBatch([])
+      batch.start(self.service.send)
+      self.assertTrue(batch.wait(0))
+      self.assertEqual(batch.get_report(), [])
+
+   def test_invalid_call(self):
+      with self.assertRaisesRegex(ValueError, "Invalid batch call"):
+         MethodCallBatch([("Add", 1, 2)])
+
+
+if __name__ == "__main__":
+   unittest.main()
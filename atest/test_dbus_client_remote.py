@@ -0,0 +1,127 @@
+#  Copyright 2020-2023 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# *******************************************************************************
+#
+# File: test_dbus_client_remote.py
+#
+# Initially created by Nguyen Huynh Tri Cuong (MS/EMC12-XC) / May 2023.
+#
+# Description:
+#   Unit tests of the batched requests of the remote DBus client. The client talks to a
+#   ThreadPoolXMLRPCServer serving a stand-in for the DBus Agent, without a message bus.
+#
+# History:
+#
+# 22.05.2023 / V 0.1.0 / Nguyen Huynh Tri Cuong
+# - Initialize
+#
+# *******************************************************************************
+from RobotFramework_DBus.dbus_agent.dbus_client_agent import ThreadPoolXMLRPCServer
+from RobotFramework_DBus.dbus_client_remote import DBusClientRemote
+from threading import Thread
+import unittest
+import xmlrpc.client
+
+
+class _FakeAgent:
+   """
+Stand-in for the DBus Agent, recording the requests of the sessions.
+   """
+   def __init__(self):
+      self.requests = []
+      self._sessions = set()
+
+   def initialize_dbus_client(self, session, namespace, object_path, *args):
+      self.requests.append(("initialize_dbus_client", session))
+      if session in self._sessions:
+         raise Exception("The session '%s' has alreday initialized." % session)
+      self._sessions.add(session)
+
+   def connect(self, session):
+      self.requests.append(("connect", session))
+
+   def quit(self, session):
+      self.requests.append(("quit", session))
+      self._sessions.discard(session)
+
+   def fail(self):
+      raise ValueError("boom")
+
+
+class _AgentTestCase(unittest.TestCase):
+
+   multicall = True
+
+   def setUp(self):
+      self.agent = _FakeAgent()
+      self.server = ThreadPoolXMLRPCServer(("127.0.0.1", 0), 2, allow_none=True, use_builtin_types=True,
+                                           logRequests=False)
+      self.server.register_instance(self.agent)
+      if self.multicall:
+         self.server.register_multicall_functions()
+      self.thread = Thread(target=self.server.serve_forever, kwargs={"poll_interval": 0.05})
+      self.thread.start()
+      self.client = DBusClientRemote("org.example", "/org/example", "127.0.0.1", self.server.server_address[1])
+
+   def tearDown(self):
+      self.client.quit()
+      self.server.shutdown()
+      self.server.server_close()
+      self.thread.join(5)
+
+
+class _BatchTests:
+
+   def test_multicall(self):
+      results = self.client.multicall([("connect", ("first",)), ("fail", ()), ("connect", ("second",))])
+      self.assertIsNone(results[0])
+      self.assertIsInstance(results[1], xmlrpc.client.Fault)
+      self.assertIn("boom", results[1].faultString)
+      self.assertIsNone(results[2])
+      self.assertEqual(self.agent.requests, [("connect", "first"), ("connect", "second")])
+
+   def test_connect(self):
+      self.client.connect()
+      self.client.connect()
+      session = self.client.session
+      self.assertEqual(self.agent.requests,
+                       [("initialize_dbus_client", session), ("connect", session), ("connect", session)])
+
+
+class TestMulticall(_AgentTestCase, _BatchTests):
+
+   def test_transport_error_is_not_retried(self):
+      call = self.client.rpc_proxy.call
+
+      def _call_and_drop_reply(method, *params):
+         call(method, *params)
+         raise ConnectionResetError("Connection reset by peer")
+
+      self.client.rpc_proxy.call = _call_and_drop_reply
+      with self.assertRaises(ConnectionResetError):
+         self.client.connect()
+      self.client.rpc_proxy.call = call
+      session = self.client.session
+      self.assertEqual(self.agent.requests, [("initialize_dbus_client", session), ("connect", session)])
+
+
+class TestMulticallNotSupported(_AgentTestCase, _BatchTests):
+   """
+The agent rejects ``system.multicall``, so the client sends the requests one by one.
+   """
+   multicall = False
+
+
+if __name__ == "__main__":
+   unittest.main()
@@ -0,0 +1,67 @@
+#  Copyright 2020-2023 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# *******************************************************************************
+#
+# File: test_dbus_reactor.py
+#
+# Initially created by Nguyen Huynh Tri Cuong (MS/EMC12-XC) / May 2023.
+#
+# Description:
+#   Unit tests of the calls marshalled onto the reactor thread.
+#
+# History:
+#
+# 22.05.2023 / V 0.1.0 / Nguyen Huynh Tri Cuong
+# - Initialize
+#
+# *******************************************************************************
+from RobotFramework_DBus.common.dbus_reactor import DBusReactor
+import threading
+import time
+import unittest
+
+
+class TestDBusReactor(unittest.TestCase):
+
+   def setUp(self):
+      self.reactor = DBusReactor()
+      self.reactor.start()
+
+   def tearDown(self):
+      if self.reactor.is_alive():
+         self.reactor.stop()
+
+   def test_call(self):
+      self.assertEqual(self.reactor.call(lambda first, second=0: first + second, 1, second=2), 3)
+      self.assertTrue(self.reactor.call(self.reactor.in_reactor_thread))
+      self.assertFalse(self.reactor.in_reactor_thread())
+
+   def test_call_raises_error(self):
+      with self.assertRaisesRegex(ValueError, "boom"):
+         self.reactor.call(int, "boom")
+
+   def test_call_on_reactor_thread(self):
+      # A nested call is executed directly instead of waiting for itself.
+      self.assertEqual(self.reactor.call(self.reactor.call, threading.current_thread), self.reactor._thread)
+
+   def test_call_after_stop(self):
+      self.reactor.stop()
+      start = time.monotonic()
+      with self.assertRaisesRegex(RuntimeError, "The DBus reactor thread is not running anymore."):
+         self.reactor.call(int, "1")
+      self.assertLess(time.monotonic() - start, 5)
+
+
+if __name__ == "__main__":
+   unittest.main()
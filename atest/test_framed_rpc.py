@@ -0,0 +1,198 @@
+#  Copyright 2020-2023 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# *******************************************************************************
+#
+# File: test_framed_rpc.py
+#
+# Initially created by Nguyen Huynh Tri Cuong (MS/EMC12-XC) / May 2023.
+#
+# Description:
+#   Unit tests of the framing and the calls of the framed transport. They are skipped if the
+#   optional 'msgpack' package is not installed.
+#
+# History:
+#
+# 22.05.2023 / V 0.1.0 / Nguyen Huynh Tri Cuong
+# - Initialize
+#
+# *******************************************************************************
+from RobotFramework_DBus.common import framed_rpc
+from RobotFramework_DBus.common.framed_rpc import (FrameStream, FramedRPCError, FramedRPCProxy, FramedRPCServer,
+                                                  parse_address)
+from RobotFramework_DBus.common.worker_pool import blocking_request
+from threading import Event, Thread
+import contextlib
+import io
+import os
+import socket
+import tempfile
+import time
+import unittest
+
+
+class TestParseAddress(unittest.TestCase):
+
+   def test_default_endpoint(self):
+      self.assertEqual(parse_address(None, "agent", 2507), ("agent", 2508))
+
+   def test_unix_socket(self):
+      self.assertEqual(parse_address("/run/agent.sock", "agent", 2507), "/run/agent.sock")
+
+   def test_host_and_port(self):
+      self.assertEqual(parse_address("other:3000", "agent", 2507), ("other", 3000))
+      self.assertEqual(parse_address(":3000", "agent", 2507), ("agent", 3000))
+
+   def test_port(self):
+      self.assertEqual(parse_address(3000, "agent", 2507), ("agent", 3000))
+
+
+@unittest.skipUnless(framed_rpc.is_available(), "The framed transport requires the 'msgpack' package.")
+class TestFrameStream(unittest.TestCase):
+
+   def setUp(self):
+      self.left, self.right = socket.socketpair()
+
+   def tearDown(self):
+      self.left.close()
+      self.right.close()
+
+   def test_round_trip(self):
+      messages = [[0, 1, "hello", ["world", 42, 1.5, True, None, {"3": [b"\x00\x01"]}]],
+                  [1, 2, None, "x" * 100000]]
+      for message in messages:
+         FrameStream(self.left).write_message(message)
+      stream = FrameStream(self.right)
+      self.assertEqual([stream.read_message() for _ in messages], messages)
+
+   def test_closed_connection(self):
+      self.left.sendall(framed_rpc._HEADER.pack(10) + b"abc")
+      self.left.close()
+      self.assertIsNone(FrameStream(self.right).read_message())
+
+   def test_frame_too_large(self):
+      self.left.sendall(framed_rpc._HEADER.pack(framed_rpc.MAX_FRAME_SIZE + 1))
+      with self.assertRaises(ConnectionError):
+         FrameStream(self.right).read_message()
+
+
+class _Service:
+   """
+The instance served in the tests.
+   """
+   def __init__(self):
+      self.released = Event()
+
+   def add(self, first, second):
+      return first + second
+
+   def fail(self):
+      raise ValueError("boom")
+
+   @blocking_request
+   def wait_for_release(self, timeout):
+      return self.released.wait(timeout)
+
+
+@unittest.skipUnless(framed_rpc.is_available(), "The framed transport requires the 'msgpack' package.")
+class TestFramedRPC(unittest.TestCase):
+
+   def setUp(self):
+      self.service = _Service()
+      self.directory = tempfile.TemporaryDirectory()
+      self.address = os.path.join(self.directory.name, "agent.sock")
+      self.server = FramedRPCServer(self.service, workers=1)
+      self.server.listen(self.address)
+      self.proxy = FramedRPCProxy(self.address)
+
+   def tearDown(self):
+      self.service.released.set()
+      self.proxy.close()
+      self.server.close()
+      self.directory.cleanup()
+
+   def test_call(self):
+      self.assertEqual(self.proxy.add(1, 2), 3)
+      self.assertEqual(self.proxy.call("add", "a", "b"), "ab")
+
+   def test_remote_error(self):
+      with self.assertRaises(FramedRPCError) as context:
+         self.proxy.fail()
+      self.assertEqual(context.exception.error_type, "ValueError")
+      self.assertEqual(context.exception.message, "boom")
+
+   def test_unknown_method(self):
+      with self.assertRaises(FramedRPCError):
+         self.proxy.unknown()
+
+   def test_multicall(self):
+      results = self.proxy.call("system.multicall", [{"methodName": "add", "params": [1, 2]},
+                                                     {"methodName": "fail", "params": []}])
+      self.assertEqual(results[0], [3])
+      self.assertEqual(results[1]["faultCode"], 1)
+
+   def test_blocking_request_does_not_delay_other_calls(self):
+      results = []
+      waiter = Thread(target=lambda: results.append(self.proxy.wait_for_release(5)))
+      waiter.start()
+      time.sleep(0.1)
+      # The only worker is blocked, the call is executed by an additional one.
+      self.assertEqual(self.proxy.add(1, 2), 3)
+      self.service.released.set()
+      waiter.join(5)
+      self.assertEqual(results, [True])
+
+   def test_timeout(self):
+      proxy = FramedRPCProxy(self.address, timeout=0.2)
+      try:
+         with self.assertRaises(TimeoutError):
+            proxy.wait_for_release(5)
+      finally:
+         proxy.close()
+
+   def test_call_after_close(self):
+      self.proxy.close()
+      with self.assertRaises(ConnectionError):
+         self.proxy.add(1, 2)
+
+   def test_server_closes_connection(self):
+      results = []
+      waiter = Thread(target=lambda: results.append(self._call_and_catch(self.proxy.wait_for_release, 5)))
+      waiter.start()
+      time.sleep(0.1)
+      self.proxy._stream.sock.shutdown(socket.SHUT_RD)
+      waiter.join(5)
+      self.assertEqual(results, [ConnectionError])
+
+   def test_invalid_frame_closes_connection(self):
+      stderr = io.StringIO()
+      with contextlib.redirect_stderr(stderr), socket.socket(socket.AF_UNIX) as sock:
+         sock.connect(self.address)
+         sock.sendall(framed_rpc._HEADER.pack(framed_rpc.MAX_FRAME_SIZE + 1))
+         sock.settimeout(5)
+         self.assertEqual(sock.recv(1), b"")
+      self.assertIn("Closing the framed RPC connection from 'Unix socket' after an error: ConnectionError",
+                    stderr.getvalue())
+      # The other connections are still served.
+      self.assertEqual(self.proxy.add(1, 2), 3)
+
+   @staticmethod
+   def _call_and_catch(func, *params):
+      try:
+         return func(*params)
+      except Exception as ex:
+         return type(ex)
+
+
+if __name__ == "__main__":
+   unittest.main()
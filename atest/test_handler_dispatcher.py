@@ -0,0 +1,140 @@
+#  Copyright 2020-2023 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# *******************************************************************************
+#
+# File: test_handler_dispatcher.py
+#
+# Initially created by Nguyen Huynh Tri Cuong (MS/EMC12-XC) / May 2023.
+#
+# Description:
+#   Unit tests of the dispatcher running the signal handler keywords.
+#
+# History:
+#
+# 22.05.2023 / V 0.1.0 / Nguyen Huynh Tri Cuong
+# - Initialize
+#
+# *******************************************************************************
+from RobotFramework_DBus.common.handler_dispatcher import HandlerDispatcher
+from threading import Event
+from unittest import mock
+import time
+import unittest
+
+
+def _wait_until(condition, timeout=5):
+   deadline = time.monotonic() + timeout
+   while not condition():
+      if time.monotonic() > deadline:
+         raise AssertionError("The condition is still false after %s seconds." % timeout)
+      time.sleep(0.01)
+
+
+class TestHandlerDispatcher(unittest.TestCase):
+
+   def setUp(self):
+      self.released = Event()
+      self.calls = []
+
+   def tearDown(self):
+      self.released.set()
+
+   def _block_worker(self, dispatcher):
+      """
+Keep the only worker busy, so that the following calls are queued.
+      """
+      started = Event()
+
+      def _blocking_handler():
+         started.set()
+         self.released.wait(5)
+
+      dispatcher.dispatch(_blocking_handler, handler_name="Blocking")
+      started.wait(5)
+
+   def _dispatch(self, dispatcher, name, priority=0):
+      return dispatcher.dispatch(self.calls.append, (name,), priority, name)
+
+   def test_priority_order(self):
+      dispatcher = HandlerDispatcher()
+      self._block_worker(dispatcher)
+      for name, priority in (("low", 0), ("high", 10), ("middle", 5), ("high again", 10), ("low again", 0)):
+         self._dispatch(dispatcher, name, priority)
+      self.released.set()
+      _wait_until(lambda: len(self.calls) == 5)
+      self.assertEqual(self.calls, ["high", "high again", "middle", "low", "low again"])
+
+   def test_drop_when_backlog_is_full(self):
+      dispatcher = HandlerDispatcher(max_backlog=2)
+      self._block_worker(dispatcher)
+      self.assertTrue(self._dispatch(dispatcher, "first"))
+      self.assertTrue(self._dispatch(dispatcher, "second"))
+      self.assertFalse(self._dispatch(dispatcher, "third"))
+      statistics = dispatcher.get_statistics()
+      self.assertEqual(statistics["backlog"], 2)
+      self.assertEqual(statistics["peak_backlog"], 2)
+      self.assertEqual(statistics["dropped"], 1)
+      self.assertEqual(statistics["dropped_per_handler"], {"third": 1})
+
+   def test_urgent_call_evicts_lowest_priority(self):
+      dispatcher = HandlerDispatcher(max_backlog=2)
+      self._block_worker(dispatcher)
+      self._dispatch(dispatcher, "low", 0)
+      self._dispatch(dispatcher, "middle", 5)
+      self.assertTrue(self._dispatch(dispatcher, "urgent", 10))
+      # The backlog holds calls of the same or a higher priority only.
+      self.assertFalse(self._dispatch(dispatcher, "middle again", 5))
+      statistics = dispatcher.get_statistics()
+      self.assertEqual(statistics["backlog"], 2)
+      self.assertEqual(statistics["dispatched"], 4)
+      self.assertEqual(statistics["dropped_per_handler"], {"low": 1, "middle again": 1})
+      self.released.set()
+      _wait_until(lambda: dispatcher.get_statistics()["executed"] == 3)
+      self.assertEqual(self.calls, ["urgent", "middle"])
+      self.assertEqual(dispatcher.get_statistics()["backlog"], 0)
+
+   @mock.patch("RobotFramework_DBus.common.handler_dispatcher.logger")
+   def test_failed_handler(self, logger):
+      dispatcher = HandlerDispatcher()
+      dispatcher.dispatch(lambda: 1 / 0, handler_name="Broken")
+      self._dispatch(dispatcher, "next")
+      _wait_until(lambda: dispatcher.get_statistics()["executed"] == 2)
+      self.assertEqual(dispatcher.get_statistics()["failed"], 1)
+      self.assertEqual(self.calls, ["next"])
+      self.assertIn("Broken", logger.error.call_args[0][0])
+
+   def test_configure_workers(self):
+      dispatcher = HandlerDispatcher(workers=3)
+      self.assertEqual(dispatcher.get_statistics()["workers"], 3)
+      dispatcher.configure(workers=1, max_backlog=10)
+      statistics = dispatcher.get_statistics()
+      self.assertEqual((statistics["workers"], statistics["max_backlog"]), (1, 10))
+      # The stopped workers remove themselves.
+      _wait_until(lambda: len(dispatcher._workers) == 1)
+      self._dispatch(dispatcher, "after shrinking")
+      _wait_until(lambda: self.calls == ["after shrinking"])
+      dispatcher.configure(workers=2)
+      self.assertEqual(dispatcher.get_statistics()["workers"], 2)
+      _wait_until(lambda: len(dispatcher._workers) == 2)
+
+   def test_configure_invalid_values(self):
+      dispatcher = HandlerDispatcher()
+      with self.assertRaises(ValueError):
+         dispatcher.configure(workers=0)
+      with self.assertRaises(ValueError):
+         dispatcher.configure(max_backlog=0)
+
+
+if __name__ == "__main__":
+   unittest.main()
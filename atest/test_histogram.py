@@ -0,0 +1,87 @@
+#  Copyright 2020-2023 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# *******************************************************************************
+#
+# File: test_histogram.py
+#
+# Initially created by Nguyen Huynh Tri Cuong (MS/EMC12-XC) / May 2023.
+#
+# Description:
+#   Unit tests of the logarithmic histogram.
+#
+# History:
+#
+# 22.05.2023 / V 0.1.0 / Nguyen Huynh Tri Cuong
+# - Initialize
+#
+# *******************************************************************************
+from RobotFramework_DBus.common.histogram import LogHistogram
+import unittest
+
+
+class TestLogHistogram(unittest.TestCase):
+
+   def test_empty(self):
+      histogram = LogHistogram()
+      self.assertIsNone(histogram.get_mean())
+      self.assertIsNone(histogram.get_percentile(99))
+      self.assertEqual(histogram.to_dict(), {"count": 0, "min": None, "mean": None, "max": None,
+                                             "p50": None, "p90": None, "p99": None})
+
+   def test_single_value(self):
+      histogram = LogHistogram()
+      histogram.record(0.25)
+      self.assertEqual(histogram.get_mean(), 0.25)
+      self.assertEqual(histogram.get_percentile(50), 0.25)
+      self.assertEqual(histogram.get_percentile(99), 0.25)
+
+   def test_percentile_relative_error(self):
+      histogram = LogHistogram()
+      values = [idx / 1000.0 for idx in range(1, 1001)]
+      for value in values:
+         histogram.record(value)
+      max_error = 2 ** (1.0 / histogram.sub_buckets) - 1
+      for percentile in (50, 90, 99):
+         expected = values[int(len(values) * percentile / 100.0) - 1]
+         self.assertLessEqual(abs(histogram.get_percentile(percentile) - expected) / expected, max_error)
+      self.assertEqual(histogram.get_percentile(100), 1.0)
+      self.assertAlmostEqual(histogram.get_mean(), 0.5005)
+
+   def test_values_out_of_range(self):
+      histogram = LogHistogram(min_value=0.001, max_value=1.0)
+      histogram.record(0.0)
+      histogram.record(50.0)
+      self.assertEqual(histogram.count, 2)
+      self.assertEqual(histogram.get_percentile(1), 0.001)
+      self.assertEqual(histogram.get_percentile(100), 50.0)
+
+   def test_merge(self):
+      first = LogHistogram()
+      second = LogHistogram()
+      first.record(0.1)
+      second.record(0.3)
+      second.record(0.2)
+      first.merge(second)
+      self.assertEqual(first.count, 3)
+      self.assertEqual((first.min, first.max), (0.1, 0.3))
+      self.assertAlmostEqual(first.get_mean(), 0.2)
+
+   def test_to_dict_with_fractional_percentile(self):
+      histogram = LogHistogram()
+      histogram.record(0.5)
+      self.assertIn("p99_9", histogram.to_dict(percentiles=(99.9,)))
+
+
+if __name__ == "__main__":
+   unittest.main()
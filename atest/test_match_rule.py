@@ -0,0 +1,171 @@
+#  Copyright 2020-2023 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# *******************************************************************************
+#
+# File: test_match_rule.py
+#
+# Initially created by Nguyen Huynh Tri Cuong (MS/EMC12-XC) / May 2023.
+#
+# Description:
+#   Unit tests of the match rules of filtered signal subscriptions. The bus calls and the signals
+#   are fed to the subscription directly, without a message bus.
+#
+# History:
+#
+# 22.05.2023 / V 0.1.0 / Nguyen Huynh Tri Cuong
+# - Initialize
+#
+# *******************************************************************************
+from RobotFramework_DBus.common.match_rule import FilteredSignal, SignalMatchFilter
+from gi.repository import Gio, GLib
+import unittest
+
+
+class TestSignalMatchFilter(unittest.TestCase):
+
+   def test_parse_string(self):
+      match_filter = SignalMatchFilter.parse(" arg0 = org.example.Device , path_namespace=/org/example,")
+      self.assertEqual(match_filter, SignalMatchFilter(arg0="org.example.Device", path_namespace="/org/example"))
+      self.assertEqual(str(match_filter), "arg0=org.example.Device,path_namespace=/org/example")
+
+   def test_parse_dict(self):
+      self.assertEqual(SignalMatchFilter.parse({"arg0namespace": "org.example"}).arg0namespace, "org.example")
+
+   def test_parse_no_filter(self):
+      for match_filter in (None, "", " , ", {}):
+         self.assertIsNone(SignalMatchFilter.parse(match_filter))
+      existing = SignalMatchFilter(arg0="ready")
+      self.assertIs(SignalMatchFilter.parse(existing), existing)
+
+   def test_parse_errors(self):
+      with self.assertRaisesRegex(ValueError, "Invalid match filter 'arg0'"):
+         SignalMatchFilter.parse("arg0")
+      with self.assertRaisesRegex(ValueError, "Unsupported match filter 'arg1'"):
+         SignalMatchFilter.parse("arg1=ready")
+      with self.assertRaisesRegex(ValueError, "cannot be combined"):
+         SignalMatchFilter.parse("arg0=ready,arg0namespace=org.example")
+      with self.assertRaisesRegex(ValueError, "must be an object path"):
+         SignalMatchFilter.parse("path_namespace=org/example")
+
+   def test_equal_filters_share_key(self):
+      self.assertEqual(len({SignalMatchFilter.parse("arg0=a"), SignalMatchFilter(arg0="a"),
+                            SignalMatchFilter(arg0namespace="a")}), 2)
+
+   def test_build_rule(self):
+      rule = SignalMatchFilter(arg0="ready").build_rule("org.example", "org.example.Device", "State", "/dev/0")
+      self.assertEqual(rule, "type='signal',sender='org.example',interface='org.example.Device',member='State',"
+                             "path='/dev/0',arg0='ready'")
+
+   def test_build_rule_with_namespaces(self):
+      rule = SignalMatchFilter(arg0namespace="org.example", path_namespace="/org").build_rule(
+                "org.example", "org.example.Device", "State", "/dev/0")
+      self.assertEqual(rule, "type='signal',sender='org.example',interface='org.example.Device',member='State',"
+                             "path_namespace='/org',arg0namespace='org.example'")
+
+   def test_build_rule_quotes_apostrophes(self):
+      rule = SignalMatchFilter(arg0="it's 'done'").build_rule("org.example", "org.example.Device", "State", "/")
+      self.assertTrue(rule.endswith(",arg0='it'\\''s '\\''done'\\'''"))
+
+   def test_matches_path(self):
+      match_filter = SignalMatchFilter(path_namespace="/org/example")
+      self.assertTrue(match_filter.matches_path("/org/example"))
+      self.assertTrue(match_filter.matches_path("/org/example/dev/0"))
+      self.assertFalse(match_filter.matches_path("/org/example2"))
+      self.assertFalse(match_filter.matches_path("/org"))
+      self.assertTrue(SignalMatchFilter(path_namespace="/").matches_path("/any/path"))
+      self.assertTrue(SignalMatchFilter(arg0="ready").matches_path("/any/path"))
+
+
+class _FakeConnection:
+   """
+Stand-in for the Gio.DBusConnection, recording the subscriptions and the calls to the bus daemon.
+   """
+   def __init__(self):
+      self.subscriptions = {}
+      self.bus_calls = []
+      self.add_match_error = None
+
+   def signal_subscribe(self, *args):
+      subscription_id = len(self.subscriptions) + 1
+      self.subscriptions[subscription_id] = args
+      return subscription_id
+
+   def signal_unsubscribe(self, subscription_id):
+      del self.subscriptions[subscription_id]
+
+   def call_sync(self, bus_name, object_path, interface_name, method_name, parameters, *args):
+      if method_name == "AddMatch" and self.add_match_error is not None:
+         raise self.add_match_error
+      self.bus_calls.append((method_name, parameters.unpack()[0]))
+
+
+class _FakeMessageBus:
+
+   def __init__(self, connection):
+      self.connection = connection
+
+
+class TestFilteredSignal(unittest.TestCase):
+
+   def setUp(self):
+      self.connection = _FakeConnection()
+
+   def _subscribe(self, match_filter):
+      return FilteredSignal(_FakeMessageBus(self.connection), "org.example", "/dev/0", "org.example.Device",
+                            "State", match_filter)
+
+   def _emit(self, object_path, *args):
+      (_subscription_args,) = self.connection.subscriptions.values()
+      callback = _subscription_args[-1]
+      callback(self.connection, ":1.5", object_path, "org.example.Device", "State",
+               GLib.Variant("(%s)" % ("s" * len(args)), args))
+
+   def test_subscription(self):
+      sgn = self._subscribe(SignalMatchFilter(arg0namespace="org.example"))
+      self.assertEqual(self.connection.bus_calls, [("AddMatch", sgn.rule)])
+      (subscription_args,) = self.connection.subscriptions.values()
+      self.assertEqual(subscription_args[:5], ("org.example", "org.example.Device", "State", "/dev/0", "org.example"))
+      self.assertEqual(subscription_args[5],
+                       Gio.DBusSignalFlags.NO_MATCH_RULE | Gio.DBusSignalFlags.MATCH_ARG0_NAMESPACE)
+
+   def test_path_namespace(self):
+      sgn = self._subscribe(SignalMatchFilter(path_namespace="/dev"))
+      received = []
+      sgn.connect(lambda *args: received.append(args))
+      self._emit("/dev/1", "ready")
+      self._emit("/device", "ready")
+      self.assertEqual(received, [("ready",)])
+
+   def test_disconnect(self):
+      sgn = self._subscribe(SignalMatchFilter(arg0="ready"))
+      first, second = [], []
+      sgn.connect(first.append)
+      sgn.connect(second.append)
+      sgn.disconnect(first.append)
+      self.assertEqual(len(self.connection.subscriptions), 1)
+      sgn.disconnect(second.append)
+      self.assertEqual(self.connection.subscriptions, {})
+      self.assertEqual(self.connection.bus_calls, [("AddMatch", sgn.rule), ("RemoveMatch", sgn.rule)])
+      sgn.disconnect()
+      self.assertEqual(len(self.connection.bus_calls), 2)
+
+   def test_add_match_error(self):
+      self.connection.add_match_error = GLib.Error("Too many match rules.")
+      with self.assertRaises(GLib.Error):
+         self._subscribe(SignalMatchFilter(arg0="ready"))
+      self.assertEqual(self.connection.subscriptions, {})
+
+
+if __name__ == "__main__":
+   unittest.main()
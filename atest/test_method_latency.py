@@ -0,0 +1,72 @@
+#  Copyright 2020-2023 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# *******************************************************************************
+#
+# File: test_method_latency.py
+#
+# Initially created by Nguyen Huynh Tri Cuong (MS/EMC12-XC) / May 2023.
+#
+# Description:
+#   Unit tests of the per-method latency histograms.
+#
+# History:
+#
+# 22.05.2023 / V 0.1.0 / Nguyen Huynh Tri Cuong
+# - Initialize
+#
+# *******************************************************************************
+from RobotFramework_DBus.common.method_latency import MethodLatencyRecorder
+import unittest
+
+
+class TestMethodLatencyRecorder(unittest.TestCase):
+
+   def setUp(self):
+      self.recorder = MethodLatencyRecorder()
+
+   def test_per_method(self):
+      for idx in range(1, 101):
+         self.recorder.record("Get", idx / 1000.0)
+      self.recorder.record("Set", 0.5)
+      summary = self.recorder.get_statistics("Get")
+      self.assertEqual(sorted(summary), ["count", "max", "mean", "min", "p50", "p90", "p99", "p99_9"])
+      self.assertEqual((summary["count"], summary["min"], summary["max"]), (100, 0.001, 0.1))
+      self.assertAlmostEqual(summary["mean"], 0.0505)
+      self.assertAlmostEqual(summary["p50"], 0.05, delta=0.05 * 0.05)
+      self.assertEqual(summary["p99_9"], 0.1)
+      self.assertEqual(self.recorder.get_statistics("Set")["p50"], 0.5)
+
+   def test_all_methods(self):
+      self.recorder.record("Get", 0.1)
+      self.recorder.record("Set", 0.2)
+      statistics = self.recorder.get_statistics()
+      self.assertEqual(sorted(statistics), ["Get", "Set"])
+      self.assertEqual(statistics["Set"]["count"], 1)
+
+   def test_unknown_method(self):
+      self.assertEqual(self.recorder.get_statistics("Unknown")["count"], 0)
+      self.assertEqual(self.recorder.get_statistics(), {})
+
+   def test_missing_latency_is_ignored(self):
+      self.recorder.record("Get", None)
+      self.assertEqual(self.recorder.get_statistics(), {})
+
+   def test_reset(self):
+      self.recorder.record("Get", 0.1)
+      self.recorder.reset()
+      self.assertEqual(self.recorder.get_statistics(), {})
+
+
+if __name__ == "__main__":
+   unittest.main()
@@ -0,0 +1,169 @@
+#  Copyright 2020-2023 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# *******************************************************************************
+#
+# File: test_object_index.py
+#
+# Initially created by Nguyen Huynh Tri Cuong (MS/EMC12-XC) / May 2023.
+#
+# Description:
+#   Unit tests of the index of the objects of an ObjectManager. The replies and signals of the
+#   object manager are fed to the index directly, without a message bus.
+#
+# History:
+#
+# 22.05.2023 / V 0.1.0 / Nguyen Huynh Tri Cuong
+# - Initialize
+#
+# *******************************************************************************
+from RobotFramework_DBus.common.object_index import ObjectIndex, _insert_sorted, _remove_sorted
+from gi.repository import GLib
+import unittest
+
+INTERFACE_NAME = "org.example.Device"
+
+
+class _FakeConnection:
+   """
+Stand-in for the Gio.DBusConnection, returning a fixed ``GetManagedObjects`` reply.
+   """
+   def __init__(self, managed_objects):
+      self.reply = GLib.Variant("(a{oa{sa{sv}}})", (managed_objects,))
+      self.pending_callback = None
+      self.subscriptions = 0
+
+   def signal_subscribe(self, *args):
+      self.subscriptions += 1
+      return self.subscriptions
+
+   def signal_unsubscribe(self, subscription_id):
+      self.subscriptions -= 1
+
+   def call_sync(self, *args):
+      return self.reply
+
+   def call(self, *args):
+      self.pending_callback = args[-1]
+
+   def finish_call(self):
+      self.pending_callback(self, None)
+
+   def call_finish(self, result):
+      if isinstance(self.reply, Exception):
+         raise self.reply
+      return self.reply
+
+
+class _FakeMessageBus:
+
+   def __init__(self, connection):
+      self.connection = connection
+
+
+def _device(state):
+   return {INTERFACE_NAME: {"State": GLib.Variant("s", state)}}
+
+
+class TestSortedPaths(unittest.TestCase):
+
+   def test_insert_and_remove(self):
+      paths = []
+      for object_path in ("/dev/2", "/dev/0", "/dev/1", "/dev/0"):
+         _insert_sorted(paths, object_path)
+      self.assertEqual(paths, ["/dev/0", "/dev/1", "/dev/2"])
+      _remove_sorted(paths, "/dev/1")
+      _remove_sorted(paths, "/dev/3")
+      self.assertEqual(paths, ["/dev/0", "/dev/2"])
+
+
+class TestObjectIndex(unittest.TestCase):
+
+   def setUp(self):
+      self.connection = _FakeConnection({"/dev/1": _device("IDLE"), "/dev/0": _device("READY")})
+      self.index = self._attach(self.connection)
+
+   @staticmethod
+   def _attach(connection):
+      index = ObjectIndex(_FakeMessageBus(connection), "org.example", "/")
+      index.attach()
+      connection.finish_call()
+      index.wait_until_loaded()
+      return index
+
+   def _interfaces_added(self, object_path, interfaces):
+      parameters = GLib.Variant("(oa{sa{sv}})", (object_path, interfaces))
+      self.index._on_interfaces_added(self.connection, None, "/", None, "InterfacesAdded", parameters)
+
+   def _interfaces_removed(self, object_path, interface_names):
+      parameters = GLib.Variant("(oas)", (object_path, interface_names))
+      self.index._on_interfaces_removed(self.connection, None, "/", None, "InterfacesRemoved", parameters)
+
+   def _properties_changed(self, object_path, changed, invalidated=()):
+      parameters = GLib.Variant("(sa{sv}as)", (INTERFACE_NAME, changed, list(invalidated)))
+      self.index._on_properties_changed(self.connection, None, object_path, None, "PropertiesChanged", parameters)
+
+   def test_load(self):
+      self.assertEqual(self.index.get_object_count(), 2)
+      self.assertEqual(self.index.get_object("/dev/1"), {INTERFACE_NAME: {"State": "IDLE"}})
+      self.assertIsNone(self.index.get_object("/dev/9"))
+      self.assertEqual(self.index.find_by_interface(INTERFACE_NAME), ["/dev/0", "/dev/1"])
+      self.assertEqual(self.index.find_by_interface("org.example.Unknown"), [])
+
+   def test_load_error(self):
+      connection = _FakeConnection({})
+      connection.reply = GLib.Error("The service has gone away.")
+      with self.assertRaises(GLib.Error):
+         self._attach(connection)
+
+   def test_find_by_property(self):
+      self.assertEqual(self.index.find_by_property(INTERFACE_NAME, "State", "READY"), ["/dev/0"])
+      self.assertEqual(self.index.find_by_property(INTERFACE_NAME, "State", "BUSY"), [])
+
+   def test_interfaces_added_and_removed(self):
+      self.index.find_by_property(INTERFACE_NAME, "State", "READY")
+      self._interfaces_added("/dev/00", _device("READY"))
+      self.assertEqual(self.index.find_by_interface(INTERFACE_NAME), ["/dev/0", "/dev/00", "/dev/1"])
+      self.assertEqual(self.index.find_by_property(INTERFACE_NAME, "State", "READY"), ["/dev/0", "/dev/00"])
+      self._interfaces_removed("/dev/0", [INTERFACE_NAME])
+      self.assertIsNone(self.index.get_object("/dev/0"))
+      self.assertEqual(self.index.find_by_interface(INTERFACE_NAME), ["/dev/00", "/dev/1"])
+      self.assertEqual(self.index.find_by_property(INTERFACE_NAME, "State", "READY"), ["/dev/00"])
+
+   def test_properties_changed(self):
+      self.index.find_by_property(INTERFACE_NAME, "State", "READY")
+      self._properties_changed("/dev/1", {"State": GLib.Variant("s", "READY")})
+      self.assertEqual(self.index.find_by_property(INTERFACE_NAME, "State", "READY"), ["/dev/0", "/dev/1"])
+      self.assertEqual(self.index.find_by_property(INTERFACE_NAME, "State", "IDLE"), [])
+      self._properties_changed("/dev/0", {}, ["State"])
+      self.assertEqual(self.index.get_object("/dev/0"), {INTERFACE_NAME: {}})
+      self.assertEqual(self.index.find_by_property(INTERFACE_NAME, "State", "READY"), ["/dev/1"])
+
+   def test_signals_before_load_are_ignored(self):
+      connection = _FakeConnection({})
+      index = ObjectIndex(_FakeMessageBus(connection), "org.example", "/")
+      index.attach()
+      parameters = GLib.Variant("(oa{sa{sv}})", ("/dev/5", _device("READY")))
+      index._on_interfaces_added(connection, None, "/", None, "InterfacesAdded", parameters)
+      connection.finish_call()
+      index.wait_until_loaded()
+      self.assertEqual(index.get_object_count(), 0)
+
+   def test_detach(self):
+      self.index.detach()
+      self.assertEqual(self.connection.subscriptions, 0)
+      self.assertEqual(self.index.get_object_count(), 0)
+
+
+if __name__ == "__main__":
+   unittest.main()
@@ -0,0 +1,243 @@
+#  Copyright 2020-2023 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# *******************************************************************************
+#
+# File: test_property_cache.py
+#
+# Initially created by Nguyen Huynh Tri Cuong (MS/EMC12-XC) / May 2023.
+#
+# Description:
+#   Unit tests of the cache of DBus properties. The replies of the Properties interface and the
+#   PropertiesChanged signals are fed to the cache directly, without a message bus.
+#
+# History:
+#
+# 22.05.2023 / V 0.1.0 / Nguyen Huynh Tri Cuong
+# - Initialize
+#
+# *******************************************************************************
+from RobotFramework_DBus.common.property_cache import PropertyCache, PropertyWaiter
+from gi.repository import GLib
+from threading import Timer
+import unittest
+
+INTERFACE_NAME = "org.example.Device"
+
+
+class _FakeConnection:
+   """
+Stand-in for the Gio.DBusConnection, serving the properties of one object.
+``on_call`` is run before a reply is returned, e.g. to emit a signal while a load is in progress.
+   """
+   def __init__(self, properties):
+      self.properties = properties
+      self.calls = []
+      self.on_call = None
+      self.subscriptions = 0
+
+   def signal_subscribe(self, *args):
+      self.subscriptions += 1
+      return self.subscriptions
+
+   def signal_unsubscribe(self, subscription_id):
+      self.subscriptions -= 1
+
+   def call_sync(self, service_name, object_path, interface_name, method_name, parameters, *args):
+      self.calls.append(method_name)
+      arguments = parameters.unpack()
+      if method_name == "GetAll":
+         reply = GLib.Variant("(a{sv})", ({name: GLib.Variant("s", value)
+                                           for name, value in self.properties.items()},))
+      elif method_name == "Get":
+         reply = GLib.Variant("(v)", (GLib.Variant("s", self.properties[arguments[1]]),))
+      else:
+         self.properties[arguments[1]] = arguments[2]
+         reply = GLib.Variant("()", ())
+      if self.on_call is not None:
+         on_call, self.on_call = self.on_call, None
+         on_call()
+      return reply
+
+
+class _FakeMessageBus:
+
+   def __init__(self, connection):
+      self.connection = connection
+
+
+class _FakeReactor:
+   """
+Stand-in for the reactor, running the functions on the calling thread.
+   """
+   def call(self, func, *args):
+      return func(*args)
+
+
+class _PropertyCacheTestCase(unittest.TestCase):
+
+   def setUp(self):
+      self.connection = _FakeConnection({"State": "IDLE", "Name": "first"})
+      self.cache = PropertyCache(_FakeMessageBus(self.connection), "org.example", "/org/example", _FakeReactor())
+      self.cache.attach()
+
+   def _properties_changed(self, changed, invalidated=()):
+      """
+Emit ``PropertiesChanged`` of the service, which has updated its properties before.
+      """
+      for name, value in changed.items():
+         self.connection.properties[name] = value
+      parameters = GLib.Variant("(sa{sv}as)", (INTERFACE_NAME, {name: GLib.Variant("s", value)
+                                                                for name, value in changed.items()},
+                                               list(invalidated)))
+      self.cache._on_properties_changed(self.connection, None, "/org/example", None, "PropertiesChanged", parameters)
+
+
+class TestPropertyCache(_PropertyCacheTestCase):
+
+   def test_properties_are_loaded_once(self):
+      self.assertEqual(self.cache.get(INTERFACE_NAME, "State"), "IDLE")
+      self.assertEqual(self.cache.get(INTERFACE_NAME, "Name"), "first")
+      self.assertEqual(self.cache.get_all(INTERFACE_NAME), {"State": "IDLE", "Name": "first"})
+      self.assertEqual(self.connection.calls, ["GetAll"])
+
+   def test_changed_properties(self):
+      self.cache.get(INTERFACE_NAME, "State")
+      self._properties_changed({"State": "READY"})
+      self.assertEqual(self.cache.get(INTERFACE_NAME, "State"), "READY")
+      self.assertEqual(self.connection.calls, ["GetAll"])
+
+   def test_invalidated_property_is_read_again(self):
+      self.cache.get(INTERFACE_NAME, "State")
+      self.connection.properties["State"] = "BUSY"
+      self._properties_changed({}, ["State"])
+      self.assertEqual(self.cache.get(INTERFACE_NAME, "State"), "BUSY")
+      self.assertEqual(self.cache.get(INTERFACE_NAME, "State"), "BUSY")
+      self.assertEqual(self.connection.calls, ["GetAll", "Get"])
+
+   def test_property_changed_during_load(self):
+      # The change may be older or newer than the loaded value, so the property is read again.
+      self.connection.on_call = lambda: self._properties_changed({"State": "READY"})
+      self.assertEqual(self.cache.get(INTERFACE_NAME, "State"), "IDLE")
+      self.assertEqual(self.cache.get(INTERFACE_NAME, "State"), "READY")
+      self.assertEqual(self.cache.get(INTERFACE_NAME, "Name"), "first")
+      self.assertEqual(self.connection.calls, ["GetAll", "Get"])
+
+   def test_property_invalidated_during_load(self):
+      def _invalidate():
+         self.connection.properties["State"] = "BUSY"
+         self._properties_changed({}, ["State"])
+
+      self.connection.on_call = _invalidate
+      self.cache.get_all(INTERFACE_NAME)
+      self.assertEqual(self.cache.get(INTERFACE_NAME, "State"), "BUSY")
+      self.assertEqual(self.connection.calls, ["GetAll", "Get"])
+
+   def test_changes_of_other_interfaces_are_ignored(self):
+      self.connection.on_call = lambda: self.cache._on_properties_changed(
+         self.connection, None, "/org/example", None, "PropertiesChanged",
+         GLib.Variant("(sa{sv}as)", ("org.example.Other", {"State": GLib.Variant("s", "READY")}, [])))
+      self.cache.get(INTERFACE_NAME, "State")
+      self.assertEqual(self.cache.get(INTERFACE_NAME, "State"), "IDLE")
+      self.assertEqual(self.connection.calls, ["GetAll"])
+
+   def test_set(self):
+      self.cache.get(INTERFACE_NAME, "State")
+      self.cache.set(INTERFACE_NAME, "State", "s", "READY")
+      self.assertEqual(self.connection.properties["State"], "READY")
+      # The service does not emit PropertiesChanged, the value is read again.
+      self.assertEqual(self.cache.get(INTERFACE_NAME, "State"), "READY")
+      self.assertEqual(self.connection.calls, ["GetAll", "Set", "Get"])
+
+   def test_invalidate_interface(self):
+      self.cache.get(INTERFACE_NAME, "State")
+      self.cache.invalidate(INTERFACE_NAME)
+      self.cache.get(INTERFACE_NAME, "State")
+      self.assertEqual(self.connection.calls, ["GetAll", "GetAll"])
+
+   def test_detach(self):
+      self.cache.get(INTERFACE_NAME, "State")
+      self.cache.detach()
+      self.assertEqual(self.connection.subscriptions, 0)
+      self.cache.get(INTERFACE_NAME, "State")
+      self.assertEqual(self.connection.calls, ["GetAll", "GetAll"])
+
+
+class TestPropertyWaiter(unittest.TestCase):
+
+   def test_matches(self):
+      waiter = PropertyWaiter(INTERFACE_NAME, "Count", 3)
+      self.assertTrue(waiter.matches(3))
+      self.assertTrue(waiter.matches("3"))
+      self.assertFalse(waiter.matches(4))
+
+   def test_notifications(self):
+      waiter = PropertyWaiter(INTERFACE_NAME, "State", "READY")
+      waiter("org.example.Other", {"State": "READY"}, [])
+      waiter(INTERFACE_NAME, {"State": "BUSY"}, [])
+      self.assertFalse(waiter.wait(0))
+      self.assertEqual(waiter.value, "BUSY")
+      waiter(INTERFACE_NAME, {}, ["State"])
+      self.assertTrue(waiter.wait(0))
+      self.assertTrue(waiter.invalidated)
+      waiter(INTERFACE_NAME, {"State": "READY"}, [])
+      self.assertTrue(waiter.wait(0))
+      self.assertTrue(waiter.matched)
+
+
+class TestWaitForValue(_PropertyCacheTestCase):
+
+   def _change_later(self, changed, invalidated=()):
+      Timer(0.05, self._properties_changed, (changed, invalidated)).start()
+
+   def test_current_value(self):
+      self.assertEqual(self.cache.wait_for_value(INTERFACE_NAME, "State", "IDLE", 5), (True, "IDLE"))
+      self.assertEqual(self.cache._waiters, [])
+
+   def test_changed_value(self):
+      self._change_later({"State": "READY"})
+      self.assertEqual(self.cache.wait_for_value(INTERFACE_NAME, "State", "READY", 5), (True, "READY"))
+      # The service is not polled.
+      self.assertEqual(self.connection.calls, ["GetAll"])
+      self.assertEqual(self.cache._waiters, [])
+
+   def test_other_value_does_not_match(self):
+      self._change_later({"State": "BUSY"})
+      self.assertEqual(self.cache.wait_for_value(INTERFACE_NAME, "State", "READY", 0.3), (False, "BUSY"))
+      self.assertEqual(self.cache._waiters, [])
+
+   def test_timeout(self):
+      self.assertEqual(self.cache.wait_for_value(INTERFACE_NAME, "State", "READY", 0.1), (False, "IDLE"))
+
+   def test_invalidated_property_is_read_again(self):
+      def _invalidate():
+         self.connection.properties["State"] = "READY"
+         self._properties_changed({}, ["State"])
+
+      Timer(0.05, _invalidate).start()
+      self.assertEqual(self.cache.wait_for_value(INTERFACE_NAME, "State", "READY", 5), (True, "READY"))
+      self.assertEqual(self.connection.calls, ["GetAll", "Get"])
+
+   def test_wait_continues_after_invalidation(self):
+      def _invalidate():
+         self.connection.properties["State"] = "BUSY"
+         self._properties_changed({}, ["State"])
+         Timer(0.05, self._properties_changed, ({"State": "READY"},)).start()
+
+      Timer(0.05, _invalidate).start()
+      self.assertEqual(self.cache.wait_for_value(INTERFACE_NAME, "State", "READY", 5), (True, "READY"))
+      self.assertEqual(self.connection.calls, ["GetAll", "Get"])
+
+
+if __name__ == "__main__":
+   unittest.main()
@@ -0,0 +1,200 @@
+#  Copyright 2020-2023 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# *******************************************************************************
+#
+# File: test_proxy_cache.py
+#
+# Initially created by Nguyen Huynh Tri Cuong (MS/EMC12-XC) / May 2023.
+#
+# Description:
+#   Unit tests of the shared proxies and signal subscriptions. The proxies are made by a stand-in
+#   factory, without a message bus.
+#
+# History:
+#
+# 22.05.2023 / V 0.1.0 / Nguyen Huynh Tri Cuong
+# - Initialize
+#
+# *******************************************************************************
+from RobotFramework_DBus.common.proxy_cache import ProxyCache, SignalSubscription
+from threading import Event, Thread
+import time
+import unittest
+
+SERVICE_NAME = "org.example"
+OBJECT_PATH = "/org/example"
+INTERFACE_NAME = "org.example.Device"
+
+
+class _FakeFactory:
+   """
+Stand-in for the proxy factory, counting the created proxies. It can be held up and made to fail.
+   """
+   def __init__(self):
+      self.created = 0
+      self.error = None
+      self.started = Event()
+      self.released = Event()
+      self.released.set()
+
+   def __call__(self):
+      self.started.set()
+      self.released.wait(5)
+      if self.error is not None:
+         raise self.error
+      self.created += 1
+      return "proxy-%s" % self.created
+
+
+class TestProxyCache(unittest.TestCase):
+
+   def setUp(self):
+      self.cache = ProxyCache()
+      self.message_bus = object()
+      self.factory = _FakeFactory()
+      self.disconnected = []
+
+   def _acquire(self, interface_name=INTERFACE_NAME, replace=False, message_bus=None):
+      return self.cache.acquire(message_bus or self.message_bus, SERVICE_NAME, OBJECT_PATH, interface_name,
+                                self.factory, replace)
+
+   def _release(self, key):
+      self.cache.release(key, self.disconnected.append)
+
+   def test_reference_counting(self):
+      first_key, first_proxy = self._acquire()
+      second_key, second_proxy = self._acquire()
+      self.assertIs(first_key, second_key)
+      self.assertEqual((first_proxy, second_proxy), ("proxy-1", "proxy-1"))
+      self.assertEqual(self.factory.created, 1)
+      self.assertEqual(self.cache.get_reference_count(first_key), 2)
+      self._release(first_key)
+      self.assertEqual(self.disconnected, [])
+      self._release(second_key)
+      self.assertEqual(self.disconnected, ["proxy-1"])
+      # A further release is ignored.
+      self._release(second_key)
+      self.assertEqual(self.disconnected, ["proxy-1"])
+      self.assertEqual(self._acquire()[1], "proxy-2")
+
+   def test_key_of_the_proxy(self):
+      self._acquire()
+      self.assertEqual(self._acquire(interface_name=None)[1], "proxy-2")
+      self.assertEqual(self._acquire(message_bus=object())[1], "proxy-3")
+      self.assertEqual(self._acquire()[1], "proxy-1")
+
+   def test_replace(self):
+      old_key, old_proxy = self._acquire()
+      new_key, new_proxy = self._acquire(replace=True)
+      self.assertEqual((old_proxy, new_proxy), ("proxy-1", "proxy-2"))
+      # Later connections get the new proxy, the old one is kept until it is released.
+      self.assertEqual(self._acquire()[1], "proxy-2")
+      self.assertEqual(self.cache.get_reference_count(old_key), 1)
+      self.assertEqual(self.cache.get_reference_count(new_key), 2)
+      self._release(old_key)
+      self.assertEqual(self.disconnected, ["proxy-1"])
+      self.assertEqual(self._acquire()[1], "proxy-2")
+
+   def test_error(self):
+      self.factory.error = RuntimeError("The object does not exist.")
+      with self.assertRaises(RuntimeError):
+         self._acquire()
+      # The failed proxy is not cached.
+      self.factory.error = None
+      key, proxy = self._acquire()
+      self.assertEqual(proxy, "proxy-1")
+      self.assertEqual(self.cache.get_reference_count(key), 1)
+
+   def test_waiter_gets_error_of_creator(self):
+      self.factory.released.clear()
+      results = []
+
+      def _acquire_and_catch():
+         try:
+            results.append(self._acquire())
+         except Exception as ex:
+            results.append(ex)
+
+      creator = Thread(target=_acquire_and_catch)
+      creator.start()
+      self.factory.started.wait(5)
+      waiter = Thread(target=_acquire_and_catch)
+      waiter.start()
+      time.sleep(0.1)
+      error = RuntimeError("The object does not exist.")
+      self.factory.error = error
+      self.factory.released.set()
+      creator.join(5)
+      waiter.join(5)
+      self.assertEqual(results, [error, error])
+      self.factory.error = None
+      key, proxy = self._acquire()
+      self.assertEqual(self.cache.get_reference_count(key), 1)
+
+   def test_waiter_shares_proxy_of_creator(self):
+      self.factory.released.clear()
+      results = []
+      creator = Thread(target=lambda: results.append(self._acquire()))
+      creator.start()
+      self.factory.started.wait(5)
+      waiter = Thread(target=lambda: results.append(self._acquire()))
+      waiter.start()
+      time.sleep(0.1)
+      self.factory.released.set()
+      creator.join(5)
+      waiter.join(5)
+      self.assertEqual([proxy for _key, proxy in results], ["proxy-1", "proxy-1"])
+      self.assertEqual(self.cache.get_reference_count(results[0][0]), 2)
+
+
+class _FakeSignal:
+   """
+Stand-in for the signal of a dasbus proxy.
+   """
+   def __init__(self):
+      self.callbacks = []
+
+   def connect(self, callback):
+      self.callbacks.append(callback)
+
+   def disconnect(self, callback):
+      self.callbacks.remove(callback)
+
+   def emit(self, *args):
+      for callback in list(self.callbacks):
+         callback(*args)
+
+
+class TestSignalSubscription(unittest.TestCase):
+
+   def test_listeners(self):
+      sgn = _FakeSignal()
+      subscription = SignalSubscription("Tick", sgn)
+      first, second = [], []
+      subscription.add_listener(first.append)
+      subscription.add_listener(second.append)
+      sgn.emit(1)
+      subscription.remove_listener(first.append)
+      subscription.remove_listener(first.append)
+      sgn.emit(2)
+      self.assertEqual((first, second), ([1], [1, 2]))
+      self.assertEqual(len(sgn.callbacks), 1)
+      self.assertTrue(subscription.has_listeners())
+      subscription.disconnect()
+      self.assertFalse(subscription.has_listeners())
+      self.assertEqual(sgn.callbacks, [])
+
+
+if __name__ == "__main__":
+   unittest.main()
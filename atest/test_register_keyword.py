@@ -0,0 +1,120 @@
+#  Copyright 2020-2023 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# *******************************************************************************
+#
+# File: test_register_keyword.py
+#
+# Initially created by Nguyen Huynh Tri Cuong (MS/EMC12-XC) / May 2023.
+#
+# Description:
+#   Unit tests of the cached argument specification of signal handler keywords. The Robot Framework
+#   namespace is replaced by stand-ins.
+#
+# History:
+#
+# 22.05.2023 / V 0.1.0 / Nguyen Huynh Tri Cuong
+# - Initialize
+#
+# *******************************************************************************
+from RobotFramework_DBus.common.register_keyword import RegisterKeyword
+from types import SimpleNamespace
+from unittest import mock
+import unittest
+
+
+class _FakeNamespace:
+   """
+Stand-in for the Robot Framework namespace with user keywords and library keywords.
+   """
+   def __init__(self, user_keywords=None, library_keywords=None):
+      handlers = {name.lower(): SimpleNamespace(arguments=SimpleNamespace(argument_names=argument_names))
+                  for name, argument_names in (user_keywords or {}).items()}
+      self._kw_store = SimpleNamespace(user_keywords=SimpleNamespace(handlers=handlers))
+      self._library_keywords = library_keywords or {}
+
+   def get_runner(self, name, recommend_on_failure=True):
+      return SimpleNamespace(keyword=SimpleNamespace(args=self._library_keywords[name]))
+
+
+class TestRegisterKeyword(unittest.TestCase):
+
+   def setUp(self):
+      self.namespace = _FakeNamespace(user_keywords={"On State": ["state"]})
+      patcher = mock.patch.object(RegisterKeyword, "_get_namespace", side_effect=lambda: self.namespace)
+      patcher.start()
+      self.addCleanup(patcher.stop)
+      patcher = mock.patch("RobotFramework_DBus.common.register_keyword.BuiltIn")
+      self.run_keyword = patcher.start().return_value.run_keyword
+      self.addCleanup(patcher.stop)
+
+   @staticmethod
+   def _get_counters():
+      statistics = RegisterKeyword.get_lookup_statistics()
+      return statistics["argument_lookups"], statistics["argument_lookups_avoided"]
+
+   def test_surplus_arguments_are_dropped(self):
+      handler = RegisterKeyword("on state")
+      handler.callback_func("READY", 3, "extra")
+      self.run_keyword.assert_called_once_with("on state", "READY")
+
+   def test_arguments_are_resolved_once(self):
+      lookups, avoided = self._get_counters()
+      handler = RegisterKeyword("On State")
+      for _ in range(3):
+         handler.callback_func("READY")
+      self.assertEqual(self._get_counters(), (lookups + 1, avoided + 3))
+
+   def test_namespace_change(self):
+      handler = RegisterKeyword("On State")
+      lookups, avoided = self._get_counters()
+      # In another suite the keyword takes two arguments.
+      self.namespace = _FakeNamespace(user_keywords={"On State": ["state", "count"]})
+      handler.callback_func("READY", 3, "extra")
+      handler.callback_func("IDLE", 0, "extra")
+      self.assertEqual(self.run_keyword.call_args_list,
+                       [mock.call("On State", "READY", 3), mock.call("On State", "IDLE", 0)])
+      self.assertEqual(self._get_counters(), (lookups + 1, avoided + 1))
+
+   def test_library_keyword(self):
+      self.namespace = _FakeNamespace(library_keywords={"Log State": SimpleNamespace(var_positional=None,
+                                                                                      maxargs=2)})
+      RegisterKeyword("Log State").callback_func("READY", 3, "extra")
+      self.run_keyword.assert_called_once_with("Log State", "READY", 3)
+
+   def test_library_keyword_with_varargs(self):
+      self.namespace = _FakeNamespace(library_keywords={"Log Many": SimpleNamespace(var_positional="items",
+                                                                                     maxargs=0)})
+      RegisterKeyword("Log Many").callback_func("READY", 3, "extra")
+      self.run_keyword.assert_called_once_with("Log Many", "READY", 3, "extra")
+
+   def test_unknown_keyword_gets_all_arguments(self):
+      RegisterKeyword("Unknown").callback_func("READY", 3)
+      self.run_keyword.assert_called_once_with("Unknown", "READY", 3)
+
+   def test_without_namespace(self):
+      self.namespace = None
+      handler = RegisterKeyword("On State")
+      handler.callback_func("READY", 3)
+      self.run_keyword.assert_called_once_with("On State", "READY", 3)
+
+   @mock.patch("RobotFramework_DBus.common.register_keyword.HandlerDispatcher")
+   def test_dispatch(self, dispatcher):
+      handler = RegisterKeyword("On State", priority="5")
+      handler.dispatch_func("READY")
+      dispatcher.get_instance.return_value.dispatch.assert_called_once_with(handler.callback_func, ("READY",), 5,
+                                                                            "On State")
+
+
+if __name__ == "__main__":
+   unittest.main()
@@ -0,0 +1,139 @@
+#  Copyright 2020-2023 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# *******************************************************************************
+#
+# File: test_rpc_proxy_pool.py
+#
+# Initially created by Nguyen Huynh Tri Cuong (MS/EMC12-XC) / May 2023.
+#
+# Description:
+#   Unit tests of the pool of XML-RPC proxies. The proxies are replaced by stand-ins, without a server.
+#
+# History:
+#
+# 22.05.2023 / V 0.1.0 / Nguyen Huynh Tri Cuong
+# - Initialize
+#
+# *******************************************************************************
+from RobotFramework_DBus.common.rpc_proxy_pool import ServerProxyPool
+from threading import Barrier, Thread
+from unittest import mock
+import unittest
+import xmlrpc.client
+
+
+class _FakeServerProxy:
+   """
+Stand-in for ``xmlrpc.client.ServerProxy``, i.e. one persistent connection.
+   """
+   instances = []
+
+   def __init__(self, uri, **kwargs):
+      self.uri = uri
+      self.kwargs = kwargs
+      self.closed = False
+      _FakeServerProxy.instances.append(self)
+
+   def __call__(self, attr):
+      if attr == "close":
+         return self._close
+      raise AttributeError(attr)
+
+   def _close(self):
+      self.closed = True
+
+   def __getattr__(self, name):
+      return lambda *params: self._call(name, params)
+
+   def _call(self, name, params):
+      if self.closed:
+         raise ConnectionError("The connection is closed.")
+      if name == "fail":
+         raise xmlrpc.client.Fault(1, "boom")
+      if name == "drop":
+         raise ConnectionResetError("Connection reset by peer")
+      if name == "wait":
+         params[0].wait(5)
+      return params
+
+
+class TestServerProxyPool(unittest.TestCase):
+
+   def setUp(self):
+      _FakeServerProxy.instances = []
+      patcher = mock.patch.object(xmlrpc.client, "ServerProxy", _FakeServerProxy)
+      patcher.start()
+      self.addCleanup(patcher.stop)
+      self.pool = ServerProxyPool("http://agent:2507", max_idle=2, allow_none=True)
+
+   def _call_concurrently(self, count):
+      """
+Run ``count`` calls at once, so that each of them needs its own proxy.
+      """
+      barrier = Barrier(count)
+      threads = [Thread(target=self.pool.wait, args=(barrier,)) for _ in range(count)]
+      for thread in threads:
+         thread.start()
+      for thread in threads:
+         thread.join(5)
+
+   def test_connection_is_reused(self):
+      self.assertEqual(self.pool.echo(1, "a"), (1, "a"))
+      self.assertEqual(self.pool.call("echo", 2), (2,))
+      self.assertEqual(len(_FakeServerProxy.instances), 1)
+      self.assertEqual(_FakeServerProxy.instances[0].uri, "http://agent:2507")
+      self.assertEqual(_FakeServerProxy.instances[0].kwargs, {"allow_none": True})
+
+   def test_fault_keeps_connection(self):
+      with self.assertRaises(xmlrpc.client.Fault):
+         self.pool.fail()
+      self.pool.echo()
+      self.assertEqual(len(_FakeServerProxy.instances), 1)
+      self.assertFalse(_FakeServerProxy.instances[0].closed)
+
+   def test_transport_error_discards_connection(self):
+      with self.assertRaises(ConnectionResetError):
+         self.pool.drop()
+      self.assertTrue(_FakeServerProxy.instances[0].closed)
+      self.assertEqual(self.pool.echo(1), (1,))
+      self.assertEqual(len(_FakeServerProxy.instances), 2)
+
+   def test_concurrent_calls_use_separate_connections(self):
+      self._call_concurrently(2)
+      self.assertEqual(len(_FakeServerProxy.instances), 2)
+      self._call_concurrently(2)
+      self.assertEqual(len(_FakeServerProxy.instances), 2)
+
+   def test_idle_limit(self):
+      self._call_concurrently(4)
+      self.assertEqual(len(_FakeServerProxy.instances), 4)
+      self.assertEqual([proxy.closed for proxy in _FakeServerProxy.instances].count(False), 2)
+      self.assertEqual(len(self.pool._idle_proxies), 2)
+
+   def test_close(self):
+      self.pool.echo()
+      self.pool.close()
+      self.assertTrue(_FakeServerProxy.instances[0].closed)
+      # A proxy in use when the pool is closed is closed when it is given back.
+      proxy = self.pool._acquire()
+      self.pool._release(proxy, True)
+      self.assertTrue(proxy.closed)
+
+   def test_private_attributes_are_not_remote_methods(self):
+      with self.assertRaises(AttributeError):
+         self.pool._unknown
+
+
+if __name__ == "__main__":
+   unittest.main()
@@ -0,0 +1,180 @@
+#  Copyright 2020-2023 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# *******************************************************************************
+#
+# File: test_signal_buffer.py
+#
+# Initially created by Nguyen Huynh Tri Cuong (MS/EMC12-XC) / May 2023.
+#
+# Description:
+#   Unit tests of the captured signal queues and the signal event log.
+#
+#   Usage:
+#
+#      python -m unittest discover -s atest -p "test_*.py"
+#
+# History:
+#
+# 22.05.2023 / V 0.1.0 / Nguyen Huynh Tri Cuong
+# - Initialize
+#
+# *******************************************************************************
+from RobotFramework_DBus.common.signal_buffer import CapturedSignalStore, SignalEventLog, pack_payloads
+from threading import Timer
+import time
+import unittest
+
+
+class TestPackPayloads(unittest.TestCase):
+
+   def test_single_argument(self):
+      self.assertEqual(pack_payloads(("READY",)), "READY")
+
+   def test_several_arguments(self):
+      self.assertEqual(pack_payloads(("state", 3)), ["state", 3])
+
+
+class TestCapturedSignalStore(unittest.TestCase):
+
+   def test_invalid_capacity(self):
+      with self.assertRaises(ValueError):
+         CapturedSignalStore(capacity=0)
+
+   def test_invalid_overflow_policy(self):
+      with self.assertRaises(ValueError):
+         CapturedSignalStore(overflow_policy="drop-all")
+
+   def test_drop_oldest(self):
+      store = CapturedSignalStore(capacity=3, overflow_policy=CapturedSignalStore.OVERFLOW_DROP_OLDEST)
+      for idx in range(5):
+         store.push("Tick", idx)
+      self.assertEqual([store.pop("Tick").payloads for _ in range(3)], [2, 3, 4])
+      self.assertIsNone(store.pop("Tick"))
+      self.assertEqual(store.get_dropped_count("Tick"), 2)
+
+   def test_drop_newest(self):
+      store = CapturedSignalStore(capacity=3, overflow_policy=CapturedSignalStore.OVERFLOW_DROP_NEWEST)
+      results = [store.push("Tick", idx) for idx in range(5)]
+      self.assertIsNone(results[3])
+      self.assertIsNone(results[4])
+      self.assertEqual([store.pop("Tick").payloads for _ in range(3)], [0, 1, 2])
+      self.assertEqual(store.get_dropped_count("Tick"), 2)
+
+   def test_latest_only(self):
+      store = CapturedSignalStore(capacity=10, overflow_policy=CapturedSignalStore.OVERFLOW_LATEST_ONLY)
+      for idx in range(5):
+         store.push("Tick", idx)
+      self.assertEqual(store.pop("Tick").payloads, 4)
+      self.assertNotIn("Tick", store)
+      self.assertEqual(store.get_dropped_count("Tick"), 4)
+
+   def test_buffers_are_per_signal(self):
+      store = CapturedSignalStore(capacity=1)
+      store.push("Tick", 1)
+      store.push("Tock", 2)
+      self.assertEqual(store.pop("Tick").payloads, 1)
+      self.assertEqual(store.pop("Tock").payloads, 2)
+      self.assertEqual(store.get_dropped_count("Tick"), 0)
+
+   def test_wait_returns_oldest_of_several_signals(self):
+      store = CapturedSignalStore()
+      store.push("Tock", "first")
+      store.push("Tick", "second")
+      event = store.wait(["Tick", "Tock"])
+      self.assertEqual((event.signal, event.payloads), ("Tock", "first"))
+
+   def test_wait_without_emission_times_out(self):
+      store = CapturedSignalStore()
+      start = time.monotonic()
+      self.assertIsNone(store.wait(["Tick"], "0.2"))
+      self.assertGreaterEqual(time.monotonic() - start, 0.2)
+
+   def test_wait_is_woken_by_new_emission(self):
+      store = CapturedSignalStore()
+      Timer(0.1, store.push, ("Tick", "late")).start()
+      event = store.wait(["Tick"], 5)
+      self.assertEqual(event.payloads, "late")
+
+   def test_wait_with_predicate_skips_queued_emissions(self):
+      store = CapturedSignalStore()
+      store.push("State", "IDLE")
+      store.push("State", "READY")
+      event = store.wait(["State"], predicate=lambda payloads: payloads == "READY")
+      self.assertEqual(event.payloads, "READY")
+      self.assertEqual(store.pop("State").payloads, "IDLE")
+
+   def test_wait_with_predicate_claims_matching_emission(self):
+      store = CapturedSignalStore()
+      Timer(0.05, store.push, ("State", "IDLE")).start()
+      Timer(0.1, store.push, ("State", "READY")).start()
+      event = store.wait(["State"], 5, predicate=lambda payloads: payloads == "READY")
+      self.assertEqual(event.payloads, "READY")
+      # The claimed emission is not queued, the other one is.
+      self.assertEqual(store.pop("State").payloads, "IDLE")
+      self.assertIsNone(store.pop("State"))
+
+   def test_clear(self):
+      store = CapturedSignalStore()
+      store.push("Tick", 1)
+      store.clear()
+      self.assertNotIn("Tick", store)
+
+
+class TestSignalEventLog(unittest.TestCase):
+
+   def test_get_since_returns_new_events(self):
+      log = SignalEventLog()
+      log.append("Tick", 1)
+      log.append("Tock", 2)
+      result = log.get_since(0)
+      self.assertEqual(result["events"], [[1, "Tick", 1], [2, "Tock", 2]])
+      self.assertEqual(result["sequence"], 2)
+      self.assertEqual(result["missed"], 0)
+      self.assertFalse(result["closed"])
+      log.append("Tick", 3)
+      self.assertEqual(log.get_since(result["sequence"])["events"], [[3, "Tick", 3]])
+
+   def test_get_since_reports_missed_events(self):
+      log = SignalEventLog(capacity=2)
+      for idx in range(5):
+         log.append("Tick", idx)
+      result = log.get_since(0)
+      self.assertEqual([event[2] for event in result["events"]], [3, 4])
+      self.assertEqual(result["missed"], 3)
+      self.assertEqual(log.get_since(1)["missed"], 2)
+      self.assertEqual(log.get_since(3)["missed"], 0)
+
+   def test_get_since_waits_for_new_event(self):
+      log = SignalEventLog()
+      Timer(0.1, log.append, ("Tick", "late")).start()
+      result = log.get_since(0, 5)
+      self.assertEqual(result["events"], [[1, "Tick", "late"]])
+
+   def test_get_since_times_out(self):
+      log = SignalEventLog()
+      result = log.get_since(0, 0.1)
+      self.assertEqual(result["events"], [])
+      self.assertEqual(result["sequence"], 0)
+
+   def test_close_wakes_up_readers(self):
+      log = SignalEventLog()
+      Timer(0.1, log.close).start()
+      start = time.monotonic()
+      result = log.get_since(0, 5)
+      self.assertTrue(result["closed"])
+      self.assertLess(time.monotonic() - start, 5)
+
+
+if __name__ == "__main__":
+   unittest.main()
@@ -0,0 +1,81 @@
+#  Copyright 2020-2023 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# *******************************************************************************
+#
+# File: test_signal_predicate.py
+#
+# Initially created by Nguyen Huynh Tri Cuong (MS/EMC12-XC) / May 2023.
+#
+# Description:
+#   Unit tests of the predicates on signal payloads.
+#
+# History:
+#
+# 22.05.2023 / V 0.1.0 / Nguyen Huynh Tri Cuong
+# - Initialize
+#
+# *******************************************************************************
+from RobotFramework_DBus.common.signal_predicate import SignalPredicate
+import unittest
+
+
+class TestSignalPredicate(unittest.TestCase):
+
+   def test_invalid_type(self):
+      with self.assertRaises(ValueError):
+         SignalPredicate("READY", "glob")
+
+   def test_regex(self):
+      predicate = SignalPredicate("state=READY")
+      self.assertTrue(predicate({"info": "state=READY"}))
+      self.assertFalse(predicate("state=IDLE"))
+
+   def test_field(self):
+      predicate = SignalPredicate("1.state=READY", SignalPredicate.TYPE_FIELD)
+      self.assertTrue(predicate(["dev0", {"state": "READY"}]))
+      self.assertFalse(predicate(["dev0", {"state": "IDLE"}]))
+
+   def test_field_compares_string_representation(self):
+      predicate = SignalPredicate("1=3", SignalPredicate.TYPE_FIELD)
+      self.assertTrue(predicate(["count", 3]))
+
+   def test_field_with_empty_path(self):
+      predicate = SignalPredicate("=READY", SignalPredicate.TYPE_FIELD)
+      self.assertTrue(predicate("READY"))
+
+   def test_field_with_double_equal_sign(self):
+      predicate = SignalPredicate("state == READY", SignalPredicate.TYPE_FIELD)
+      self.assertTrue(predicate({"state": "READY"}))
+
+   def test_field_without_value(self):
+      with self.assertRaises(ValueError):
+         SignalPredicate("state", SignalPredicate.TYPE_FIELD)
+
+   def test_missing_field_does_not_match(self):
+      predicate = SignalPredicate("2.state=READY", SignalPredicate.TYPE_FIELD)
+      self.assertFalse(predicate(["dev0"]))
+
+   def test_expression(self):
+      predicate = SignalPredicate("payloads[1] > 3", SignalPredicate.TYPE_EXPRESSION)
+      self.assertTrue(predicate(["count", 4]))
+      self.assertFalse(predicate(["count", 3]))
+      self.assertFalse(predicate("no list"))
+
+   def test_expression_not_allowed(self):
+      with self.assertRaises(ValueError):
+         SignalPredicate("True", SignalPredicate.TYPE_EXPRESSION, allow_expression=False)
+
+
+if __name__ == "__main__":
+   unittest.main()
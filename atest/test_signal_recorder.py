@@ -0,0 +1,140 @@
+#  Copyright 2020-2023 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# *******************************************************************************
+#
+# File: test_signal_recorder.py
+#
+# Initially created by Nguyen Huynh Tri Cuong (MS/EMC12-XC) / May 2023.
+#
+# Description:
+#   Unit tests of the signal recorder and the lazy replay of its recordings.
+#
+# History:
+#
+# 22.05.2023 / V 0.1.0 / Nguyen Huynh Tri Cuong
+# - Initialize
+#
+# *******************************************************************************
+from RobotFramework_DBus.common.signal_recorder import SignalRecorder, get_recording_files, read_signal_recording
+import os
+import tempfile
+import time
+import types
+import unittest
+from unittest import mock
+
+
+class _FailingFile:
+   """
+Stand-in for the recording file, failing on every write.
+   """
+   def write(self, data):
+      raise OSError("No space left on device")
+
+   def flush(self):
+      pass
+
+   def close(self):
+      pass
+
+
+class TestSignalRecorder(unittest.TestCase):
+
+   def setUp(self):
+      self.directory = tempfile.TemporaryDirectory()
+      self.file_path = os.path.join(self.directory.name, "signals.jsonl.gz")
+
+   def tearDown(self):
+      self.directory.cleanup()
+
+   @mock.patch.object(SignalRecorder, "BATCH_SIZE", 10)
+   def _record(self, count, **kwargs):
+      # Small batches, so that the size of the file is checked several times.
+      recorder = SignalRecorder(self.file_path, flush_interval=0.05, **kwargs)
+      recorder.start()
+      for idx in range(count):
+         recorder.record("Tick" if idx % 2 == 0 else "Tock", "org.example", ":1.5", "/org/example", idx)
+      return recorder.stop()
+
+   def test_record_and_replay(self):
+      statistics = self._record(10)
+      self.assertEqual(statistics, {"file_path": self.file_path, "recorded": 10, "dropped": 0, "rotations": 0})
+      records = list(read_signal_recording(self.file_path))
+      self.assertEqual([record["payloads"] for record in records], list(range(10)))
+      self.assertEqual(set(records[0]), {"signal", "interface", "sender", "path", "monotonic", "wall", "payloads"})
+
+   def test_replay_is_lazy_and_filtered(self):
+      self._record(10)
+      records = read_signal_recording(self.file_path, signals="Tock")
+      self.assertIsInstance(records, types.GeneratorType)
+      self.assertEqual(next(records)["payloads"], 1)
+      self.assertEqual([record["payloads"] for record in records], [3, 5, 7, 9])
+
+   def test_rotation(self):
+      statistics = self._record(100, max_bytes=1000, backup_count=100)
+      self.assertGreater(statistics["rotations"], 1)
+      files = get_recording_files(self.file_path)
+      self.assertEqual(len(files), statistics["rotations"] + 1)
+      self.assertEqual(files[-2:], [self.file_path + ".1", self.file_path])
+      self.assertEqual([record["payloads"] for record in read_signal_recording(self.file_path)], list(range(100)))
+
+   def test_rotation_keeps_backup_count_files(self):
+      statistics = self._record(100, max_bytes=1000, backup_count=2)
+      self.assertGreater(statistics["rotations"], 2)
+      self.assertEqual(get_recording_files(self.file_path),
+                       [self.file_path + ".2", self.file_path + ".1", self.file_path])
+      payloads = [record["payloads"] for record in read_signal_recording(self.file_path)]
+      self.assertEqual(payloads, list(range(100 - len(payloads), 100)))
+
+   def test_no_rotation_without_backups(self):
+      statistics = self._record(100, max_bytes=1000, backup_count=0)
+      self.assertEqual(statistics["rotations"], 0)
+      self.assertEqual(get_recording_files(self.file_path), [self.file_path])
+      self.assertEqual(len(list(read_signal_recording(self.file_path))), 100)
+
+   def test_replay_of_running_recording(self):
+      recorder = SignalRecorder(self.file_path, flush_interval=0.05)
+      recorder.start()
+      recorder.record("Tick", "org.example", ":1.5", "/org/example", b"\x00\x01")
+      time.sleep(0.3)
+      try:
+         self.assertEqual([record["payloads"] for record in read_signal_recording(self.file_path)], ["AAE="])
+      finally:
+         recorder.stop()
+
+   def test_dropped_when_queue_is_full(self):
+      recorder = SignalRecorder(self.file_path, queue_size=1)
+      recorder.record("Tick", "org.example", ":1.5", "/org/example", 1)
+      recorder.record("Tick", "org.example", ":1.5", "/org/example", 2)
+      self.assertEqual(recorder.get_statistics()["dropped"], 1)
+
+   def test_stop_after_writer_failure(self):
+      recorder = SignalRecorder(self.file_path, queue_size=2, flush_interval=0.05)
+      recorder.start()
+      recorder._file.close()
+      recorder._file = _FailingFile()
+      recorder.record("Tick", "org.example", ":1.5", "/org/example", 1)
+      recorder._writer.join(5)
+      self.assertFalse(recorder._writer.is_alive())
+      # The queue is full and nobody takes items from it anymore.
+      recorder.record("Tick", "org.example", ":1.5", "/org/example", 2)
+      recorder.record("Tick", "org.example", ":1.5", "/org/example", 3)
+      start = time.monotonic()
+      with self.assertRaisesRegex(Exception, "No space left on device"):
+         recorder.stop()
+      self.assertLess(time.monotonic() - start, 1)
+
+
+if __name__ == "__main__":
+   unittest.main()
@@ -0,0 +1,101 @@
+#  Copyright 2020-2023 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# *******************************************************************************
+#
+# File: test_signal_statistics.py
+#
+# Initially created by Nguyen Huynh Tri Cuong (MS/EMC12-XC) / May 2023.
+#
+# Description:
+#   Unit tests of the per-signal counters, rates and inter-arrival times.
+#
+# History:
+#
+# 22.05.2023 / V 0.1.0 / Nguyen Huynh Tri Cuong
+# - Initialize
+#
+# *******************************************************************************
+from RobotFramework_DBus.common.signal_statistics import SignalCounter, SignalStatistics
+import time
+import unittest
+
+
+class TestSignalCounter(unittest.TestCase):
+
+   def setUp(self):
+      self.counter = SignalCounter(window=10.0, bucket_width=0.5)
+
+   def test_no_emission(self):
+      self.assertEqual(self.counter.get_rate(100.0), 0.0)
+      summary = self.counter.to_dict(100.0)
+      self.assertEqual((summary["count"], summary["last_received"], summary["inter_arrival_p99"]), (0, None, None))
+
+   def test_steady_rate(self):
+      # 5 emissions per second for 20 seconds, the window holds the last 10 seconds.
+      for idx in range(100):
+         self.counter.record(100.0 + idx * 0.2)
+      self.assertAlmostEqual(self.counter.get_rate(120.0), 5.0, delta=0.3)
+      self.assertEqual(self.counter.count, 100)
+
+   def test_rate_since_first_emission(self):
+      for idx in range(10):
+         self.counter.record(100.0 + idx * 0.2)
+      # The emissions of the last 2 seconds, not spread over the whole window.
+      self.assertAlmostEqual(self.counter.get_rate(102.0), 5.0)
+
+   def test_rate_floor_of_one_bucket_width(self):
+      self.counter.record(100.0)
+      self.assertEqual(self.counter.get_rate(100.0), 2.0)
+      self.counter.record(100.1)
+      self.assertEqual(self.counter.get_rate(100.1), 4.0)
+      self.assertEqual(self.counter.get_rate(101.0), 2.0)
+
+   def test_old_emissions_leave_window(self):
+      for idx in range(10):
+         self.counter.record(100.0 + idx * 0.2)
+      self.assertGreater(self.counter.get_rate(105.0), 0)
+      self.assertEqual(self.counter.get_rate(112.5), 0.0)
+      # A slot of the ring is reused by a later bucket.
+      self.counter.record(120.0)
+      self.assertAlmostEqual(self.counter.get_rate(125.0), 1 / 10.0, delta=0.01)
+      self.assertEqual(self.counter.count, 11)
+
+   def test_inter_arrival(self):
+      for timestamp in (100.0, 100.1, 100.4):
+         self.counter.record(timestamp)
+      summary = self.counter.to_dict(101.0)
+      self.assertAlmostEqual(summary["inter_arrival_min"], 0.1)
+      self.assertAlmostEqual(summary["inter_arrival_max"], 0.3)
+      self.assertAlmostEqual(summary["inter_arrival_mean"], 0.2)
+      self.assertAlmostEqual(summary["last_received"], 0.6)
+      self.assertEqual(summary["window"], 10.0)
+
+
+class TestSignalStatistics(unittest.TestCase):
+
+   def test_per_signal(self):
+      statistics = SignalStatistics()
+      now = time.monotonic()
+      statistics.record("Tick", now - 1.0)
+      statistics.record("Tick", now - 0.5)
+      statistics.record("Tock")
+      self.assertEqual(statistics.get_statistics("Tick")["count"], 2)
+      self.assertEqual(statistics.get_statistics("Unknown")["count"], 0)
+      self.assertEqual(sorted(statistics.get_statistics()), ["Tick", "Tock"])
+      statistics.reset()
+      self.assertEqual(statistics.get_statistics(), {})
+
+
+if __name__ == "__main__":
+   unittest.main()
@@ -0,0 +1,97 @@
+#  Copyright 2020-2023 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# *******************************************************************************
+#
+# File: test_worker_pool.py
+#
+# Initially created by Nguyen Huynh Tri Cuong (MS/EMC12-XC) / May 2023.
+#
+# Description:
+#   Unit tests of the worker pool of the DBus Agent servers.
+#
+# History:
+#
+# 22.05.2023 / V 0.1.0 / Nguyen Huynh Tri Cuong
+# - Initialize
+#
+# *******************************************************************************
+from RobotFramework_DBus.common.worker_pool import WorkerPool
+from threading import Event
+import contextlib
+import io
+import unittest
+
+
+class TestWorkerPool(unittest.TestCase):
+
+   def setUp(self):
+      self.pool = WorkerPool(1, "test-worker")
+
+   def tearDown(self):
+      self.pool.shutdown()
+
+   def _run(self, func, *args):
+      done = Event()
+
+      def _task():
+         try:
+            func(*args)
+         finally:
+            done.set()
+
+      self.pool.submit(_task)
+      self.assertTrue(done.wait(5))
+
+   def test_submit(self):
+      results = []
+      self._run(results.append, 1)
+      self.assertEqual(results, [1])
+
+   def test_failed_task_is_logged(self):
+      def _fail():
+         raise ValueError("boom")
+
+      stderr = io.StringIO()
+      with contextlib.redirect_stderr(stderr):
+         self.pool.submit(_fail)
+         # The worker keeps running the following tasks.
+         results = []
+         self._run(results.append, 1)
+      self.assertEqual(results, [1])
+      self.assertIn("failed on the worker thread 'test-worker-1'", stderr.getvalue())
+      self.assertIn("ValueError: boom", stderr.getvalue())
+
+   def test_blocking_task_does_not_count(self):
+      released = Event()
+
+      def _wait():
+         with self.pool.blocking():
+            released.wait(5)
+
+      self.pool.submit(_wait)
+      results = []
+      try:
+         self._run(results.append, 1)
+      finally:
+         released.set()
+      self.assertEqual(results, [1])
+
+   def test_submit_after_shutdown(self):
+      self.pool.shutdown()
+      with self.assertRaises(RuntimeError):
+         self.pool.submit(print)
+
+
+if __name__ == "__main__":
+   unittest.main()
@@ -0,0 +1,134 @@
+#  Copyright 2020-2023 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# *******************************************************************************
+#
+# File: bench_service.py
+#
+# Initially created by Nguyen Huynh Tri Cuong (MS/EMC12-XC) / May 2023.
+#
+# Description:
+#   Provide a configurable stand-in DBus service used as load source by the benchmarks.
+#
+# History:
+#
+# 22.05.2023 / V 0.1.0 / Nguyen Huynh Tri Cuong
+# - Initialize
+#
+# *******************************************************************************
+import argparse
+import time
+
+from dasbus.connection import SessionMessageBus
+from dasbus.loop import EventLoop
+from dasbus.server.interface import dbus_interface, dbus_signal
+from dasbus.typing import Str, UInt32, Double
+from gi.repository import GLib
+
+SERVICE_NAME = "org.example.Benchmark"
+OBJECT_PATH = "/org/example/Benchmark"
+INTERFACE_NAME = "org.example.Benchmark"
+
+
+@dbus_interface(INTERFACE_NAME)
+class BenchmarkService(object):
+   """
+The DBus interface of the benchmark service.
+
+``Sample`` emissions are produced in chunks from the event loop, so that a burst does not block
+the method calls of the clients.
+   """
+   CHUNK_SIZE = 200
+
+   def __init__(self, payload_size):
+      """
+Constructor for BenchmarkService class.
+
+**Arguments:**
+
+* ``payload_size``
+
+  / *Condition*: required / *Type*: int /
+
+  The default size (in characters) of the string payload of the emissions.
+
+**Returns:**
+
+(*no returns*)
+      """
+      self.payload_size = payload_size
+
+   @dbus_signal
+   def Sample(self, seq: UInt32, sent: Double, payload: Str):
+      """Signal emitted by ``Burst``."""
+      pass
+
+   @dbus_signal
+   def Tick(self, sent: Double):
+      """Signal emitted by ``EmitTick``, carrying the wall clock time of the emission."""
+      pass
+
+   def Noop(self):
+      """Do nothing."""
+      pass
+
+   def Echo(self, data: Str) -> Str:
+      """Return the given data."""
+      return data
+
+   def Burst(self, count: UInt32, payload_size: UInt32):
+      """Emit ``count`` ``Sample`` signals as fast as possible."""
+      payload = "x" * (payload_size if payload_size else self.payload_size)
+      state = {"seq": 0}
+
+      def _emit_chunk():
+         end = min(state["seq"] + BenchmarkService.CHUNK_SIZE, count)
+         for seq in range(state["seq"], end):
+            self.Sample(seq, time.time(), payload)
+         state["seq"] = end
+         return end < count
+
+      GLib.idle_add(_emit_chunk)
+
+   def EmitTick(self, delay_ms: UInt32):
+      """Emit one ``Tick`` signal after ``delay_ms`` milliseconds."""
+      def _emit():
+         self.Tick(time.time())
+         return False
+
+      GLib.timeout_add(delay_ms, _emit)
+
+
+def main():
+   """
+Publish the benchmark service on the session bus and run the event loop.
+   """
+   parser = argparse.ArgumentParser(description='Stand-in DBus service of the RobotFramework_DBus benchmarks')
+   parser.add_argument('--service-name', default=SERVICE_NAME, help='The well-known name of the service')
+   parser.add_argument('--object-path', default=OBJECT_PATH, help='The object path of the service')
+   parser.add_argument('--payload-size', type=int, default=64,
+                       help='The default size (in characters) of the payload of the emissions')
+   args = parser.parse_args()
+
+   bus = SessionMessageBus()
+   try:
+      bus.publish_object(args.object_path, BenchmarkService(args.payload_size))
+      bus.register_service(args.service_name)
+      print("Benchmark service '%s' published at '%s'" % (args.service_name, args.object_path), flush=True)
+      EventLoop().run()
+   finally:
+      bus.disconnect()
+
+
+if __name__ == "__main__":
+   main()
@@ -0,0 +1,654 @@
+#  Copyright 2020-2023 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# *******************************************************************************
+#
+# File: run_benchmark.py
+#
+# Initially created by Nguyen Huynh Tri Cuong (MS/EMC12-XC) / May 2023.
+#
+# Description:
+#   Run reproducible benchmarks of DBusClient and DBusClientRemote against a stand-in
+#   service on a private session bus and write the results as JSON.
+#
+#   Usage:
+#
+#      python benchmark/run_benchmark.py --output benchmark_results.json
+#      python benchmark/run_benchmark.py --modes local --scenarios method,signal --iterations 5000
+#      python benchmark/run_benchmark.py --modes remote --scenarios sessions --agent-workers 1
+#      python benchmark/run_benchmark.py --modes remote --scenarios sessions,handlers --blocked-sessions 20
+#      python benchmark/run_benchmark.py --modes remote --scenarios method --transport framed
+#
+#   The private bus is started with 'dbus-daemon --print-address' (--bus daemon, default)
+#   or by running the benchmark under 'dbus-run-session' (--bus run-session).
+#   --bus inherit uses the session bus of the environment as is.
+#
+# History:
+#
+# 22.05.2023 / V 0.1.0 / Nguyen Huynh Tri Cuong
+# - Initialize
+#
+# *******************************************************************************
+import argparse
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPOSITORY_DIR = os.path.dirname(BENCHMARK_DIR)
+
+# Prefer the repository local version of the library (instead of the installed version under site-packages).
+sys.path.insert(0, REPOSITORY_DIR)
+
+PERCENTILES = (50, 90, 99, 99.9)
+MODES = ("local", "remote")
+
+
+class PrivateBus:
+   """
+A private session bus started with 'dbus-daemon --print-address'.
+   """
+   def __init__(self):
+      """
+Constructor for PrivateBus class.
+
+**Returns:**
+
+(*no returns*)
+      """
+      self.address = None
+      self._process = None
+
+   def start(self):
+      """
+Start the bus daemon and make it the session bus of this process and of its children.
+
+**Returns:**
+
+(*no returns*)
+      """
+      self._process = subprocess.Popen(["dbus-daemon", "--session", "--nofork", "--print-address"],
+                                       stdout=subprocess.PIPE, universal_newlines=True)
+      self.address = self._process.stdout.readline().strip()
+      if not self.address:
+         raise RuntimeError("Unable to start a private dbus-daemon.")
+      os.environ["DBUS_SESSION_BUS_ADDRESS"] = self.address
+
+   def stop(self):
+      """
+Stop the bus daemon.
+
+**Returns:**
+
+(*no returns*)
+      """
+      _terminate(self._process)
+      self._process = None
+
+
+def _terminate(process):
+   if process is not None and process.poll() is None:
+      process.terminate()
+      try:
+         process.wait(5)
+      except subprocess.TimeoutExpired:
+         process.kill()
+
+
+def _get_free_port():
+   with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+      sock.bind(("127.0.0.1", 0))
+      return sock.getsockname()[1]
+
+
+def _get_child_env():
+   env = dict(os.environ)
+   env["PYTHONPATH"] = os.pathsep.join([REPOSITORY_DIR] + [p for p in [env.get("PYTHONPATH")] if p])
+   return env
+
+
+def start_service(config):
+   """
+Start the stand-in service and wait until its name is owned on the bus.
+
+**Arguments:**
+
+* ``config``
+
+  / *Condition*: required / *Type*: argparse.Namespace /
+
+  The benchmark configuration.
+
+**Returns:**
+
+  / *Type*: subprocess.Popen /
+
+  The service process.
+   """
+   process = subprocess.Popen([sys.executable, os.path.join(BENCHMARK_DIR, "bench_service.py"),
+                               "--service-name", config.service_name,
+                               "--object-path", config.object_path,
+                               "--payload-size", str(config.payload_size)],
+                              stdout=subprocess.PIPE, universal_newlines=True, env=_get_child_env())
+   if not process.stdout.readline():
+      raise RuntimeError("The benchmark service exited with code '%s'." % process.wait())
+   return process
+
+
+def start_agent(port, workers, framed_port=0):
+   """
+Start a DBus agent listening on the loopback interface and wait until it accepts connections.
+
+**Arguments:**
+
+* ``port``
+
+  / *Condition*: required / *Type*: int /
+
+  The port of the agent.
+
+* ``workers``
+
+  / *Condition*: required / *Type*: int /
+
+  The number of requests which the agent handles at once.
+
+* ``framed_port``
+
+  / *Condition*: optional / *Type*: int / *Default*: 0 /
+
+  The port of the framed transport. 0 disables it.
+
+**Returns:**
+
+  / *Type*: subprocess.Popen /
+
+  The agent process.
+   """
+   process = subprocess.Popen([sys.executable, "-m", "RobotFramework_DBus.dbus_agent.dbus_client_agent",
+                               "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers),
+                               "--framed-port", str(framed_port)],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=_get_child_env())
+   deadline = time.monotonic() + 10
+   while True:
+      if process.poll() is not None:
+         raise RuntimeError("The DBus agent exited with code '%s'." % process.returncode)
+      try:
+         socket.create_connection(("127.0.0.1", port), timeout=1).close()
+         return process
+      except OSError:
+         if time.monotonic() > deadline:
+            raise RuntimeError("The DBus agent is not reachable on port '%s'." % port)
+         time.sleep(0.05)
+
+
+def create_client(mode, config, introspection_cache=True):
+   """
+Create and connect a client of the benchmark service.
+
+**Arguments:**
+
+* ``mode``
+
+  / *Condition*: required / *Type*: str /
+
+  'local' for DBusClient or 'remote' for DBusClientRemote.
+
+* ``config``
+
+  / *Condition*: required / *Type*: argparse.Namespace /
+
+  The benchmark configuration.
+
+* ``introspection_cache``
+
+  / *Condition*: optional / *Type*: bool / *Default*: True /
+
+  Whether the on-disk introspection cache is used.
+
+**Returns:**
+
+  / *Type*: DBusClient | DBusClientRemote /
+
+  The connected client.
+   """
+   if mode == "local":
+      from RobotFramework_DBus.dbus_client import DBusClient
+      client = DBusClient(config.service_name, config.object_path, introspection_cache=introspection_cache)
+   else:
+      from RobotFramework_DBus.dbus_client_remote import DBusClientRemote
+      client = DBusClientRemote(config.service_name, config.object_path, "127.0.0.1", config.agent_port,
+                                introspection_cache=introspection_cache, transport=config.transport,
+                                transport_address=config.framed_port or None)
+   client.connect()
+   return client
+
+
+def _summarize(histogram, operations, elapsed):
+   return {"operations": operations,
+           "elapsed": elapsed,
+           "throughput": operations / elapsed if elapsed > 0 else None,
+           "latency": histogram.to_dict(PERCENTILES)}
+
+
+def _measure_calls(client, method_name, args, iterations, warmup):
+   from RobotFramework_DBus.common.histogram import LogHistogram
+
+   for _ in range(warmup):
+      client.call_dbus_method(method_name, *args)
+   histogram = LogHistogram()
+   start = time.perf_counter()
+   for _ in range(iterations):
+      call_start = time.perf_counter()
+      client.call_dbus_method(method_name, *args)
+      histogram.record(time.perf_counter() - call_start)
+   return _summarize(histogram, iterations, time.perf_counter() - start)
+
+
+def bench_connect(mode, config, client):
+   """
+Time of creating and connecting a client until its first method call returns, without and with
+the introspection cache. The proxies introspect lazily, so the first call is part of the connect time. It runs before the other scenarios, so that the proxy is not shared with their client.
+   """
+   from RobotFramework_DBus.common.histogram import LogHistogram
+
+   results = {}
+   for name, introspection_cache in (("connect", False), ("connect_cached", True)):
+      new_client = create_client(mode, config, introspection_cache)
+      new_client.call_dbus_method("Noop")
+      new_client.quit()
+      histogram = LogHistogram()
+      start = time.perf_counter()
+      for _ in range(config.connect_iterations):
+         connect_start = time.perf_counter()
+         new_client = create_client(mode, config, introspection_cache)
+         new_client.call_dbus_method("Noop")
+         histogram.record(time.perf_counter() - connect_start)
+         new_client.quit()
+      results[name] = _summarize(histogram, config.connect_iterations, time.perf_counter() - start)
+   return results
+
+
+def bench_method(mode, config, client):
+   """
+Throughput and latency of sequential method calls, with an empty and with a string payload.
+   """
+   return {"method_noop": _measure_calls(client, "Noop", [], config.iterations, config.warmup),
+           "method_echo": _measure_calls(client, "Echo", ["x" * config.payload_size],
+                                         config.iterations, config.warmup)}
+
+
+def bench_batch(mode, config, client):
+   """
+Throughput of method calls sent as batches of pipelined calls.
+   """
+   from RobotFramework_DBus.common.histogram import LogHistogram
+
+   calls = [("Noop", [])] * config.batch_size
+   client.call_dbus_method_batch(calls)
+   histogram = LogHistogram()
+   batches = max(1, config.iterations // config.batch_size)
+   start = time.perf_counter()
+   for _ in range(batches):
+      batch_start = time.perf_counter()
+      client.call_dbus_method_batch(calls)
+      histogram.record(time.perf_counter() - batch_start)
+   result = _summarize(histogram, batches * config.batch_size, time.perf_counter() - start)
+   result["batch_size"] = config.batch_size
+   return {"method_batch": result}
+
+
+def bench_signal(mode, config, client):
+   """
+Delivery throughput of a burst of signal emissions, counted by the signal statistics of the client.
+The elapsed time runs from the call of the burst until the last emission has been received.
+   """
+   client.register_monitored_signal("Sample")
+   received_before = client.get_signal_statistics("Sample")["count"]
+   start = time.monotonic()
+   client.call_dbus_method("Burst", config.signal_count, config.payload_size)
+
+   statistics = client.get_signal_statistics("Sample")
+   last_progress = time.monotonic()
+   received = statistics["count"] - received_before
+   while received < config.signal_count and time.monotonic() - last_progress < config.signal_timeout:
+      time.sleep(0.01)
+      statistics = client.get_signal_statistics("Sample")
+      if statistics["count"] - received_before > received:
+         received = statistics["count"] - received_before
+         last_progress = time.monotonic()
+   now = time.monotonic()
+
+   elapsed = (now - statistics["last_received"] - start) if received else None
+   return {"signal_burst": {"sent": config.signal_count,
+                            "received": received,
+                            "elapsed": elapsed,
+                            "throughput": received / elapsed if elapsed else None,
+                            "inter_arrival_p99": statistics["inter_arrival_p99"]}}
+
+
+def bench_wait(mode, config, client):
+   """
+Latency from the emission of a signal until ``wait_for_signal`` returns it.
+The service emits the signal with its wall clock time shortly after the wait has started.
+   """
+   from RobotFramework_DBus.common.histogram import LogHistogram
+
+   client.register_monitored_signal("Tick")
+   histogram = LogHistogram()
+   iterations = config.wait_iterations
+   start = time.perf_counter()
+   for idx in range(config.warmup + iterations):
+      client.call_dbus_method("EmitTick", config.tick_delay)
+      sent = float(client.wait_for_signal("Tick", 5))
+      if idx >= config.warmup:
+         histogram.record(max(time.time() - sent, 0.0))
+   return {"wait_for_signal": _summarize(histogram, iterations, time.perf_counter() - start)}
+
+
+def bench_sessions(mode, config, client):
+   """
+Aggregated throughput of sequential method calls from concurrent sessions, each with its own client
+and thread, while ``--blocked-sessions`` more sessions are blocked in ``wait_for_signal`` for a signal
+which is not emitted. In remote mode it shows whether blocking requests of some sessions delay the
+other sessions.
+   """
+   results = {}
+   for session_count in config.session_counts:
+      blocked_clients = [create_client(mode, config) for _ in range(config.blocked_sessions)]
+      for blocked_client in blocked_clients:
+         blocked_client.register_monitored_signal("Tick")
+
+      def _block(blocked_client):
+         try:
+            blocked_client.wait_for_signal("Tick", config.session_duration + 1)
+         except Exception:
+            pass
+
+      blockers = [threading.Thread(target=_block, args=(blocked_client,)) for blocked_client in blocked_clients]
+
+      def _start_blockers():
+         for blocker in blockers:
+            blocker.start()
+
+      try:
+         result = _measure_callers(mode, config, session_count, _start_blockers)
+         for blocker in blockers:
+            blocker.join()
+      finally:
+         for blocked_client in blocked_clients:
+            blocked_client.quit()
+      result["blocked_sessions"] = config.blocked_sessions
+      results["sessions_%s" % session_count] = result
+   return results
+
+
+def bench_handlers(mode, config, client):
+   """
+Aggregated throughput of sequential method calls from ``--caller-sessions`` concurrent sessions while
+N other sessions have a signal handler for a signal which is not emitted. In remote mode every handler
+session keeps a long poll for signal emissions waiting on the agent, so it shows whether the handler
+sessions delay the callers.
+   """
+   results = {}
+   for handler_count in config.handler_sessions:
+      handler_clients = [create_client(mode, config) for _ in range(handler_count)]
+
+      def _set_handlers():
+         for handler_client in handler_clients:
+            handler_client.set_signal_received_handler("Tick", "No Operation")
+
+      try:
+         result = _measure_callers(mode, config, config.caller_sessions, _set_handlers)
+      finally:
+         for handler_client in handler_clients:
+            handler_client.quit()
+      result["handler_sessions"] = handler_count
+      results["handlers_%s" % handler_count] = result
+   return results
+
+
+def _measure_callers(mode, config, session_count, start_load):
+   """
+Measure the aggregated throughput of sequential method calls from concurrent sessions, each with its own
+client and thread, for ``--session-duration`` seconds. The callers are connected and warmed up before
+``start_load`` starts the requests of the other sessions.
+   """
+   from RobotFramework_DBus.common.histogram import LogHistogram
+
+   clients = [create_client(mode, config) for _ in range(session_count)]
+   try:
+      for session_client in clients:
+         session_client.call_dbus_method("Noop")
+      start_load()
+      # Give the blocking requests of the other sessions time to reach the agent before the measurement starts.
+      time.sleep(0.2)
+      histograms = [LogHistogram() for _ in clients]
+      operations = [0] * session_count
+      start_barrier = threading.Barrier(session_count + 1)
+
+      def _run(idx):
+         start_barrier.wait()
+         deadline = time.perf_counter() + config.session_duration
+         while True:
+            call_start = time.perf_counter()
+            if call_start >= deadline:
+               break
+            clients[idx].call_dbus_method("Noop")
+            histograms[idx].record(time.perf_counter() - call_start)
+            operations[idx] += 1
+
+      threads = [threading.Thread(target=_run, args=(idx,)) for idx in range(session_count)]
+      for thread in threads:
+         thread.start()
+      start_barrier.wait()
+      start = time.perf_counter()
+      for thread in threads:
+         thread.join()
+      elapsed = time.perf_counter() - start
+   finally:
+      for session_client in clients:
+         session_client.quit()
+
+   histogram = LogHistogram()
+   for session_histogram in histograms:
+      histogram.merge(session_histogram)
+   result = _summarize(histogram, sum(operations), elapsed)
+   result["sessions"] = session_count
+   return result
+
+
+SCENARIOS = {"connect": bench_connect,
+             "method": bench_method,
+             "batch": bench_batch,
+             "signal": bench_signal,
+             "wait": bench_wait,
+             "sessions": bench_sessions,
+             "handlers": bench_handlers}
+
+
+def run_benchmarks(config):
+   """
+Run the selected scenarios in the selected modes.
+
+**Arguments:**
+
+* ``config``
+
+  / *Condition*: required / *Type*: argparse.Namespace /
+
+  The benchmark configuration.
+
+**Returns:**
+
+  / *Type*: dict /
+
+  The results keyed by mode and scenario.
+   """
+   results = {}
+   cache_dir = tempfile.TemporaryDirectory(prefix="rf_dbus_bench_")
+   os.environ["ROBOTFRAMEWORK_DBUS_INTROSPECTION_CACHE"] = cache_dir.name
+   service = start_service(config)
+   agent = None
+   try:
+      if "remote" in config.modes:
+         config.agent_port = config.agent_port or _get_free_port()
+         config.framed_port = _get_free_port() if config.transport == "framed" else 0
+         agent = start_agent(config.agent_port, config.agent_workers, config.framed_port)
+
+      for mode in config.modes:
+         results[mode] = {}
+         if "connect" in config.scenarios:
+            print("Running 'connect' in %s mode..." % mode, flush=True)
+            results[mode].update(bench_connect(mode, config, None))
+         client = create_client(mode, config)
+         try:
+            for scenario in config.scenarios:
+               if scenario != "connect":
+                  print("Running '%s' in %s mode..." % (scenario, mode), flush=True)
+                  results[mode].update(SCENARIOS[scenario](mode, config, client))
+         finally:
+            client.quit()
+   finally:
+      _terminate(agent)
+      _terminate(service)
+      cache_dir.cleanup()
+      if "local" in config.modes:
+         # A shared GDBus connection raises SIGTERM when its bus goes away, so it is closed before the bus is stopped.
+         from RobotFramework_DBus.dbus_client import get_session_bus
+         get_session_bus().disconnect()
+   return results
+
+
+def print_results(results):
+   """
+Print a short overview of the results.
+
+**Arguments:**
+
+* ``results``
+
+  / *Condition*: required / *Type*: dict /
+
+  The results of ``run_benchmarks``.
+
+**Returns:**
+
+(*no returns*)
+   """
+   print("%-8s %-16s %10s %12s %12s %12s" % ("mode", "scenario", "ops", "ops/s", "p50 [ms]", "p99 [ms]"))
+   for mode, scenarios in results.items():
+      for name, result in scenarios.items():
+         latency = result.get("latency", {})
+         operations = result.get("operations", result.get("received"))
+         cells = [result.get("throughput"), latency.get("p50"), latency.get("p99")]
+         cells = [("%.1f" % cells[0]) if cells[0] is not None else "-"] + \
+                 [("%.3f" % (value * 1000)) if value is not None else "-" for value in cells[1:]]
+         print("%-8s %-16s %10s %12s %12s %12s" % (mode, name, operations, *cells))
+
+
+def _parse_list(value, choices):
+   items = [item.strip() for item in value.split(",") if item.strip()]
+   for item in items:
+      if item not in choices:
+         raise argparse.ArgumentTypeError("Invalid value '%s'. Possible values are: %s" % (item, ", ".join(choices)))
+   return items
+
+
+def parse_args(argv=None):
+   """
+Parse the command-line arguments of the benchmark.
+   """
+   parser = argparse.ArgumentParser(description='RobotFramework_DBus benchmarks')
+   parser.add_argument('--bus', choices=("daemon", "run-session", "inherit"), default="daemon",
+                       help='How the private session bus is provided')
+   parser.add_argument('--modes', type=lambda value: _parse_list(value, MODES), default=list(MODES),
+                       help='Comma separated client modes: local, remote')
+   parser.add_argument('--scenarios', type=lambda value: _parse_list(value, tuple(SCENARIOS)),
+                       default=list(SCENARIOS), help='Comma separated scenarios: %s' % ", ".join(SCENARIOS))
+   parser.add_argument('--output', default="benchmark_results.json", help='The JSON result file')
+   parser.add_argument('--iterations', type=int, default=2000, help='Number of measured method calls')
+   parser.add_argument('--warmup', type=int, default=50, help='Number of unmeasured calls before measuring')
+   parser.add_argument('--connect-iterations', type=int, default=20, help='Number of measured connects')
+   parser.add_argument('--wait-iterations', type=int, default=200, help='Number of measured signal waits')
+   parser.add_argument('--batch-size', type=int, default=100, help='Number of calls per batch')
+   parser.add_argument('--signal-count', type=int, default=10000, help='Number of emissions of the signal burst')
+   parser.add_argument('--signal-timeout', type=float, default=5.0,
+                       help='Seconds without a received emission after which the burst is considered finished')
+   parser.add_argument('--payload-size', type=int, default=64, help='Size (in characters) of the payloads')
+   parser.add_argument('--tick-delay', type=int, default=20,
+                       help='Delay (in milliseconds) between the start of a wait and the emission')
+   parser.add_argument('--service-name', default="org.example.Benchmark", help='The name of the stand-in service')
+   parser.add_argument('--object-path', default="/org/example/Benchmark", help='The object path of the service')
+   parser.add_argument('--agent-port', type=int, default=0, help='The port of the loopback agent. 0 picks a free port')
+   parser.add_argument('--agent-workers', type=int, default=16,
+                       help='The number of requests which the loopback agent handles at once')
+   parser.add_argument('--transport', choices=("xmlrpc", "framed"), default="xmlrpc",
+                       help='The transport of the remote mode. framed requires the msgpack package')
+   parser.add_argument('--session-counts', type=lambda value: [int(item) for item in value.split(",") if item.strip()],
+                       default=[1, 4, 16], help='Comma separated numbers of concurrent sessions')
+   parser.add_argument('--session-duration', type=float, default=2.0,
+                       help='Duration (in seconds) of the concurrent sessions measurement')
+   parser.add_argument('--blocked-sessions', type=int, default=1,
+                       help='Number of sessions blocked in Wait For Signal during the concurrent sessions measurement')
+   parser.add_argument('--handler-sessions', type=lambda value: [int(item) for item in value.split(",") if item.strip()],
+                       default=[0, 32], help='Comma separated numbers of sessions with a signal handler')
+   parser.add_argument('--caller-sessions', type=int, default=4,
+                       help='Number of calling sessions during the signal handler sessions measurement')
+   return parser.parse_args(argv)
+
+
+def main(argv=None):
+   """
+Run the benchmarks and write the results.
+   """
+   argv = sys.argv[1:] if argv is None else argv
+   config = parse_args(argv)
+
+   if config.bus == "run-session":
+      command = ["dbus-run-session", "--", sys.executable, os.path.abspath(__file__)] + argv + ["--bus", "inherit"]
+      return subprocess.call(command)
+
+   private_bus = PrivateBus() if config.bus == "daemon" else None
+   if private_bus is not None:
+      private_bus.start()
+   try:
+      results = run_benchmarks(config)
+   finally:
+      if private_bus is not None:
+         private_bus.stop()
+
+   from RobotFramework_DBus.version import VERSION
+   report = {"metadata": {"version": VERSION,
+                          "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                          "python": platform.python_version(),
+                          "platform": platform.platform(),
+                          "processor": platform.processor() or platform.machine(),
+                          "cpu_count": os.cpu_count(),
+                          "config": {key: value for key, value in vars(config).items()}},
+             "results": results}
+   with open(config.output, "w", encoding="utf-8") as output_file:
+      json.dump(report, output_file, indent=2)
+   print_results(results)
+   print("Results written to '%s'" % config.output)
+   return 0
+
+
+if __name__ == "__main__":
+   sys.exit(main())
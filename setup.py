@@ -225,6 +225,7 @@ setuptools.setup(
         'install': ExtendedInstallCommand,
     },
     install_requires = install_requires_packages,
+    extras_require = oRepositoryConfig.Get('EXTRASREQUIRE'),
     package_data={f"{oRepositoryConfig.Get('PACKAGENAME')}" : oRepositoryConfig.Get('PACKAGEDATA')},
 )
 